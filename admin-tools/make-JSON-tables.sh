@@ -5,10 +5,14 @@ PYTHON=${PYTHON:-python}
 
 cd $mydir/../mathicsscript/data
 mathics3-make-named-character-json --field=ascii-operators -o mma-tables.json
+# The named-character and operator tables that mathicsscript memory-maps.
+(cd ../.. && $PYTHON -m mathicsscript.chartables -o mathicsscript/data/character-tables.bin)
 
 for file in inputrc-unicode inputrc-no-unicode; do
     echo "# GNU Readline input unicode translations" > $file
     echo "# Autogenerated from mathics_scanner.generate.rl_inputrc on $(date)" >> $file
     echo "" >> $file
-    $PYTHON -m mathics_scanner.generate.rl_inputrc inputrc-unicode >> $file
+    $PYTHON -m mathics_scanner.generate.rl_inputrc $file >> $file
+    # The trie of bindings that the prompt_toolkit shell reads.
+    (cd ../.. && $PYTHON -m mathicsscript.inputrc mathicsscript/data/$file)
 done
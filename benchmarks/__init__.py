@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for mathicsscript front-end hot paths.
+
+Run with ``python -m benchmarks``; ``python -m benchmarks --help`` lists
+options. See ``benchmarks/runner.py`` for how benchmarks are written.
+"""
+
+import importlib
+import pkgutil
+import os.path as osp
+
+
+def load_all_benchmarks():
+    """
+    Import every ``bench_*`` module in this package so that its
+    benchmarks get registered.
+    """
+    for module_info in pkgutil.iter_modules([osp.dirname(__file__)]):
+        if module_info.name.startswith("bench_"):
+            importlib.import_module(f"benchmarks.{module_info.name}")
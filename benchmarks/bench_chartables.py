@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Loading the named-character and operator tables that the completers use:
+from Mathics-Scanner's JSON, as mathicsscript did at startup, or from the
+compiled tables it memory-maps.
+"""
+
+from benchmarks.runner import benchmark
+
+
+@benchmark("chartables.load.json", repeat=10)
+def chartables_load_json():
+    """
+    What mathicsscript.settings, Mathics3Completer and the GNU Readline
+    shell each did to get the tables they needed.
+    """
+    import json
+    import os.path as osp
+
+    from mathics_scanner.load import load_mathics3_named_characters_json
+
+    from mathicsscript.completion import get_datadir
+
+    def run():
+        named_characters = load_mathics3_named_characters_json()
+        sorted(named_characters["named-characters"].keys())
+        set(named_characters["named-characters"].keys())
+        with open(osp.join(get_datadir(), "mma-tables.json"), "r") as f:
+            frozenset(json.load(f)["ascii-operators"])
+
+    return run
+
+
+@benchmark("chartables.load.mmap", repeat=10)
+def chartables_load_mmap():
+    from mathicsscript.chartables import load_character_tables
+
+    return lambda: load_character_tables(cache_path=None)["named-characters"]
+
+
+@benchmark("chartables.lookup.prefix", number=100, items=3)
+def chartables_lookup_prefix():
+    from mathicsscript.chartables import load_character_tables
+
+    named_characters = load_character_tables(cache_path=None)["named-characters"]
+
+    def run():
+        for prefix in ("Alp", "Dou", "Z"):
+            list(named_characters.prefixed(prefix))
+
+    return run
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""
+Session checkpoints: saving after an input, and taking a session up
+again from its checkpoint rather than by evaluating its inputs again.
+"""
+
+import atexit
+import os.path as osp
+import shutil
+import tempfile
+
+from benchmarks.common import builtin_definitions
+from benchmarks.runner import benchmark
+
+SESSION_INPUTS = [
+    "data = Table[Prime[i] + i^2, {i, 400}]",
+    "f[n_] := Sum[1/k^2, {k, n}]",
+    "series = Table[f[n], {n, 60}]",
+    "poly = Expand[(x + y + z)^8]",
+    "sol = Solve[x^3 - 6 x^2 + 11 x - 6 == 0, x]",
+] + [f"v{i} = Factor[x^{i % 20 + 2} - 1]" for i in range(95)]
+
+
+def new_definitions():
+    definitions = builtin_definitions()
+    definitions.set_line_no(0)
+    return definitions
+
+
+def replay(definitions) -> None:
+    from mathics.core.evaluation import Evaluation
+
+    for code in SESSION_INPUTS:
+        Evaluation(definitions).parse_evaluate(code)
+
+
+def session_file() -> str:
+    """
+    Return a checkpoint of the session that SESSION_INPUTS make.
+    """
+    from mathicsscript.checkpoint import SessionCheckpoint
+
+    directory = tempfile.mkdtemp(prefix="mathicsscript-checkpoint-")
+    atexit.register(shutil.rmtree, directory, True)
+    path = osp.join(directory, "session")
+    definitions = new_definitions()
+    replay(definitions)
+    SessionCheckpoint(path).save(definitions)
+    return path
+
+
+# Loading the builtin definitions, which both ways of resuming start
+# with, isn't timed.
+
+
+@benchmark("checkpoint.resume.replay", repeat=3, items=len(SESSION_INPUTS))
+def checkpoint_resume_replay():
+    definitions = new_definitions()
+    return lambda: replay(definitions)
+
+
+@benchmark("checkpoint.resume.restore", repeat=5, items=len(SESSION_INPUTS))
+def checkpoint_resume_restore():
+    from mathicsscript.checkpoint import restore_session
+
+    path = session_file()
+    definitions = new_definitions()
+    return lambda: restore_session(definitions, path)
+
+
+@benchmark("checkpoint.save.full", repeat=5)
+def checkpoint_save_full():
+    from mathicsscript.checkpoint import SessionCheckpoint
+
+    path = session_file()
+    definitions = new_definitions()
+    replay(definitions)
+    return lambda: SessionCheckpoint(path).save(definitions)
+
+
+@benchmark("checkpoint.save.incremental", number=20, repeat=5)
+def checkpoint_save_incremental():
+    """
+    Evaluating an input and saving what it changed, as --autosave 1 does
+    without the fork.
+    """
+    from mathics.core.evaluation import Evaluation
+
+    from mathicsscript.checkpoint import SessionCheckpoint
+
+    path = session_file()
+    definitions = new_definitions()
+    replay(definitions)
+    checkpoint = SessionCheckpoint(path)
+    checkpoint.save(definitions)
+
+    def run():
+        Evaluation(definitions).parse_evaluate("1 + 1")
+        checkpoint.save(definitions)
+
+    return run
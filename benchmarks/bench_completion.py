@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Completion latency for the prompt_toolkit and GNU Readline shells.
+"""
+
+from benchmarks.runner import benchmark
+
+COMPLETION_PREFIXES = ("F", "Fibo", "Sys", "System`Plu", "Settings`$")
+
+
+def get_prompt_completer():
+    from mathicsscript.completion import Mathics3Completer
+    from mathicsscript.settings import definitions
+
+    return Mathics3Completer(definitions)
+
+
+def get_gnu_shell():
+    from mathicsscript.settings import definitions
+    from mathicsscript.termshell_gnu import TerminalShellGNUReadline
+
+    return TerminalShellGNUReadline(
+        definitions=definitions,
+        want_readline=True,
+        want_completion=True,
+        use_unicode=False,
+        prompt=True,
+    )
+
+
+def all_completions(complete_fn, text: str) -> list:
+    """Call a GNU Readline-style completer until it runs out of matches."""
+    matches = []
+    state = 0
+    while (match := complete_fn(text, state)) is not None:
+        matches.append(match)
+        state += 1
+    return matches
+
+
+@benchmark("completion.prompt.symbol", number=10)
+def completion_prompt_symbol():
+    from prompt_toolkit.completion import CompleteEvent
+    from prompt_toolkit.document import Document
+
+    completer = get_prompt_completer()
+    documents = [Document(prefix) for prefix in COMPLETION_PREFIXES]
+    event = CompleteEvent(completion_requested=True)
+
+    def run():
+        for document in documents:
+            list(completer.get_completions(document, event))
+
+    return run
+
+
+@benchmark("completion.prompt.named_character", number=50)
+def completion_prompt_named_character():
+    from prompt_toolkit.completion import CompleteEvent
+    from prompt_toolkit.document import Document
+
+    completer = get_prompt_completer()
+    document = Document(r"\[Al")
+    event = CompleteEvent(completion_requested=True)
+    return lambda: list(completer.get_completions(document, event))
+
+
+@benchmark("completion.gnu.symbol", number=10)
+def completion_gnu_symbol():
+    shell = get_gnu_shell()
+
+    def run():
+        for prefix in COMPLETION_PREFIXES:
+            all_completions(shell.complete_symbol_name, prefix)
+
+    return run
+
+
+@benchmark("completion.gnu.named_character", number=50)
+def completion_gnu_named_character():
+    shell = get_gnu_shell()
+    return lambda: all_completions(shell.complete_symbol_name, r"\[Al")
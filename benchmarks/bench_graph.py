@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""
+Graph rendering through ``format_graph`` for several networkx layouts
+and graph sizes. Drawing uses matplotlib's non-interactive Agg backend.
+"""
+
+from benchmarks.common import has_matplotlib
+from benchmarks.runner import benchmark
+
+GRAPH_SIZES = (10, 100, 500)
+GRAPH_LAYOUTS = ("circular", "spiral", "spring", "tree")
+
+
+def make_graph(layout: str, size: int):
+    import networkx as nx
+
+    if layout == "tree":
+        G = nx.balanced_tree(2, max(size.bit_length() - 1, 1), create_using=nx.DiGraph)
+    else:
+        G = nx.gnm_random_graph(size, 2 * size, seed=42)
+    G.graph_layout = layout
+    G.vertex_labels = False
+    return G
+
+
+def make_format_graph_benchmark(layout: str, size: int):
+    @benchmark(f"graph.format_graph.{layout}.{size}", repeat=3)
+    def format_graph_benchmark():
+        import warnings
+
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+
+        from mathicsscript.format import format_graph
+
+        G = make_graph(layout, size)
+
+        def run():
+            with warnings.catch_warnings():
+                # Agg warns that plt.show() can't show anything.
+                warnings.simplefilter("ignore")
+                format_graph(G)
+            plt.close("all")
+
+        return run
+
+
+# Without matplotlib, format_graph() can't draw anything.
+if has_matplotlib():
+    for layout in GRAPH_LAYOUTS:
+        for size in GRAPH_SIZES:
+            make_format_graph_benchmark(layout, size)
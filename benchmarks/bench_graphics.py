@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+"""
+Showing a Graphics[] of many points: drawn straight into matplotlib by
+``render_graphics`` and saved as a PNG, against exporting it to SVG,
+which is what the matplotlib display used before and still uses for
+graphics it can't draw. And rotating a dense Graphics3D[] surface drawn
+by ``render_graphics3d``, with and without simplifying it. Drawing uses
+matplotlib's Agg backend.
+"""
+
+import math
+import random
+from typing import Optional
+
+from benchmarks.common import builtin_definitions, has_matplotlib
+from benchmarks.runner import benchmark
+
+POINT_COUNTS = (10_000, 1_000_000)
+# Exporting to SVG takes about 40 seconds for 100,000 points.
+SVG_POINT_COUNT = 10_000
+
+
+def point_graphics(count: int):
+    """
+    Return Graphics[{Point[{...}]}] with ``count`` random points, the
+    way ListPlot draws them.
+    """
+    from mathics.core.atoms import MachineReal
+    from mathics.core.expression import Expression
+    from mathics.core.list import ListExpression
+    from mathics.core.systemsymbols import SymbolGraphics, SymbolPoint
+
+    rng = random.Random(44)
+    points = ListExpression(
+        *(
+            ListExpression(MachineReal(rng.random()), MachineReal(rng.random()))
+            for _ in range(count)
+        )
+    )
+    return Expression(SymbolGraphics, ListExpression(Expression(SymbolPoint, points)))
+
+
+def make_matplotlib_benchmark(count: int):
+    @benchmark(f"graphics.points.matplotlib.{count}", repeat=3, items=count)
+    def matplotlib_benchmark():
+        import io
+
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        from mathics.core.evaluation import Evaluation
+
+        from mathicsscript.mplgraphics import render_graphics
+
+        definitions = builtin_definitions()
+        graphics = point_graphics(count)
+
+        def run():
+            figure = render_graphics(graphics, Evaluation(definitions), plt)
+            figure.savefig(io.BytesIO(), format="png")
+            plt.close(figure)
+
+        return run
+
+
+@benchmark(f"graphics.points.svg.{SVG_POINT_COUNT}", repeat=3, items=SVG_POINT_COUNT)
+def svg_benchmark():
+    from mathics.core.atoms import String
+    from mathics.core.evaluation import Evaluation
+    from mathics.core.expression import Expression
+    from mathics.core.systemsymbols import SymbolExportString
+
+    definitions = builtin_definitions()
+    export = Expression(
+        SymbolExportString, point_graphics(SVG_POINT_COUNT), String("SVG")
+    )
+    return lambda: export.evaluate(Evaluation(definitions))
+
+
+# A surface like Plot3D[] gives, of 2 x 199^2 triangles.
+SURFACE_GRID = 200
+
+
+def surface_graphics3d(n: int):
+    """
+    Return Graphics3D[{Polygon[...], ...}] with the triangles of the
+    surface z = Sin[x y] over an ``n`` x ``n`` grid.
+    """
+    from mathics.core.atoms import MachineReal
+    from mathics.core.expression import Expression
+    from mathics.core.list import ListExpression
+    from mathics.core.systemsymbols import SymbolGraphics3D, SymbolPolygon
+
+    def vertex(i, j):
+        x, y = 3 * i / (n - 1), 3 * j / (n - 1)
+        return ListExpression(
+            MachineReal(x), MachineReal(y), MachineReal(math.sin(x * y))
+        )
+
+    vertices = [[vertex(i, j) for j in range(n)] for i in range(n)]
+    triangles = []
+    for i in range(n - 1):
+        for j in range(n - 1):
+            for corners in (
+                ((i, j), (i + 1, j), (i, j + 1)),
+                ((i + 1, j), (i + 1, j + 1), (i, j + 1)),
+            ):
+                triangles.append(
+                    Expression(
+                        SymbolPolygon,
+                        ListExpression(*(vertices[a][b] for a, b in corners)),
+                    )
+                )
+    return Expression(SymbolGraphics3D, ListExpression(*triangles))
+
+
+def make_rotation_benchmark(name: str, max_polygons: Optional[int]):
+    @benchmark(f"graphics3d.surface.rotate.{name}", number=5, repeat=3)
+    def rotation_benchmark():
+        """
+        Redraw a dense surface from a new view point, as rotating it does.
+        """
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        from mathics.core.evaluation import Evaluation
+
+        from mathicsscript.mplgraphics3d import MAX_POLYGONS, render_graphics3d
+
+        definitions = builtin_definitions()
+        figure = render_graphics3d(
+            surface_graphics3d(SURFACE_GRID),
+            Evaluation(definitions),
+            plt,
+            max_polygons or MAX_POLYGONS,
+        )
+        (ax,) = figure.axes
+        figure.canvas.draw()
+
+        def run():
+            ax.view_init(elev=ax.elev, azim=ax.azim + 10)
+            figure.canvas.draw()
+
+        return run
+
+
+# Without matplotlib, nothing can be drawn.
+if has_matplotlib():
+    for count in POINT_COUNTS:
+        make_matplotlib_benchmark(count)
+    make_rotation_benchmark("decimated", None)
+    make_rotation_benchmark("full", 2 * SURFACE_GRID**2)
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+The input history store: what a shell pays at startup to open it and
+load recent entries, and searching a large archive.
+"""
+
+import atexit
+import os.path as osp
+import shutil
+import tempfile
+
+from benchmarks.runner import benchmark
+from mathicsscript.history import HistoryStore
+
+ARCHIVE_SIZE = 200000
+
+
+def make_archive(size: int) -> str:
+    """
+    Return the path of a history database holding ``size`` entries.
+    """
+    directory = tempfile.mkdtemp(prefix="mathicsscript-history-")
+    atexit.register(shutil.rmtree, directory, True)
+    path = osp.join(directory, "history.sqlite")
+    store = HistoryStore(path, max_entries=0, legacy_files=())
+    with store.connection:
+        store.connection.executemany(
+            "INSERT INTO history(time, shell, text) VALUES (?, 'prompt', ?)",
+            ((float(i), f"Expand[(x + y)^{i % 50}] + f{i}[z]") for i in range(size)),
+        )
+    store.connection.close()
+    return path
+
+
+def open_and_load(size: int):
+    path = make_archive(size)
+
+    def run():
+        store = HistoryStore(path, max_entries=0, legacy_files=())
+        store.recent()
+        store.connection.close()
+
+    return run
+
+
+@benchmark("history.startup.1k", repeat=10)
+def history_startup_small():
+    return open_and_load(1000)
+
+
+@benchmark("history.startup.200k", repeat=10)
+def history_startup_large():
+    return open_and_load(ARCHIVE_SIZE)
+
+
+def search_archive(pattern: str, regex: bool):
+    store = HistoryStore(make_archive(ARCHIVE_SIZE), max_entries=0, legacy_files=())
+    return lambda: store.search(pattern, regex)
+
+
+@benchmark("history.search.substring.200k", repeat=10)
+def history_search_substring():
+    # Only a few old entries match, so most of the archive is considered.
+    return search_archive("f123[", False)
+
+
+@benchmark("history.search.regex.200k", repeat=5)
+def history_search_regex():
+    return search_archive(r"f12\d\[", True)
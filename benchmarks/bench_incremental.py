@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+``mathicsscript --incremental -f``: evaluating a script again after a
+change to its last statement, compared with evaluating all of it.
+"""
+
+import atexit
+import itertools
+import os.path as osp
+import shutil
+import tempfile
+
+from benchmarks.common import builtin_definitions
+from benchmarks.runner import benchmark
+
+STATEMENT_COUNT = 200
+
+
+def script_text(last: int) -> str:
+    statements = [f"d{i} = Table[Prime[k] + {i}, {{k, 200}}]" for i in range(100)]
+    statements += [
+        f"s{i} = Total[d{i}] + Length[Select[d{i}, PrimeQ]]" for i in range(99)
+    ]
+    statements.append(f"result = s{last} + s{last + 1}")
+    return "\n".join(statements) + "\n"
+
+
+def make_script() -> tuple:
+    directory = tempfile.mkdtemp(prefix="mathicsscript-incremental-")
+    atexit.register(shutil.rmtree, directory, True)
+    path = osp.join(directory, "analysis.m")
+    with open(path, "w") as f:
+        f.write(script_text(0))
+    return path, osp.join(directory, "cache")
+
+
+@benchmark("incremental.file.full", repeat=3, items=STATEMENT_COUNT)
+def incremental_file_full():
+    from mathics.core.evaluation import Evaluation, Output
+    from mathics.core.parser import MathicsFileLineFeeder
+
+    path, _ = make_script()
+    definitions = builtin_definitions()
+
+    def run():
+        with open(path) as f:
+            feeder = MathicsFileLineFeeder(f)
+            while not feeder.empty():
+                evaluation = Evaluation(definitions, output=Output())
+                query = evaluation.parse_feeder(feeder)
+                if query is not None:
+                    evaluation.evaluate(query)
+
+    return run
+
+
+@benchmark("incremental.file.last_changed", repeat=5, items=STATEMENT_COUNT)
+def incremental_file_last_changed():
+    from mathics.core.evaluation import Output
+
+    from mathicsscript.incremental import evaluate_file_incremental
+
+    path, cache_dir = make_script()
+    definitions = builtin_definitions()
+    evaluate_file_incremental(definitions, path, Output(), print, cache_dir=cache_dir)
+    lasts = itertools.cycle(range(1, 10))
+
+    def run():
+        with open(path, "w") as f:
+            f.write(script_text(next(lasts)))
+        evaluate_file_incremental(
+            definitions, path, Output(), print, cache_dir=cache_dir
+        )
+
+    return run
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+"""
+Showing a Plot[] in the terminal: drawing it and encoding it as Sixel,
+and showing it again from the cache of encoded images. Drawing uses
+matplotlib's Agg backend.
+"""
+
+import io
+
+from benchmarks.common import builtin_definitions, has_matplotlib
+from benchmarks.runner import benchmark
+
+
+def inline_plot(cached: bool):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    from mathics.core.evaluation import Evaluation
+
+    from mathicsscript import inlineimage
+
+    inlineimage.terminal_size = lambda: (120, (10, 20))
+    definitions = builtin_definitions()
+    plot = (
+        Evaluation(definitions)
+        .parse_evaluate("Plot[{Sin[x], Cos[2 x]}, {x, 0, 10}]")
+        .last_eval
+    )
+
+    def run():
+        if not cached:
+            inlineimage.image_cache = inlineimage.InlineImageCache()
+        inlineimage.show_inline(plot, Evaluation(definitions), "Sixel", io.BytesIO())
+
+    run()
+    return run
+
+
+# Without matplotlib, nothing can be drawn.
+if has_matplotlib():
+
+    @benchmark("inlineimage.plot.sixel.draw", repeat=3)
+    def inlineimage_plot_draw():
+        return inline_plot(cached=False)
+
+    @benchmark("inlineimage.plot.sixel.cached", number=100, repeat=3)
+    def inlineimage_plot_cached():
+        return inline_plot(cached=True)
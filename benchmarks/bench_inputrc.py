@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+inputrc key bindings in the prompt_toolkit shell: reading them at startup,
+and typing input that uses them.
+"""
+
+import atexit
+import os.path as osp
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.runner import benchmark
+
+ALIAS_COUNT = 200
+
+
+def full_inputrc() -> str:
+    """
+    Return the path of an inputrc with all the bindings Mathics-Scanner
+    generates, as a built mathicsscript has.
+    """
+    directory = tempfile.mkdtemp(prefix="mathicsscript-inputrc-")
+    atexit.register(shutil.rmtree, directory, True)
+    path = osp.join(directory, "inputrc-unicode")
+    with open(path, "w") as f:
+        subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "mathics_scanner.generate.rl_inputrc",
+                "inputrc-unicode",
+            ],
+            stdout=f,
+            check=True,
+        )
+    return path
+
+
+@benchmark("inputrc.load.parse", repeat=10)
+def inputrc_load_parse():
+    from mathicsscript.inputrc import load_inputrc_trie
+
+    path = full_inputrc()
+    return lambda: load_inputrc_trie(path, cache_dir=None)
+
+
+@benchmark("inputrc.load.compiled", repeat=10)
+def inputrc_load_compiled():
+    from mathicsscript.inputrc import load_inputrc_trie
+
+    path = full_inputrc()
+    cache_dir = osp.join(osp.dirname(path), "cache")
+    load_inputrc_trie(path, cache_dir)
+    return lambda: load_inputrc_trie(path, cache_dir)
+
+
+@benchmark("inputrc.typing.aliases", repeat=5, items=ALIAS_COUNT)
+def inputrc_typing_aliases():
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.input import create_pipe_input
+    from prompt_toolkit.key_binding import KeyBindings
+    from prompt_toolkit.output import DummyOutput
+
+    from mathicsscript.bindkeys import InputrcDispatcher
+    from mathicsscript.inputrc import load_inputrc_trie
+
+    key_bindings = KeyBindings()
+    InputrcDispatcher(key_bindings).add_trie(
+        load_inputrc_trie(full_inputrc(), cache_dir=None)
+    )
+    keys = "\x1bal\x1b + \x1bp\x1b " * (ALIAS_COUNT // 2) + "\r"
+
+    def run():
+        with create_pipe_input() as pipe_input:
+            pipe_input.send_text(keys)
+            PromptSession(
+                input=pipe_input, output=DummyOutput(), key_bindings=key_bindings
+            ).prompt()
+
+    return run
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Settings`Cached: a report of expensive pure expressions, evaluated
+afresh and read back from the cache of an earlier run.
+"""
+
+import atexit
+import shutil
+import tempfile
+
+from benchmarks.common import builtin_definitions
+from benchmarks.runner import benchmark
+
+REPORT = [
+    "f[x_] := x^3 Exp[-x] Sin[x]",
+    "integral = Settings`Cached[Integrate[f[x], x]];",
+    "roots = Settings`Cached[Solve[x^4 - 10 x^2 + 1 == 0, x]];",
+    "poly = Settings`Cached[Expand[(1 + x + y)^12]];",
+    "factors = Settings`Cached[Factor[x^60 - 1]];",
+    "series = Settings`Cached[Series[f[x], {x, 0, 8}]];",
+]
+
+
+def report_definitions(memo_dir: str):
+    from mathics.core.atoms import String
+
+    from mathicsscript.memo import install_memo_builtins
+
+    definitions = builtin_definitions()
+    install_memo_builtins(definitions)
+    definitions.set_ownvalue("Settings`$MemoDirectory", String(memo_dir))
+    return definitions
+
+
+def run_report(definitions) -> None:
+    from mathics.core.evaluation import Evaluation
+
+    for code in REPORT:
+        Evaluation(definitions).parse_evaluate(code)
+
+
+def memo_dir() -> str:
+    directory = tempfile.mkdtemp(prefix="mathicsscript-memo-")
+    atexit.register(shutil.rmtree, directory, True)
+    return directory
+
+
+@benchmark("memo.report.uncached", repeat=3)
+def memo_report_uncached():
+    directory = memo_dir()
+    definitions = report_definitions(directory)
+
+    def run():
+        shutil.rmtree(directory, ignore_errors=True)
+        run_report(definitions)
+
+    return run
+
+
+@benchmark("memo.report.cached", number=5, repeat=3)
+def memo_report_cached():
+    definitions = report_definitions(memo_dir())
+    run_report(definitions)
+    return lambda: run_report(definitions)
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Keeping Out[] results within Settings`$OutHistoryMemoryLimit: what
+OutHistory.update() adds to each input once the history is full, and
+the resident memory of a session of large results with and without a
+limit.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+
+from benchmarks.common import builtin_definitions
+from benchmarks.runner import benchmark
+
+# Each result is a different string of 8 megabytes.
+LARGE_INPUT = 'StringRepeat["ab", 4000000] <> "{}"'
+INPUTS = 40
+
+
+def new_definitions():
+    definitions = builtin_definitions()
+    definitions.set_line_no(0)
+    return definitions
+
+
+def new_out_history():
+    from mathicsscript.outhistory import OutHistory, install_out_history_builtins
+
+    directory = tempfile.mkdtemp(prefix="mathicsscript-outhistory-")
+    atexit.register(shutil.rmtree, directory, True)
+    definitions = new_definitions()
+    install_out_history_builtins(definitions)
+    return definitions, OutHistory(directory)
+
+
+def resident_megabytes() -> float:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+@benchmark("outhistory.update.full-history", number=20)
+def outhistory_update():
+    from mathics.core.evaluation import Evaluation
+
+    definitions, out_history = new_out_history()
+    for i in range(100):
+        Evaluation(definitions).parse_evaluate(f"Range[{i}, 1000]")
+    out_history.update(definitions)
+    return lambda: out_history.update(definitions)
+
+
+def session_of_large_results(limit: str) -> None:
+    """
+    Evaluate INPUTS large results with the given limit in a forked child,
+    and report how much the child's resident memory grew.
+    """
+    from mathics.core.evaluation import Evaluation
+
+    pid = os.fork()
+    if pid == 0:
+        definitions, out_history = new_out_history()
+        Evaluation(definitions).parse_evaluate(
+            f"Settings`$OutHistoryMemoryLimit = {limit}"
+        )
+        start = resident_megabytes()
+        for i in range(INPUTS):
+            Evaluation(definitions).parse_evaluate(LARGE_INPUT.format(i))
+            out_history.update(definitions)
+        print(
+            f"    {limit} MB limit: resident memory grew by "
+            f"{resident_megabytes() - start:.0f} MB"
+        )
+        out_history.close()
+        os._exit(0)
+    os.waitpid(pid, 0)
+
+
+@benchmark("outhistory.session.limit-64MB", repeat=1)
+def outhistory_session_limited():
+    return lambda: session_of_large_results("64")
+
+
+@benchmark("outhistory.session.no-limit", repeat=1)
+def outhistory_session_unlimited():
+    return lambda: session_of_large_results("Infinity")
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Result printing throughput: ``print_result`` with and without Pygments
+styling, for small and large outputs.
+"""
+
+import contextlib
+import io
+
+from benchmarks.runner import benchmark
+
+OUTPUTS = {
+    "small": ("Expand[(x + y)^3]", 200),
+    "large": ("Range[20000]", 3),
+}
+
+STYLES = ("None", "inkpot")
+
+
+def make_print_result_benchmark(size: str, style: str):
+    expr, number = OUTPUTS[size]
+
+    @benchmark(f"output.print_result.{size}.{style}", number=number)
+    def print_result_benchmark():
+        from mathics.core.evaluation import Evaluation
+
+        from mathicsscript.settings import definitions
+        from mathicsscript.termshell_gnu import TerminalShellGNUReadline
+
+        shell = TerminalShellGNUReadline(
+            definitions,
+            want_readline=False,
+            want_completion=False,
+            use_unicode=False,
+            prompt=True,
+        )
+        shell.setup_pygments_style(style)
+        result = Evaluation(definitions, format="text").parse_evaluate(expr)
+        sink = io.StringIO()
+
+        def run():
+            sink.seek(0)
+            sink.truncate()
+            with contextlib.redirect_stdout(sink):
+                shell.print_result(result, prompt=True)
+
+        return run
+
+
+for size in OUTPUTS:
+    for style in STYLES:
+        make_print_result_benchmark(size, style)
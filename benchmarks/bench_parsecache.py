@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""
+Reading a large generated package: parsing it, parsing it while making
+its parse cache, and reading its statements back from the cache.
+"""
+
+import atexit
+import os
+import random
+import shutil
+import tempfile
+
+from benchmarks.common import builtin_definitions
+from benchmarks.runner import benchmark
+
+# About 170 KB of Mathics3.
+STATEMENTS = 2000
+
+
+def generated_package(directory: str) -> str:
+    rng = random.Random(43)
+    lines = ['BeginPackage["Generated`"]', 'Begin["`Private`"]']
+    for i in range(STATEMENTS):
+        lines.append(
+            f"coef{i}[x_, y_] := {rng.randrange(1000)} x^{i % 7} y^2 "
+            f"+ Sin[{rng.random():.6f} x] - c{i}[[{i % 5 + 1}]] "
+            "/. {a -> b, p_ :> p^2}"
+        )
+    lines += ["End[]", "EndPackage[]"]
+    path = os.path.join(directory, "generated.m")
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    return path
+
+
+def temporary_directory() -> str:
+    directory = tempfile.mkdtemp(prefix="mathicsscript-parse-cache-")
+    atexit.register(shutil.rmtree, directory, True)
+    return directory
+
+
+def parse_file(definitions, path: str, make_feeder) -> None:
+    from mathics.core.evaluation import Evaluation
+
+    with open(path, "r") as f:
+        feeder = make_feeder(f)
+        while not feeder.empty():
+            Evaluation(definitions).parse_feeder(feeder)
+
+
+def package_reader(mode: str):
+    from mathics.core.parser import MathicsFileLineFeeder
+
+    from mathicsscript.parsecache import file_feeder, install_parse_cache
+
+    install_parse_cache()
+    definitions = builtin_definitions()
+    directory = temporary_directory()
+    path = generated_package(directory)
+    cache_dir = os.path.join(directory, "cache")
+
+    def make_feeder(fileobject):
+        if mode == "parse":
+            return MathicsFileLineFeeder(fileobject)
+        if mode == "cold":
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        return file_feeder(fileobject, cache_dir=cache_dir)
+
+    parse_file(definitions, path, make_feeder)
+    return lambda: parse_file(definitions, path, make_feeder)
+
+
+@benchmark("parsecache.package.parse", repeat=3, items=STATEMENTS)
+def parsecache_package_parse():
+    return package_reader("parse")
+
+
+@benchmark("parsecache.package.cold", repeat=3, items=STATEMENTS)
+def parsecache_package_cold():
+    return package_reader("cold")
+
+
+@benchmark("parsecache.package.warm", number=5, repeat=3, items=STATEMENTS)
+def parsecache_package_warm():
+    return package_reader("warm")
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Throughput of ``mathicsscript --serve``: requests per second for small
+expressions sent one at a time by mathicsscript.client. Server startup
+is not included in the timings.
+"""
+
+import atexit
+import os.path as osp
+import subprocess
+import tempfile
+
+from benchmarks.common import mathicsscript_command, subprocess_env
+from benchmarks.runner import benchmark
+
+REQUEST_COUNT = 200
+
+
+def start_server():
+    """
+    Start a server and return a client connected to it.
+    """
+    from mathicsscript.client import MathicsClient
+
+    socket_dir = tempfile.TemporaryDirectory(prefix="mathicsscript-bench-")
+    socket_path = osp.join(socket_dir.name, "kernel.sock")
+    process = subprocess.Popen(
+        mathicsscript_command("--serve", socket_path),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env=subprocess_env(),
+    )
+    client = MathicsClient(socket_path, wait=60)
+
+    def stop():
+        client.shutdown()
+        client.close()
+        process.wait()
+        socket_dir.cleanup()
+
+    atexit.register(stop)
+    return client
+
+
+@benchmark("server.evaluate.trivial", repeat=5, items=REQUEST_COUNT)
+def server_evaluate_trivial():
+    client = start_server()
+
+    def run():
+        for i in range(REQUEST_COUNT):
+            client.evaluate(f"{i} + 1")
+
+    run()
+    return run
+
+
+@benchmark("server.complete", repeat=5, items=REQUEST_COUNT)
+def server_complete():
+    client = start_server()
+
+    def run():
+        for _ in range(REQUEST_COUNT):
+            client.complete("Integ")
+
+    run()
+    return run
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Process startup: importing mathicsscript, ``mathicsscript -c`` and
+``mathicsscript -f``.
+"""
+
+import os.path as osp
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import DATA_DIR, run_mathicsscript, subprocess_env
+from benchmarks.runner import benchmark
+
+
+@benchmark("startup.import", repeat=5, threshold=1.15)
+def startup_import():
+    """
+    Just importing mathicsscript's main module. For a breakdown by module,
+    run "mathicsscript --import-profile".
+    """
+    command = [sys.executable, "-c", "import mathicsscript.__main__"]
+    env = subprocess_env()
+    return lambda: subprocess.run(command, env=env, check=True)
+
+
+@benchmark("startup.code.warm", repeat=5, threshold=1.15)
+def startup_code_warm():
+    env = subprocess_env()
+    # Make sure bytecode caches are written before timing.
+    run_mathicsscript("-c", "1 + 2", env=env)
+    return lambda: run_mathicsscript("-c", "1 + 2", env=env)
+
+
+@benchmark("startup.code.cold", repeat=3, threshold=1.15)
+def startup_code_cold():
+    """
+    Startup without any cached bytecode: every run compiles all of the
+    Python modules it imports.
+    """
+
+    def run():
+        with tempfile.TemporaryDirectory(prefix="mathicsscript-bench-") as pycache:
+            run_mathicsscript(
+                "-c", "1 + 2", env=subprocess_env(PYTHONPYCACHEPREFIX=pycache)
+            )
+
+    return run
+
+
+@benchmark("startup.file.reference", repeat=5, threshold=1.15)
+def startup_file_reference():
+    env = subprocess_env()
+    script = osp.join(DATA_DIR, "reference.m")
+    run_mathicsscript("--readline", "None", "-f", script, env=env)
+    return lambda: run_mathicsscript("--readline", "None", "-f", script, env=env)
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Throughput of ``mathicsscript --stdin-stream``: a single long-running
+process evaluating trivial expressions written to its standard input.
+Process startup is not included in the timings.
+"""
+
+import atexit
+import subprocess
+
+from benchmarks.common import mathicsscript_command, subprocess_env
+from benchmarks.runner import benchmark
+
+EXPRESSION_COUNT = 1000
+
+
+def start_stream(*args: str) -> subprocess.Popen:
+    process = subprocess.Popen(
+        mathicsscript_command("--stdin-stream", *args),
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=subprocess_env(),
+        text=True,
+        bufsize=1,
+    )
+
+    def stop():
+        process.stdin.close()
+        process.wait()
+
+    atexit.register(stop)
+    return process
+
+
+def stream_expressions(process: subprocess.Popen, count: int):
+    """
+    Return a function that writes ``count`` expressions to ``process``,
+    each giving a single line of output, and reads back all of the results.
+    """
+    text = "".join(f"{i} + 1\n" for i in range(count))
+
+    def run():
+        process.stdin.write(text)
+        process.stdin.flush()
+        for _ in range(count):
+            if not process.stdout.readline():
+                raise RuntimeError("mathicsscript --stdin-stream exited early")
+
+    # Warm up, and make sure the process works before timing it.
+    run()
+    return run
+
+
+@benchmark("stream.text.trivial", repeat=5, items=EXPRESSION_COUNT)
+def stream_text_trivial():
+    return stream_expressions(start_stream(), EXPRESSION_COUNT)
+
+
+@benchmark("stream.jsonl.trivial", repeat=5, items=EXPRESSION_COUNT)
+def stream_jsonl_trivial():
+    return stream_expressions(
+        start_stream("--output-format", "jsonl"), EXPRESSION_COUNT
+    )
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""
+Typesetting a TeXForm[] formula: in a 3 x 2 inch pyplot figure, as the
+matplotlib display used to, against with mathtext straight into a
+bitmap, uncached and cached. Drawing uses matplotlib's Agg backend.
+"""
+
+from benchmarks.common import has_matplotlib
+from benchmarks.runner import benchmark
+
+FORMULA = r"\int_0^{\infty } \frac{\sin (x)}{x^2+1} \, dx+\sqrt{a^2+b^2}"
+
+
+def figure_formula():
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    def run():
+        fig, ax = plt.subplots(figsize=(3, 2))
+        ax.axis("off")
+        ax.text(0.5, 0.5, f"${FORMULA}$", size=50, ha="center", va="center")
+        fig.canvas.draw()
+        plt.close(fig)
+
+    return run
+
+
+def mathtext_formula(cached: bool):
+    from mathicsscript.texrender import tex_image, tex_png
+
+    def run():
+        if not cached:
+            tex_image.cache_clear()
+            tex_png.cache_clear()
+        tex_png(FORMULA)
+
+    run()
+    return run
+
+
+# Without matplotlib, nothing can be typeset.
+if has_matplotlib():
+
+    @benchmark("texform.render.figure", number=10, repeat=3)
+    def texform_render_figure():
+        return figure_formula()
+
+    @benchmark("texform.render.mathtext", number=10, repeat=3)
+    def texform_render_mathtext():
+        return mathtext_formula(cached=False)
+
+    @benchmark("texform.render.mathtext.cached", number=1000, repeat=3)
+    def texform_render_mathtext_cached():
+        return mathtext_formula(cached=True)
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+"""
+``mathicsscript --watch``: evaluating a file again in a child forked from
+a warm process, compared with starting mathicsscript for it; see
+startup.file.reference.
+"""
+
+import os
+import os.path as osp
+
+from benchmarks.common import DATA_DIR
+from benchmarks.runner import benchmark
+
+
+@benchmark("watch.rerun.reference", repeat=5)
+def watch_rerun_reference():
+    from mathics.core.evaluation import Evaluation, Output
+    from mathics.core.parser import MathicsFileLineFeeder
+
+    from mathicsscript.settings import definitions
+    from mathicsscript.watch import start_run
+
+    script = osp.join(DATA_DIR, "reference.m")
+
+    def evaluate_file():
+        with open(script) as f:
+            feeder = MathicsFileLineFeeder(f)
+            while not feeder.empty():
+                evaluation = Evaluation(definitions, output=Output())
+                query = evaluation.parse_feeder(feeder)
+                if query is not None:
+                    evaluation.evaluate(query)
+
+    def run():
+        _, status = os.waitpid(start_run(evaluate_file), 0)
+        assert status == 0
+
+    return run
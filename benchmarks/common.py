@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers shared by the benchmark modules.
+"""
+
+import importlib.util
+import os
+import os.path as osp
+import subprocess
+import sys
+
+BENCHMARK_DIR = osp.dirname(osp.abspath(__file__))
+DATA_DIR = osp.join(BENCHMARK_DIR, "data")
+
+
+def mathicsscript_command(*args: str) -> list:
+    """
+    Return a command line that runs the mathicsscript in this source tree
+    using the current Python interpreter.
+    """
+    return [sys.executable, "-m", "mathicsscript", *args]
+
+
+def run_mathicsscript(*args: str, env=None) -> None:
+    """
+    Run mathicsscript in a subprocess, discarding output. An error is
+    raised if it does not succeed, so that a broken run isn't mistaken
+    for a fast one.
+    """
+    subprocess.run(
+        mathicsscript_command(*args),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        stdin=subprocess.DEVNULL,
+        env=env,
+        check=True,
+    )
+
+
+def subprocess_env(**overrides) -> dict:
+    """
+    The environment benchmark subprocesses run in: non-interactive
+    matplotlib and no colors, plus ``overrides``.
+    """
+    env = dict(os.environ, MPLBACKEND="Agg", NO_COLOR="1")
+    env.update(overrides)
+    return env
+
+
+def has_matplotlib() -> bool:
+    """
+    Whether matplotlib, which the drawing benchmarks need, is installed.
+    """
+    return importlib.util.find_spec("matplotlib") is not None
+
+
+def builtin_definitions():
+    """
+    Return new Definitions with the builtins. Importing
+    ``mathicsscript.settings`` loads the builtin modules, just once.
+    """
+    from mathics.core.definitions import Definitions
+
+    importlib.import_module("mathicsscript.settings")
+    return Definitions(add_builtin=True)
@@ -0,0 +1,20 @@
+(* Reference script for the "startup.file.reference" benchmark.
+   It exercises parsing, pattern-based definitions, lists, and
+   symbolic and numeric evaluation, but should be quick to run. *)
+
+fib[0] = 0; fib[1] = 1;
+fib[n_Integer /; n > 1] := fib[n] = fib[n - 1] + fib[n - 2];
+fib[60]
+
+squares = Table[i^2, {i, 1, 200}];
+Total[squares]
+
+Expand[(x + y)^12]
+D[Sin[x]^2 Exp[x], x]
+Integrate[x^3 + 2 x, x]
+
+N[Pi, 50]
+Select[Range[500], PrimeQ] // Length
+
+StringJoin[Table[ToString[i], {i, 1, 50}]] // StringLength
+Print["done"]
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+A small standalone benchmark runner for mathicsscript front-end hot paths.
+
+Benchmarks are registered with the ``@benchmark`` decorator. A decorated
+function does any setup it needs and returns the zero-argument callable
+to be timed. Each benchmark is run ``repeat`` times, each run calling the
+callable ``number`` times; we record the per-call minimum and median
+times. A benchmark that processes ``items`` things per call, expressions
+say, also reports its best throughput in items per second.
+
+Results can be saved to a JSON file and later runs compared against it.
+A benchmark whose per-call minimum is more than ``threshold`` times its
+baseline value is reported as a regression, and the runner then exits
+with a nonzero return code.
+"""
+
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, NamedTuple, Optional
+
+BASELINE_FORMAT_VERSION = 1
+
+# A benchmark is flagged as a regression when it is this many times
+# slower than its baseline, unless it sets its own threshold.
+DEFAULT_THRESHOLD = 1.25
+
+
+class Benchmark(NamedTuple):
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    number: int
+    repeat: int
+    threshold: Optional[float]
+    items: Optional[int]
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(
+    name: str,
+    number: int = 1,
+    repeat: int = 5,
+    threshold: Optional[float] = None,
+    items: Optional[int] = None,
+):
+    """
+    Register a benchmark called ``name``. See the module docstring.
+    """
+
+    def register(setup_fn: Callable[[], Callable[[], object]]):
+        if name in BENCHMARKS:
+            raise ValueError(f"benchmark {name} registered twice")
+        BENCHMARKS[name] = Benchmark(name, setup_fn, number, repeat, threshold, items)
+        return setup_fn
+
+    return register
+
+
+def run_benchmark(bench: Benchmark) -> dict:
+    """
+    Run a single benchmark and return its timing summary.
+    """
+    fn = bench.setup()
+    times = []
+    for _ in range(bench.repeat):
+        start = time.perf_counter()
+        for _ in range(bench.number):
+            fn()
+        times.append((time.perf_counter() - start) / bench.number)
+    result = {
+        "min": min(times),
+        "median": statistics.median(times),
+        "number": bench.number,
+        "repeat": bench.repeat,
+    }
+    if bench.items:
+        result["items_per_second"] = bench.items / result["min"]
+    return result
+
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+    except Exception:
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def format_time(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:8.3f} s "
+    elif seconds >= 1e-3:
+        return f"{seconds * 1e3:8.3f} ms"
+    return f"{seconds * 1e6:8.3f} us"
+
+
+def compare(
+    results: Dict[str, dict], baseline: dict, threshold: Optional[float]
+) -> list:
+    """
+    Return a list of (name, ratio, threshold) for each benchmark in
+    ``results`` that is slower than allowed relative to ``baseline``.
+    """
+    regressions = []
+    baseline_results = baseline.get("results", {})
+    for name, result in results.items():
+        if name not in baseline_results:
+            continue
+        bench_threshold = threshold or BENCHMARKS[name].threshold or DEFAULT_THRESHOLD
+        ratio = result["min"] / baseline_results[name]["min"]
+        if ratio > bench_threshold:
+            regressions.append((name, ratio, bench_threshold))
+    return regressions
+
+
+def main(args=None) -> int:
+    import argparse
+
+    from benchmarks import load_all_benchmarks
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark mathicsscript front-end hot paths.",
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        metavar="SUBSTRING",
+        help="only run benchmarks whose name contains SUBSTRING",
+    )
+    parser.add_argument(
+        "--list", action="store_true", help="list benchmark names and exit"
+    )
+    parser.add_argument("--save", metavar="JSON", help="save results to JSON")
+    parser.add_argument(
+        "--compare", metavar="JSON", help="compare results against a saved JSON"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        help=(
+            "slowdown ratio over the baseline that counts as a regression; "
+            f"the default is per-benchmark or {DEFAULT_THRESHOLD}"
+        ),
+    )
+    options = parser.parse_args(args)
+
+    load_all_benchmarks()
+    names = sorted(
+        name for name in BENCHMARKS if not options.filter or options.filter in name
+    )
+    if options.list:
+        print("\n".join(names))
+        return 0
+
+    baseline = None
+    if options.compare:
+        with open(options.compare, "r") as f:
+            baseline = json.load(f)
+        if baseline.get("version") != BASELINE_FORMAT_VERSION:
+            print(f"{options.compare}: unsupported baseline format")
+            return 2
+
+    results = {}
+    for name in names:
+        result = results[name] = run_benchmark(BENCHMARKS[name])
+        line = f"{name:50} {format_time(result['min'])} {format_time(result['median'])}"
+        if baseline is not None and name in baseline.get("results", {}):
+            ratio = result["min"] / baseline["results"][name]["min"]
+            line += f"  x{ratio:5.2f}"
+        if "items_per_second" in result:
+            line += f"  {result['items_per_second']:10.1f}/s"
+        print(line, flush=True)
+
+    if options.save:
+        with open(options.save, "w") as f:
+            json.dump(
+                {
+                    "version": BASELINE_FORMAT_VERSION,
+                    "commit": git_commit(),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "results": results,
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+        print(f"Results saved to {options.save}")
+
+    if baseline is not None:
+        regressions = compare(results, baseline, options.threshold)
+        for name, ratio, threshold in regressions:
+            print(
+                f"REGRESSION {name}: {ratio:.2f} times baseline "
+                f"(commit {baseline.get('commit')}), threshold {threshold:.2f}"
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -15,6 +15,7 @@
 
 import os
 import os.path as osp
+import re
 import subprocess
 import sys
 from pathlib import Path
@@ -26,7 +27,7 @@ from mathics import license_string, settings, version_info
 from mathics.core.attributes import attribute_string_to_number
 from mathics.core.evaluation import Evaluation, Output
 from mathics.core.expression import from_python
-from mathics.core.parser import MathicsFileLineFeeder
+from mathics.core.parser import MathicsFileLineFeeder, MathicsSingleLineFeeder
 from mathics.core.symbols import Symbol, SymbolNull, SymbolFalse, SymbolTrue
 from mathics.core.systemsymbols import SymbolTeXForm
 from mathics.session import autoload_files
@@ -34,48 +35,81 @@ from mathics.session import autoload_files
 from mathics_scanner import replace_wl_with_plain_text
 from pygments import highlight
 
-from mathicsscript.asymptote import asymptote_version
+from mathicsscript.asymptote import get_asymptote_version
+from mathicsscript.checkpoint import (
+    DEFAULT_SESSION_FILE,
+    get_checkpoint,
+    install_session_builtins,
+    restore_session,
+)
+from mathicsscript.history import (
+    HISTORY_USAGE,
+    is_history_command,
+    parse_history_command,
+    show_history,
+)
 from mathicsscript.interrupt import setup_signal_handler
+from mathicsscript.jsonl_output import jsonl_evaluate_feeder
+from mathicsscript.memo import install_memo_builtins
+from mathicsscript.outhistory import OutHistory, install_out_history_builtins
+from mathicsscript.parsecache import file_feeder, install_parse_cache
+from mathicsscript.profiling import (
+    PROFILE_USAGE,
+    is_profile_command,
+    parse_profile_command,
+    run_profiled,
+)
 from mathicsscript.settings import definitions
+from mathicsscript.stream import MathicsStreamLineFeeder, open_stdin_stream
 from mathicsscript.termshell import ShellEscapeException, mma_lexer
 from mathicsscript.termshell_gnu import TerminalShellGNUReadline
 from mathicsscript.termshell import TerminalShellCommon
-from mathicsscript.termshell_prompt import TerminalShellPromptToolKit
 from mathicsscript.version import __version__
+from mathicsscript.watch import can_watch, watch_file
 
 try:
     __import__("readline")
 except ImportError:
-    have_readline = False
     readline_choices = ["Prompt", "None"]
 else:
     readline_choices = ["GNU", "Prompt", "None"]
-    have_readline = True
 
 
-from mathicsscript.format import format_output, matplotlib_version
+from mathicsscript.format import (
+    finish_output,
+    format_output,
+    get_matplotlib_version,
+)
+
 
-version_string = """Mathics3 {mathics}
+def get_version_string() -> str:
+    """
+    Return the versions of the main packages we use, shown at startup.
+    """
+    version_string = """Mathics3 {mathics}
 on {python}
 
 Using:
 SymPy {sympy}, mpmath {mpmath}, numpy {numpy}
 """.format(
-    **version_info
-)
+        **version_info
+    )
 
-if "cython" in version_info:
-    version_string += f"cython {version_info['cython']}, "
+    if "cython" in version_info:
+        version_string += f"cython {version_info['cython']}, "
 
-if matplotlib_version is None:
-    version_string += "\nNo matplotlib installed,"
-else:
-    version_string += f"matplotlib {matplotlib_version},"
+    matplotlib_version = get_matplotlib_version()
+    if matplotlib_version is None:
+        version_string += "\nNo matplotlib installed,"
+    else:
+        version_string += f"matplotlib {matplotlib_version},"
 
-if asymptote_version is None:
-    version_string += "\nNo asymptote installed,"
-else:
-    version_string += f"\n{asymptote_version}"
+    asymptote_version = get_asymptote_version()
+    if asymptote_version is None:
+        version_string += "\nNo asymptote installed,"
+    else:
+        version_string += f"\n{asymptote_version}"
+    return version_string
 
 
 def get_srcdir():
@@ -154,13 +188,160 @@ class TerminalOutput(Output):
         return self.shell.out_callback(out)
 
 
+def evaluate_file_feeder(shell: TerminalShellCommon, feeder) -> None:
+    """
+    Evaluate all of the expressions given by ``feeder``, typically the contents
+    of a file, showing only messages and Print[] output.
+    """
+    try:
+        while not feeder.empty():
+            evaluation = Evaluation(
+                shell.definitions,
+                output=TerminalOutput(shell),
+                catch_interrupt=False,
+                format="text",
+            )
+            query = evaluation.parse_feeder(feeder)
+            if query is None:
+                continue
+            evaluation.evaluate(query, timeout=settings.TIMEOUT)
+    except KeyboardInterrupt:
+        print("\nKeyboardInterrupt")
+
+
+def evaluate_incremental(shell: TerminalShellCommon, path: str) -> None:
+    """
+    Evaluate file ``path`` for ``--incremental``, showing only messages
+    and Print[] output, and report how much was taken from the cache.
+    """
+    from mathicsscript.incremental import evaluate_file_incremental
+
+    try:
+        stats = evaluate_file_incremental(
+            shell.definitions,
+            path,
+            TerminalOutput(shell),
+            shell.out_callback,
+            timeout=settings.TIMEOUT,
+        )
+    except KeyboardInterrupt:
+        print("\nKeyboardInterrupt")
+        return
+    except OSError as e:
+        print(f"\nError reading {path}: {e}; skipping reading.")
+        return
+    print(
+        f"{path}: {stats.evaluated} statements evaluated, "
+        f"{stats.reused} taken from the cache",
+        file=sys.stderr,
+    )
+
+
+def evaluate_stream_feeder(
+    shell: TerminalShellCommon, feeder, strict_wl_output: bool
+) -> Symbol:
+    """
+    Evaluate each expression given by ``feeder`` as soon as it has been
+    read, printing its result and flushing output right away. Return the
+    ``exc_result`` of the last evaluation.
+    """
+    shell.terminal_formatter = None
+    exc_result = SymbolNull
+    try:
+        while not feeder.empty():
+            evaluation = Evaluation(
+                shell.definitions,
+                output=TerminalOutput(shell),
+                catch_interrupt=False,
+                format="text",
+            )
+            query = evaluation.parse_feeder(feeder)
+            if query is not None:
+                result = evaluation.evaluate(query, timeout=settings.TIMEOUT)
+                shell.print_result(result, False, "text", strict_wl_output)
+                exc_result = evaluation.exc_result
+            # Syntax errors are reported too, so flush either way.
+            sys.stdout.flush()
+    except KeyboardInterrupt:
+        print("\nKeyboardInterrupt")
+    return exc_result
+
+
+def exit_code_from_exc_result(exc_result) -> int:
+    """
+    Return the process exit code for an evaluation that ended with
+    ``exc_result``.
+    """
+    if exc_result is None or exc_result == Symbol("Null"):
+        return 0
+    elif exc_result == Symbol("$Aborted"):
+        return -1
+    elif exc_result == Symbol("Overflow"):
+        return -2
+    return -3
+
+
+def profile_input(
+    shell: TerminalShellCommon, line: str, prompt, strict_wl_output: bool
+):
+    """
+    Evaluate the expression of a ``!!profile`` shell escape under the
+    Python profilers and show the result along with the profile report.
+    """
+    try:
+        options = parse_profile_command(line)
+    except ValueError as e:
+        shell.errmsg(f"!!profile: {e}")
+        print(PROFILE_USAGE)
+        return
+
+    evaluation = Evaluation(shell.definitions, output=TerminalOutput(shell))
+    evaluation.shell = shell
+    result = run_profiled(
+        lambda: evaluation.parse_evaluate(options.expr, timeout=settings.TIMEOUT),
+        options,
+    )
+    if result is not None:
+        shell.print_result(result, prompt, strict_wl_output=strict_wl_output)
+
+
+def history_input(shell: TerminalShellCommon, line: str):
+    """
+    Show the entries of the input history selected by a ``!!history``
+    shell escape.
+    """
+    try:
+        options = parse_history_command(line)
+    except ValueError as e:
+        shell.errmsg(f"!!history: {e}")
+        print(HISTORY_USAGE)
+        return
+    if shell.history_store is None:
+        shell.errmsg("!!history: input history is not kept in this shell.")
+        return
+    try:
+        show_history(shell.history_store, options)
+    except re.error as e:
+        shell.errmsg(f"!!history: bad regular expression: {e}")
+
+
 def interactive_eval_loop(
     shell: TerminalShellCommon,
     unicode,
     prompt,
     strict_wl_output: bool,
+    checkpoint=None,
+    autosave: int = 0,
+    out_history=None,
 ):
+    """
+    Read, evaluate and show inputs until end of input or Quit[]. With
+    ``checkpoint``, the session is saved in the background after every
+    ``autosave`` inputs. With ``out_history``, Out[] results are kept
+    within ``Settings`$OutHistoryMemoryLimit`` after each input.
+    """
     setup_signal_handler()
+    input_count = 0
 
     def identity(x: Any) -> Any:
         return x
@@ -171,14 +352,12 @@ def interactive_eval_loop(
     shell.fmt_fn = fmt_fun
     while True:
         try:
-            if have_readline and shell.using_readline:
-                import readline as GNU_readline
-
-                last_pos = GNU_readline.get_current_history_length()
-
             full_form = definitions.get_ownvalue(
                 "Settings`$ShowFullFormInput"
             ).to_python()
+            isolate = definitions.get_ownvalue(
+                "Settings`$IsolateEvaluation"
+            ).to_python()
             style = definitions.get_ownvalue("Settings`$PygmentsStyle")
             fmt = identity
             if style:
@@ -197,21 +376,12 @@ def interactive_eval_loop(
             if mathics_core.PRE_EVALUATION_HOOK is not None:
                 mathics_core.PRE_EVALUATION_HOOK(query, evaluation)
 
-            if (
-                have_readline
-                and shell.using_readline
-                and hasattr(GNU_readline, "remove_history_item")
-            ):
-                current_pos = GNU_readline.get_current_history_length()
-                for pos in range(last_pos, current_pos - 1):
-                    try:
-                        GNU_readline.remove_history_item(pos)
-                    except ValueError:
-                        pass
-                wl_input = source_code.rstrip()
+            # An input of several lines goes into history as one entry.
+            wl_input = source_code.rstrip()
+            if wl_input:
                 if unicode:
                     wl_input = replace_wl_with_plain_text(wl_input)
-                GNU_readline.add_history(wl_input)
+                shell.add_history(wl_input)
 
             if query is None:
                 continue
@@ -223,19 +393,55 @@ def interactive_eval_loop(
 
             if full_form:
                 print(fmt(query))
-            result = evaluation.evaluate(
-                query, timeout=settings.TIMEOUT, format="unformatted"
-            )
-            if result is not None:
+
+            def show_result(result):
                 shell.print_result(
                     result, prompt, output_style, strict_wl_output=strict_wl_output
                 )
 
+            if isolate is True:
+                from mathicsscript.isolate import (
+                    evaluate_isolated,
+                    get_isolation_limits,
+                )
+
+                reason = evaluate_isolated(
+                    evaluation,
+                    query,
+                    get_isolation_limits(definitions),
+                    show_result,
+                    timeout=settings.TIMEOUT,
+                )
+                if reason is not None:
+                    shell.errmsg(reason)
+            else:
+                result = evaluation.evaluate(
+                    query, timeout=settings.TIMEOUT, format="unformatted"
+                )
+                if result is not None:
+                    show_result(result)
+
+            if out_history is not None:
+                out_history.update(definitions)
+            input_count += 1
+            if checkpoint is not None and input_count % autosave == 0:
+                checkpoint.save(definitions, background=True)
+
         except ShellEscapeException as e:
             source_code = e.line
             if not settings.ENABLE_SYSTEM_COMMANDS:
                 shell.errmsg("System commands are disabled in sandboxed mode.")
                 continue
+            # "!!FILE" shows FILE, even one named "history" or "profile".
+            names_file = osp.isfile(source_code[2:])
+            if is_history_command(source_code) and not names_file:
+                history_input(shell, source_code)
+                shell.add_history(source_code.rstrip())
+                continue
+            if is_profile_command(source_code) and not names_file:
+                profile_input(shell, source_code, prompt, strict_wl_output)
+                shell.add_history(source_code.rstrip())
+                continue
             if len(source_code) and source_code[1] == "!":
                 try:
                     print(open(source_code[2:], "r").read())
@@ -245,7 +451,7 @@ def interactive_eval_loop(
                 subprocess.run(source_code[1:], shell=True)
 
                 # Should we test exit code for adding to history?
-                GNU_readline.add_history(source_code.rstrip())
+                shell.add_history(source_code.rstrip())
                 # FIXME add this... when in Mathics3 core updated
                 shell.definitions.increment_line(1)
 
@@ -269,6 +475,18 @@ def interactive_eval_loop(
 case_sensitive = {"case_sensitive": False}
 
 
+def show_import_profile(ctx, _param, value):
+    """
+    Callback for --import-profile: report import costs and exit.
+    """
+    if not value or ctx.resilient_parsing:
+        return
+    from mathicsscript.importprofile import measure_import, print_import_profile
+
+    print_import_profile(measure_import())
+    ctx.exit()
+
+
 @click.command(context_settings=dict(help_option_names=["-h", "-help", "--help"]))
 @click.option(
     "--edit-mode",
@@ -277,6 +495,14 @@ case_sensitive = {"case_sensitive": False}
     help="Set initial edit mode (when using prompt toolkit only)",
 )
 @click.version_option(version=__version__)
+@click.option(
+    "--import-profile",
+    is_flag=True,
+    expose_value=False,
+    is_eager=True,
+    callback=show_import_profile,
+    help="Show how long importing each module at startup takes, and exit.",
+)
 @click.option(
     "--full-form/--no-full-form",
     "-F",
@@ -359,6 +585,34 @@ case_sensitive = {"case_sensitive": False}
     type=click.Path(readable=True),
     help=("Give a file containing Mathics3 source code to execute."),
 )
+@click.option(
+    "--incremental",
+    default=False,
+    is_flag=True,
+    help=(
+        "Evaluate only the statements of FILE that changed since the last "
+        "--incremental run, and those that depend on them; take what the "
+        "rest define from a cache."
+    ),
+)
+@click.option(
+    "--watch",
+    default=False,
+    is_flag=True,
+    help=(
+        "Keep running, and evaluate FILE again, starting from fresh "
+        "definitions, each time it changes. Only on systems with fork()."
+    ),
+)
+@click.option(
+    "--memo-dir",
+    metavar="DIRECTORY",
+    type=click.Path(file_okay=False),
+    help=(
+        "Keep the results of Settings`Cached[expr] in DIRECTORY, rather "
+        "than in the Mathics3 configuration directory."
+    ),
+)
 @click.option(
     "-s",
     "--style",
@@ -388,17 +642,135 @@ case_sensitive = {"case_sensitive": False}
         "you need a working asymptote for this option."
     ),
 )
+@click.option(
+    "--asy-batch",
+    metavar="DIRECTORY",
+    type=click.Path(file_okay=False),
+    help=(
+        "Rather than showing Graphics rendered using asymptote, write them "
+        "to numbered files in DIRECTORY, and compile them together with as "
+        "few asy runs as possible; see Settings`$AsymptoteBatchSize."
+    ),
+)
 @click.option(
     "--matplotlib/--no-matplotlib",
     default=True,
     show_default=True,
     help=(
-        "Use matplotlib for 2D Graphics; "
+        "Use matplotlib for 2D and 3D Graphics; "
         "you need a working matplotlib for this option. "
-        "If set, this will take precedence over asymptote for 2D Graphics."
+        "If set, this will take precedence over asymptote."
+    ),
+)
+@click.option(
+    "--output-format",
+    type=click.Choice(["text", "jsonl"], **case_sensitive),
+    default="text",
+    show_default=True,
+    help=(
+        "jsonl writes a JSON object per evaluation, one per line, "
+        "for use by other programs. Sets --quiet and --no-prompt."
+    ),
+)
+@click.option(
+    "--stdin-stream",
+    default=False,
+    is_flag=True,
+    help=(
+        "Evaluate expressions from standard input as soon as each is read, "
+        "flushing results right away, until end of file. For use at the end "
+        "of a pipe; FILE and -c are evaluated first. Sets --quiet and --no-prompt."
+    ),
+)
+@click.option(
+    "--serve",
+    metavar="SOCKET",
+    type=click.Path(),
+    help=(
+        "Serve evaluation requests from other programs on Unix domain socket "
+        "SOCKET until asked to shut down; see mathicsscript.client. "
+        "FILE is evaluated first."
+    ),
+)
+@click.option(
+    "--sessions",
+    default=False,
+    is_flag=True,
+    help=(
+        "With --serve, give each client its own session in a worker process "
+        "forked from the server, rather than sharing one set of definitions."
+    ),
+)
+@click.option(
+    "--session-idle-timeout",
+    metavar="SECONDS",
+    type=click.FloatRange(min=0, min_open=True),
+    default=1800,
+    show_default=True,
+    help="With --sessions, end a session whose client sends nothing for SECONDS.",
+)
+@click.option(
+    "--session-memory-limit",
+    metavar="MB",
+    type=click.IntRange(min=1),
+    help=(
+        "With --sessions, abort an evaluation that would grow its session "
+        "by more than MB megabytes."
+    ),
+)
+@click.option(
+    "--isolate/--no-isolate",
+    default=False,
+    show_default=True,
+    help=(
+        "Evaluate each input in a child process with hard time and memory "
+        "limits, so that an input that exceeds them is aborted without "
+        "losing the session. Only on systems with fork()."
+    ),
+)
+@click.option(
+    "--time-limit",
+    metavar="SECONDS",
+    type=click.FloatRange(min=0, min_open=True),
+    help="With --isolate, abort an input that runs longer than SECONDS.",
+)
+@click.option(
+    "--cpu-limit",
+    metavar="SECONDS",
+    type=click.FloatRange(min=0, min_open=True),
+    help="With --isolate, abort an input that uses more than SECONDS of CPU time.",
+)
+@click.option(
+    "--memory-limit",
+    metavar="MB",
+    type=click.IntRange(min=1),
+    help="With --isolate, abort an input that needs more than MB more megabytes.",
+)
+@click.option(
+    "--resume",
+    metavar="FILE",
+    type=click.Path(dir_okay=False),
+    help=(
+        "Take up the session saved in FILE by Settings`SaveSession or "
+        "--autosave, before reading input."
+    ),
+)
+@click.option(
+    "--autosave",
+    metavar="N",
+    type=click.IntRange(min=1),
+    help=(
+        "Save the session after every N inputs, in the --resume FILE or "
+        f"else in {DEFAULT_SESSION_FILE}, and again on exit."
     ),
 )
-@click.argument("file", nargs=1, type=click.Path(readable=True), required=False)
+@click.argument(
+    "file_argument",
+    metavar="[FILE]",
+    nargs=1,
+    type=click.Path(readable=True),
+    required=False,
+)
 def main(
     edit_mode,
     full_form,
@@ -412,11 +784,28 @@ def main(
     pyextensions,
     code,
     file,
+    incremental,
+    watch,
+    memo_dir,
     style,
     pygments_tokens,
     strict_wl_output,
     asymptote,
+    asy_batch,
     matplotlib,
+    output_format,
+    stdin_stream,
+    serve,
+    sessions,
+    session_idle_timeout,
+    session_memory_limit,
+    isolate,
+    time_limit,
+    cpu_limit,
+    memory_limit,
+    resume,
+    autosave,
+    file_argument,
 ) -> int:
     """A command-line interface to Mathics.
 
@@ -424,6 +813,23 @@ def main(
     """
 
     exit_rc = 0
+    if file is None:
+        file = file_argument
+    jsonl = output_format == "jsonl"
+    if jsonl:
+        # Output is for another program: no banner, prompts,
+        # colors, or windows popping up with graphics.
+        quiet = True
+        prompt = False
+        style = "None"
+        asymptote = matplotlib = False
+    if stdin_stream:
+        quiet = True
+        prompt = False
+    if serve:
+        quiet = True
+        asymptote = matplotlib = False
+
     quit_command = "CTRL-BREAK" if sys.platform == "win32" else "CONTROL-D"
 
     extension_modules = []
@@ -431,12 +837,33 @@ def main(
         for ext in pyextensions:
             extension_modules.append(ext)
 
+    if isolate and not hasattr(os, "fork"):
+        print("Isolated evaluation needs fork(); --isolate ignored.")
+        isolate = False
+    if watch and not can_watch():
+        print("Watching a file needs fork(); --watch ignored.")
+    for option, value in (
+        ("--session-memory-limit", session_memory_limit),
+        ("--memory-limit", memory_limit),
+    ):
+        if value:
+            from mathicsscript.memorylimit import can_limit_memory
+
+            if not can_limit_memory():
+                print(
+                    f"{option} needs /proc/self/statm, which this system "
+                    "doesn't have.",
+                    file=sys.stderr,
+                )
+                return 1
+
     definitions.set_line_no(0)
     # Set a default value for $ShowFullFormInput to False.
     # Then, it can be changed by the settings file (in WL)
     # and overwritten by the command line parameter.
     for setting_name, setting_value in (
         ("$ShowFullFormInput", full_form),
+        ("$IsolateEvaluation", isolate),
         ("$UseAsymptote", asymptote),
         ("$UseMatplotlib", matplotlib),
     ):
@@ -459,8 +886,15 @@ def main(
         else:
             sys.excepthook = post_mortem_excepthook
 
-    readline = "none" if (code or file and not persist) else readline.lower()
+    readline = (
+        "none"
+        if (code or file and not persist or jsonl or stdin_stream or serve)
+        else readline.lower()
+    )
     if readline == "prompt":
+        # prompt_toolkit is only needed here, so import it only when used.
+        from mathicsscript.termshell_prompt import TerminalShellPromptToolKit
+
         shell = TerminalShellPromptToolKit(
             definitions, completion, charset, prompt, edit_mode
         )
@@ -471,6 +905,16 @@ def main(
         )
 
     load_settings_file(shell)
+    install_session_builtins(shell.definitions)
+    install_out_history_builtins(shell.definitions)
+    install_memo_builtins(shell.definitions)
+    install_parse_cache()
+    if memo_dir is not None:
+        definitions.set_ownvalue("Settings`$MemoDirectory", from_python(memo_dir))
+    if asy_batch is not None:
+        definitions.set_ownvalue(
+            "Settings`$AsymptoteBatchDirectory", from_python(asy_batch)
+        )
     style_from_settings_file = definitions.get_ownvalue("Settings`$PygmentsStyle")
     if style_from_settings_file is not SymbolNull and style is None:
         style = style_from_settings_file
@@ -483,32 +927,78 @@ def main(
         elif os.path.isdir(file):
             print(f"\nFile {file} does is a directory; skipping reading.")
             file = None
+        elif watch and not jsonl and can_watch():
+
+            def evaluate_file():
+                if incremental:
+                    evaluate_incremental(shell, file)
+                else:
+                    with open(file, "r") as ifile:
+                        evaluate_file_feeder(shell, file_feeder(ifile))
+                # The child evaluating the file doesn't run atexit handlers.
+                finish_output()
+
+            return watch_file(file, evaluate_file)
+        elif incremental and not jsonl:
+            evaluate_incremental(shell, file)
+            definitions.set_line_no(0)
         else:
             try:
                 with open(file, "r") as ifile:
-                    feeder = MathicsFileLineFeeder(ifile)
-                    try:
-                        while not feeder.empty():
-                            evaluation = Evaluation(
-                                shell.definitions,
-                                output=TerminalOutput(shell),
-                                catch_interrupt=False,
-                                format="text",
+                    feeder = file_feeder(ifile)
+                    if jsonl:
+                        exit_rc = exit_code_from_exc_result(
+                            jsonl_evaluate_feeder(
+                                shell.definitions, feeder, timeout=settings.TIMEOUT
                             )
-                            query = evaluation.parse_feeder(feeder)
-                            if query is None:
-                                continue
-                            evaluation.evaluate(query, timeout=settings.TIMEOUT)
-                    except KeyboardInterrupt:
-                        print("\nKeyboardInterrupt")
+                        )
+                    else:
+                        evaluate_file_feeder(shell, feeder)
+                        finish_output()
             except Exception as e:
                 print(f"\nError reading {file}: {e}; skipping reading.")
                 file = None
             else:
                 definitions.set_line_no(0)
 
+    if serve:
+        try:
+            if sessions:
+                from mathicsscript.sessions import serve_sessions
+
+                serve_sessions(
+                    shell.definitions,
+                    serve,
+                    timeout=settings.TIMEOUT,
+                    idle_timeout=session_idle_timeout,
+                    memory_limit=(
+                        session_memory_limit * 1024 * 1024
+                        if session_memory_limit
+                        else None
+                    ),
+                )
+            else:
+                from mathicsscript.server import serve as serve_socket
+
+                serve_socket(shell.definitions, serve, timeout=settings.TIMEOUT)
+        except OSError as e:
+            print(f"Cannot serve on {serve}: {e}", file=sys.stderr)
+            return 1
+        except KeyboardInterrupt:
+            pass
+        return exit_rc
+
     if code:
         for expr in code:
+            if jsonl:
+                exit_rc = exit_code_from_exc_result(
+                    jsonl_evaluate_feeder(
+                        shell.definitions,
+                        MathicsSingleLineFeeder(expr, ""),
+                        timeout=settings.TIMEOUT,
+                    )
+                )
+                continue
             evaluation = Evaluation(
                 shell.definitions, output=TerminalOutput(shell), format="text"
             )
@@ -518,41 +1008,26 @@ def main(
 
             # After the next release, we can remove the hasattr test.
             if hasattr(evaluation, "exc_result"):
-                if evaluation.exc_result == Symbol("Null"):
-                    exit_rc = 0
-                elif evaluation.exc_result == Symbol("$Aborted"):
-                    exit_rc = -1
-                elif evaluation.exc_result == Symbol("Overflow"):
-                    exit_rc = -2
-                else:
-                    exit_rc = -3
+                exit_rc = exit_code_from_exc_result(evaluation.exc_result)
 
-        if not persist:
+        if not (persist or stdin_stream):
             return exit_rc
 
-    if file is not None:
-        with open(file, "r") as ifile:
-            feeder = MathicsFileLineFeeder(ifile)
-            try:
-                while not feeder.empty():
-                    evaluation = Evaluation(
-                        shell.definitions,
-                        output=TerminalOutput(shell),
-                        catch_interrupt=False,
-                        format="text",
-                    )
-                    query = evaluation.parse_feeder(feeder)
-                    if query is None:
-                        continue
-                    evaluation.evaluate(query, timeout=settings.TIMEOUT)
-            except KeyboardInterrupt:
-                print("\nKeyboardInterrupt")
-
-        if not persist:
-            return exit_rc
+    if file is not None and not (persist or stdin_stream):
+        return exit_rc
+
+    if jsonl or stdin_stream:
+        feeder = MathicsStreamLineFeeder(open_stdin_stream())
+        if jsonl:
+            exc_result = jsonl_evaluate_feeder(
+                shell.definitions, feeder, timeout=settings.TIMEOUT
+            )
+        else:
+            exc_result = evaluate_stream_feeder(shell, feeder, strict_wl_output)
+        return exit_code_from_exc_result(exc_result)
 
     if not quiet and prompt:
-        print(f"\nMathicscript: {__version__}, {version_string}\n")
+        print(f"\nMathicscript: {__version__}, {get_version_string()}\n")
         print(license_string + "\n")
         print(f"Quit by evaluating Quit[] or by pressing {quit_command}.\n")
     # If defined, full_form and style overwrite the predefined values.
@@ -564,6 +1039,23 @@ def main(
         "Settings`$PygmentsShowTokens", from_python(pygments_tokens)
     )
     definitions.set_ownvalue("Settings`MathicsScriptVersion", from_python(__version__))
+    # Limits given on the command line can't be changed by the inputs
+    # they limit.
+    limits_given = (time_limit, cpu_limit, memory_limit) != (None, None, None)
+    for setting_name, setting_value in (
+        ("$IsolateEvaluation", True if isolate and limits_given else None),
+        ("$IsolationTimeLimit", time_limit),
+        ("$IsolationCPULimit", cpu_limit),
+        ("$IsolationMemoryLimit", memory_limit),
+    ):
+        if setting_value is not None:
+            definitions.set_ownvalue(
+                f"Settings`{setting_name}", from_python(setting_value)
+            )
+            for attribute in ("System`Protected", "System`Locked"):
+                definitions.set_attribute(
+                    f"Settings`{setting_name}", attribute_string_to_number[attribute]
+                )
     definitions.set_attribute(
         "Settings`MathicsScriptVersion", attribute_string_to_number["System`Protected"]
     )
@@ -572,7 +1064,39 @@ def main(
     )
 
     definitions.set_line_no(0)
-    interactive_eval_loop(shell, charset, prompt, strict_wl_output)
+    if resume is not None:
+        if osp.exists(resume):
+            try:
+                restore_session(definitions, resume)
+            except Exception as e:
+                print(f"Cannot resume the session in {resume}: {e}", file=sys.stderr)
+                return 1
+            if not quiet and prompt:
+                print(f"Resumed the session in {resume}.\n")
+        elif not autosave:
+            print(f"Session file {resume} does not exist; starting a new session.")
+
+    checkpoint = None
+    if autosave:
+        checkpoint = get_checkpoint(resume or DEFAULT_SESSION_FILE)
+    out_history = OutHistory()
+    try:
+        interactive_eval_loop(
+            shell,
+            charset,
+            prompt,
+            strict_wl_output,
+            checkpoint,
+            autosave or 0,
+            out_history,
+        )
+    finally:
+        if checkpoint is not None:
+            skipped = checkpoint.close(definitions)
+            if skipped:
+                shell.errmsg(f"Definitions of {', '.join(skipped)} were not saved.")
+        # After the last save, which reads back spilled results.
+        out_history.close()
     return exit_rc
 
 
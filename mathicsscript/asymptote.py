@@ -3,15 +3,21 @@
 (modified from gnuplot.py)
 """
 
+import atexit
+import glob
 import mathics
 import os
 import os.path as osp
+import shutil
 import subprocess
+import tempfile
 
+from functools import cache
 from subprocess import Popen, PIPE, run
-from tempfile import NamedTemporaryFile
 from typing import Optional
 
+from mathicsscript.numberedfiles import create_numbered_file
+
 # An aysmptote string to
 INTEACTIVE_PREAMBLE = """
 // Generated by Mathics3 mathicsscript.
@@ -25,37 +31,85 @@ mathics_asymptote_dir = osp.join(osp.dirname(mathics.__file__), "asymptote")
 with_asymptote_dir = f"""{mathics_asymptote_dir}{os.pathsep}{asymptote_dir}"""
 os.environ["ASYMPTOTE_DIR"] = with_asymptote_dir
 
-asymptote_version: Optional[str] = None
-try:
-    result = run(
-        [ASY_PROGRAM, "--version"],
-        timeout=0.5,
-        stdout=PIPE,
-        stderr=PIPE,
-    )
-    if result.returncode == 0:
-        # Use the first line of output only, not all of the enabled options
-        asymptote_version = result.stderr.decode("utf-8").split("\n")[0]
-        # Just the name and version, not the copyright and authors
-        asymptote_version = asymptote_version.split("[")[0].strip()
-except Exception:
-    pass
 
+@cache
+def have_asymptote() -> bool:
+    """
+    Return True if the Asymptote program can be found.
+    """
+    return shutil.which(ASY_PROGRAM) is not None
+
+
+@cache
+def get_asymptote_version() -> Optional[str]:
+    """
+    Return the Asymptote name and version, e.g. "Asymptote version 2.95",
+    or None if Asymptote is not installed or doesn't respond.
+
+    This runs "asy --version", so it is done only when asked for.
+    """
+    if not have_asymptote():
+        return None
+    try:
+        result = run(
+            [ASY_PROGRAM, "--version"],
+            timeout=0.5,
+            stdout=PIPE,
+            stderr=PIPE,
+        )
+    except Exception:
+        return None
+    if result.returncode != 0:
+        return None
+    # Use the first line of output only, not all of the enabled options
+    asymptote_version = result.stderr.decode("utf-8").split("\n")[0]
+    # Just the name and version, not the copyright and authors
+    return asymptote_version.split("[")[0].strip()
+
+
+# Asymptote writes the files it makes next to the .asy file it is given,
+# or in its current directory. Those of this process all go in a scratch
+# directory, made when first needed and removed when mathicsscript exits.
+scratch_dir: Optional[str] = None
 
-def get_srcdir():
-    filename = osp.normcase(osp.dirname(osp.abspath(__file__)))
-    return osp.realpath(filename)
 
+def get_scratch_dir() -> str:
+    """
+    Return the scratch directory for Asymptote files, making it if needed.
+    """
+    global scratch_dir
+    if scratch_dir is None:
+        atexit.register(remove_scratch_dir)
+    if scratch_dir is None or not osp.isdir(scratch_dir):
+        scratch_dir = tempfile.mkdtemp(prefix="mathicsscript-asy-")
+    return scratch_dir
 
-mydir = get_srcdir()
-asy_config = os.path.join(mydir, "config.asy")
+
+def remove_scratch_dir() -> None:
+    if scratch_dir is not None:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+def remove_files(stem: str) -> None:
+    """
+    Remove the files Asymptote made for the .asy file ``stem``.asy.
+    """
+    pattern = glob.escape(stem)
+    for path in glob.glob(pattern + ".*") + glob.glob(pattern + "_*"):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
 
 
 class Asy:
     def __init__(self, show_help=True):
+        # Without a viewer, what shipout() writes is left in the scratch
+        # directory.
         self.session = Popen(
-            [ASY_PROGRAM, f"-config={asy_config}", "-quiet", "-inpipe=0", "-outpipe=2"],
+            [ASY_PROGRAM, "-noV", "-quiet", "-inpipe=0", "-outpipe=2"],
             stdin=PIPE,
+            cwd=get_scratch_dir(),
         )
         if show_help:
             self.help()
@@ -102,14 +156,150 @@ class Asy:
             self.session.wait()
 
 
+# The stem of the files of the last graphics viewed. They are kept until
+# the next graphics is viewed, since the viewer may still be reading them
+# when asy exits.
+last_viewed: Optional[str] = None
+
+
 def write_asy_and_view(asy_string: str):
-    # TODO: add option to let user decide whether or not to delete
-    # image afterwards.
-    with NamedTemporaryFile(
-        mode="w", prefix="Mathics3-Graph-", suffix=".asy", delete=False
-    ) as asy_fp:
-        asy_fp.write(INTEACTIVE_PREAMBLE + asy_string + "\n")
-    subprocess.run(args=[ASY_PROGRAM, "-View", asy_fp.name])
+    """
+    Render Asymptote code ``asy_string`` and show it in Asymptote's viewer.
+    Only asy is run; its files are written in the scratch directory.
+    """
+    global last_viewed
+    if last_viewed is not None:
+        remove_files(last_viewed)
+        last_viewed = None
+    directory = get_scratch_dir()
+    fd, asy_path = tempfile.mkstemp(
+        prefix="Mathics3-Graph-", suffix=".asy", dir=directory
+    )
+    stem = asy_path[: -len(".asy")]
+    try:
+        with os.fdopen(fd, "w") as asy_fp:
+            asy_fp.write(INTEACTIVE_PREAMBLE + asy_string + "\n")
+        subprocess.run(args=[ASY_PROGRAM, "-View", "-o", stem, asy_path], cwd=directory)
+    finally:
+        os.unlink(asy_path)
+        last_viewed = stem
+
+
+class AsyBatch:
+    """
+    Asymptote sources collected to be compiled together, so that a script
+    that makes many graphics runs asy a few times rather than once each.
+
+    Each source added is written to ``directory`` as
+    Mathics3-Graph-NNN.asy, numbered after the files already there. Once
+    ``size`` of them are waiting, or when ``flush()`` is called, they are
+    all given to a single asy process, which writes Mathics3-Graph-NNN.
+    ``output_format`` beside them. The sources of outputs that were made
+    are then removed.
+    """
+
+    def __init__(self, directory: str, size: int = 50, output_format: str = "pdf"):
+        self.directory = directory
+        self.size = size
+        self.output_format = output_format
+        self.pending = []
+
+    def add(self, asy_string: str) -> str:
+        """
+        Queue Asymptote code ``asy_string``, and return the path of the
+        output file it will be compiled to.
+        """
+        asy_path = create_numbered_file(self.directory, "Mathics3-Graph-", ".asy")
+        with open(asy_path, "w") as asy_fp:
+            asy_fp.write(INTEACTIVE_PREAMBLE + asy_string + "\n")
+        name = osp.basename(asy_path)[: -len(".asy")]
+        self.pending.append(name)
+        if len(self.pending) >= self.size:
+            self.flush()
+        return osp.join(self.directory, f"{name}.{self.output_format}")
+
+    def flush(self) -> int:
+        """
+        Compile the sources waiting, and return asy's exit code, or 0 if
+        there were none.
+        """
+        pending, self.pending = self.pending, []
+        # A forked child may have compiled sources it was handed already.
+        pending = [
+            name
+            for name in pending
+            if osp.exists(osp.join(self.directory, name + ".asy"))
+        ]
+        if not pending:
+            return 0
+        sources = [name + ".asy" for name in pending]
+        result = subprocess.run(
+            args=[ASY_PROGRAM, "-noV", "-f", self.output_format] + sources,
+            cwd=self.directory,
+        )
+        for name in pending:
+            output = osp.join(self.directory, f"{name}.{self.output_format}")
+            if osp.exists(output):
+                os.unlink(osp.join(self.directory, name + ".asy"))
+        return result.returncode
+
+
+BATCH_DIRECTORY_SETTING = "Settings`$AsymptoteBatchDirectory"
+BATCH_SIZE_SETTING = "Settings`$AsymptoteBatchSize"
+BATCH_FORMAT_SETTING = "Settings`$AsymptoteBatchFormat"
+
+# The batch of the directory in BATCH_DIRECTORY_SETTING, if that is set.
+asy_batch: Optional[AsyBatch] = None
+
+
+def get_asy_batch(definitions) -> Optional[AsyBatch]:
+    """
+    Return the batch that graphics are to be added to, following
+    ``Settings`$AsymptoteBatchDirectory``, ``Settings`$AsymptoteBatchSize``
+    and ``Settings`$AsymptoteBatchFormat``, or None when graphics are to
+    be shown one at a time.
+    """
+    global asy_batch
+    try:
+        directory = definitions.get_ownvalue(BATCH_DIRECTORY_SETTING)
+        directory = directory.get_string_value()
+    except ValueError:
+        directory = None
+    if not directory:
+        flush_asy_batch()
+        asy_batch = None
+        return None
+    directory = osp.expanduser(directory)
+    if asy_batch is None or asy_batch.directory != directory:
+        flush_asy_batch()
+        if asy_batch is None:
+            atexit.register(flush_asy_batch)
+        asy_batch = AsyBatch(directory)
+
+    try:
+        size = definitions.get_ownvalue(BATCH_SIZE_SETTING).to_python()
+    except ValueError:
+        size = None
+    if isinstance(size, int) and not isinstance(size, bool) and size > 0:
+        asy_batch.size = size
+    try:
+        output_format = definitions.get_ownvalue(BATCH_FORMAT_SETTING)
+        output_format = output_format.get_string_value()
+    except ValueError:
+        output_format = None
+    if output_format and output_format != asy_batch.output_format:
+        asy_batch.flush()
+        asy_batch.output_format = output_format
+    return asy_batch
+
+
+def flush_asy_batch() -> int:
+    """
+    Compile the graphics waiting in the current batch, if there is one.
+    """
+    if asy_batch is None:
+        return 0
+    return asy_batch.flush()
 
 
 if __name__ == "__main__":
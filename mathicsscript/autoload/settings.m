@@ -33,9 +33,9 @@ Settings`$UseUnicode::usage = "This Boolean variable sets whether Unicode is use
 Settings`$UseUnicode = True
 
 Settings`$UseAsymptote::usage = "This Boolean variable sets whether 2D and 3D Graphics should render using Asymptote."
-Settings`$UseMatplotlib::usage = "This Boolean variable sets whether 2D Graphics should render using Matplotlib.
+Settings`$UseMatplotlib::usage = "This Boolean variable sets whether 2D and 3D Graphics should render using Matplotlib.
 
-If set, and $UseAsymptote is also set, matplotlib will take precedence for 2D graphics.
+If set, and $UseAsymptote is also set, matplotlib will take precedence. Graphics that Matplotlib can't draw, such as 3D graphics with Cylinder[], are still rendered using Asymptote.
 "
 
 Settings`MathicsScriptVersion::usage = "This string is the version of MathicsScript we are running."
@@ -46,5 +46,45 @@ System`$Notebooks = False
 Settings`$GroupAutocomplete::usage = "This Boolean variable sets whether mathicsscript should automatically close braces."
 Settings`$GroupAutocomplete = True
 
-Settings`$RenderTeXForm::usage = "If this Boolean variable is set True, TeXForm output is rendered via Matplotlib.";
+Settings`$RenderTeXForm::usage = "If this Boolean variable is set True, TeXForm output is typeset via Matplotlib's mathtext, and shown in the terminal when it can show pictures or else in a window.";
 Settings`$RenderTeXForm = True
+
+Settings`$TeXFormDirectory::usage = "If this is set to a directory name, TeXForm output typeset by Settings`$RenderTeXForm is not shown. Instead it is written to files numbered TeXForm-001.png, TeXForm-002.png, and so on, after those already in that directory. A formula that can't be typeset is shown as TeX. Use this when there is no display."
+Settings`$TeXFormDirectory = ""
+
+Settings`$IsolateEvaluation::usage = "If this Boolean variable is set True, each input is evaluated in a child process with the limits given by Settings`$IsolationTimeLimit, Settings`$IsolationCPULimit and Settings`$IsolationMemoryLimit. An input that goes over a limit gives $Aborted, and definitions are left as they were before it.
+
+This is set by the ``--isolate`` option, and needs an operating system with fork()."
+
+Settings`$IsolationTimeLimit::usage = "This sets the number of seconds that an isolated evaluation may run before it is aborted, or Infinity for no limit."
+Settings`$IsolationTimeLimit = Infinity
+
+Settings`$IsolationCPULimit::usage = "This sets the number of seconds of CPU time that an isolated evaluation may use before it is aborted, or Infinity for no limit."
+Settings`$IsolationCPULimit = Infinity
+
+Settings`$IsolationMemoryLimit::usage = "This sets the number of megabytes that an isolated evaluation may grow mathicsscript's memory by before it is aborted, or Infinity for no limit. It is only applied where /proc is available, as on Linux."
+Settings`$IsolationMemoryLimit = Infinity
+
+Settings`$OutHistoryMemoryLimit::usage = "This sets the number of megabytes of Out[] results that are kept in memory, or Infinity for no limit. Older results beyond that are written to disk, and read back when they are used."
+Settings`$OutHistoryMemoryLimit = 1024
+
+Settings`$MemoDirectory::usage = "This sets the directory in which Settings`Cached keeps its results. If it is the empty string, they are kept in the memo directory of the Mathics3 configuration directory. This is set by the ``--memo-dir`` option."
+Settings`$MemoDirectory = ""
+
+Settings`$MemoCacheLimit::usage = "This sets the number of megabytes that the results kept by Settings`Cached may add up to, or Infinity for no limit. Beyond that, the least recently used results are removed."
+Settings`$MemoCacheLimit = 1024
+
+Settings`$AsymptoteBatchDirectory::usage = "If this is set to a directory name, Graphics that are rendered using Asymptote are not shown. Instead their Asymptote code is written to files numbered Mathics3-Graph-001.asy, Mathics3-Graph-002.asy, and so on, after those already in that directory, and compiled together by a single asy process. This is set by the ``--asy-batch`` option."
+Settings`$AsymptoteBatchDirectory = ""
+
+Settings`$AsymptoteBatchSize::usage = "This sets the number of Graphics written by Settings`$AsymptoteBatchDirectory that are compiled together. They are compiled once there are that many, and when mathicsscript exits."
+Settings`$AsymptoteBatchSize = 50
+
+Settings`$AsymptoteBatchFormat::usage = "This string sets the format of the files compiled from the Graphics written by Settings`$AsymptoteBatchDirectory, such as \"pdf\", \"eps\", \"svg\" or \"png\"."
+Settings`$AsymptoteBatchFormat = "pdf"
+
+Settings`$InlineGraphics::usage = "This sets how Graphics, Graphics3D and Image results are shown in the terminal itself, rather than in a window, when Settings`$UseMatplotlib is set. If it is Automatic, they are shown using whichever of the Kitty graphics protocol, iTerm2 inline images or Sixel the terminal supports, if any. It can be set to \"Kitty\", \"iTerm\" or \"Sixel\" to use that one, or False to always use a window."
+Settings`$InlineGraphics = Automatic
+
+Settings`$MaxFigures::usage = "This sets the number of matplotlib windows of Graphics, Image and other results that are kept open, or Infinity for no limit. When another result is shown, the oldest are closed."
+Settings`$MaxFigures = 5
@@ -18,15 +18,15 @@ Keyboard input binding routines for prompt_toolkit which are
 analogous to GNU Readlines' parse_and_bind().
 """
 
-from typing import Callable
+import asyncio
+
+from prompt_toolkit.application.current import get_app
 from prompt_toolkit.enums import EditingMode
 from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.filters import Condition
-from sys import version_info
-import contextlib
-import pathlib
-import re
+from prompt_toolkit.keys import Keys
 
+from mathicsscript.inputrc import TERMINAL, load_inputrc_trie, merge_trie
 from mathicsscript.settings import definitions
 from mathics.session import get_settings_value
 
@@ -146,54 +146,133 @@ def _group_autocomplete_toggle(event):
     app.group_autocomplete = not app.group_autocomplete
 
 
-def read_inputrc(read_init_file_fn: Callable, use_unicode: bool) -> None:
+class InputrcDispatcher:
+    """
+    The handler of all inputrc bindings. Rather than a prompt_toolkit key
+    binding for each, which slows down startup and the matching of every
+    key typed, there is this single handler. It follows the keys typed
+    through the trie of bindings (see mathicsscript.inputrc), and inserts
+    the text of a binding when its keys are complete.
+
+    When keys stop matching a binding, they are fed back to prompt_toolkit
+    to be handled as they would be without inputrc bindings; Emacs mode's
+    ESC b, for example. So are keys after which nothing is typed for
+    ``ttimeoutlen`` seconds, after ESC, or ``timeoutlen`` seconds, as
+    prompt_toolkit does with its own bindings: a lone ESC in Vi mode
+    still leaves insert mode.
+    """
+
+    def __init__(self, key_bindings: KeyBindings):
+        self.key_bindings = key_bindings
+        key_bindings.add(Keys.Any, eager=True, filter=Condition(self.is_active))(self)
+        self.trie = {}
+        # The keys typed so far of an incomplete binding, and the trie
+        # node they lead to.
+        self.keys = []
+        self.node = self.trie
+        # A binding that is complete but is also the start of a longer one:
+        # its text, and the number of its keys.
+        self.pending = None
+        # The first of the keys last fed back, which must not start a
+        # binding again.
+        self.replayed = None
+        # Keys handled so far, so that a timeout can tell whether any
+        # came after it was started.
+        self.key_count = 0
+
+    def add_trie(self, trie: dict) -> None:
+        for key in trie:
+            if key not in self.trie:
+                self.key_bindings.add(
+                    key_name(key), eager=True, filter=Condition(self.can_start)
+                )(self)
+        merge_trie(self.trie, trie)
+
+    def can_start(self) -> bool:
+        key_buffer = get_app().key_processor.key_buffer
+        return not self.keys and not (key_buffer and key_buffer[0] is self.replayed)
+
+    def is_active(self) -> bool:
+        return bool(self.keys)
+
+    def reset(self) -> None:
+        self.keys = []
+        self.node = self.trie
+        self.pending = None
+
+    def __call__(self, event) -> None:
+        self.key_count += 1
+        key_press = event.key_sequence[0]
+        key = key_press.key
+        char = "\x1b" if key == Keys.Escape else key if len(key) == 1 else None
+        child = self.node.get(char) if char is not None else None
+        if child is None:
+            self.stop(event, key_press)
+            return
+        self.keys.append(key_press)
+        if TERMINAL in child:
+            if len(child) == 1:
+                self.reset()
+                event.current_buffer.insert_text(child[TERMINAL])
+                return
+            self.pending = child[TERMINAL], len(self.keys)
+        self.node = child
+        self.start_timeout(event.app, key == Keys.Escape)
+
+    def start_timeout(self, app, after_escape: bool) -> None:
+        """
+        Flush the keys typed so far if no other key comes within
+        ``app.ttimeoutlen`` seconds after ESC, or ``app.timeoutlen`` seconds.
+        """
+        timeout = app.ttimeoutlen if after_escape else app.timeoutlen
+        if timeout is None:
+            return
+        key_count = self.key_count
+
+        async def wait() -> None:
+            await asyncio.sleep(timeout)
+            if self.keys and self.key_count == key_count:
+                self.replay(app, self.keys)
+                app.key_processor.process_keys()
+
+        app.create_background_task(wait())
+
+    def stop(self, event, key_press) -> None:
+        """
+        ``key_press`` doesn't continue the keys typed so far. Insert the
+        longest binding they complete, if any, and feed back the rest.
+        """
+        self.replay(event.app, self.keys + [key_press])
+
+    def replay(self, app, keys: list) -> None:
+        """
+        Insert the longest binding that ``keys`` complete, if any, and feed
+        back the rest.
+        """
+        pending = self.pending
+        self.reset()
+        if pending is None:
+            self.replayed = keys[0]
+        else:
+            # The keys after the binding may start another.
+            text, length = pending
+            app.current_buffer.insert_text(text)
+            keys = keys[length:]
+        app.key_processor.feed_multiple(keys, first=True)
+
+
+def key_name(char: str) -> str:
     """
-    Read GNU Readline style inputrc
+    Return the prompt_toolkit name of the key that types ``char``.
     """
-    # GNU Readline inputrc $include's paths are relative to itself,
-    # so chdir to its directory before reading the file.
-    parent_dir = pathlib.Path(__file__).parent.absolute()
-    path_context_fn = (
-        parent_dir if version_info < (3, 11) else contextlib.chdir(parent_dir)
-    )
-    with path_context_fn:
-        inputrc = "inputrc-unicode" if use_unicode else "inputrc-no-unicode"
-        try:
-            read_init_file_fn(str(parent_dir / "data" / inputrc))
-        except Exception:
-            pass
+    return "escape" if char == "\x1b" else char
+
+
+dispatcher = InputrcDispatcher(bindings)
 
 
 def read_init_file(path: str):
-    def check_quoted(s: str):
-        return s[0:1] == '"' and s[-1:] == '"'
-
-    def add_binding(alias_expand, replacement: str):
-        def self_insert(event):
-            event.current_buffer.insert_text(replacement)
-
-        bindings.add(*alias_expand)(self_insert)
-
-    for line_no, line in enumerate(open(path, "r").readlines()):
-        line = line.strip()
-        if not line or line.startswith("#"):
-            continue
-        fields = re.split(r"\s*: ", line)
-        if len(fields) != 2:
-            print(f"{line_no+1}: expecting 2 fields, got {len(fields)} in:\n{line}")
-            continue
-        alias, replacement = fields
-        if not check_quoted(alias):
-            print(f"{line_no+1}: expecting alias to be quoted, got {alias} in:\n{line}")
-        alias = alias[1:-1]
-        if not check_quoted(replacement):
-            print(
-                f"{line_no+1}: expecting replacement to be quoted, got {replacement} in:\n{line}"
-            )
-            continue
-        replacement = replacement[1:-1]
-        alias_expand = [
-            c if c != "\x1b" else "escape" for c in list(alias.replace(r"\e", "\x1b"))
-        ]
-        add_binding(alias_expand, replacement)
-    pass
+    """
+    Add the bindings of inputrc file ``path``.
+    """
+    dispatcher.add_trie(load_inputrc_trie(path))
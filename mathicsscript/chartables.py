@@ -0,0 +1,343 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Named-character and operator tables, compiled into a file that is
+memory-mapped instead of parsed.
+
+The completers need the names of Mathics3's named characters, like
+``Alpha`` in ``\\[Alpha]``, the ASCII operators, and the escape-sequence
+aliases. Mathics-Scanner keeps these in JSON. Rather than parse that
+JSON each time mathicsscript starts, ``admin-tools/make-JSON-tables.sh``
+compiles the tables once:
+
+    python -m mathicsscript.chartables -o mathicsscript/data/character-tables.bin
+
+In the compiled file, each table is a sorted array of strings: a count,
+the offsets of the strings, and then the UTF-8 text of the strings one
+after another. A table that maps names to text, like "named-characters",
+has a second array of the same length for its values. Nothing is read
+until it is used, so opening the tables costs the same however large
+they are, and processes on a host that open the same file share its
+pages.
+
+All integers are unsigned 32 bits, little-endian. The file starts with
+``MAGIC``, the format version and the number of tables, followed by
+an entry for each table: its name and the positions of its arrays.
+"""
+
+import bisect
+import mmap
+import os
+import os.path as osp
+import struct
+import sys
+import tempfile
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+from mathicsscript.termshell import CONFIGDIR
+
+MAGIC = b"MS3CHARS"
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct("<8sII")
+# Table name, position of its keys array, and of its values array or 0.
+ENTRY = struct.Struct("<32sII")
+UINT32 = struct.Struct("<I")
+OFFSET_PAIR = struct.Struct("<II")
+
+DEFAULT_TABLES_PATH = osp.join(
+    osp.dirname(osp.abspath(__file__)), "data", "character-tables.bin"
+)
+TABLES_CACHE_PATH = osp.join(CONFIGDIR, "character-tables.bin")
+
+# The Mathics-Scanner version that tables were compiled from. When a
+# different version is installed, the tables are compiled again.
+SCANNER_VERSION_TABLE = "mathics-scanner-version"
+
+Buffer = Union[bytes, mmap.mmap]
+
+
+class StringArray(Sequence):
+    """
+    A sorted array of strings in compiled tables. Strings are decoded only
+    as they are looked at.
+    """
+
+    def __init__(self, buffer: Buffer, position: int):
+        self._buffer = buffer
+        (self._count,) = UINT32.unpack_from(buffer, position)
+        self._offsets = position + UINT32.size
+        self._text = self._offsets + (self._count + 1) * UINT32.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("StringArray index out of range")
+        start, end = OFFSET_PAIR.unpack_from(
+            self._buffer, self._offsets + i * UINT32.size
+        )
+        return self._buffer[self._text + start : self._text + end].decode("utf-8")
+
+    def index(self, s: str, start: int = 0, stop: Optional[int] = None) -> int:
+        i = bisect.bisect_left(self, s, start, self._count if stop is None else stop)
+        if i < self._count and self[i] == s:
+            return i
+        raise ValueError(f"{s!r} is not in the table")
+
+    def __contains__(self, s) -> bool:
+        try:
+            self.index(s)
+        except (TypeError, ValueError):
+            return False
+        return True
+
+    def prefixed(self, prefix: str) -> Iterator[str]:
+        """
+        Yield, in order, the strings that start with ``prefix``.
+        """
+        for i in range(bisect.bisect_left(self, prefix), self._count):
+            s = self[i]
+            if not s.startswith(prefix):
+                break
+            yield s
+
+
+class StringTable(Mapping):
+    """
+    A mapping from strings to strings in compiled tables.
+    """
+
+    def __init__(self, keys: StringArray, values: StringArray):
+        self.keys_array = keys
+        self._values = values
+
+    def __getitem__(self, key: str) -> str:
+        try:
+            return self._values[self.keys_array.index(key)]
+        except (TypeError, ValueError):
+            raise KeyError(key)
+
+    def __contains__(self, key) -> bool:
+        return key in self.keys_array
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.keys_array)
+
+    def __len__(self) -> int:
+        return len(self.keys_array)
+
+    def prefixed(self, prefix: str) -> Iterator[str]:
+        """
+        Yield, in order, the keys that start with ``prefix``.
+        """
+        return self.keys_array.prefixed(prefix)
+
+
+class CharacterTables:
+    """
+    The tables in a compiled buffer, by name.
+    """
+
+    def __init__(self, buffer: Buffer):
+        magic, version, count = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError("not a compiled character table file of this version")
+        self.buffer = buffer
+        self.tables: Dict[str, Union[StringArray, StringTable]] = {}
+        for i in range(count):
+            name, keys, values = ENTRY.unpack_from(buffer, HEADER.size + i * ENTRY.size)
+            array = StringArray(buffer, keys)
+            self.tables[name.rstrip(b"\0").decode("ascii")] = (
+                StringTable(array, StringArray(buffer, values)) if values else array
+            )
+
+    def __getitem__(self, name: str) -> Union[StringArray, StringTable]:
+        return self.tables[name]
+
+    @property
+    def scanner_version(self) -> Optional[str]:
+        versions = self.tables.get(SCANNER_VERSION_TABLE)
+        return versions[0] if versions else None
+
+
+def encode_strings(strings: Iterable[str]) -> bytes:
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = [0]
+    for s in encoded:
+        offsets.append(offsets[-1] + len(s))
+    return (
+        UINT32.pack(len(encoded))
+        + struct.pack(f"<{len(offsets)}I", *offsets)
+        + b"".join(encoded)
+    )
+
+
+def compile_tables(tables: Dict[str, Union[Iterable[str], Dict[str, str]]]) -> bytes:
+    """
+    Return the compiled form of ``tables``, each of which is either a
+    collection of strings or a dictionary from strings to strings.
+    """
+    position = HEADER.size + len(tables) * ENTRY.size
+    entries = []
+    blocks = []
+    for name, table in tables.items():
+        if isinstance(table, dict):
+            keys = sorted(table)
+            arrays = [encode_strings(keys), encode_strings(table[k] for k in keys)]
+        else:
+            arrays = [encode_strings(sorted(set(table)))]
+        positions = []
+        for array in arrays:
+            positions.append(position)
+            blocks.append(array)
+            position += len(array)
+        if len(positions) == 1:
+            positions.append(0)
+        entries.append(ENTRY.pack(name.encode("ascii"), *positions))
+    return (
+        HEADER.pack(MAGIC, FORMAT_VERSION, len(tables))
+        + b"".join(entries)
+        + b"".join(blocks)
+    )
+
+
+def scanner_version() -> str:
+    from mathics_scanner.version import __version__
+
+    return __version__
+
+
+def compile_scanner_tables() -> bytes:
+    """
+    Compile the tables mathicsscript uses from the JSON tables of the
+    installed Mathics-Scanner.
+    """
+    from mathics_scanner.load import load_mathics3_named_characters_json
+
+    named_characters = load_mathics3_named_characters_json()
+    return compile_tables(
+        {
+            "named-characters": named_characters["named-characters"],
+            "aliased-characters": named_characters["aliased-characters"],
+            "ascii-operators": named_characters["ascii-operators"],
+            SCANNER_VERSION_TABLE: [scanner_version()],
+        }
+    )
+
+
+def write_tables(data: bytes, path: str) -> None:
+    """
+    Save compiled tables in ``path``, replacing any file there all at once.
+    A process that has the old file mapped keeps seeing the old tables.
+    """
+    directory = osp.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def map_tables(path: str) -> Optional[CharacterTables]:
+    """
+    Memory-map the compiled tables in ``path``. Return None if there are
+    none there, or they are for another format or Mathics-Scanner version.
+    """
+    try:
+        with open(path, "rb") as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        tables = CharacterTables(buffer)
+    except (struct.error, ValueError):
+        buffer.close()
+        return None
+    if tables.scanner_version != scanner_version():
+        return None
+    return tables
+
+
+def load_character_tables(
+    path: str = DEFAULT_TABLES_PATH, cache_path: Optional[str] = TABLES_CACHE_PATH
+) -> CharacterTables:
+    """
+    Return the tables compiled in ``path``, or else in ``cache_path``.
+    If neither is up to date, compile them and, if ``cache_path`` is given,
+    save them there for next time.
+    """
+    for compiled_path in (path, cache_path):
+        if compiled_path is not None:
+            tables = map_tables(compiled_path)
+            if tables is not None:
+                return tables
+
+    data = compile_scanner_tables()
+    if cache_path is not None:
+        try:
+            write_tables(data, cache_path)
+        except OSError:
+            pass
+    return CharacterTables(data)
+
+
+_character_tables: Optional[CharacterTables] = None
+
+
+def get_character_tables() -> CharacterTables:
+    """
+    Return the tables this process uses, loading them the first time.
+    """
+    global _character_tables
+    if _character_tables is None:
+        _character_tables = load_character_tables()
+    return _character_tables
+
+
+def main(args=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m mathicsscript.chartables",
+        description=(
+            "Compile Mathics-Scanner's named-character and operator tables "
+            "into the file mathicsscript memory-maps."
+        ),
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        default=DEFAULT_TABLES_PATH,
+        help=f"file to write; default: {DEFAULT_TABLES_PATH}",
+    )
+    options = parser.parse_args(args)
+    write_tables(compile_scanner_tables(), options.output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,418 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Session checkpoints: ``Settings`SaveSession["file"]`` and
+``mathicsscript --resume FILE``.
+
+A checkpoint file holds the user's definitions, the In[] and Out[]
+history, and the line number, so that a session that dies can be taken
+up again where it was last saved. Restoring it is just unpickling the
+definitions, however long they took to compute.
+
+The file starts with ``MAGIC``. After that come records, each a pickled
+dictionary preceded by its length as an unsigned 32-bit little-endian
+integer. The first record has every definition; each later one has only
+what changed since the record before it:
+
+    changed   definitions that are new or changed, by name
+    rules     for definitions whose only change is to their DownValues, like
+              In and Out after each input: the rules added and the
+              patterns of those removed, by name
+    removed   names of definitions that were removed
+
+along with the line number and the other state that
+``mathicsscript.definitionchanges`` passes back from an isolated
+evaluation. So saving after
+each input costs about as much as what that input defined. Once the
+records after the first add up to more than the first, the file is
+written out again as a single record. Out[] results that
+``mathicsscript.outhistory`` has spilled to disk are read back and
+saved in full.
+
+A record that was being written when the process died is ignored. With
+``--autosave N``, the session is saved after every N inputs by a child
+process forked for the purpose, so that the session goes on while the
+definitions are written out.
+"""
+
+import os
+import os.path as osp
+import pickle
+import signal
+import struct
+import sys
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+from mathics.core.atoms import String
+from mathics.core.builtin import Builtin
+from mathics.core.systemsymbols import SymbolFailed
+
+from mathicsscript.definitionchanges import DEFINITIONS_STATE, merge_changes
+from mathicsscript.outhistory import dumps_with_spilled
+from mathicsscript.termshell import CONFIGDIR
+
+MAGIC = b"Mathics3 session 1\n"
+RECORD_LENGTH = struct.Struct("<I")
+
+# Definitions in these contexts are set up by mathicsscript, its
+# settings file and the command line of each run, so they aren't saved.
+UNSAVED_CONTEXTS = ("Settings`",)
+
+DEFAULT_SESSION_FILE = osp.join(CONFIGDIR, "session.checkpoint")
+
+
+def definition_state(definition) -> Dict[str, tuple]:
+    """
+    Return, for each attribute of ``definition``, the value along with
+    the contents of a list or dictionary. Holding on to the contents lets
+    a later state be compared element by element, by identity.
+    """
+    state = {}
+    for name, value in vars(definition).items():
+        if name == "changed":
+            continue
+        if isinstance(value, list):
+            contents = tuple(value)
+        elif isinstance(value, dict):
+            contents = tuple(value.items())
+        else:
+            contents = None
+        state[name] = (value, contents)
+    return state
+
+
+def same_value(old: tuple, new: tuple) -> bool:
+    (old_value, old_contents), (new_value, new_contents) = old, new
+    if old_contents is None or new_contents is None:
+        return old_contents is new_contents and old_value == new_value
+    return (
+        old_value is new_value
+        and len(old_contents) == len(new_contents)
+        and all(
+            (a[0] == b[0] and a[1] is b[1]) if isinstance(a, tuple) else a is b
+            for a, b in zip(old_contents, new_contents)
+        )
+    )
+
+
+def changed_rules(old: Dict[str, tuple], new: Dict[str, tuple]) -> Optional[tuple]:
+    """
+    Return the DownValues that a definition gained between states ``old``
+    and ``new``, and the patterns of those it lost, or None if it changed
+    in some other way.
+    """
+    if old.keys() != new.keys():
+        return None
+    for name in new:
+        if name != "downvalues" and not same_value(old[name], new[name]):
+            return None
+    (old_list, old_rules), (new_list, new_rules) = old["downvalues"], new["downvalues"]
+    if old_list is not new_list:
+        return None
+    old_ids = {id(rule) for rule in old_rules}
+    new_ids = {id(rule) for rule in new_rules}
+    return (
+        [rule for rule in new_rules if id(rule) not in old_ids],
+        [rule.pattern.expr for rule in old_rules if id(rule) not in new_ids],
+    )
+
+
+def is_saved(name: str) -> bool:
+    return not name.startswith(UNSAVED_CONTEXTS)
+
+
+def take_snapshot(definitions) -> dict:
+    """
+    Return the state of each saved definition, for collect_record().
+    """
+    return {
+        name: definition_state(definition)
+        for name, definition in definitions.user.items()
+        if is_saved(name)
+    }
+
+
+def collect_record(definitions, snapshot: Optional[dict]) -> Tuple[dict, dict]:
+    """
+    Return the record of what changed in ``definitions`` since
+    ``snapshot``, or of all of them if ``snapshot`` is None, along with the
+    snapshot to compare against next time.
+    """
+    old_snapshot = snapshot or {}
+    new_snapshot = {}
+    changed = {}
+    rules = {}
+    for name, definition in definitions.user.items():
+        if not is_saved(name):
+            continue
+        state = new_snapshot[name] = definition_state(definition)
+        old_state = old_snapshot.get(name)
+        if old_state is None:
+            changed[name] = definition
+            continue
+        rule_changes = changed_rules(old_state, state)
+        if rule_changes is None:
+            changed[name] = definition
+        elif rule_changes != ([], []):
+            rules[name] = rule_changes
+    record = {
+        "changed": changed,
+        "rules": rules,
+        "removed": set(old_snapshot) - set(new_snapshot),
+        "now": definitions.now,
+        "line_no": definitions.get_line_no(),
+        "state": {name: getattr(definitions, name, None) for name in DEFINITIONS_STATE},
+    }
+    return record, new_snapshot
+
+
+def encode_record(record: dict) -> Tuple[bytes, List[str]]:
+    """
+    Return ``record`` pickled, with its length in front, and the names of
+    any definitions that had to be left out because they can't be pickled,
+    such as those holding Python objects.
+    """
+    try:
+        data = dumps_with_spilled(record)
+    except Exception:
+        skipped = []
+        for key in ("changed", "rules"):
+            for name, value in list(record[key].items()):
+                try:
+                    dumps_with_spilled(value)
+                except Exception:
+                    del record[key][name]
+                    skipped.append(name)
+        return encode_record(record)[0], skipped
+    return RECORD_LENGTH.pack(len(data)) + data, []
+
+
+def apply_record(definitions, record: dict) -> None:
+    """
+    Apply a record made by collect_record() to ``definitions``.
+    """
+    user = definitions.user
+    for name, (new_rules, removed_patterns) in record["rules"].items():
+        definition = user.get(name)
+        if definition is None:
+            definition = user[name] = definitions.get_user_definition(name)
+        if removed_patterns:
+            definition.downvalues[:] = [
+                rule
+                for rule in definition.downvalues
+                if not any(rule.pattern.expr.sameQ(p) for p in removed_patterns)
+            ]
+        for rule in new_rules:
+            definition.add_rule_at(rule, "downvalues")
+    merge_changes(definitions, record)
+
+
+def read_records(path: str):
+    """
+    Yield the records in the checkpoint file ``path``. A record cut short,
+    because the process writing it died, ends the file.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a Mathics3 session checkpoint")
+        while True:
+            header = f.read(RECORD_LENGTH.size)
+            if len(header) < RECORD_LENGTH.size:
+                return
+            (length,) = RECORD_LENGTH.unpack(header)
+            data = f.read(length)
+            if len(data) < length:
+                return
+            yield pickle.loads(data)
+
+
+def restore_session(definitions, path: str) -> int:
+    """
+    Restore the session saved in ``path`` into ``definitions``, and return
+    the number of records read.
+    """
+    count = 0
+    for record in read_records(path):
+        apply_record(definitions, record)
+        count += 1
+    return count
+
+
+class SessionCheckpoint:
+    """
+    Saves a session in a checkpoint file, each save after the first
+    appending only what changed since the one before.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.snapshot: Optional[dict] = None
+        # The process id of a background save still in progress.
+        self.pid: Optional[int] = None
+
+    def wait(self) -> None:
+        """
+        Wait for a background save to finish. If it failed, or left out
+        definitions that couldn't be saved, the next save writes the file
+        out in full.
+        """
+        if self.pid is None:
+            return
+        _, status = os.waitpid(self.pid, 0)
+        self.pid = None
+        if not (os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0):
+            self.snapshot = None
+
+    def needs_rewrite(self) -> bool:
+        """
+        True when the file is missing, or the records after its first one
+        add up to more than it.
+        """
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(len(MAGIC))
+                (first_size,) = RECORD_LENGTH.unpack(f.read(RECORD_LENGTH.size))
+                size = f.seek(0, os.SEEK_END)
+        except (OSError, struct.error):
+            return True
+        return size - len(MAGIC) > 2 * (RECORD_LENGTH.size + first_size)
+
+    def save(self, definitions, background: bool = False) -> List[str]:
+        """
+        Save what changed in ``definitions`` since the last save. With
+        ``background``, the record is pickled and written by a forked child
+        process. Return the names of definitions that couldn't be saved;
+        a child process reports those on stderr instead.
+        """
+        self.wait()
+        full = self.snapshot is None or self.needs_rewrite()
+        record, self.snapshot = collect_record(
+            definitions, None if full else self.snapshot
+        )
+        if background and hasattr(os, "fork"):
+            sys.stdout.flush()
+            sys.stderr.flush()
+            pid = os.fork()
+            if pid == 0:
+                self.write_in_child(record, full)
+            self.pid = pid
+            return []
+
+        data, skipped = encode_record(record)
+        self.write(data, full)
+        for name in skipped:
+            # Saved again next time, as if new. Keeping the name means
+            # that its removal is still recorded.
+            self.snapshot[name] = None
+        return skipped
+
+    def write(self, data: bytes, full: bool) -> None:
+        if not full:
+            with open(self.path, "ab") as f:
+                f.write(data)
+            return
+        directory = osp.dirname(osp.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(MAGIC + data)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def write_in_child(self, record: dict, full: bool) -> None:
+        # A Control-C meant for the session shouldn't cut the save short.
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        exit_code = 0
+        try:
+            data, skipped = encode_record(record)
+            self.write(data, full)
+            if skipped:
+                sys.stderr.write(
+                    f"Session checkpoint {self.path}: could not save "
+                    f"{', '.join(skipped)}\n"
+                )
+                sys.stderr.flush()
+                # The parent's snapshot has these as saved.
+                exit_code = 2
+        except BaseException:
+            exit_code = 1
+        finally:
+            # Don't run anything that mathicsscript would do on exit.
+            os._exit(exit_code)
+
+    def close(self, definitions=None) -> List[str]:
+        """
+        Finish any background save and, if ``definitions`` are given,
+        save them one last time.
+        """
+        self.wait()
+        if definitions is None:
+            return []
+        return self.save(definitions)
+
+
+# Checkpoints by file, so that saving a session in the same file again
+# just adds what changed.
+checkpoints: Dict[str, SessionCheckpoint] = {}
+
+
+def get_checkpoint(path: str) -> SessionCheckpoint:
+    path = osp.abspath(osp.expanduser(path))
+    checkpoint = checkpoints.get(path)
+    if checkpoint is None:
+        checkpoint = checkpoints[path] = SessionCheckpoint(path)
+    return checkpoint
+
+
+class SaveSession(Builtin):
+    """
+    <dl>
+      <dt>'Settings`SaveSession["file"]'
+      <dd>saves the definitions, In[] and Out[] history, and line number \
+      of the session in "file", to be taken up again with \
+      'mathicsscript --resume "file"'.
+    </dl>
+
+    Saving in the same file again adds just what has changed since.
+    """
+
+    context = "Settings`"
+    messages = {
+        "nosave": "Cannot save the session in `1`: `2`.",
+        "skipped": "Definitions of `1` could not be saved.",
+    }
+    summary_text = "save the session in a checkpoint file"
+
+    def eval(self, file, evaluation):
+        "Settings`SaveSession[file_String]"
+        path = file.value
+        try:
+            skipped = get_checkpoint(path).save(evaluation.definitions)
+        except (OSError, pickle.PicklingError) as e:
+            evaluation.message("Settings`SaveSession", "nosave", file, String(str(e)))
+            return SymbolFailed
+        if skipped:
+            evaluation.message(
+                "Settings`SaveSession", "skipped", String(", ".join(skipped))
+            )
+        return file
+
+
+def install_session_builtins(definitions) -> None:
+    SaveSession(expression=False).contribute(definitions)
@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+A Python client for ``mathicsscript --serve``. For example:
+
+    from mathicsscript.client import MathicsClient
+
+    with MathicsClient("/tmp/mathics.sock") as client:
+        for result in client.evaluate("x = 2; x^10"):
+            print(result["result"])
+
+Each method sends a request and waits for its response. A client can
+be shared between threads, so that one thread can call ``interrupt()``
+while another is waiting in ``evaluate()``.
+"""
+
+import socket
+import threading
+import time
+from typing import List, Optional
+
+from mathicsscript.protocol import ProtocolError, recv_message, send_message
+
+
+class ServerError(Exception):
+    """
+    The server could not carry out a request.
+    """
+
+
+class MathicsClient:
+    def __init__(self, socket_path: str, wait: float = 0.0):
+        """
+        Connect to the server listening on ``socket_path``. If ``wait`` is
+        given, keep trying for up to that many seconds while the server
+        starts up.
+        """
+        self.socket_path = socket_path
+        self.next_id = 1
+        # Responses read by one thread for a request made by another,
+        # by request id.
+        self.responses = {}
+        self.send_lock = threading.Lock()
+        self.receive_condition = threading.Condition()
+        self.receiving = False
+        deadline = time.monotonic() + wait
+        while True:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                self.sock.connect(socket_path)
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                self.sock.close()
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.05)
+
+    def close(self) -> None:
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def request(self, op: str, **fields) -> dict:
+        """
+        Send a request and return its response, raising ServerError if it
+        failed.
+        """
+        with self.send_lock:
+            request_id = self.next_id
+            self.next_id += 1
+            send_message(self.sock, {"id": request_id, "op": op, **fields})
+        response = self.wait_for_response(request_id)
+        if not response.get("ok"):
+            raise ServerError(response.get("error"))
+        return response
+
+    def wait_for_response(self, request_id: int) -> dict:
+        """
+        Return the response to request ``request_id``. Only one thread
+        reads from the socket at a time; a response it reads for another
+        thread is handed over to that thread.
+        """
+        with self.receive_condition:
+            while request_id not in self.responses:
+                if self.receiving:
+                    self.receive_condition.wait()
+                    continue
+                self.receiving = True
+                self.receive_condition.release()
+                try:
+                    response = recv_message(self.sock)
+                finally:
+                    self.receive_condition.acquire()
+                    self.receiving = False
+                    self.receive_condition.notify_all()
+                if response is None:
+                    raise ProtocolError("the server closed the connection")
+                if response.get("id") is None:
+                    # Not a response to any request: the server is
+                    # dropping the connection.
+                    raise ServerError(response.get("error"))
+                self.responses[response["id"]] = response
+            return self.responses.pop(request_id)
+
+    def evaluate(self, code: str) -> List[dict]:
+        """
+        Evaluate ``code`` and return a result object for each expression
+        in it; see mathicsscript.jsonl_output for the fields.
+        """
+        return self.request("evaluate", code=code)["results"]
+
+    def interrupt(self) -> bool:
+        """
+        Abort the evaluation the server is doing. Return False if it was
+        not evaluating anything.
+        """
+        return self.request("interrupt")["interrupted"]
+
+    def complete(self, text: str, cursor: Optional[int] = None) -> List[dict]:
+        fields = {"text": text}
+        if cursor is not None:
+            fields["cursor"] = cursor
+        return self.request("complete", **fields)["completions"]
+
+    def status(self) -> List[dict]:
+        """
+        For a server started with --sessions, return an object for each
+        session with its process id and resource use. This must be asked
+        before any other request on a connection starts a session.
+        """
+        return self.request("status")["sessions"]
+
+    def shutdown(self) -> None:
+        """
+        Stop the server or, within a session started by --sessions, end
+        the session.
+        """
+        self.request("shutdown")
@@ -22,7 +22,7 @@ from typing import Iterable, List, NamedTuple, Tuple
 
 from mathics.core.symbols import strip_context
 from mathics_pygments.lexer import Regex
-from mathicsscript.settings import NAMED_CHARACTERS
+from mathicsscript.chartables import get_character_tables
 
 from prompt_toolkit.completion import (
     CompleteEvent,
@@ -87,7 +87,8 @@ class Mathics3Completer(WordCompleter):
     def __init__(self, definitions):
         self.definitions = definitions
         self.completer = WordCompleter([])
-        self.named_characters = sorted(NAMED_CHARACTERS["named-characters"].keys())
+        tables = get_character_tables()
+        self.named_characters = tables["named-characters"]
 
         # From WordCompleter, adjusted with default values
         self.ignore_case = True
@@ -98,19 +99,9 @@ class Mathics3Completer(WordCompleter):
         self.match_middle = False
         self.pattern = None
 
-        try:
-            import ujson
-        except ImportError:
-            import json as ujson
-        # Load tables from disk
-        with open(osp.join(get_datadir(), "mma-tables.json"), "r") as f:
-            _data = ujson.load(f)
-
         # @ is not really an operator
-        self.ascii_operators = frozenset(_data["ascii-operators"])
-        from mathics_scanner.characters import ALIASED_CHARACTERS
-
-        self.escape_sequences = ALIASED_CHARACTERS.keys()
+        self.ascii_operators = tables["ascii-operators"]
+        self.escape_sequences = tables["aliased-characters"]
 
     def _is_space_before_cursor(self, text_before_cursor: str) -> bool:
         """Space before or no text before cursor."""
@@ -124,7 +115,12 @@ class Mathics3Completer(WordCompleter):
         if kind == TokenKind.Symbol:
             words = self.get_word_names()
         elif kind == TokenKind.NamedCharacter:
-            words = self.named_characters
+            # Names are sorted, so those with a prefix are found directly.
+            words = (
+                self.named_characters
+                if self.match_middle
+                else self.named_characters.prefixed(word_before_cursor)
+            )
         elif kind == TokenKind.ASCII_Operator:
             words = self.ascii_operators
         elif kind == TokenKind.EscapeSequence:
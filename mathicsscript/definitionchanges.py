@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+What evaluation changes in a Definitions object, and applying those
+changes to another one.
+
+``mathicsscript.isolate`` uses these to pass back what an input changed
+in its forked child, ``mathicsscript.checkpoint`` to save and restore
+a session, and ``mathicsscript.memo`` to tell whether an evaluation
+changed any definitions. Nothing is imported here, so that those
+modules can use it without loading each other.
+"""
+
+
+# Attributes of Definitions, other than user definitions, that evaluation
+# can change and that are passed back and saved along with them.
+DEFINITIONS_STATE = (
+    "current_context",
+    "context_path",
+    "inputfile",
+    "trace_evaluation",
+    "trace_show_rewrite",
+    "timing_trace_evaluation",
+)
+
+
+def definition_fingerprint(definition) -> tuple:
+    """
+    Return what identifies the current contents of ``definition``.
+
+    Definitions.mark_changed() isn't called for every change: Clear[]
+    for example replaces a definition's lists of rules without it. Such a
+    change gives the attribute a new identity, and a rule added in place
+    changes the length of its list.
+    """
+    return tuple(
+        (name, id(value), len(value) if isinstance(value, (list, dict)) else None)
+        for name, value in vars(definition).items()
+    )
+
+
+def snapshot_definitions(definitions) -> dict:
+    """
+    Return the fingerprint of each user definition, for collect_changes().
+    """
+    return {
+        name: definition_fingerprint(definition)
+        for name, definition in definitions.user.items()
+    }
+
+
+def collect_changes(definitions, snapshot: dict) -> dict:
+    """
+    Return what evaluation changed in ``definitions`` since ``snapshot``
+    was taken.
+    """
+    user = definitions.user
+    return {
+        "changed": {
+            name: definition
+            for name, definition in user.items()
+            if snapshot.get(name) != definition_fingerprint(definition)
+        },
+        "removed": set(snapshot) - set(user),
+        "now": definitions.now,
+        "line_no": definitions.get_line_no(),
+        "state": {name: getattr(definitions, name, None) for name in DEFINITIONS_STATE},
+    }
+
+
+def merge_changes(definitions, changes: dict) -> None:
+    """
+    Apply ``changes``, made by ``collect_changes`` in a child, to
+    ``definitions``.
+    """
+    user = definitions.user
+    for name in changes["removed"]:
+        user.pop(name, None)
+    user.update(changes["changed"])
+    definitions.now = max(definitions.now, changes["now"])
+    for name, value in changes["state"].items():
+        if hasattr(definitions, name):
+            setattr(definitions, name, value)
+    definitions.set_line_no(changes["line_no"])
+    definitions.clear_cache()
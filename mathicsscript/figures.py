@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Closing the matplotlib figures that results are shown in.
+
+pyplot keeps every figure it makes until it is closed, along with the
+images drawn in it, so a long session that shows many plots grows
+without end. Each figure a result is shown in is therefore made afresh,
+rather than drawn into whatever figure pyplot last left current, and is
+handed to ``show_figure()``. That closes it once it is shown, if the
+matplotlib backend has no windows to show it in, and otherwise keeps at
+most ``Settings`$MaxFigures`` of the figures shown open, closing the
+oldest.
+"""
+
+import math
+from collections import deque
+from typing import Optional
+
+MAX_FIGURES_SETTING = "Settings`$MaxFigures"
+
+DEFAULT_MAX_FIGURES = 5
+
+# Backends that only write files: a figure shown with one of these can't
+# be seen, or looked at again.
+NONINTERACTIVE_BACKENDS = frozenset(
+    ("agg", "cairo", "pdf", "pgf", "ps", "svg", "template")
+)
+
+
+def get_max_figures(definitions) -> Optional[int]:
+    """
+    Return the number of figures kept open following
+    ``Settings`$MaxFigures``, or None for no limit.
+    """
+    try:
+        value = definitions.get_ownvalue(MAX_FIGURES_SETTING).to_python()
+    except ValueError:
+        return DEFAULT_MAX_FIGURES
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return DEFAULT_MAX_FIGURES
+    if value == math.inf:
+        return None
+    return max(0, int(value))
+
+
+def release_figure(plt, figure) -> None:
+    """
+    Close ``figure``, letting go of the images drawn in it right away
+    rather than when the garbage collector gets to the figure.
+    """
+    import numpy as np
+
+    for ax in figure.axes:
+        for image in ax.images:
+            image.set_data(np.zeros((1, 1)))
+    figure.clear()
+    plt.close(figure)
+
+
+class FigureManager:
+    """
+    The figures that results were shown in and are still open, oldest
+    first.
+    """
+
+    def __init__(self):
+        self.shown: deque = deque()
+
+    def show(self, plt, figure, limit: Optional[int] = DEFAULT_MAX_FIGURES):
+        """
+        Show ``figure``, and close figures shown so that at most ``limit``
+        are left open.
+        """
+        plt.show()
+        self.shown.append(figure)
+        if plt.get_backend().lower() in NONINTERACTIVE_BACKENDS:
+            limit = 0
+        # Figures whose windows were closed are gone already.
+        self.shown = deque(
+            shown for shown in self.shown if plt.fignum_exists(shown.number)
+        )
+        while limit is not None and len(self.shown) > limit:
+            release_figure(plt, self.shown.popleft())
+
+
+figure_manager = FigureManager()
+
+
+def show_figure(plt, figure, limit: Optional[int] = DEFAULT_MAX_FIGURES) -> None:
+    """
+    Show the figure of a result, and close older ones beyond ``limit``.
+    """
+    figure_manager.show(plt, figure, limit)
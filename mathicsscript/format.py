@@ -4,10 +4,11 @@ Format Mathics3 objects
 
 import math
 import random
+from functools import cache
+from importlib.metadata import PackageNotFoundError, version as package_version
 from tempfile import NamedTemporaryFile
-from typing import Callable
+from typing import Callable, Optional
 
-import networkx as nx
 from mathics.core.atoms import String
 from mathics.core.symbols import Symbol
 from mathics.core.systemsymbols import (
@@ -29,38 +30,101 @@ from mathics.core.systemsymbols import (
 )
 from mathics.format.box import format_element
 from mathics.session import get_settings_value
-from mathicsscript.asymptote import Asy, write_asy_and_view
+from mathicsscript.asymptote import (
+    flush_asy_batch,
+    get_asy_batch,
+    have_asymptote,
+    write_asy_and_view,
+)
+from mathicsscript.figures import DEFAULT_MAX_FIGURES, get_max_figures, show_figure
+from mathicsscript.inlineimage import get_inline_protocol, show_inline
+from mathicsscript.texrender import show_tex, wait_for_writes
 
 PyMathicsGraph = Symbol("Pymathics`Graph")
 
-try:
-    from matplotlib import __version__ as matplotlib_version
-except ImportError:
-    matplotlib_version = None
+# The graphics backends below are optional and can take a while to
+# import, while many runs, like "mathicsscript -c", never display
+# graphics.  So each backend is imported the first time it is needed,
+# not when this module is imported.
+
+
+def get_matplotlib_version() -> Optional[str]:
+    """
+    Return the installed matplotlib version, or None if matplotlib is
+    not installed. matplotlib itself is not imported.
+    """
+    try:
+        return package_version("matplotlib")
+    except PackageNotFoundError:
+        return None
+
+
+@cache
+def get_pyplot():
+    """
+    Return the matplotlib.pyplot module or None if that can't be imported.
+    """
+    try:
+        import matplotlib.pyplot as plt
+    except ImportError:
+        return None
+    return plt
+
+
+@cache
+def get_mpimg():
+    """
+    Return the matplotlib.image module or None if that can't be imported.
+    """
+    try:
+        import matplotlib.image as mpimg
+    except ImportError:
+        return None
+    return mpimg
 
-try:
-    import matplotlib.pyplot as plt
-except ImportError:
-    plt = None
 
-try:
-    import matplotlib.image as mpimg
-except ImportError:
-    mpimg = None
+@cache
+def get_svg2png() -> Optional[Callable]:
+    """
+    Return cairosvg's svg2png() or None if that can't be imported.
+    """
+    try:
+        from cairosvg import svg2png
+    except (ImportError, OSError):
+        # OSError is raised when cairosvg is installed but the
+        # underlying cairo library is not.
+        return None
+    return svg2png
 
-try:
-    from cairosvg import svg2png
-except ImportError:
-    svg2png = None
 
-have_asymptote = False
-try:
-    asymptote_graph = Asy(show_help=False)
-except Exception:
-    asymptote_graph = None
-else:
-    have_asymptote = True
-    asymptote_graph.size(200)
+def show_graphics(expr, evaluation, plt) -> bool:
+    """
+    Draw Graphics[] or Graphics3D[] expression ``expr`` with matplotlib and
+    show it. Return False if it has something that can't be drawn that way.
+    """
+    from mathicsscript.mplgraphics import UnsupportedGraphics
+
+    if expr.get_head() is SymbolGraphics3D:
+        from mathicsscript.mplgraphics3d import render_graphics3d as render
+    else:
+        from mathicsscript.mplgraphics import render_graphics as render
+
+    try:
+        figure = render(expr, evaluation, plt)
+    except UnsupportedGraphics:
+        return False
+    show_figure(plt, figure, get_max_figures(evaluation.definitions))
+    return True
+
+
+def finish_output() -> None:
+    """
+    Finish the output of results that is left to be done later: compile
+    Asymptote graphics waiting in a batch, and write TeXForm images. A
+    forked child that evaluated inputs must call this before it exits.
+    """
+    flush_asy_batch()
+    wait_for_writes()
 
 
 def format_output(obj, expr, format=None):
@@ -115,31 +179,31 @@ def format_output(obj, expr, format=None):
             if hasattr(boxed, "head") and boxed.head is SymbolInterpretationBox:
                 inner_box = boxed.elements[0]
                 box_str_sans_quotes = inner_box.value[1:-1]
-                box_str_display_math = rf"${box_str_sans_quotes}$"
-                try:
-                    # Create a figure and axis with no visible borders
-                    fig, ax = plt.subplots(figsize=(3, 2))
-                    ax.axis("off")
-                    # Render the LaTeX string in the center
-                    # 'transform=ax.transAxes' ensures 0.5 is the exact middle of the window
-                    ax.text(
-                        0.5,
-                        0.5,
-                        box_str_display_math,
-                        size=50,
-                        ha="center",
-                        va="center",
-                        transform=ax.transAxes,
-                    )
-                    plt.show()
+                if show_tex(box_str_sans_quotes, obj):
                     return String(box_str_sans_quotes)
-                except:  # noqa
-                    pass
 
+    elif (
+        expr_head in (SymbolGraphics, SymbolPlot, SymbolGraphics3D)
+        and get_settings_value(obj.definitions, "Settings`$UseAsymptote")
+        and have_asymptote()
+        and (asy_batch := get_asy_batch(obj.definitions))
+    ):
+        # Graphics are written to files, to be compiled together later,
+        # rather than shown.
+        asy_expr = Expression(SymbolExportString, expr, String("asy"))
+        asy_str = asy_expr.evaluate(obj).to_python(string_quotes=False)
+        return asy_batch.add(asy_str)
+    elif (
+        expr_head in (SymbolGraphics, SymbolGraphics3D, SymbolImage)
+        and get_settings_value(obj.definitions, "Settings`$UseMatplotlib")
+        and (protocol := get_inline_protocol(obj.definitions))
+        and show_inline(expr, obj, protocol)
+    ):
+        return expr_type
     elif (
         expr_head is SymbolImage
         and get_settings_value(obj.definitions, "Settings`$UseMatplotlib")
-        and plt
+        and (plt := get_pyplot())
     ):
         temp_png = NamedTemporaryFile(
             mode="w+b", suffix=".png", prefix="mathicsscript-"
@@ -149,21 +213,31 @@ def format_output(obj, expr, format=None):
                 SymbolExport, String(temp_png.name), expr, String("PNG")
             )
             result = png_expr.evaluate(obj)
-            plt.axes().set_axis_off()
-            img = mpimg.imread(temp_png)
+            fig, ax = plt.subplots()
+            ax.set_axis_off()
+            img = get_mpimg().imread(temp_png)
             cmap = "gray" if expr.color_space == "Grayscale" else None
-            plt.imshow(img, cmap=cmap)
-            plt.show()
+            ax.imshow(img, cmap=cmap)
+            show_figure(plt, fig, get_max_figures(obj.definitions))
         except:  # noqa
             pass
         temp_png.close()
 
+    elif (
+        expr_head in (SymbolGraphics, SymbolGraphics3D)
+        and get_settings_value(obj.definitions, "Settings`$UseMatplotlib")
+        and (plt := get_pyplot())
+        and show_graphics(expr, obj, plt)
+    ):
+        return expr_type
     elif (
         expr_head in (SymbolGraphics, SymbolPlot)
         and get_settings_value(obj.definitions, "Settings`$UseMatplotlib")
-        and plt
-        and svg2png
+        and (plt := get_pyplot())
+        and (svg2png := get_svg2png())
     ):
+        # Graphics that show_graphics() can't draw are converted to SVG,
+        # and shown as a bitmap.
         svg_expr = Expression(SymbolExportString, expr, String("SVG"))
         svg_str = svg_expr.evaluate(obj).to_python(string_quotes=False)
         temp_png = NamedTemporaryFile(
@@ -171,26 +245,22 @@ def format_output(obj, expr, format=None):
         )
         try:
             svg2png(bytestring=svg_str, write_to=temp_png.name)
-            plt.axes().set_axis_off()
-            img = mpimg.imread(temp_png)
-            plt.imshow(img)
-            plt.show()
+            fig, ax = plt.subplots()
+            ax.set_axis_off()
+            ax.imshow(get_mpimg().imread(temp_png))
+            show_figure(plt, fig, get_max_figures(obj.definitions))
             temp_png.close()
         except:  # noqa
             pass
         return expr_type
     elif (
         expr_head in (SymbolGraphics, SymbolPlot, SymbolGraphics3D)
-        and have_asymptote
         and get_settings_value(obj.definitions, "Settings`$UseAsymptote")
+        and have_asymptote()
     ):
         asy_expr = Expression(SymbolExportString, expr, String("asy"))
         asy_str = asy_expr.evaluate(obj).to_python(string_quotes=False)
 
-        # Alternate older version
-        # asymptote_graph.erase()
-        # asymptote_graph.send(asy_str)
-
         write_asy_and_view(asy_str)
         return expr_type
 
@@ -217,7 +287,7 @@ def format_output(obj, expr, format=None):
         result = expr.format(obj, SymbolOutputForm)
     elif format == "unformatted":
         if expr_head is PyMathicsGraph and hasattr(expr, "G"):
-            return format_graph(expr.G)
+            return format_graph(expr.G, get_max_figures(obj.definitions))
         else:
             result = expr.format(obj, SymbolOutputForm)
     else:
@@ -309,6 +379,8 @@ def hierarchy_pos(
     https://networkx.org/documentation/latest/auto_examples/index.html
 
     """
+    import networkx as nx
+
     if not nx.is_tree(G):
         raise TypeError("cannot use hierarchy_pos on a graph that is not a tree")
 
@@ -464,22 +536,33 @@ def tree_layout(G):
 
 
 def spiral_equidistant_layout(G, *args, **kwargs):
+    import networkx as nx
+
     return nx.spiral_layout(G, equidistant=True, *args, **kwargs)
 
 
-NETWORKX_LAYOUTS = {
-    "circular": nx.circular_layout,
-    "kamada_kawai": nx.kamada_kawai_layout,
-    "multipartite": nx.multipartite_layout,
-    "planar": nx.planar_layout,
-    "random": nx.random_layout,
-    "shell": nx.shell_layout,
-    "spectral": nx.spectral_layout,
-    "spiral": nx.spiral_layout,
-    "spiral_equidistant": spiral_equidistant_layout,
-    "spring": nx.spring_layout,
-    "tree": tree_layout,
-}
+@cache
+def get_networkx_layouts() -> dict:
+    """
+    Return a dictionary mapping a GraphLayout name to the networkx
+    function that computes node positions for that layout.
+    """
+    import networkx as nx
+
+    return {
+        "circular": nx.circular_layout,
+        "kamada_kawai": nx.kamada_kawai_layout,
+        "multipartite": nx.multipartite_layout,
+        "planar": nx.planar_layout,
+        "random": nx.random_layout,
+        "shell": nx.shell_layout,
+        "spectral": nx.spectral_layout,
+        "spiral": nx.spiral_layout,
+        "spiral_equidistant": spiral_equidistant_layout,
+        "spring": nx.spring_layout,
+        "tree": tree_layout,
+    }
+
 
 LAYOUT_DENSITY_EXPONENT = {"circular": 0.9, "spiral_equidistant": 0.7, "spiral": 0.6}
 
@@ -529,11 +612,14 @@ def harmonize_parameters(G, draw_options: dict):
         draw_options["font_size"] = font_size
 
 
-def format_graph(G):
+def format_graph(G, max_figures: Optional[int] = DEFAULT_MAX_FIGURES):
     """
     Format a Graph
     """
     # FIXME handle graphviz as well
+    import networkx as nx
+
+    plt = get_pyplot()
 
     global node_size
     global cached_pair
@@ -558,17 +644,18 @@ def format_graph(G):
     if vertex_labels:
         draw_options["with_labels"] = bool(vertex_labels)
 
+    fig, ax = plt.subplots()  # Create a figure and an axes
+    draw_options["ax"] = ax
     if hasattr(G, "title") and G.title:
-        fig, ax = plt.subplots()  # Create a figure and an axes
         ax.set_title(G.title)
 
     layout_fn = None
     if graph_layout:
         if not isinstance(graph_layout, str):
             graph_layout = graph_layout.get_string_value()
-        layout_fn = NETWORKX_LAYOUTS.get(graph_layout, None)
+        layout_fn = get_networkx_layouts().get(graph_layout, None)
         if graph_layout in ["circular", "spiral", "spiral_equidistant"]:
-            plt.axes().set_aspect("equal")
+            ax.set_aspect("equal")
 
     harmonize_parameters(G, draw_options)
 
@@ -576,5 +663,5 @@ def format_graph(G):
         nx.draw(G, pos=layout_fn(G), **draw_options)
     else:
         nx.draw_shell(G, **draw_options)
-    plt.show()
+    show_figure(plt, fig, max_figures)
     return None
@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Input history shared by the prompt_toolkit and GNU Readline shells.
+
+History is kept in an SQLite database, by default ``history.sqlite`` in
+the Mathics3 configuration directory. At startup a shell loads only the
+most recent entries, so startup time doesn't grow with the size of the
+history. The whole archive can be searched, by substring or by regular
+expression, with the ``!!history`` shell escape:
+
+    !!history [--regex] [--limit N] [PATTERN]
+
+Without a pattern, the most recent entries are shown. Substring search
+uses an SQLite full-text index of the history when SQLite supports one.
+
+When the database is first created, the history files that the shells
+used before, ``history`` and ``history-gnu``, are copied into it. They are
+left in place.
+
+When a shell exits, entries older than ``MATHICS3_HISTORY_MAX_DAYS`` days
+are removed, and then the oldest entries beyond
+``MATHICS3_HISTORY_MAX_ENTRIES``. Both are environment variables; 0
+means no limit.
+"""
+
+import os
+import os.path as osp
+import re
+import sqlite3
+import time
+from datetime import datetime
+from typing import Iterable, Iterator, List, NamedTuple, Tuple
+
+from mathicsscript.termshell import CONFIGDIR, HISTFILE
+
+HISTORY_DB = os.environ.get(
+    "MATHICS3_HISTORY_DB", osp.join(CONFIGDIR, "history.sqlite")
+)
+
+# The history files of mathicsscript versions before HISTORY_DB.
+LEGACY_HISTORY_FILES = (HISTFILE, osp.join(CONFIGDIR, "history-gnu"))
+
+
+def int_from_environment(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+HISTORY_MAX_ENTRIES = int_from_environment("MATHICS3_HISTORY_MAX_ENTRIES", 100000)
+HISTORY_MAX_DAYS = int_from_environment("MATHICS3_HISTORY_MAX_DAYS", 0)
+
+# The number of recent entries a shell loads at startup.
+HISTORY_LOAD_SIZE = int_from_environment("MATHICS3_HISTORY_LOAD_SIZE", 1000)
+
+HISTORY_ESCAPE = "!!history"
+
+HISTORY_USAGE = """Usage: !!history [options] [PATTERN]
+Show the most recent inputs containing PATTERN, or the most recent inputs.
+Options:
+	--regex (or -r)        PATTERN is a Python regular expression
+	--limit (or -n) N      number of entries to show (default 20)
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    time REAL NOT NULL,
+    shell TEXT NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_time ON history(time);
+"""
+
+# A trigram index can find any substring of at least three characters.
+# It needs SQLite 3.34 or later, built with FTS5.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+    text, content='history', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS history_fts_insert AFTER INSERT ON history BEGIN
+    INSERT INTO history_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS history_fts_delete AFTER DELETE ON history BEGIN
+    INSERT INTO history_fts(history_fts, rowid, text)
+        VALUES ('delete', old.id, old.text);
+END;
+"""
+
+FTS_MIN_LENGTH = 3
+
+
+class HistoryEntry(NamedTuple):
+    id: int
+    time: float
+    shell: str
+    text: str
+
+
+class HistoryOptions(NamedTuple):
+    pattern: str = ""
+    regex: bool = False
+    limit: int = 20
+
+
+def regexp(pattern: str, text: str) -> bool:
+    return re.search(pattern, text) is not None
+
+
+class HistoryStore:
+    """
+    The history database at ``path``. See the module docstring.
+    """
+
+    def __init__(
+        self,
+        path: str = HISTORY_DB,
+        max_entries: int = HISTORY_MAX_ENTRIES,
+        max_days: int = HISTORY_MAX_DAYS,
+        legacy_files: Iterable[str] = LEGACY_HISTORY_FILES,
+    ):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_days = max_days
+        is_new = path == ":memory:" or not osp.exists(path)
+        # prompt_toolkit may load history from another thread.
+        self.connection = sqlite3.connect(
+            path, timeout=5.0, check_same_thread=False, isolation_level=None
+        )
+        # Several mathicsscript processes can share the database.
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.create_function("regexp", 2, regexp, deterministic=True)
+        self.connection.executescript(SCHEMA)
+        try:
+            self.connection.executescript(FTS_SCHEMA)
+            self.has_fts = True
+        except sqlite3.OperationalError:
+            self.has_fts = False
+        if is_new:
+            for legacy_file in legacy_files:
+                if osp.isfile(legacy_file):
+                    self.import_file(legacy_file)
+
+    def append(self, text: str, shell: str = "") -> None:
+        if not text.strip():
+            return
+        self.connection.execute(
+            "INSERT INTO history(time, shell, text) VALUES (?, ?, ?)",
+            (time.time(), shell, text),
+        )
+
+    def recent(self, limit: int = HISTORY_LOAD_SIZE) -> List[HistoryEntry]:
+        """
+        Return the ``limit`` most recent entries, newest first.
+        """
+        return [
+            HistoryEntry(*row)
+            for row in self.connection.execute(
+                "SELECT id, time, shell, text FROM history ORDER BY id DESC LIMIT ?",
+                (limit,),
+            )
+        ]
+
+    def search(
+        self, pattern: str, regex: bool = False, limit: int = 20
+    ) -> List[HistoryEntry]:
+        """
+        Return the ``limit`` most recent entries containing ``pattern``, or
+        matching it as a regular expression if ``regex`` is set, newest
+        first. re.error is raised for a bad regular expression.
+        """
+        columns = "history.id, history.time, history.shell, history.text"
+        if regex:
+            re.compile(pattern)
+            query = (
+                f"SELECT {columns} FROM history WHERE text REGEXP ? "
+                "ORDER BY id DESC LIMIT ?"
+            )
+            params: Tuple = (pattern, limit)
+        elif self.has_fts and len(pattern) >= FTS_MIN_LENGTH:
+            # The index is not case sensitive; instr() is.
+            query = (
+                f"SELECT {columns} FROM history_fts "
+                "JOIN history ON history.id = history_fts.rowid "
+                "WHERE history_fts MATCH ? AND instr(history.text, ?) > 0 "
+                "ORDER BY history.id DESC LIMIT ?"
+            )
+            params = ('"' + pattern.replace('"', '""') + '"', pattern, limit)
+        else:
+            query = (
+                f"SELECT {columns} FROM history WHERE instr(text, ?) > 0 "
+                "ORDER BY id DESC LIMIT ?"
+            )
+            params = (pattern, limit)
+        return [HistoryEntry(*row) for row in self.connection.execute(query, params)]
+
+    def compact(self) -> int:
+        """
+        Remove entries that are too old or too many. Return how many were
+        removed.
+        """
+        removed = 0
+        with self.connection:
+            if self.max_days > 0:
+                removed += self.connection.execute(
+                    "DELETE FROM history WHERE time < ?",
+                    (time.time() - self.max_days * 24 * 60 * 60,),
+                ).rowcount
+            if self.max_entries > 0:
+                removed += self.connection.execute(
+                    "DELETE FROM history WHERE id <= "
+                    "(SELECT id FROM history ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (self.max_entries,),
+                ).rowcount
+        return removed
+
+    def import_file(self, path: str) -> int:
+        """
+        Add the entries of history file ``path``, written by prompt_toolkit
+        or GNU Readline. Return how many were added.
+        """
+        shell = "gnu" if path.endswith("-gnu") else "prompt"
+        rows = [
+            (entry_time, shell, text)
+            for entry_time, text in read_history_file(path)
+            if text.strip()
+        ]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO history(time, shell, text) VALUES (?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def close(self) -> None:
+        try:
+            self.compact()
+        except sqlite3.Error:
+            pass
+        self.connection.close()
+
+
+def read_history_file(path: str) -> Iterator[Tuple[float, str]]:
+    """
+    Yield the (time, text) of each entry in a history file. prompt_toolkit
+    writes a "# date" line before each entry and starts the entry's lines
+    with "+"; GNU Readline writes an entry per line, with no date.
+    """
+    file_time = osp.getmtime(path)
+    with open(path, "rb") as f:
+        lines = [line.decode("utf-8", errors="replace").rstrip("\n") for line in f]
+    first = next((line for line in lines if line), "")
+    if not (first.startswith("# ") or first.startswith("+")):
+        for line in lines:
+            yield file_time, line
+        return
+
+    entry_time, entry_lines = file_time, []
+    for line in lines:
+        if line.startswith("+"):
+            entry_lines.append(line[1:])
+            continue
+        if entry_lines:
+            yield entry_time, "\n".join(entry_lines)
+            entry_lines = []
+        if line.startswith("# "):
+            try:
+                entry_time = datetime.fromisoformat(line[2:]).timestamp()
+            except ValueError:
+                pass
+    if entry_lines:
+        yield entry_time, "\n".join(entry_lines)
+
+
+def is_history_command(line: str) -> bool:
+    """
+    Return True if ``line`` is a ``!!history`` shell escape.
+    """
+    return line == HISTORY_ESCAPE or line.startswith(HISTORY_ESCAPE + " ")
+
+
+def parse_history_command(line: str) -> HistoryOptions:
+    """
+    Split a ``!!history`` line into its options and pattern. Options must
+    come before the pattern.
+
+    ValueError is raised on a malformed line.
+    """
+    rest = line[len(HISTORY_ESCAPE) :].strip()
+    options = {}
+    while rest.startswith("-"):
+        option, _, rest = rest.partition(" ")
+        rest = rest.lstrip()
+        if option in ("-r", "--regex"):
+            options["regex"] = True
+        elif option in ("-n", "--limit"):
+            value, _, rest = rest.partition(" ")
+            rest = rest.lstrip()
+            try:
+                options["limit"] = int(value)
+            except ValueError:
+                raise ValueError(f"option {option} needs an integer, got {value}")
+        else:
+            raise ValueError(f"unknown option {option}")
+    if options.get("regex") and not rest:
+        raise ValueError("no regular expression given")
+    return HistoryOptions(rest, **options)
+
+
+def show_history(store: HistoryStore, options: HistoryOptions, print_fn=print) -> None:
+    """
+    Show the entries selected by ``options``, oldest first.
+    """
+    if options.pattern:
+        entries = store.search(options.pattern, options.regex, options.limit)
+    else:
+        entries = store.recent(options.limit)
+    for entry in reversed(entries):
+        date = datetime.fromtimestamp(entry.time).strftime("%Y-%m-%d %H:%M")
+        text = entry.text.replace("\n", "\n" + " " * 25)
+        print_fn(f"{entry.id:7}  {date}  {text}")
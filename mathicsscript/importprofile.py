@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Report how long it takes to import mathicsscript, module by module.
+
+This is what ``mathicsscript --import-profile`` runs. The import is done
+in a fresh Python interpreter using Python's ``-X importtime`` option, so
+that modules already imported by the current process don't hide their
+cost.
+"""
+
+import subprocess
+import sys
+from typing import List, NamedTuple
+
+# The module whose import is measured by default. Importing it pulls in
+# everything that mathicsscript loads before it starts evaluating input.
+DEFAULT_IMPORT_TARGET = "mathicsscript.__main__"
+
+
+class ImportTime(NamedTuple):
+    module: str
+    # Time in microseconds spent importing just this module...
+    self_us: int
+    # ... and including the modules it imports.
+    cumulative_us: int
+    # Import nesting level; 0 is a module imported at top level.
+    depth: int
+
+
+def parse_importtime(text: str) -> List[ImportTime]:
+    """
+    Parse the output of ``python -X importtime``, lines of the form:
+
+        import time:       self [us] |  cumulative | imported package
+        import time:       104 |        104 |   _io
+    """
+    import_times = []
+    for line in text.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3:
+            continue
+        self_us, cumulative_us, name = fields
+        try:
+            self_us, cumulative_us = int(self_us), int(cumulative_us)
+        except ValueError:
+            # The header line.
+            continue
+        stripped_name = name.lstrip()
+        depth = (len(name) - len(stripped_name) - 1) // 2
+        import_times.append(
+            ImportTime(stripped_name.rstrip(), self_us, cumulative_us, depth)
+        )
+    return import_times
+
+
+def measure_import(module: str = DEFAULT_IMPORT_TARGET) -> List[ImportTime]:
+    """
+    Import ``module`` in a new Python interpreter and return the import time
+    of each module loaded.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{result.stderr}")
+    return parse_importtime(result.stderr)
+
+
+def top_level_package(module: str) -> str:
+    return module.split(".")[0]
+
+
+def print_import_profile(
+    import_times: List[ImportTime], limit: int = 25, print_fn=print
+) -> None:
+    """
+    Show the total import time, the time attributable to each top-level
+    package, and the ``limit`` slowest individual modules.
+    """
+    total_us = sum(t.self_us for t in import_times)
+    print_fn(f"Total import time: {total_us / 1e6:.3f} s ({len(import_times)} modules)")
+
+    packages = {}
+    for t in import_times:
+        package = top_level_package(t.module)
+        packages[package] = packages.get(package, 0) + t.self_us
+    print_fn("\nSlowest packages (by self time of all their modules):")
+    for package, self_us in sorted(packages.items(), key=lambda kv: -kv[1])[:limit]:
+        print_fn(f"  {self_us / 1e3:10.1f} ms  {package}")
+
+    print_fn("\nSlowest modules:")
+    print_fn(f"  {'self':>10}     {'cumulative':>10}")
+    for t in sorted(import_times, key=lambda t: -t.self_us)[:limit]:
+        print_fn(
+            f"  {t.self_us / 1e3:10.1f} ms  {t.cumulative_us / 1e3:10.1f} ms  {t.module}"
+        )
+
+    mathicsscript_times = [
+        t for t in import_times if top_level_package(t.module) == "mathicsscript"
+    ]
+    if mathicsscript_times:
+        print_fn("\nmathicsscript modules:")
+        for t in sorted(mathicsscript_times, key=lambda t: -t.cumulative_us):
+            print_fn(
+                f"  {t.self_us / 1e3:10.1f} ms  {t.cumulative_us / 1e3:10.1f} ms  {t.module}"
+            )
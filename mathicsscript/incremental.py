@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Incremental evaluation of a file: ``mathicsscript --incremental -f FILE``.
+
+Each top-level statement of the file is identified by the SHA-1 of its
+FullForm, so that whitespace and comments don't matter. As a statement
+is evaluated, we note the symbols it reads, which are those that appear
+in it, and those it defines, which are the user definitions that its
+evaluation changed. What it changed is kept in a cache, along with the
+messages and Print[] output it gave, in the form that
+``mathicsscript.checkpoint`` saves a session in.
+
+The next time the file is evaluated, a statement that is in the cache is
+not evaluated again; its definitions are restored from the cache and its
+output is shown again. That is so unless it reads a symbol that is
+"dirty": one defined by a statement that was evaluated this time because
+it is new or changed, or by a statement that was in the file last time
+but has since been removed. A statement that is evaluated makes the
+symbols it defines dirty in turn, so a change reaches every statement
+that depends on it, however indirectly.
+
+Some statements depend on more than their symbols. Those that use any of
+VOLATILE_SYMBOLS, to read a file or make a symbol from a string for
+example, are always evaluated, and so are statements that can't be
+cached because what they define can't be pickled.
+
+The cache assumes that the definitions the file starts with are the
+same from one run to the next. If, say, the settings file changes what
+the script depends on, remove the cache, which is kept in
+INCREMENTAL_CACHE_DIR.
+"""
+
+import bisect
+import hashlib
+import os
+import os.path as osp
+import pickle
+import sys
+import tempfile
+from typing import Callable, Dict, FrozenSet, List, NamedTuple, Optional
+
+from mathics import version_info
+from mathics.core.evaluation import Evaluation, Output
+from mathics.core.expression import Expression
+from mathics.core.symbols import Symbol
+
+from mathicsscript.checkpoint import (
+    RECORD_LENGTH,
+    apply_record,
+    collect_record,
+    encode_record,
+    take_snapshot,
+)
+from mathicsscript.parsecache import file_feeder
+from mathicsscript.termshell import CONFIGDIR
+
+CACHE_FORMAT_VERSION = 1
+
+INCREMENTAL_CACHE_DIR = osp.join(CONFIGDIR, "incremental-cache")
+
+# A statement that uses one of these depends on more than the symbols in
+# it, so it is evaluated every time.
+VOLATILE_SYMBOLS = frozenset(
+    f"System`{name}"
+    for name in (
+        "Directory",
+        "Environment",
+        "FileDate",
+        "Get",
+        "Import",
+        "Names",
+        "Needs",
+        "Read",
+        "ReadList",
+        "ReadString",
+        "Run",
+        "RunProcess",
+        "SetDirectory",
+        "Symbol",
+        "ToExpression",
+    )
+)
+
+
+class Statement(NamedTuple):
+    # SHA-1 of the statement's FullForm.
+    key: str
+    reads: FrozenSet[str]
+    defines: FrozenSet[str]
+    # What evaluating the statement changed, pickled; None if it can't be
+    # cached.
+    record: Optional[bytes]
+    # Messages and Print[] output.
+    out: list
+
+
+def statement_key(query) -> str:
+    return hashlib.sha1(str(query).encode("utf-8")).hexdigest()
+
+
+def symbols_in(expr) -> FrozenSet[str]:
+    """
+    Return the names of the symbols that appear in ``expr``.
+    """
+    names = set()
+    stack = [expr]
+    while stack:
+        expr = stack.pop()
+        if isinstance(expr, Symbol):
+            names.add(expr.get_name())
+        elif isinstance(expr, Expression):
+            stack.append(expr.head)
+            stack.extend(expr.elements)
+    return frozenset(names)
+
+
+def cache_path(path: str, cache_dir: str = INCREMENTAL_CACHE_DIR) -> str:
+    name = hashlib.sha1(osp.abspath(path).encode("utf-8")).hexdigest()
+    return osp.join(cache_dir, name + ".pickle")
+
+
+def cache_version() -> tuple:
+    from mathicsscript.version import __version__
+
+    return (CACHE_FORMAT_VERSION, version_info["mathics"], __version__)
+
+
+def read_cache(cache_file: str) -> List[Statement]:
+    """
+    Return the statements cached in ``cache_file``, or none if it is
+    missing or from another version.
+    """
+    try:
+        with open(cache_file, "rb") as f:
+            cache = pickle.load(f)
+    except Exception:
+        return []
+    if not isinstance(cache, dict) or cache.get("version") != cache_version():
+        return []
+    return cache["statements"]
+
+
+def write_cache(statements: List[Statement], cache_file: str) -> None:
+    directory = osp.dirname(cache_file)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(
+                {"version": cache_version(), "statements": statements},
+                f,
+                pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, cache_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class IncrementalStats(NamedTuple):
+    evaluated: int
+    reused: int
+
+
+def evaluate_file_incremental(
+    definitions,
+    path: str,
+    output: Output,
+    show_output: Callable,
+    timeout=None,
+    cache_dir: str = INCREMENTAL_CACHE_DIR,
+) -> IncrementalStats:
+    """
+    Evaluate the statements of file ``path``, using the cache described
+    above for those that haven't changed. ``output`` shows the messages
+    and Print[] output of statements that are evaluated, and
+    ``show_output`` is called with each of those that a cached statement
+    gave.
+    """
+    cache_file = cache_path(path, cache_dir)
+    old_statements = read_cache(cache_file)
+    old_indexes: Dict[str, List[int]] = {}
+    for i, statement in enumerate(old_statements):
+        old_indexes.setdefault(statement.key, []).append(i)
+
+    statements: List[Statement] = []
+    dirty = set()
+    # The next cached statement that can be matched.
+    next_old = 0
+    snapshot = None
+    evaluated = reused = 0
+    try:
+        with open(path, "r") as f:
+            feeder = file_feeder(f)
+            while not feeder.empty():
+                evaluation = Evaluation(
+                    definitions, output=output, catch_interrupt=False, format="text"
+                )
+                query = evaluation.parse_feeder(feeder)
+                if query is None:
+                    continue
+                key = statement_key(query)
+
+                # Match the statement with the next cached one like it.
+                # Statements skipped over were changed or removed.
+                old = None
+                indexes = old_indexes.get(key, [])
+                position = bisect.bisect_left(indexes, next_old)
+                if position < len(indexes):
+                    match = indexes[position]
+                    for skipped in old_statements[next_old:match]:
+                        dirty |= skipped.defines
+                    old = old_statements[match]
+                    next_old = match + 1
+
+                if (
+                    old is not None
+                    and old.record is not None
+                    and not (old.reads & dirty)
+                ):
+                    apply_record(definitions, pickle.loads(old.record))
+                    for out in old.out:
+                        show_output(out)
+                    statements.append(old)
+                    snapshot = None
+                    reused += 1
+                    continue
+
+                if snapshot is None:
+                    snapshot = take_snapshot(definitions)
+                result = evaluation.evaluate(query, timeout=timeout)
+                record, snapshot = collect_record(definitions, snapshot)
+                defines = frozenset(
+                    set(record["changed"]) | set(record["rules"]) | record["removed"]
+                )
+                dirty |= defines
+                reads = symbols_in(query)
+                data, skipped = encode_record(record)
+                out = list(result.out)
+                cacheable = not (skipped or reads & VOLATILE_SYMBOLS)
+                if cacheable:
+                    try:
+                        pickle.dumps(out, pickle.HIGHEST_PROTOCOL)
+                    except Exception:
+                        cacheable = False
+                statements.append(
+                    Statement(
+                        key,
+                        reads,
+                        defines,
+                        data[RECORD_LENGTH.size :] if cacheable else None,
+                        out if cacheable else [],
+                    )
+                )
+                evaluated += 1
+    finally:
+        try:
+            write_cache(statements, cache_file)
+        except OSError as e:
+            print(f"Cannot cache {path}: {e}", file=sys.stderr)
+    return IncrementalStats(evaluated, reused)
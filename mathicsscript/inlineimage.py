@@ -0,0 +1,421 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Showing Graphics[] and Image[] results in the terminal itself.
+
+Terminals that support the Kitty graphics protocol, iTerm2's inline
+images or Sixel can show a picture in their text, which works over ssh
+and doesn't leave a window open. Which of these, if any, the terminal
+supports is worked out once, from the environment, by
+``terminal_protocol()``. ``Settings`$InlineGraphics`` can name a
+protocol instead, or turn this off.
+
+A result is drawn once, as a PNG a whole number of terminal cells wide.
+Turning that into the terminal's escape sequences is done on a
+background thread, which hands over the sequences a piece at a time, so
+that they are written while the rest is being encoded. The sequences
+written are kept, up to MAX_CACHED_BYTES of them, so that showing the
+same result again just writes them out.
+"""
+
+import base64
+import io
+import math
+import os
+import queue
+import shutil
+import sys
+from collections import OrderedDict
+from functools import cache
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from mathics.core.symbols import SymbolFalse
+from mathics.core.systemsymbols import SymbolAutomatic, SymbolGraphics3D, SymbolImage
+
+PROTOCOLS = ("Kitty", "iTerm", "Sixel")
+
+INLINE_SETTING = "Settings`$InlineGraphics"
+
+# The size of a cell when the terminal doesn't say.
+DEFAULT_CELL_SIZE = (10, 20)
+
+# How many points of ImageSize a terminal cell is shown as.
+POINTS_PER_CELL = 8
+
+# The most base64 data the Kitty protocol allows in one escape sequence.
+KITTY_CHUNK_SIZE = 4096
+
+# The size of the pieces of iTerm2 image data written at a time.
+ITERM_CHUNK_SIZE = 65536
+
+SIXEL_COLORS = 256
+
+# The most bytes of escape sequences kept for showing results again.
+MAX_CACHED_BYTES = 64 * 1024 * 1024
+
+
+def detect_protocol(environ, isatty: bool = True) -> Optional[str]:
+    """
+    Return the inline image protocol, one of PROTOCOLS, that the terminal
+    described by environment ``environ`` supports, or None.
+    """
+    if not isatty:
+        return None
+    term = environ.get("TERM", "")
+    term_program = environ.get("TERM_PROGRAM", "")
+    if term.startswith("screen") or term.startswith("tmux"):
+        # tmux and screen pass on neither protocol by default.
+        return None
+    if (
+        term == "xterm-kitty"
+        or "KITTY_WINDOW_ID" in environ
+        or term_program == "ghostty"
+    ):
+        return "Kitty"
+    # WezTerm's Kitty graphics support is off unless enable_kitty_graphics
+    # is set, but it always shows iTerm2 images.
+    if (
+        term_program in ("iTerm.app", "WezTerm")
+        or environ.get("LC_TERMINAL") == "iTerm2"
+    ):
+        return "iTerm"
+    if (
+        "sixel" in term
+        or term.startswith(("mlterm", "foot", "contour", "yaft"))
+        or term_program in ("mlterm", "contour")
+    ):
+        return "Sixel"
+    return None
+
+
+@cache
+def terminal_protocol() -> Optional[str]:
+    """
+    Return the inline image protocol that the terminal on standard output
+    supports, or None. This is worked out just once.
+    """
+    return detect_protocol(os.environ, sys.stdout.isatty())
+
+
+def get_inline_protocol(definitions) -> Optional[str]:
+    """
+    Return the protocol to show graphics with following
+    ``Settings`$InlineGraphics``, or None if they aren't shown inline.
+    """
+    try:
+        value = definitions.get_ownvalue(INLINE_SETTING)
+    except ValueError:
+        value = SymbolAutomatic
+    if value is SymbolAutomatic:
+        return terminal_protocol()
+    if value is SymbolFalse:
+        return None
+    name = value.get_string_value()
+    return name if name in PROTOCOLS else None
+
+
+def terminal_size() -> Tuple[int, Tuple[int, int]]:
+    """
+    Return the number of columns of the terminal, and the width and
+    height of a cell in pixels.
+    """
+    columns = shutil.get_terminal_size().columns
+    try:
+        import fcntl
+        import struct
+        import termios
+
+        packed = fcntl.ioctl(sys.stdout.fileno(), termios.TIOCGWINSZ, bytes(8))
+        rows, cells, width, height = struct.unpack("HHHH", packed)
+    except (ImportError, OSError, ValueError):
+        rows = cells = width = height = 0
+    if 0 in (rows, cells, width, height):
+        return columns, DEFAULT_CELL_SIZE
+    return columns, (width // cells, height // rows)
+
+
+def encode_kitty(png: bytes, columns: int) -> Iterator[bytes]:
+    data = base64.standard_b64encode(png)
+    for start in range(0, len(data), KITTY_CHUNK_SIZE):
+        more = int(start + KITTY_CHUNK_SIZE < len(data))
+        # q=2 keeps the terminal from answering on standard input.
+        keys = f"m={more}"
+        if start == 0:
+            keys = f"a=T,f=100,q=2,c={columns}," + keys
+        yield b"\x1b_G%s;%s\x1b\\" % (
+            keys.encode("ascii"),
+            data[start : start + KITTY_CHUNK_SIZE],
+        )
+
+
+def encode_iterm(png: bytes, columns: int) -> Iterator[bytes]:
+    yield b"\x1b]1337;File=inline=1;size=%d;width=%d:" % (len(png), columns)
+    data = base64.standard_b64encode(png)
+    for start in range(0, len(data), ITERM_CHUNK_SIZE):
+        yield data[start : start + ITERM_CHUNK_SIZE]
+    yield b"\x07"
+
+
+def sixel_runs(sixels) -> bytes:
+    """
+    Return the sixel characters for the values 0 to 63 of ``sixels``,
+    with runs of more than three the same given by a count. Empty sixels
+    at the end are left out.
+    """
+    import numpy as np
+
+    sixels = np.trim_zeros(sixels, "b")
+    starts = np.flatnonzero(np.diff(sixels, prepend=-1))
+    lengths = np.diff(starts, append=len(sixels))
+    parts = []
+    for value, length in zip((sixels[starts] + 63).tolist(), lengths.tolist()):
+        char = chr(value)
+        parts.append(f"!{length}{char}" if length > 3 else char * length)
+    return "".join(parts).encode("ascii")
+
+
+def encode_sixel(png: bytes, columns: int) -> Iterator[bytes]:
+    """
+    Encode ``png`` as Sixel, in SIXEL_COLORS colors. A piece is given for
+    each band of six rows.
+    """
+    import numpy as np
+    from PIL import Image
+
+    picture = Image.open(io.BytesIO(png))
+    if picture.mode in ("RGBA", "LA", "P"):
+        picture = picture.convert("RGBA")
+        background = Image.new("RGBA", picture.size, "white")
+        picture = Image.alpha_composite(background, picture)
+    picture = picture.convert("RGB").quantize(SIXEL_COLORS)
+    width, height = picture.size
+    palette = np.array(picture.getpalette()[: 3 * SIXEL_COLORS]).reshape(-1, 3)
+    indices = np.asarray(picture)
+
+    header = [b'\x1bPq"1;1;%d;%d' % (width, height)]
+    for index, rgb in enumerate((palette * 100 // 255).tolist()):
+        header.append(b"#%d;2;%d;%d;%d" % (index, *rgb))
+    yield b"".join(header)
+
+    weights = (1 << np.arange(6)).reshape(6, 1)
+    for top in range(0, height, 6):
+        band = indices[top : top + 6]
+        parts = []
+        for color in np.unique(band).tolist():
+            sixels = ((band == color) * weights[: len(band)]).sum(axis=0)
+            parts.append(b"#%d%s" % (color, sixel_runs(sixels)))
+        yield b"$".join(parts) + b"-"
+    yield b"\x1b\\"
+
+
+ENCODERS = {
+    "Kitty": encode_kitty,
+    "iTerm": encode_iterm,
+    "Sixel": encode_sixel,
+}
+
+# The thread that encodes images, started when first needed.
+encoder_pool = None
+
+
+def encode_in_background(
+    encode: Callable[[bytes, int], Iterator[bytes]], png: bytes, columns: int
+) -> Iterator[bytes]:
+    """
+    Give the pieces of ``encode(png, columns)`` as a background thread
+    makes them.
+    """
+    global encoder_pool
+    if encoder_pool is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        encoder_pool = ThreadPoolExecutor(1, thread_name_prefix="inline-image")
+    pieces: queue.Queue = queue.Queue()
+    done = object()
+
+    def run():
+        try:
+            for piece in encode(png, columns):
+                pieces.put(piece)
+        finally:
+            pieces.put(done)
+
+    future = encoder_pool.submit(run)
+    while (piece := pieces.get()) is not done:
+        yield piece
+    # Raises what the encoder raised, if anything.
+    future.result()
+
+
+class InlineImageCache:
+    """
+    The escape sequences of results shown, most recently shown last, up to
+    ``limit`` bytes of them.
+    """
+
+    def __init__(self, limit: int = MAX_CACHED_BYTES):
+        self.limit = limit
+        self.size = 0
+        self.entries: OrderedDict = OrderedDict()
+
+    def get(self, key: tuple, expr) -> Optional[List[bytes]]:
+        entry = self.entries.get(key)
+        # Different expressions can have the same hash.
+        if entry is None or not entry[0].sameQ(expr):
+            return None
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: tuple, expr, pieces: List[bytes]) -> None:
+        size = sum(len(piece) for piece in pieces)
+        if size > self.limit:
+            return
+        if key in self.entries:
+            self.size -= self.entries.pop(key)[2]
+        self.entries[key] = (expr, pieces, size)
+        self.size += size
+        while self.size > self.limit:
+            self.size -= self.entries.popitem(last=False)[1][2]
+
+
+image_cache = InlineImageCache()
+
+
+def figure_png(figure, width: int) -> bytes:
+    """
+    Return matplotlib figure ``figure`` as a PNG ``width`` pixels wide.
+    """
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png", dpi=width / figure.get_figwidth())
+    return buffer.getvalue()
+
+
+def graphics_png(expr, evaluation, width: int) -> Optional[bytes]:
+    """
+    Return Graphics[], Graphics3D[] or Image[] expression ``expr`` as a
+    PNG at most ``width`` pixels wide, or None if it can't be drawn.
+    """
+    if expr.get_head() is SymbolImage:
+        from PIL import Image
+
+        picture = expr.pil()
+        if picture.mode not in ("1", "L", "LA", "P", "RGB", "RGBA"):
+            picture = picture.convert("RGB")
+        if picture.width > width:
+            height = max(1, picture.height * width // picture.width)
+            picture = picture.resize((width, height), Image.LANCZOS)
+        buffer = io.BytesIO()
+        picture.save(buffer, format="PNG")
+        return buffer.getvalue()
+
+    from mathicsscript.format import get_pyplot, get_svg2png
+    from mathicsscript.mplgraphics import UnsupportedGraphics
+
+    plt = get_pyplot()
+    if plt is not None:
+        if expr.get_head() is SymbolGraphics3D:
+            from mathicsscript.mplgraphics3d import render_graphics3d as render
+        else:
+            from mathicsscript.mplgraphics import render_graphics as render
+        try:
+            figure = render(expr, evaluation, plt)
+        except UnsupportedGraphics:
+            pass
+        else:
+            try:
+                return figure_png(figure, width)
+            finally:
+                plt.close(figure)
+
+    svg2png = get_svg2png()
+    if expr.get_head() is SymbolGraphics3D or svg2png is None:
+        return None
+    from mathics.core.atoms import String
+    from mathics.core.expression import Expression
+    from mathics.core.systemsymbols import SymbolExportString
+
+    svg_expr = Expression(SymbolExportString, expr, String("SVG"))
+    svg = svg_expr.evaluate(evaluation).to_python(string_quotes=False)
+    return svg2png(bytestring=svg, output_width=width)
+
+
+def image_columns(expr, evaluation, cell_width: int, columns: int) -> int:
+    """
+    Return the number of terminal columns to show ``expr`` in.
+    """
+    if expr.get_head() is SymbolImage:
+        width = expr.pil().width / cell_width
+    elif expr.get_head() is SymbolGraphics3D:
+        from mathicsscript.mplgraphics3d import graphics3d_options
+
+        width = graphics3d_options(expr, evaluation).image_width / POINTS_PER_CELL
+    else:
+        from mathicsscript.mplgraphics import graphics_options
+
+        width = graphics_options(expr, evaluation).image_width / POINTS_PER_CELL
+    return max(1, min(math.ceil(width), columns - 1))
+
+
+def write_inline(
+    expr,
+    make_png: Callable[[], Optional[bytes]],
+    protocol: str,
+    columns: int,
+    cell_width: int,
+    out=None,
+) -> bool:
+    """
+    Show the PNG that ``make_png()`` gives for ``expr`` in the terminal,
+    ``columns`` cells wide, using ``protocol``. ``make_png()`` is called
+    only if ``expr`` wasn't shown that way before. Return False if it
+    gives None.
+    """
+    if out is None:
+        sys.stdout.flush()
+        out = sys.stdout.buffer
+    key = (hash(expr), protocol, columns, cell_width)
+    pieces = image_cache.get(key, expr)
+    if pieces is None:
+        png = make_png()
+        if png is None:
+            return False
+        pieces = []
+        for piece in encode_in_background(ENCODERS[protocol], png, columns):
+            out.write(piece)
+            out.flush()
+            pieces.append(piece)
+        image_cache.put(key, expr, pieces)
+    else:
+        out.write(b"".join(pieces))
+    out.write(b"\n")
+    out.flush()
+    return True
+
+
+def show_inline(expr, evaluation, protocol: str, out=None) -> bool:
+    """
+    Show Graphics[], Graphics3D[] or Image[] expression ``expr`` in the
+    terminal using ``protocol``. Return False if it can't be drawn.
+    """
+    columns, (cell_width, _) = terminal_size()
+    image_width = image_columns(expr, evaluation, cell_width, columns)
+    return write_inline(
+        expr,
+        lambda: graphics_png(expr, evaluation, image_width * cell_width),
+        protocol,
+        image_width,
+        cell_width,
+        out,
+    )
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+r"""
+GNU Readline inputrc key bindings, compiled into a trie for prompt_toolkit.
+
+An inputrc line that mathicsscript uses looks like:
+
+    "\eal\e": "α"
+
+It binds the keys ESC a l ESC to inserting "α". All of the bindings of a
+file are compiled into a trie: nested dictionaries keyed by a character,
+where the key TERMINAL ("") holds the text to insert when the keys so far
+are a complete binding. For example, the line above gives:
+
+    {"\x1b": {"a": {"l": {"\x1b": {"": "α"}}}}}
+
+A compiled trie is saved as JSON along with the SHA-1 of the file it came
+from. For the inputrc files that come with mathicsscript, that is done
+when it is built, by ``admin-tools/make-JSON-tables.sh``:
+
+    python -m mathicsscript.inputrc inputrc-unicode -o inputrc-unicode.json
+
+Other files, like the user's inputrc, are compiled the first time they are
+read, and the result is cached in the Mathics3 configuration directory.
+Either way, a file isn't parsed again until it changes.
+"""
+
+import hashlib
+import json
+import os
+import os.path as osp
+import re
+import sys
+import tempfile
+from typing import Iterable, Iterator, Optional, Tuple
+
+from mathicsscript.termshell import CONFIGDIR
+
+TERMINAL = ""
+
+COMPILED_FORMAT_VERSION = 1
+
+INPUTRC_CACHE_DIR = osp.join(CONFIGDIR, "inputrc-cache")
+
+# Backslash escapes GNU Readline accepts in a quoted key sequence or macro.
+ESCAPES = {"e": "\x1b", "\\": "\\", '"': '"', "'": "'", "t": "\t", "n": "\n"}
+ESCAPE_RE = re.compile(r"\\(.)", re.DOTALL)
+
+
+def unescape(s: str) -> str:
+    return ESCAPE_RE.sub(lambda m: ESCAPES.get(m.group(1), m.group(0)), s)
+
+
+def parse_inputrc(text: str, path: str = "") -> Iterator[Tuple[str, str]]:
+    """
+    Yield the (keys, replacement) pairs of the bindings in inputrc ``text``.
+    Lines that aren't a binding of a quoted key sequence to quoted text
+    are reported and skipped.
+    """
+
+    def check_quoted(s: str):
+        return s[0:1] == '"' and s[-1:] == '"'
+
+    for line_no, line in enumerate(text.splitlines()):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        fields = re.split(r"\s*: ", line)
+        where = f"{path}{line_no+1}"
+        if len(fields) != 2:
+            print(f"{where}: expecting 2 fields, got {len(fields)} in:\n{line}")
+            continue
+        alias, replacement = fields
+        if not check_quoted(alias):
+            print(f"{where}: expecting alias to be quoted, got {alias} in:\n{line}")
+            continue
+        if not check_quoted(replacement):
+            print(
+                f"{where}: expecting replacement to be quoted, "
+                f"got {replacement} in:\n{line}"
+            )
+            continue
+        yield unescape(alias[1:-1]), unescape(replacement[1:-1])
+
+
+def build_trie(
+    bindings: Iterable[Tuple[str, str]], trie: Optional[dict] = None
+) -> dict:
+    """
+    Add ``bindings`` to ``trie``, or to a new trie, and return it. A later
+    binding of the same keys replaces an earlier one.
+    """
+    if trie is None:
+        trie = {}
+    for keys, replacement in bindings:
+        if not keys:
+            continue
+        node = trie
+        for key in keys:
+            node = node.setdefault(key, {})
+        node[TERMINAL] = replacement
+    return trie
+
+
+def merge_trie(trie: dict, other: dict) -> dict:
+    """
+    Add the bindings of ``other`` to ``trie``; those of ``other`` win.
+    """
+    for key, value in other.items():
+        if key == TERMINAL:
+            trie[TERMINAL] = value
+        else:
+            merge_trie(trie.setdefault(key, {}), value)
+    return trie
+
+
+def compile_inputrc(source: bytes, path: str = "") -> dict:
+    """
+    Return the compiled form, to be saved as JSON, of inputrc ``source``.
+    """
+    return {
+        "version": COMPILED_FORMAT_VERSION,
+        "sha1": hashlib.sha1(source).hexdigest(),
+        "trie": build_trie(parse_inputrc(source.decode("utf-8"), path)),
+    }
+
+
+def cache_path(path: str, cache_dir: str = INPUTRC_CACHE_DIR) -> str:
+    name = hashlib.sha1(osp.abspath(path).encode("utf-8")).hexdigest()
+    return osp.join(cache_dir, name + ".json")
+
+
+def read_compiled(compiled_path: str, sha1: str) -> Optional[dict]:
+    """
+    Return the trie saved in ``compiled_path`` if it was compiled from the
+    file whose SHA-1 is ``sha1``.
+    """
+    try:
+        with open(compiled_path, "r", encoding="utf-8") as f:
+            compiled = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (
+        isinstance(compiled, dict)
+        and compiled.get("version") == COMPILED_FORMAT_VERSION
+        and compiled.get("sha1") == sha1
+    ):
+        return compiled["trie"]
+    return None
+
+
+def write_compiled(compiled: dict, compiled_path: str) -> None:
+    """
+    Save ``compiled`` as JSON in ``compiled_path``, replacing any file
+    there all at once.
+    """
+    directory = osp.dirname(compiled_path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(compiled, f, ensure_ascii=False, separators=(",", ":"))
+            f.write("\n")
+        os.replace(tmp_path, compiled_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_inputrc_trie(path: str, cache_dir: Optional[str] = INPUTRC_CACHE_DIR) -> dict:
+    """
+    Return the trie for inputrc file ``path``, from ``path + ".json"`` or
+    the cache if either was compiled from the file as it is now. Otherwise
+    compile it and, if ``cache_dir`` is given, cache the result.
+    """
+    with open(path, "rb") as f:
+        source = f.read()
+    sha1 = hashlib.sha1(source).hexdigest()
+    compiled_paths = [path + ".json"]
+    if cache_dir is not None:
+        compiled_paths.append(cache_path(path, cache_dir))
+    for compiled_path in compiled_paths:
+        trie = read_compiled(compiled_path, sha1)
+        if trie is not None:
+            return trie
+
+    compiled = compile_inputrc(source, f"{path}:")
+    if cache_dir is not None:
+        try:
+            write_compiled(compiled, compiled_paths[-1])
+        except OSError:
+            pass
+    return compiled["trie"]
+
+
+def main(args=None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m mathicsscript.inputrc",
+        description="Compile an inputrc file into the JSON trie mathicsscript reads.",
+    )
+    parser.add_argument("inputrc", help="inputrc file to compile")
+    parser.add_argument(
+        "-o", "--output", help="JSON file to write; default: INPUTRC.json"
+    )
+    options = parser.parse_args(args)
+    with open(options.inputrc, "rb") as f:
+        compiled = compile_inputrc(f.read(), f"{options.inputrc}:")
+    write_compiled(compiled, options.output or options.inputrc + ".json")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Isolated evaluation: ``mathicsscript --isolate``.
+
+Each input is evaluated in a child process forked from mathicsscript, so
+that the child starts with the current definitions. The child runs with
+hard operating-system limits on its CPU time and on how much its address
+space may grow, and the parent kills it if it runs past its wall-clock
+time limit. Unlike the timeout that Mathics3 checks for as it evaluates,
+these limits also stop computations in SymPy or in C code, and an
+evaluation that runs out of memory can't take the session down with it.
+
+The child shows its own output and result. When it is done, it sends the
+definitions that the evaluation changed back to the parent through a
+pipe, and the parent merges them into its own. If instead the child is
+stopped by a limit or dies, the parent records ``$Aborted`` as the
+result, and its definitions are left as they were before the input.
+
+The limits are read, for each input, from these settings, each of which
+is a number or ``Infinity``:
+
+    Settings`$IsolationTimeLimit     wall-clock seconds
+    Settings`$IsolationCPULimit      CPU seconds
+    Settings`$IsolationMemoryLimit   megabytes that the address space may grow
+
+The memory limit needs /proc to find the size of the address space, and
+is not applied where that isn't available.
+"""
+
+import math
+import os
+import pickle
+import resource
+import select
+import signal
+import sys
+import time
+from typing import Callable, NamedTuple, Optional
+
+from mathics.core.atoms import Integer
+from mathics.core.evaluation import Evaluation, Result
+from mathics.core.expression import Expression
+from mathics.core.rules import Rule
+from mathics.core.systemsymbols import SymbolAborted, SymbolIn, SymbolOut
+
+from mathicsscript.definitionchanges import (
+    collect_changes,
+    merge_changes,
+    snapshot_definitions,
+)
+from mathicsscript.format import finish_output
+from mathicsscript.memorylimit import set_memory_limit
+
+READ_SIZE = 1 << 16
+
+
+class IsolationLimits(NamedTuple):
+    # None means no limit.
+    wall_time: Optional[float] = None
+    cpu_time: Optional[float] = None
+    # Megabytes.
+    memory: Optional[float] = None
+
+
+LIMIT_SETTINGS = {
+    "wall_time": "Settings`$IsolationTimeLimit",
+    "cpu_time": "Settings`$IsolationCPULimit",
+    "memory": "Settings`$IsolationMemoryLimit",
+}
+
+
+def get_isolation_limits(definitions) -> IsolationLimits:
+    """
+    Return the limits given by the ``Settings`$Isolation...`` variables.
+    A value that isn't a positive, finite number means no limit.
+    """
+    limits = {}
+    for field, name in LIMIT_SETTINGS.items():
+        try:
+            value = definitions.get_ownvalue(name).to_python()
+        except ValueError:
+            continue
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            if 0 < value < math.inf:
+                limits[field] = float(value)
+    return IsolationLimits(**limits)
+
+
+def apply_limits(limits: IsolationLimits) -> None:
+    """
+    Set the CPU and memory limits of the current process.
+    """
+    if limits.cpu_time is not None:
+        cpu_seconds = max(1, int(limits.cpu_time + 0.5))
+        # SIGXCPU, whose default action is to end the process, is sent
+        # at the soft limit; the hard limit is a backstop.
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    if limits.memory is not None:
+        set_memory_limit(int(limits.memory * 1024 * 1024))
+
+
+def record_aborted(evaluation: Evaluation, query) -> Result:
+    """
+    Record In[n] and Out[n] = $Aborted in the parent for an input whose
+    child didn't finish, and return the Result to show.
+    """
+    definitions = evaluation.definitions
+    line_no = definitions.get_line_no() + 1
+    definitions.set_line_no(line_no)
+    n = Integer(line_no)
+    definitions.add_rule("In", Rule(Expression(SymbolIn, n), query))
+    definitions.add_rule("Out", Rule(Expression(SymbolOut, n), SymbolAborted))
+    return Result(
+        [],
+        evaluation.format_output(SymbolAborted, "unformatted"),
+        line_no,
+        SymbolAborted,
+    )
+
+
+def run_child(
+    evaluation: Evaluation,
+    query,
+    limits: IsolationLimits,
+    show_result: Callable[[Result], None],
+    timeout,
+    write_fd: int,
+) -> None:
+    """
+    Evaluate ``query`` in the forked child, send the changes back through
+    ``write_fd``, and exit.
+    """
+    definitions = evaluation.definitions
+    snapshot = snapshot_definitions(definitions)
+    exit_code = 0
+    reply = {}
+    try:
+        apply_limits(limits)
+        try:
+            result = evaluation.evaluate(query, timeout=timeout, format="unformatted")
+            if result is not None:
+                show_result(result)
+        except SystemExit as e:
+            reply["exit"] = e.code
+        finish_output()
+        sys.stdout.flush()
+        try:
+            reply.update(collect_changes(definitions, snapshot))
+            data = pickle.dumps(reply, pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            # Something, a Python object say, can't be pickled.
+            for key in ("changed", "removed", "now", "state"):
+                reply.pop(key, None)
+            reply["error"] = f"{e.__class__.__name__}: {e}"
+            reply["line_no"] = definitions.get_line_no()
+            data = pickle.dumps(reply, pickle.HIGHEST_PROTOCOL)
+        with os.fdopen(write_fd, "wb") as f:
+            f.write(data)
+    except BaseException:
+        exit_code = 1
+    finally:
+        # Don't run anything that mathicsscript would do on exit.
+        os._exit(exit_code)
+
+
+def wait_for_child(pid: int, read_fd: int, wall_time: Optional[float]) -> tuple:
+    """
+    Read the child's reply until it closes its end of the pipe, killing
+    it if ``wall_time`` runs out. Return the reply bytes, the child's wait
+    status, and whether it was killed for running out of time.
+    """
+    deadline = None if wall_time is None else time.monotonic() + wall_time
+    chunks = []
+    timed_out = False
+    while True:
+        remaining = None if deadline is None else deadline - time.monotonic()
+        if remaining is not None and remaining <= 0:
+            timed_out = True
+            os.kill(pid, signal.SIGKILL)
+            break
+        try:
+            readable, _, _ = select.select([read_fd], [], [], remaining)
+        except InterruptedError:
+            continue
+        if not readable:
+            continue
+        chunk = os.read(read_fd, READ_SIZE)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    _, status = os.waitpid(pid, 0)
+    return b"".join(chunks), status, timed_out
+
+
+def abort_reason(status: int, timed_out: bool, limits: IsolationLimits) -> str:
+    if timed_out:
+        return f"Evaluation ran longer than {limits.wall_time:g} seconds."
+    if os.WIFSIGNALED(status):
+        signum = os.WTERMSIG(status)
+        if signum == signal.SIGXCPU:
+            return f"Evaluation used more than {limits.cpu_time:g} seconds of CPU time."
+        return f"Evaluation was ended by signal {signal.Signals(signum).name}."
+    if limits.memory is not None:
+        return (
+            "Evaluation failed; it may have needed more than "
+            f"{limits.memory:g} MB of memory."
+        )
+    return "Evaluation failed."
+
+
+def evaluate_isolated(
+    evaluation: Evaluation,
+    query,
+    limits: IsolationLimits,
+    show_result: Callable[[Result], None],
+    timeout=None,
+) -> Optional[str]:
+    """
+    Evaluate ``query`` in a forked child limited by ``limits``, with the
+    child calling ``show_result`` on its result, and merge the changes it
+    makes into ``evaluation.definitions``.
+
+    If the child doesn't finish, ``show_result`` is called in the parent
+    with $Aborted, and the reason is returned. Otherwise None is returned,
+    unless the changes couldn't be passed back, which is also reported.
+    SystemExit is raised if the input called Quit[].
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        run_child(evaluation, query, limits, show_result, timeout, write_fd)
+    os.close(write_fd)
+
+    # A Control-C at the terminal reaches the child, whose handler deals
+    # with it; the parent just waits.
+    previous_handler = signal.signal(signal.SIGINT, signal.SIG_IGN)
+    try:
+        data, status, timed_out = wait_for_child(pid, read_fd, limits.wall_time)
+    finally:
+        os.close(read_fd)
+        signal.signal(signal.SIGINT, previous_handler)
+
+    reply = None
+    if not timed_out and os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0:
+        try:
+            reply = pickle.loads(data)
+        except Exception:
+            reply = None
+    if reply is None:
+        show_result(record_aborted(evaluation, query))
+        return abort_reason(status, timed_out, limits)
+
+    message = None
+    if "error" in reply:
+        evaluation.definitions.set_line_no(reply["line_no"])
+        message = (
+            "Definitions changed by this input could not be kept: " + reply["error"]
+        )
+    else:
+        merge_changes(evaluation.definitions, reply)
+    if "exit" in reply:
+        raise SystemExit(reply["exit"])
+    return message
@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Machine-readable output: ``mathicsscript --output-format jsonl``.
+
+Each evaluation is written to stdout as a single JSON object on its own
+line, flushed as soon as the evaluation finishes, so that a program
+reading mathicsscript's output can process results as they stream in.
+
+An object has these fields:
+
+    line        the In[]/Out[] line number, or null if the input did not parse
+    input       the input source text
+    result      the result in InputForm, or null if there is no result
+    fullform    the result in FullForm, or null
+    head        the fully-qualified name of the result's head, e.g. "System`List"
+    messages    a list of {"symbol", "tag", "text"} objects for messages issued
+    prints      a list of strings written by Print[] and friends
+    timing      wall-clock seconds spent evaluating
+    exc_result  "Null" for a normal evaluation; otherwise the reason it
+                stopped, e.g. "$Aborted" or "Overflow[]"
+    exit        present only when evaluation called Quit[] or Exit[]:
+                the process exit code
+
+No Pygments highlighting, prompts or line wrapping is done in this mode.
+"""
+
+import json
+import sys
+import time
+from typing import Optional
+
+from mathics.core.evaluation import Evaluation, Output
+from mathics.core.interrupt import AbortInterrupt
+from mathics.core.symbols import SymbolNull
+from mathics.core.systemsymbols import SymbolFullForm, SymbolInputForm
+from mathics.format.box import format_element
+
+
+class JSONLinesOutput(Output):
+    """
+    Output that doesn't write anything as it happens: messages and Print[]
+    output are instead reported in the JSON object for the evaluation.
+    """
+
+    def max_stored_size(self, settings):
+        return None
+
+    def out(self, out):
+        pass
+
+
+class JSONLinesEvaluation(Evaluation):
+    """
+    An Evaluation whose result is formatted as the "result", "fullform" and
+    "head" fields of a JSON object. Other formatting, like that done by
+    Print[], is unchanged.
+
+    Setting ``interrupted`` from another thread aborts the evaluation the
+    next time it checks whether it has been stopped, so that its result
+    is $Aborted. Once evaluate() has returned, this does nothing.
+    """
+
+    interrupted = False
+    evaluating = False
+
+    def evaluate(self, query, timeout=None, format=None):
+        self.evaluating = True
+        try:
+            return super().evaluate(query, timeout=timeout, format=format)
+        finally:
+            self.evaluating = False
+
+    def check_stopped(self) -> None:
+        if self.interrupted and self.evaluating:
+            # Abort once: formatting $Aborted checks this too.
+            self.interrupted = False
+            raise AbortInterrupt
+        super().check_stopped()
+
+    def format_output(self, expr, format=None):
+        if format == "jsonl":
+            return {
+                "result": form_text(expr, self, SymbolInputForm),
+                "fullform": form_text(expr, self, SymbolFullForm),
+                "head": expr.get_head_name(),
+            }
+        return super().format_output(expr, format)
+
+
+def form_text(expr, evaluation: Evaluation, form) -> Optional[str]:
+    """
+    Return the text of ``expr`` in ``form``, or None if it can't be formatted.
+    """
+    try:
+        return format_element(expr, evaluation, form).to_text(evaluation=evaluation)
+    except Exception:
+        return None
+
+
+NULL_RESULT = {"result": "Null", "fullform": "Null", "head": "System`Symbol"}
+NO_RESULT = {"result": None, "fullform": None, "head": None}
+
+
+def make_record(
+    evaluation: Evaluation, source_code: str, result, timing: float, out: list
+) -> dict:
+    """
+    Return the JSON-serializable dictionary described in the module docstring.
+    ``result`` is the Result of evaluation or None if nothing was evaluated.
+    """
+    if result is None:
+        result_fields = NO_RESULT
+    elif isinstance(result.result, dict):
+        result_fields = result.result
+    elif result.last_eval is SymbolNull:
+        # evaluate() doesn't format a Null result.
+        result_fields = NULL_RESULT
+    else:
+        result_fields = NO_RESULT
+
+    exc_result = evaluation.exc_result
+    if exc_result is None or exc_result is SymbolNull:
+        exc_result_text = "Null"
+    else:
+        # When evaluation stops early, its result is the reason it stopped.
+        exc_result_text = result_fields["result"]
+
+    return {
+        "line": result.line_no if result is not None else None,
+        "input": source_code,
+        **result_fields,
+        "messages": [
+            {"symbol": str(o.symbol), "tag": o.tag, "text": o.text}
+            for o in out
+            if o.is_message
+        ],
+        "prints": [o.text for o in out if o.is_print],
+        "timing": timing,
+        "exc_result": exc_result_text,
+    }
+
+
+def write_record(record: dict, stream=None) -> None:
+    """
+    Write ``record`` as a line of JSON and flush it right away.
+    """
+    if stream is None:
+        stream = sys.stdout
+    stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+    stream.flush()
+
+
+def iter_feeder_records(definitions, feeder, timeout=None, on_evaluation=None):
+    """
+    Parse and evaluate each expression in ``feeder``, yielding for each
+    the JSON object described above along with the ``exc_result`` of its
+    evaluation, or None if the input didn't parse.
+
+    ``on_evaluation``, if given, is called with each Evaluation before it
+    starts, so that a caller can stop it from another thread.
+
+    If evaluation calls Quit[], the object is yielded with an "exit" field
+    and then SystemExit is raised.
+    """
+    while not feeder.empty():
+        evaluation = JSONLinesEvaluation(
+            definitions, output=JSONLinesOutput(), format="jsonl"
+        )
+        query, source_code = evaluation.parse_feeder_returning_code(feeder)
+        if query is None:
+            if evaluation.out:
+                # Report syntax errors. Blank lines and comments say nothing.
+                yield make_record(
+                    evaluation, source_code, None, 0.0, evaluation.out
+                ), None
+            continue
+
+        if on_evaluation is not None:
+            on_evaluation(evaluation)
+        start = time.perf_counter()
+        try:
+            result = evaluation.evaluate(query, timeout=timeout)
+        except SystemExit as e:
+            record = make_record(
+                evaluation,
+                source_code,
+                None,
+                time.perf_counter() - start,
+                evaluation.out,
+            )
+            record["line"] = definitions.get_line_no()
+            record["exit"] = e.code if isinstance(e.code, int) else 0
+            yield record, evaluation.exc_result
+            raise
+        timing = time.perf_counter() - start
+        yield make_record(
+            evaluation, source_code, result, timing, result.out
+        ), evaluation.exc_result
+
+
+def jsonl_evaluate_feeder(definitions, feeder, timeout=None):
+    """
+    Parse and evaluate each expression in ``feeder``, writing a JSON
+    object for each. Return the ``exc_result`` of the last evaluation.
+
+    If evaluation calls Quit[], the object is written with an "exit" field
+    before SystemExit is passed on.
+    """
+    last_exc_result = SymbolNull
+    for record, exc_result in iter_feeder_records(definitions, feeder, timeout):
+        write_record(record)
+        if exc_result is not None:
+            last_exc_result = exc_result
+    return last_exc_result
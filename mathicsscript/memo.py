@@ -0,0 +1,431 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+A persistent cache of evaluation results: ``Settings`Cached[expr]``.
+
+``Settings`Cached[expr]`` evaluates ``expr`` just once for all runs of
+mathicsscript: its result, along with the messages and Print[] output it
+gave, is saved in a file, and later evaluations of the same ``expr``
+read it back. It is meant for expensive, pure computations, like a large
+Integrate or Solve in a report that is run again and again.
+
+A result is found by a key, the SHA-256 of
+
+  * the versions of Mathics3 and mathicsscript,
+  * the FullForm of ``expr``, and
+  * each user definition that ``expr`` depends on: those of the symbols
+    in it, and in turn those of the symbols in their rules.
+
+So a result isn't used once anything it depends on is defined
+differently. ``expr`` isn't cached, and is just evaluated, when it uses
+a symbol in NONDETERMINISTIC_SYMBOLS, such as RandomReal or Import, or
+when evaluating it changes a definition or is stopped.
+
+The cache is kept in ``Settings`$MemoDirectory``, which the
+``--memo-dir`` option sets, or else in DEFAULT_MEMO_DIR, with a file for
+each result. Several mathicsscript processes can use it at the same
+time: a result is written to a temporary file and renamed into place, so
+that no process reads a partly-written one. Using a result updates the
+modification time of its file. Once the files add up to more than
+``Settings`$MemoCacheLimit`` megabytes, the least recently used ones are
+removed, by one process at a time.
+
+Since anyone may be able to write to the cache directory, which is
+whatever ``Settings`$MemoDirectory`` says, each file starts with an
+HMAC of its contents, made with a secret key kept in KEY_PATH. Only
+files with a valid HMAC, which this user's mathicsscript wrote, are
+unpickled.
+"""
+
+import hashlib
+import hmac
+import math
+import os
+import os.path as osp
+import pickle
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+from mathics.core.atoms import String
+from mathics.core.attributes import A_HOLD_ALL, A_PROTECTED
+from mathics.core.builtin import Builtin
+from mathics.core.systemsymbols import SymbolAborted
+
+from mathicsscript.incremental import VOLATILE_SYMBOLS, cache_version, symbols_in
+from mathicsscript.definitionchanges import snapshot_definitions
+from mathicsscript.outhistory import compact_dumps
+from mathicsscript.termshell import CONFIGDIR
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+DEFAULT_MEMO_DIR = osp.join(CONFIGDIR, "memo")
+KEY_PATH = osp.join(CONFIGDIR, "memo.key")
+KEY_SIZE = 32
+DIGEST_SIZE = hashlib.sha256().digest_size
+
+# The keys read from key files, by path.
+_keys: Dict[str, bytes] = {}
+
+DIRECTORY_SETTING = "Settings`$MemoDirectory"
+LIMIT_SETTING = "Settings`$MemoCacheLimit"
+
+# The result of an expression that uses one of these depends on more than
+# its input and definitions, or has an effect besides its output.
+NONDETERMINISTIC_SYMBOLS = VOLATILE_SYMBOLS | frozenset(
+    f"System`{name}"
+    for name in (
+        "$Line",
+        "AbsoluteTime",
+        "AbsoluteTiming",
+        "CopyFile",
+        "CreateFile",
+        "Date",
+        "DateList",
+        "DateString",
+        "DeleteFile",
+        "Export",
+        "In",
+        "Now",
+        "Out",
+        "Pause",
+        "Put",
+        "PutAppend",
+        "Random",
+        "RandomChoice",
+        "RandomComplex",
+        "RandomInteger",
+        "RandomReal",
+        "RandomSample",
+        "RenameFile",
+        "SeedRandom",
+        "SessionTime",
+        "TimeUsed",
+        "Timing",
+        "Write",
+        "WriteString",
+    )
+)
+
+# Attributes of a Definition that don't change what its symbol evaluates
+# to.
+IGNORED_ATTRIBUTES = frozenset(("builtin", "changed", "formatvalues"))
+
+
+def describe_definition(definition) -> Tuple[str, frozenset]:
+    """
+    Return the text that identifies what ``definition`` does, and the
+    symbols that appear in its rules.
+    """
+    parts = []
+    symbols = set()
+    for name, value in sorted(vars(definition).items()):
+        if name in IGNORED_ATTRIBUTES:
+            continue
+        if isinstance(value, list):
+            for rule in value:
+                pattern = rule.pattern.expr
+                replace = getattr(rule, "replace", None)
+                parts.append(f"{name}: {pattern} -> {replace}")
+                symbols |= symbols_in(pattern)
+                if replace is not None:
+                    symbols |= symbols_in(replace)
+        elif isinstance(value, dict):
+            parts.append(f"{name}: {sorted((k, str(v)) for k, v in value.items())}")
+        else:
+            parts.append(f"{name}: {value}")
+    return "\n".join(parts), frozenset(symbols)
+
+
+def is_empty(definition) -> bool:
+    """
+    True for a definition that has nothing in it, like the one made for a
+    symbol the first time it is looked up.
+    """
+    return not definition.attributes and not any(
+        value
+        for name, value in vars(definition).items()
+        if isinstance(value, (list, dict))
+    )
+
+
+def changed_definitions(definitions, snapshot: dict) -> List[str]:
+    """
+    Return the names of the definitions that changed since ``snapshot``,
+    taken with mathicsscript.definitionchanges.snapshot_definitions(), other than
+    empty ones that were added.
+    """
+    user = definitions.user
+    return [
+        name
+        for name, fingerprint in snapshot_definitions(definitions).items()
+        if snapshot.get(name) != fingerprint
+        and not (name not in snapshot and is_empty(user[name]))
+    ] + [name for name in snapshot if name not in user]
+
+
+def memo_key(expr, definitions) -> Optional[str]:
+    """
+    Return the key described above for ``expr``, or None if it shouldn't
+    be cached.
+    """
+    described: Dict[str, str] = {}
+    pending = list(symbols_in(expr))
+    while pending:
+        name = pending.pop()
+        if name in described:
+            continue
+        if name in NONDETERMINISTIC_SYMBOLS:
+            return None
+        described[name] = ""
+        definition = definitions.user.get(name)
+        if definition is not None and not is_empty(definition):
+            described[name], symbols = describe_definition(definition)
+            pending.extend(symbols)
+
+    key = hashlib.sha256(repr(cache_version()).encode("utf-8"))
+    key.update(str(expr).encode("utf-8"))
+    for name in sorted(described):
+        if described[name]:
+            key.update(f"\0{name}\0{described[name]}".encode("utf-8"))
+    return key.hexdigest()
+
+
+def memo_secret() -> bytes:
+    """
+    Return the key in KEY_PATH, first creating it, readable only by this
+    user, if there isn't one.
+    """
+    path = KEY_PATH
+    key = _keys.get(path)
+    if key is not None:
+        return key
+    try:
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(path, "rb") as f:
+            key = f.read()
+        if len(key) != KEY_SIZE:
+            raise OSError(f"{path} is not a memo key")
+    else:
+        key = os.urandom(KEY_SIZE)
+        with os.fdopen(fd, "wb") as f:
+            f.write(key)
+    _keys[path] = key
+    return key
+
+
+def signature(data: bytes) -> bytes:
+    return hmac.new(memo_secret(), data, hashlib.sha256).digest()
+
+
+class MemoCache:
+    """
+    The results of Settings`Cached[] in ``directory``, within
+    ``limit`` bytes if that is given.
+    """
+
+    def __init__(self, directory: str, limit: Optional[int] = None):
+        self.directory = directory
+        self.limit = limit
+
+    def path(self, key: str) -> str:
+        return osp.join(self.directory, key[:2], key)
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Return the entry saved for ``key``, or None if there isn't one.
+        """
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            signed = hmac.compare_digest(
+                data[:DIGEST_SIZE], signature(data[DIGEST_SIZE:])
+            )
+        except OSError:
+            return None
+        if not signed:
+            # Not written by this cache, so it mustn't be unpickled.
+            self.remove(path)
+            return None
+        try:
+            entry = pickle.loads(data[DIGEST_SIZE:])
+        except Exception:
+            # A file that can't be read is as good as missing.
+            self.remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key: str, entry: dict) -> None:
+        """
+        Save ``entry`` for ``key``, and then remove the least recently used
+        entries if the cache has grown past its limit.
+        """
+        data = compact_dumps(entry)
+        digest = signature(data)
+        path = self.path(key)
+        directory = osp.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(digest)
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            self.remove(tmp_path)
+            raise
+        if self.limit is not None:
+            self.evict()
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """
+        Return the modification time, size and path of each entry.
+        """
+        entries = []
+        try:
+            subdirectories = os.scandir(self.directory)
+        except OSError:
+            return entries
+        with subdirectories:
+            for subdirectory in subdirectories:
+                if not subdirectory.is_dir():
+                    continue
+                for entry in os.scandir(subdirectory.path):
+                    if entry.name.endswith(".tmp"):
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self) -> int:
+        """
+        Remove the least recently used entries until the rest fit within
+        the limit. Return the number removed. If another process is
+        already doing this, leave it to that one.
+        """
+        lock_path = osp.join(self.directory, "lock")
+        with open(lock_path, "a") as lock:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    return 0
+            entries = self.entries()
+            total = sum(size for _, size, _ in entries)
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= self.limit:
+                    break
+                self.remove(path)
+                total -= size
+                removed += 1
+            return removed
+
+    def remove(self, path: str) -> None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def get_memo_cache(definitions) -> MemoCache:
+    """
+    Return the cache given by ``Settings`$MemoDirectory`` and
+    ``Settings`$MemoCacheLimit``.
+    """
+    directory = DEFAULT_MEMO_DIR
+    try:
+        value = definitions.get_ownvalue(DIRECTORY_SETTING).get_string_value()
+    except ValueError:
+        value = None
+    if value:
+        directory = osp.expanduser(value)
+
+    limit = None
+    try:
+        megabytes = definitions.get_ownvalue(LIMIT_SETTING).to_python()
+    except ValueError:
+        megabytes = None
+    if isinstance(megabytes, (int, float)) and not isinstance(megabytes, bool):
+        if 0 <= megabytes < math.inf:
+            limit = int(megabytes * 1024 * 1024)
+    return MemoCache(directory, limit)
+
+
+class Cached(Builtin):
+    """
+    <dl>
+      <dt>'Settings`Cached[expr]'
+      <dd>evaluates $expr$, or if it was evaluated before, in this or an \
+      earlier run of mathicsscript, gives the result it had then.
+    </dl>
+
+    Results are kept on disk, in 'Settings`$MemoDirectory'. A result is \
+    used again only if $expr$ and the definitions it depends on are the \
+    same. Use it for pure computations that take a long time.
+    """
+
+    attributes = A_HOLD_ALL | A_PROTECTED
+    context = "Settings`"
+    messages = {
+        "nosave": "The result could not be cached: `1`.",
+    }
+    summary_text = "evaluate an expression once for all runs"
+
+    def eval(self, expr, evaluation):
+        "Settings`Cached[expr_]"
+        definitions = evaluation.definitions
+        key = memo_key(expr, definitions)
+        if key is None:
+            return expr.evaluate(evaluation)
+
+        cache = get_memo_cache(definitions)
+        entry = cache.get(key)
+        if entry is not None and entry.get("version") == cache_version():
+            for out in entry["out"]:
+                evaluation.out.append(out)
+                evaluation.output.out(out)
+            return entry["result"]
+
+        snapshot = snapshot_definitions(definitions)
+        out_start = len(evaluation.out)
+        result = expr.evaluate(evaluation)
+        if result is SymbolAborted or changed_definitions(definitions, snapshot):
+            return result
+        entry = {
+            "version": cache_version(),
+            "result": result,
+            "out": evaluation.out[out_start:],
+        }
+        try:
+            cache.put(key, entry)
+        except (OSError, pickle.PicklingError, TypeError) as e:
+            evaluation.message("Settings`Cached", "nosave", String(str(e)))
+        return result
+
+
+def install_memo_builtins(definitions) -> None:
+    Cached(expression=False).contribute(definitions)
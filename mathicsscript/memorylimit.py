@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+Limit how much the address space of the current process can grow.
+
+RLIMIT_AS bounds the size of the address space, not its growth, so the
+limit is the current size plus the growth allowed. The current size is
+read from /proc/self/statm; where that isn't available (macOS, the BSDs
+without procfs) no limit is set. Peak resident size from getrusage() is
+smaller than the address space, and a limit based on it would leave the
+process unable to allocate anything at all.
+"""
+
+import os
+import os.path as osp
+import resource
+
+STATM_PATH = "/proc/self/statm"
+
+
+def can_limit_memory() -> bool:
+    """
+    Return True if set_memory_limit() can limit memory here.
+    """
+    return hasattr(resource, "RLIMIT_AS") and osp.exists(STATM_PATH)
+
+
+def set_memory_limit(limit: int) -> bool:
+    """
+    Let this process's address space grow by at most ``limit`` bytes.
+    Return False, changing nothing, if that can't be done here.
+    """
+    if not can_limit_memory():
+        return False
+    try:
+        with open(STATM_PATH) as f:
+            current = int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+        soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+        new_soft = current + limit
+        if hard != resource.RLIM_INFINITY:
+            new_soft = min(new_soft, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (new_soft, hard))
+    except (OSError, ValueError, IndexError):
+        return False
+    return True
@@ -0,0 +1,736 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Draw Mathics3 Graphics[] straight into matplotlib.
+
+Rather than exporting a Graphics expression to SVG and showing a
+rasterized image of that, its primitives are turned into NumPy arrays of
+coordinates, and each is drawn as a single matplotlib artist:
+Line[] as a LineCollection, Point[] as a PathCollection, Polygon[] and
+Rectangle[] as a PolyCollection. The axes and ticks are matplotlib's, so
+the plot can be zoomed and panned like any other.
+
+This is done in two passes. ``graphics_items()`` walks the expression,
+applying directives like RGBColor[], Thickness[] and EdgeForm[] in the
+scope of the list, or Style[], they appear in, and returns what is to be drawn.
+``draw_items()`` then draws that. A primitive or form that isn't handled
+here raises UnsupportedGraphics in the first pass, before any figure is
+made, so that the caller can show the graphics some other way.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from mathics.builtin.colors.color_directives import expression_to_color
+from mathics.builtin.graphics import DEFAULT_POINT_FACTOR
+from mathics.core.atoms import Integer, MachineReal, String
+from mathics.core.expression import Expression
+from mathics.core.list import ListExpression
+from mathics.core.systemsymbols import SymbolOutputForm
+
+# Sizes are in printer's points, as in AbsoluteThickness[].
+DEFAULT_IMAGE_WIDTH = 360.0
+DEFAULT_ASPECT_RATIO = 0.618
+DEFAULT_FONT_SIZE = 10.0
+DEFAULT_THICKNESS = 1.0
+
+IMAGE_SIZES = {
+    "System`Tiny": 100.0,
+    "System`Small": 180.0,
+    "System`Medium": 360.0,
+    "System`Large": 576.0,
+}
+
+COLOR_HEADS = frozenset(
+    f"System`{name}"
+    for name in (
+        "CMYKColor",
+        "GrayLevel",
+        "Hue",
+        "LABColor",
+        "LCHColor",
+        "LUVColor",
+        "RGBColor",
+        "XYZColor",
+    )
+)
+
+BLACK = (0.0, 0.0, 0.0, 1.0)
+
+RGBA = Tuple[float, float, float, float]
+
+
+class UnsupportedGraphics(Exception):
+    """
+    Raised for a Graphics expression that can't be drawn here.
+    """
+
+
+class Style(NamedTuple):
+    # None for the default color, black.
+    color: Optional[RGBA] = None
+    opacity: Optional[float] = None
+    # Line width and point diameter, in points.
+    thickness: float = DEFAULT_THICKNESS
+    point_size: float = 2 * DEFAULT_POINT_FACTOR * DEFAULT_IMAGE_WIDTH
+    # The fill of faces: None to use ``color``, or "none" for no fill.
+    face_color: Optional[object] = None
+    # The edges of faces, which aren't drawn if ``edge_color`` is None.
+    edge_color: Optional[RGBA] = None
+    edge_thickness: float = DEFAULT_THICKNESS
+
+    def with_opacity(self, color: RGBA) -> RGBA:
+        if self.opacity is None:
+            return color
+        return (*color[:3], color[3] * self.opacity)
+
+    def line_color(self) -> RGBA:
+        return self.with_opacity(self.color or BLACK)
+
+    def fill_color(self, default: RGBA = BLACK):
+        if self.face_color == "none":
+            return "none"
+        return self.with_opacity(self.face_color or self.color or default)
+
+    def edge(self):
+        if self.edge_color is None:
+            return "none"
+        return self.with_opacity(self.edge_color)
+
+
+class GraphicsItem(NamedTuple):
+    # "lines", "points", "polygons", "arrows", "disk", "circle" or "text".
+    kind: str
+    # Arrays of coordinates, or for "disk" and "circle" the center,
+    # radii and angles, or for "text" the text, position and offset.
+    data: object
+    style: Style
+
+
+class GraphicsOptions(NamedTuple):
+    image_width: float
+    # A number, or None for the aspect ratio of the plot range.
+    aspect_ratio: Optional[float]
+    plot_range: Tuple[Optional[Tuple[float, float]], Optional[Tuple[float, float]]]
+    axes: Tuple[bool, bool]
+    axes_origin: Optional[Tuple[float, float]]
+    axes_label: Tuple[Optional[str], Optional[str]]
+    frame: bool
+    grid_lines: bool
+    plot_label: Optional[str]
+    background: Optional[RGBA]
+
+
+def to_float(expr, evaluation=None) -> Optional[float]:
+    if isinstance(expr, (MachineReal, Integer)):
+        return float(expr.value)
+    return expr.round_to_float(evaluation)
+
+
+def to_rgba(expr) -> Optional[RGBA]:
+    color = expression_to_color(expr)
+    if color is None:
+        return None
+    try:
+        components = [min(max(c, 0.0), 1.0) for c in color.to_rgba()]
+    except ValueError:
+        return None
+    if len(components) == 3:
+        components.append(1.0)
+    return tuple(components)
+
+
+def coordinates(expr, dimension: int = 2) -> np.ndarray:
+    """
+    Return the list of points ``expr`` as an n x ``dimension`` array.
+    """
+    if not isinstance(expr, ListExpression):
+        raise UnsupportedGraphics(f"coordinates {expr}")
+    try:
+        # Most points are lists of machine numbers.
+        points = np.array(
+            [[c.value for c in point.elements] for point in expr.elements],
+            dtype=float,
+        )
+    except (AttributeError, TypeError, ValueError):
+        points = np.array(
+            [
+                [to_float(c) for c in getattr(point, "elements", ())]
+                for point in expr.elements
+            ],
+            dtype=object,
+        )
+        # Points that aren't numbers, like Indeterminate, aren't drawn.
+        points[points == None] = np.nan  # noqa: E711
+        try:
+            points = points.astype(float)
+        except (TypeError, ValueError):
+            raise UnsupportedGraphics(f"coordinates {expr}")
+    if points.ndim != 2 or points.shape[1] != dimension:
+        if len(points) == 0:
+            return np.zeros((0, dimension))
+        raise UnsupportedGraphics(f"coordinates {expr}")
+    return points
+
+
+def coordinate_lists(expr, dimension: int = 2) -> List[np.ndarray]:
+    """
+    Return the list of points, or list of lists of points, ``expr`` as a
+    list of n x ``dimension`` arrays.
+    """
+    if (
+        isinstance(expr, ListExpression)
+        and expr.elements
+        and isinstance(expr.elements[0], ListExpression)
+        and expr.elements[0].elements
+        and isinstance(expr.elements[0].elements[0], ListExpression)
+    ):
+        return [coordinates(points, dimension) for points in expr.elements]
+    return [coordinates(expr, dimension)]
+
+
+def position(expr, evaluation=None, dimension: int = 2) -> Tuple[float, ...]:
+    if not isinstance(expr, ListExpression) or len(expr.elements) != dimension:
+        raise UnsupportedGraphics(f"position {expr}")
+    values = tuple(to_float(c, evaluation) for c in expr.elements)
+    if None in values:
+        raise UnsupportedGraphics(f"position {expr}")
+    return values
+
+
+def text_of(expr, evaluation) -> str:
+    if isinstance(expr, String):
+        return expr.value
+    return expr.format(evaluation, SymbolOutputForm).boxes_to_text(
+        evaluation=evaluation
+    )
+
+
+def option_rules(expr) -> Dict[str, object]:
+    """
+    Return the options given in Graphics[] expression ``expr`` by name.
+    """
+    options = {}
+    for element in expr.elements[1:]:
+        if element.has_form(("Rule", "RuleDelayed"), 2):
+            options[element.elements[0].get_name()] = element.elements[1]
+    return options
+
+
+def graphics_options(expr, evaluation) -> GraphicsOptions:
+    """
+    Return the options of Graphics[] expression ``expr`` that are used here.
+    """
+    options = option_rules(expr)
+
+    def option(name):
+        return options.get(f"System`{name}")
+
+    def number(value) -> Optional[float]:
+        return None if value is None else to_float(value, evaluation)
+
+    def pair(value) -> Optional[Tuple[float, float]]:
+        if isinstance(value, ListExpression) and len(value.elements) == 2:
+            a, b = (number(c) for c in value.elements)
+            if a is not None and b is not None:
+                return a, b
+        return None
+
+    def label(value) -> Optional[str]:
+        if value is None or value.get_name() == "System`None":
+            return None
+        return text_of(value, evaluation)
+
+    image_width = DEFAULT_IMAGE_WIDTH
+    image_size = option("ImageSize")
+    if image_size is not None:
+        if image_size.get_name() in IMAGE_SIZES:
+            image_width = IMAGE_SIZES[image_size.get_name()]
+        elif isinstance(image_size, ListExpression) and image_size.elements:
+            image_width = number(image_size.elements[0]) or image_width
+        else:
+            image_width = number(image_size) or image_width
+
+    aspect_ratio = number(option("AspectRatio"))
+
+    plot_range = option("PlotRange")
+    ranges = (None, None)
+    if isinstance(plot_range, ListExpression) and len(plot_range.elements) == 2:
+        ranges = tuple(pair(r) for r in plot_range.elements)
+
+    def is_true(value) -> bool:
+        return value is not None and value.get_name() == "System`True"
+
+    axes = option("Axes")
+    if isinstance(axes, ListExpression) and len(axes.elements) == 2:
+        axes = tuple(is_true(a) for a in axes.elements)
+    else:
+        axes = (is_true(axes), is_true(axes))
+
+    axes_label = option("AxesLabel")
+    if isinstance(axes_label, ListExpression) and len(axes_label.elements) == 2:
+        axes_label = tuple(label(a) for a in axes_label.elements)
+    else:
+        axes_label = (None, label(axes_label))
+
+    background = option("Background")
+    return GraphicsOptions(
+        image_width=image_width,
+        aspect_ratio=aspect_ratio,
+        plot_range=ranges,
+        axes=axes,
+        axes_origin=pair(option("AxesOrigin")),
+        axes_label=axes_label,
+        frame=is_true(option("Frame")),
+        grid_lines=option("GridLines") is not None
+        and option("GridLines").get_name() in ("System`Automatic", "System`All"),
+        plot_label=label(option("PlotLabel")),
+        background=to_rgba(background) if background is not None else None,
+    )
+
+
+class GraphicsWalker:
+    """
+    Collects the GraphicsItems of a Graphics[] expression.
+    """
+
+    dimension = 2
+
+    def __init__(self, evaluation, image_width: float):
+        self.evaluation = evaluation
+        self.image_width = image_width
+        self.items: List[GraphicsItem] = []
+
+    def walk(self, expr, style: Style) -> Style:
+        """
+        Collect the items of graphics ``expr`` drawn in ``style``, and
+        return the style that follows it in its list.
+        """
+        if isinstance(expr, ListExpression):
+            inner_style = style
+            for element in expr.elements:
+                inner_style = self.walk(element, inner_style)
+            return style
+        if not isinstance(expr, Expression):
+            raise UnsupportedGraphics(f"graphics {expr}")
+        directive_style = self.directive(expr, style)
+        if directive_style is not None:
+            return directive_style
+        primitive = self.primitives.get(expr.get_head_name())
+        if primitive is None:
+            raise UnsupportedGraphics(f"graphics {expr.get_head_name()}")
+        primitive(self, expr.elements, style)
+        return style
+
+    def directive(self, expr, style: Style) -> Optional[Style]:
+        """
+        Return ``style`` changed by ``expr`` if that is a directive,
+        and None otherwise.
+        """
+        head = expr.get_head_name()
+        elements = expr.elements
+        if head in COLOR_HEADS:
+            color = to_rgba(expr)
+            if color is None:
+                raise UnsupportedGraphics(f"color {expr}")
+            return style._replace(color=color)
+        elif head == "System`Opacity" and len(elements) in (1, 2):
+            opacity = to_float(elements[0])
+            if opacity is None:
+                raise UnsupportedGraphics(f"opacity {expr}")
+            if len(elements) == 2:
+                style = self.walk_directive(elements[1], style)
+            return style._replace(opacity=opacity)
+        elif head == "System`Thickness" and len(elements) == 1:
+            return style._replace(thickness=self.size(elements[0], relative=True))
+        elif head == "System`AbsoluteThickness" and len(elements) == 1:
+            return style._replace(thickness=self.size(elements[0]))
+        elif head == "System`PointSize" and len(elements) == 1:
+            size = 2 * self.size(elements[0], relative=True)
+            return style._replace(point_size=size)
+        elif head == "System`AbsolutePointSize" and len(elements) == 1:
+            return style._replace(point_size=self.size(elements[0]))
+        elif head == "System`Directive":
+            for element in elements:
+                style = self.walk_directive(element, style)
+            return style
+        elif head == "System`EdgeForm":
+            if not elements:
+                return style._replace(edge_color=None)
+            edge_style = self.walk_directive(
+                elements[0], Style(point_size=style.point_size)
+            )
+            return style._replace(
+                edge_color=edge_style.line_color(),
+                edge_thickness=edge_style.thickness,
+            )
+        elif head == "System`FaceForm":
+            if not elements:
+                return style._replace(face_color="none")
+            face_style = self.walk_directive(elements[0], style._replace(opacity=None))
+            return style._replace(face_color=face_style.line_color())
+        return None
+
+    def walk_directive(self, expr, style: Style) -> Style:
+        """
+        Return ``style`` changed by directive, or list of directives, ``expr``.
+        """
+        if isinstance(expr, ListExpression):
+            for element in expr.elements:
+                style = self.walk_directive(element, style)
+            return style
+        new_style = None
+        if isinstance(expr, Expression):
+            new_style = self.directive(expr, style)
+        if new_style is None:
+            raise UnsupportedGraphics(f"directive {expr}")
+        return new_style
+
+    def size(self, expr, relative: bool = False) -> float:
+        """
+        Return the size ``expr`` in points. A ``relative`` size is a
+        fraction of the width of the graphics.
+        """
+        value = to_float(expr, self.evaluation)
+        if value is None:
+            raise UnsupportedGraphics(f"size {expr}")
+        return value * self.image_width if relative else value
+
+    def position(self, elements, index: int, default):
+        """
+        Return the position ``elements[index]``, or ``default`` if there
+        are not that many elements.
+        """
+        if index >= len(elements):
+            return default
+        return position(elements[index], self.evaluation, self.dimension)
+
+    def points(self, expr) -> np.ndarray:
+        """
+        Return the point, or list of points, ``expr`` as an array of points.
+        """
+        if (
+            isinstance(expr, ListExpression)
+            and expr.elements
+            and not isinstance(expr.elements[0], ListExpression)
+        ):
+            expr = ListExpression(expr)
+        return coordinates(expr, self.dimension)
+
+    def coordinate_lists(self, expr) -> List[np.ndarray]:
+        return coordinate_lists(expr, self.dimension)
+
+    def add(self, kind: str, data, style: Style) -> None:
+        # Plots are made of many primitives in the same style, which are
+        # drawn together.
+        if kind in ("lines", "polygons") and self.items:
+            last = self.items[-1]
+            if last.kind == kind and last.style == style:
+                last.data.extend(data)
+                return
+        self.items.append(GraphicsItem(kind, data, style))
+
+    def line(self, elements, style: Style) -> None:
+        if len(elements) != 1:
+            raise UnsupportedGraphics("Line")
+        self.add("lines", self.coordinate_lists(elements[0]), style)
+
+    def arrow(self, elements, style: Style) -> None:
+        if len(elements) not in (1, 2):
+            raise UnsupportedGraphics("Arrow")
+        self.add("arrows", self.coordinate_lists(elements[0]), style)
+
+    def point(self, elements, style: Style) -> None:
+        if len(elements) != 1:
+            raise UnsupportedGraphics("Point")
+        self.add("points", self.points(elements[0]), style)
+
+    def polygon(self, elements, style: Style) -> None:
+        # VertexColors and other options aren't handled.
+        if len(elements) != 1:
+            raise UnsupportedGraphics("Polygon")
+        self.add("polygons", self.coordinate_lists(elements[0]), style)
+
+    def rectangle(self, elements, style: Style) -> None:
+        if len(elements) > 2:
+            raise UnsupportedGraphics("Rectangle")
+        x1, y1 = self.position(elements, 0, (0.0, 0.0))
+        x2, y2 = self.position(elements, 1, (x1 + 1, y1 + 1))
+        corners = np.array([[x1, y1], [x2, y1], [x2, y2], [x1, y2]])
+        self.add("polygons", [corners], style)
+
+    def round_primitive(self, kind: str, elements, style: Style) -> None:
+        if len(elements) > 3:
+            raise UnsupportedGraphics(kind)
+        center = self.position(elements, 0, (0.0, 0.0))
+        radii = (1.0, 1.0)
+        if len(elements) >= 2:
+            r = elements[1]
+            if isinstance(r, ListExpression):
+                radii = position(r, self.evaluation)
+            else:
+                radius = to_float(r, self.evaluation)
+                if radius is None:
+                    raise UnsupportedGraphics(kind)
+                radii = (radius, radius)
+        angles = self.position(elements, 2, None)
+        if angles is not None:
+            if kind == "disk" and radii[0] != radii[1]:
+                raise UnsupportedGraphics("elliptical sector")
+            # The sector between the angles, in whichever order they are
+            # given, as PieChart gives them.
+            angles = tuple(sorted(angles))
+        self.add(kind, (center, radii, angles), style)
+
+    def disk(self, elements, style: Style) -> None:
+        self.round_primitive("disk", elements, style)
+
+    def circle(self, elements, style: Style) -> None:
+        self.round_primitive("circle", elements, style)
+
+    def text(self, elements, style: Style) -> None:
+        if not 1 <= len(elements) <= 3:
+            raise UnsupportedGraphics("Text")
+        xy = self.position(elements, 1, (0.0, 0.0))
+        offset = self.position(elements, 2, (0.0, 0.0))
+        text = text_of(elements[0], self.evaluation)
+        self.add("text", (text, xy, offset), style)
+
+    def styled(self, elements, style: Style) -> None:
+        """
+        Collect the items of ``Style[graphics, directives...]``.
+        """
+        if not elements:
+            raise UnsupportedGraphics("Style")
+        for directive in elements[1:]:
+            style = self.walk_directive(directive, style)
+        self.walk(elements[0], style)
+
+    primitives = {
+        "System`Arrow": arrow,
+        "System`Circle": circle,
+        "System`Disk": disk,
+        "System`Line": line,
+        "System`Point": point,
+        "System`Polygon": polygon,
+        "System`Rectangle": rectangle,
+        "System`Style": styled,
+        "System`Text": text,
+    }
+
+
+def graphics_items(expr, evaluation, image_width: float) -> List[GraphicsItem]:
+    """
+    Return the items to draw for Graphics[] expression ``expr``, raising
+    UnsupportedGraphics if there is something in it that can't be drawn.
+    """
+    if not expr.elements:
+        raise UnsupportedGraphics("Graphics[]")
+    walker = GraphicsWalker(evaluation, image_width)
+    default_style = Style(point_size=2 * DEFAULT_POINT_FACTOR * image_width)
+    options = option_rules(expr)
+    for primitives in (
+        options.get("System`Prolog"),
+        expr.elements[0],
+        options.get("System`Epilog"),
+    ):
+        if primitives is not None:
+            walker.walk(primitives, default_style)
+    return walker.items
+
+
+def text_alignment(offset: Tuple[float, float]) -> Tuple[str, str]:
+    """
+    Return matplotlib's horizontal and vertical alignment for the offset
+    of a Text[].
+    """
+    ox, oy = offset
+    ha = "left" if ox < 0 else "right" if ox > 0 else "center"
+    va = "bottom" if oy < 0 else "top" if oy > 0 else "center"
+    return ha, va
+
+
+def draw_items(ax, items: List[GraphicsItem]) -> None:
+    """
+    Draw ``items`` on matplotlib axes ``ax``.
+    """
+    from matplotlib.collections import LineCollection, PolyCollection
+    from matplotlib.patches import Arc, Ellipse, Wedge
+
+    for kind, data, style in items:
+        if kind == "lines":
+            ax.add_collection(
+                LineCollection(
+                    data,
+                    colors=[style.line_color()],
+                    linewidths=style.thickness,
+                    capstyle="butt",
+                )
+            )
+        elif kind == "arrows":
+            ax.add_collection(
+                LineCollection(
+                    data,
+                    colors=[style.line_color()],
+                    linewidths=style.thickness,
+                )
+            )
+            for points in data:
+                if len(points) >= 2:
+                    ax.annotate(
+                        "",
+                        xy=points[-1],
+                        xytext=points[-2],
+                        arrowprops={
+                            "arrowstyle": "-|>",
+                            "color": style.line_color(),
+                            "linewidth": style.thickness,
+                            "shrinkA": 0,
+                            "shrinkB": 0,
+                        },
+                    )
+        elif kind == "points":
+            ax.scatter(
+                data[:, 0],
+                data[:, 1],
+                s=style.point_size**2,
+                c=[style.line_color()],
+                marker="o",
+                linewidths=0,
+            )
+        elif kind == "polygons":
+            ax.add_collection(
+                PolyCollection(
+                    data,
+                    facecolors=[style.fill_color()],
+                    edgecolors=[style.edge()],
+                    linewidths=style.edge_thickness,
+                    closed=True,
+                )
+            )
+        elif kind in ("disk", "circle"):
+            (x, y), (rx, ry), angles = data
+            if kind == "circle":
+                patch_options = {
+                    "fill": False,
+                    "edgecolor": style.line_color(),
+                    "linewidth": style.thickness,
+                }
+                if angles is None:
+                    patch = Ellipse((x, y), 2 * rx, 2 * ry, **patch_options)
+                else:
+                    theta1, theta2 = np.degrees(angles)
+                    patch = Arc(
+                        (x, y),
+                        2 * rx,
+                        2 * ry,
+                        theta1=theta1,
+                        theta2=theta2,
+                        **patch_options,
+                    )
+            else:
+                patch_options = {
+                    "facecolor": style.fill_color(),
+                    "edgecolor": style.edge(),
+                    "linewidth": style.edge_thickness,
+                }
+                if angles is None:
+                    patch = Ellipse((x, y), 2 * rx, 2 * ry, **patch_options)
+                else:
+                    theta1, theta2 = np.degrees(angles)
+                    patch = Wedge((x, y), rx, theta1, theta2, **patch_options)
+            ax.add_patch(patch)
+        elif kind == "text":
+            text, (x, y), offset = data
+            ha, va = text_alignment(offset)
+            ax.text(
+                x,
+                y,
+                text,
+                ha=ha,
+                va=va,
+                color=style.line_color(),
+                fontsize=DEFAULT_FONT_SIZE,
+            )
+
+
+def setup_axes(ax, options: GraphicsOptions) -> None:
+    """
+    Set the plot range, aspect ratio, axes and labels of matplotlib axes
+    ``ax`` from the options of the Graphics[].
+    """
+    ax.autoscale_view()
+    x_range, y_range = options.plot_range
+    if x_range is not None and x_range[0] < x_range[1]:
+        ax.set_xlim(*x_range)
+    if y_range is not None and y_range[0] < y_range[1]:
+        ax.set_ylim(*y_range)
+
+    if options.aspect_ratio is None:
+        ax.set_aspect("equal")
+    else:
+        ax.set_box_aspect(options.aspect_ratio)
+
+    if options.background is not None:
+        ax.set_facecolor(options.background)
+    if options.plot_label is not None:
+        ax.set_title(options.plot_label)
+    if options.grid_lines:
+        ax.grid(True)
+
+    if options.frame:
+        return
+    show_x, show_y = options.axes
+    if not (show_x or show_y):
+        ax.set_axis_off()
+        return
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.spines["bottom"].set_visible(show_x)
+    ax.spines["left"].set_visible(show_y)
+    if not show_x:
+        ax.set_xticks([])
+    if not show_y:
+        ax.set_yticks([])
+    # Like Mathematica, axes cross at the origin when it is in view.
+    x0, y0 = options.axes_origin or (0.0, 0.0)
+    xmin, xmax = sorted(ax.get_xlim())
+    ymin, ymax = sorted(ax.get_ylim())
+    if xmin <= x0 <= xmax:
+        ax.spines["left"].set_position(("data", x0))
+    if ymin <= y0 <= ymax:
+        ax.spines["bottom"].set_position(("data", y0))
+    x_label, y_label = options.axes_label
+    if x_label is not None:
+        ax.set_xlabel(x_label, loc="right")
+    if y_label is not None:
+        ax.set_ylabel(y_label, loc="top")
+
+
+def render_graphics(expr, evaluation, plt):
+    """
+    Draw Graphics[] expression ``expr`` in a new matplotlib figure made
+    with ``plt``, and return the figure. UnsupportedGraphics is raised,
+    and no figure made, if ``expr`` has something that isn't handled.
+    """
+    options = graphics_options(expr, evaluation)
+    items = graphics_items(expr, evaluation, options.image_width)
+
+    width = options.image_width / 72
+    height = width * (options.aspect_ratio or DEFAULT_ASPECT_RATIO)
+    fig, ax = plt.subplots(figsize=(width, height))
+    draw_items(ax, items)
+    setup_axes(ax, options)
+    return fig
@@ -0,0 +1,496 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Draw Mathics3 Graphics3D[] with matplotlib's mplot3d, instead of running
+Asymptote.
+
+This works like the 2D drawing in mplgraphics: the primitives of the
+expression are turned into NumPy arrays, and those in the same style are
+drawn together, polygons as a single Poly3DCollection and lines as a
+single Line3DCollection.
+
+mplot3d sorts and redraws every polygon each time the view is rotated,
+so a surface of more than MAX_POLYGONS polygons is first simplified by
+vertex clustering: vertices are snapped to the centers of the cells of a
+grid over the bounding box, and the polygons that collapse, or become
+the same as another, are dropped. The grid is made coarser until the
+polygons are few enough.
+"""
+
+import math
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from mathics.builtin.graphics import DEFAULT_POINT_FACTOR
+from mathics.core.list import ListExpression
+
+from mathicsscript.mplgraphics import (
+    DEFAULT_FONT_SIZE,
+    DEFAULT_IMAGE_WIDTH,
+    IMAGE_SIZES,
+    GraphicsItem,
+    GraphicsWalker,
+    Style,
+    UnsupportedGraphics,
+    option_rules,
+    text_of,
+    to_float,
+    to_rgba,
+)
+
+# Enough for a smooth surface that can still be turned around smoothly.
+MAX_POLYGONS = 5000
+
+# The color of surfaces when no color is given, which is then shaded.
+DEFAULT_SURFACE_COLOR = (1.0, 0.8, 0.5, 1.0)
+
+# Lines are thinner than in 2D, so that the mesh of a surface doesn't
+# hide it.
+DEFAULT_THICKNESS = 0.5
+
+# Mathematica's default ViewPoint.
+DEFAULT_VIEW_POINT = (1.3, -2.4, 2.0)
+
+# The number of faces around and from pole to pole of a Sphere[].
+SPHERE_SEGMENTS = (24, 12)
+
+
+class Graphics3DOptions(NamedTuple):
+    image_width: float
+    plot_range: Tuple[Optional[Tuple[float, float]], ...]
+    # Three numbers, or None for the ratios of the plot range.
+    box_ratios: Optional[Tuple[float, float, float]]
+    boxed: bool
+    axes: Tuple[bool, bool, bool]
+    axes_label: Tuple[Optional[str], Optional[str], Optional[str]]
+    plot_label: Optional[str]
+    background: Optional[Tuple[float, float, float, float]]
+    # The elevation and azimuth of the view, in degrees.
+    view: Tuple[float, float]
+
+
+def graphics3d_options(expr, evaluation) -> Graphics3DOptions:
+    """
+    Return the options of Graphics3D[] expression ``expr`` that are used
+    here.
+    """
+    options = option_rules(expr)
+
+    def option(name):
+        return options.get(f"System`{name}")
+
+    def numbers(value, count: int) -> Optional[Tuple[float, ...]]:
+        if isinstance(value, ListExpression) and len(value.elements) == count:
+            values = tuple(to_float(c, evaluation) for c in value.elements)
+            if None not in values:
+                return values
+        return None
+
+    def is_true(value) -> bool:
+        return value is not None and value.get_name() == "System`True"
+
+    def label(value) -> Optional[str]:
+        if value is None or value.get_name() == "System`None":
+            return None
+        return text_of(value, evaluation)
+
+    image_width = DEFAULT_IMAGE_WIDTH
+    image_size = option("ImageSize")
+    if image_size is not None:
+        if image_size.get_name() in IMAGE_SIZES:
+            image_width = IMAGE_SIZES[image_size.get_name()]
+        else:
+            image_width = to_float(image_size, evaluation) or image_width
+
+    plot_range = option("PlotRange")
+    ranges = (None, None, None)
+    if isinstance(plot_range, ListExpression) and len(plot_range.elements) == 3:
+        ranges = tuple(numbers(r, 2) for r in plot_range.elements)
+
+    axes = option("Axes")
+    if isinstance(axes, ListExpression) and len(axes.elements) == 3:
+        axes = tuple(is_true(a) for a in axes.elements)
+    else:
+        axes = (is_true(axes),) * 3
+
+    axes_label = option("AxesLabel")
+    if isinstance(axes_label, ListExpression) and len(axes_label.elements) == 3:
+        axes_label = tuple(label(a) for a in axes_label.elements)
+    else:
+        axes_label = (None, None, label(axes_label))
+
+    x, y, z = numbers(option("ViewPoint"), 3) or DEFAULT_VIEW_POINT
+    elevation = math.degrees(math.atan2(z, math.hypot(x, y)))
+    azimuth = math.degrees(math.atan2(y, x))
+
+    boxed = option("Boxed")
+    background = option("Background")
+    return Graphics3DOptions(
+        image_width=image_width,
+        plot_range=ranges,
+        box_ratios=numbers(option("BoxRatios"), 3),
+        boxed=boxed is None or is_true(boxed),
+        axes=axes,
+        axes_label=axes_label,
+        plot_label=label(option("PlotLabel")),
+        background=to_rgba(background) if background is not None else None,
+        view=(elevation, azimuth),
+    )
+
+
+def sphere_polygons(center, radius: float) -> np.ndarray:
+    """
+    Return the quadrilaterals of a sphere.
+    """
+    around, pole_to_pole = SPHERE_SEGMENTS
+    u = np.linspace(0, 2 * np.pi, around + 1)
+    v = np.linspace(0, np.pi, pole_to_pole + 1)
+    grid = np.stack(
+        [
+            np.outer(np.sin(v), np.cos(u)),
+            np.outer(np.sin(v), np.sin(u)),
+            np.outer(np.cos(v), np.ones_like(u)),
+        ],
+        axis=-1,
+    )
+    grid = np.asarray(center) + radius * grid
+    quads = np.stack(
+        [grid[:-1, :-1], grid[:-1, 1:], grid[1:, 1:], grid[1:, :-1]], axis=2
+    )
+    return quads.reshape(-1, 4, 3)
+
+
+def cuboid_polygons(low, high) -> np.ndarray:
+    """
+    Return the six faces of the box with opposite corners ``low`` and
+    ``high``.
+    """
+    corners = np.array(
+        [[(high if (i >> k) & 1 else low)[k] for k in range(3)] for i in range(8)],
+        dtype=float,
+    )
+    faces = [
+        [0, 1, 3, 2],
+        [4, 5, 7, 6],
+        [0, 1, 5, 4],
+        [2, 3, 7, 6],
+        [0, 2, 6, 4],
+        [1, 3, 7, 5],
+    ]
+    return corners[faces]
+
+
+def facing_up(polygon: np.ndarray) -> np.ndarray:
+    """
+    Return ``polygon`` with its vertices in the order that makes its
+    normal point up.
+
+    The triangles of a surface that Plot3D[] gives go around either way,
+    and shading would make every other one dark.
+    """
+    if len(polygon) >= 3:
+        normal = np.cross(polygon[1] - polygon[0], polygon[2] - polygon[0])
+        if normal[2] < 0:
+            return polygon[::-1]
+    return polygon
+
+
+class GraphicsWalker3D(GraphicsWalker):
+    """
+    Collects the GraphicsItems of a Graphics3D[] expression.
+    """
+
+    dimension = 3
+
+    def sphere(self, elements, style: Style) -> None:
+        if len(elements) > 2:
+            raise UnsupportedGraphics("Sphere")
+        centers = self.points(elements[0]) if elements else np.zeros((1, 3))
+        radius = 1.0
+        if len(elements) == 2:
+            radius = to_float(elements[1], self.evaluation)
+            if radius is None:
+                raise UnsupportedGraphics("Sphere")
+        for center in centers:
+            self.add("polygons", list(sphere_polygons(center, radius)), style)
+
+    def cuboid(self, elements, style: Style) -> None:
+        if len(elements) == 2:
+            corners = self.points(ListExpression(*elements))
+        elif len(elements) == 1:
+            corners = self.points(elements[0])
+            if len(corners) == 1:
+                corners = np.vstack([corners, corners + 1])
+        else:
+            corners = np.zeros((2, 3))
+            corners[1] = 1
+        if len(corners) != 2:
+            raise UnsupportedGraphics("Cuboid")
+        self.add("polygons", list(cuboid_polygons(*corners)), style)
+
+    def polygon(self, elements, style: Style) -> None:
+        if len(elements) != 1:
+            raise UnsupportedGraphics("Polygon")
+        polygons = [facing_up(p) for p in self.coordinate_lists(elements[0])]
+        self.add("polygons", polygons, style)
+
+    def text(self, elements, style: Style) -> None:
+        if not 1 <= len(elements) <= 3:
+            raise UnsupportedGraphics("Text")
+        xyz = self.position(elements, 1, (0.0, 0.0, 0.0))
+        text = text_of(elements[0], self.evaluation)
+        self.add("text", (text, xyz), style)
+
+    primitives = {
+        "System`Arrow": GraphicsWalker.arrow,
+        "System`Cuboid": cuboid,
+        "System`Line": GraphicsWalker.line,
+        "System`Point": GraphicsWalker.point,
+        "System`Polygon": polygon,
+        "System`Sphere": sphere,
+        "System`Style": GraphicsWalker.styled,
+        "System`Text": text,
+    }
+
+
+def graphics3d_items(expr, evaluation, image_width: float) -> List[GraphicsItem]:
+    """
+    Return the items to draw for Graphics3D[] expression ``expr``, raising
+    UnsupportedGraphics if there is something in it that can't be drawn.
+    """
+    if not expr.elements:
+        raise UnsupportedGraphics("Graphics3D[]")
+    walker = GraphicsWalker3D(evaluation, image_width)
+    default_style = Style(
+        thickness=DEFAULT_THICKNESS,
+        point_size=2 * DEFAULT_POINT_FACTOR * image_width,
+    )
+    walker.walk(expr.elements[0], default_style)
+    return walker.items
+
+
+def cluster_polygons(
+    groups: List[np.ndarray], low: np.ndarray, span: np.ndarray, cells: int
+) -> List[np.ndarray]:
+    """
+    Snap the vertices of the polygons in ``groups``, arrays of polygons
+    with the same number of vertices, to the grid of ``cells`` cells a
+    side over the box at ``low`` with sides ``span``. Return the polygons
+    that are left, grouped the same way.
+    """
+    vertices = np.concatenate([group.reshape(-1, 3) for group in groups])
+    cell = np.clip(((vertices - low) / span * cells).astype(np.int64), 0, cells - 1)
+    keys = (cell[:, 0] * cells + cell[:, 1]) * cells + cell[:, 2]
+    _, inverse = np.unique(keys, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    counts = np.bincount(inverse)
+    centers = np.zeros((len(counts), 3))
+    np.add.at(centers, inverse, vertices)
+    centers /= counts[:, np.newaxis]
+
+    result = []
+    start = 0
+    for group in groups:
+        count, size = group.shape[:2]
+        indexes = inverse[start : start + count * size].reshape(count, size)
+        start += count * size
+        ordered = np.sort(indexes, axis=1)
+        distinct = 1 + np.count_nonzero(np.diff(ordered, axis=1), axis=1)
+        keep = distinct >= 3
+        _, first = np.unique(ordered[keep], axis=0, return_index=True)
+        result.append(centers[indexes[keep][np.sort(first)]])
+    return result
+
+
+def decimate(polygons: List[np.ndarray], max_polygons: int = MAX_POLYGONS):
+    """
+    Return ``polygons``, or if there are more than ``max_polygons`` of
+    them, a simplified surface with about that many, as a list of arrays
+    of polygons with the same number of vertices.
+    """
+    by_size = {}
+    for polygon in polygons:
+        if len(polygon) >= 3 and not np.isnan(polygon).any():
+            by_size.setdefault(len(polygon), []).append(polygon)
+    groups = [np.array(group) for group in by_size.values()]
+    count = sum(len(group) for group in groups)
+    if count <= max_polygons:
+        return groups
+
+    vertices = np.concatenate([group.reshape(-1, 3) for group in groups])
+    low = vertices.min(axis=0)
+    span = vertices.max(axis=0) - low
+    span[span == 0] = 1
+    # A surface over an n x n grid has about 2 n^2 triangles.
+    cells = max(int(math.sqrt(max_polygons / 2)), 2)
+    while True:
+        result = cluster_polygons(groups, low, span, cells)
+        if sum(len(group) for group in result) <= max_polygons or cells <= 2:
+            return result
+        cells = max(int(cells * 0.8), 2)
+
+
+def draw_items3d(
+    ax, items: List[GraphicsItem], max_polygons: int = MAX_POLYGONS
+) -> None:
+    """
+    Draw ``items`` on mplot3d axes ``ax``, simplifying surfaces of more than
+    ``max_polygons`` polygons.
+    """
+    from mpl_toolkits.mplot3d.art3d import Line3DCollection, Poly3DCollection
+
+    for kind, data, style in items:
+        if kind in ("lines", "arrows"):
+            ax.add_collection3d(
+                Line3DCollection(
+                    data, colors=[style.line_color()], linewidths=style.thickness
+                )
+            )
+            if kind == "arrows":
+                for points in data:
+                    if len(points) >= 2:
+                        (x, y, z), (u, v, w) = points[-2], points[-1] - points[-2]
+                        ax.quiver(
+                            x,
+                            y,
+                            z,
+                            u,
+                            v,
+                            w,
+                            color=style.line_color(),
+                            linewidths=style.thickness,
+                            arrow_length_ratio=0.2,
+                        )
+        elif kind == "points":
+            ax.scatter(
+                data[:, 0],
+                data[:, 1],
+                data[:, 2],
+                s=style.point_size**2,
+                c=[style.line_color()],
+                linewidths=0,
+                depthshade=False,
+            )
+        elif kind == "polygons":
+            face_color = style.fill_color(DEFAULT_SURFACE_COLOR)
+            if style.edge_color is None:
+                # Shading can't be given "none" for the edge color.
+                edge_options = {"linewidths": 0}
+            else:
+                edge_options = {
+                    "edgecolors": style.edge(),
+                    "linewidths": style.edge_thickness,
+                }
+            for group in decimate(data, max_polygons):
+                ax.add_collection3d(
+                    Poly3DCollection(
+                        group,
+                        facecolors=face_color,
+                        shade=face_color != "none",
+                        **edge_options,
+                    )
+                )
+        elif kind == "text":
+            text, (x, y, z) = data
+            ax.text(
+                x,
+                y,
+                z,
+                text,
+                ha="center",
+                va="center",
+                color=style.line_color(),
+                fontsize=DEFAULT_FONT_SIZE,
+            )
+
+
+def data_limits(items: List[GraphicsItem]) -> List[Optional[Tuple[float, float]]]:
+    """
+    Return the range of the x, y and z coordinates of ``items``.
+    """
+    arrays = []
+    for kind, data, _ in items:
+        if kind == "points":
+            arrays.append(data)
+        elif kind in ("lines", "arrows", "polygons"):
+            arrays.extend(data)
+        elif kind == "text":
+            arrays.append(np.array([data[1]]))
+    arrays = [a for a in arrays if len(a)]
+    if not arrays:
+        return [None, None, None]
+    points = np.concatenate(arrays)
+    low, high = np.nanmin(points, axis=0), np.nanmax(points, axis=0)
+    return [(lo, hi) for lo, hi in zip(low, high)]
+
+
+def setup_axes3d(ax, items: List[GraphicsItem], options: Graphics3DOptions) -> None:
+    """
+    Set the plot range, box, view and labels of mplot3d axes ``ax``.
+    """
+    ranges = [
+        given or found for given, found in zip(options.plot_range, data_limits(items))
+    ]
+    for set_limits, limits in zip((ax.set_xlim, ax.set_ylim, ax.set_zlim), ranges):
+        if limits is not None and limits[0] < limits[1]:
+            set_limits(*limits)
+
+    if options.box_ratios is not None:
+        ax.set_box_aspect(options.box_ratios)
+    else:
+        ax.set_box_aspect(
+            [hi - lo if hi > lo else 1 for lo, hi in (r or (0, 1) for r in ranges)]
+        )
+    elevation, azimuth = options.view
+    ax.view_init(elev=elevation, azim=azimuth)
+
+    if options.background is not None:
+        ax.set_facecolor(options.background)
+    if options.plot_label is not None:
+        ax.set_title(options.plot_label)
+    if not options.boxed and not any(options.axes):
+        ax.set_axis_off()
+        return
+    for shown, label, set_ticks, set_label in zip(
+        options.axes,
+        options.axes_label,
+        (ax.set_xticks, ax.set_yticks, ax.set_zticks),
+        (ax.set_xlabel, ax.set_ylabel, ax.set_zlabel),
+    ):
+        if not shown:
+            set_ticks([])
+        if label is not None:
+            set_label(label)
+    if not options.boxed:
+        ax.grid(False)
+        for axis in (ax.xaxis, ax.yaxis, ax.zaxis):
+            axis.set_pane_color((1, 1, 1, 0))
+
+
+def render_graphics3d(expr, evaluation, plt, max_polygons: int = MAX_POLYGONS):
+    """
+    Draw Graphics3D[] expression ``expr`` in a new matplotlib figure made
+    with ``plt``, and return the figure. UnsupportedGraphics is raised,
+    and no figure made, if ``expr`` has something that isn't handled.
+    """
+    options = graphics3d_options(expr, evaluation)
+    items = graphics3d_items(expr, evaluation, options.image_width)
+
+    size = options.image_width / 72
+    fig = plt.figure(figsize=(size, size))
+    ax = fig.add_subplot(projection="3d")
+    draw_items3d(ax, items, max_polygons)
+    setup_axes3d(ax, items, options)
+    return fig
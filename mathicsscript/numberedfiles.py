@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Files numbered in the order they are made, such as Mathics3-Graph-001.asy.
+
+The next number is found from the files already in the directory, not
+kept by the process. So the files made by the forked children that
+``--isolate`` and ``--watch`` evaluate in, which can't hand anything back
+to mathicsscript, are numbered one after another too.
+"""
+
+import os
+import os.path as osp
+import re
+
+
+def last_number(directory: str, prefix: str) -> int:
+    """
+    Return the highest number of a file in ``directory`` whose name is
+    ``prefix`` followed by a number, or 0 if there is none.
+    """
+    pattern = re.compile(re.escape(prefix) + r"(\d+)(?:\D|$)")
+    numbers = [0]
+    for name in os.listdir(directory):
+        match = pattern.match(name)
+        if match:
+            numbers.append(int(match.group(1)))
+    return max(numbers)
+
+
+def create_numbered_file(directory: str, prefix: str, suffix: str) -> str:
+    """
+    Make an empty file in ``directory`` named ``prefix``, the number after
+    the highest one there, and ``suffix``, and return its path.
+    """
+    os.makedirs(directory, exist_ok=True)
+    number = last_number(directory, prefix)
+    while True:
+        number += 1
+        path = osp.join(directory, f"{prefix}{number:03d}{suffix}")
+        try:
+            os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+        except FileExistsError:
+            # Another process took this number first.
+            continue
+        return path
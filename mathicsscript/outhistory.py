@@ -0,0 +1,378 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Bounded Out[] history: ``Settings`$OutHistoryMemoryLimit``.
+
+Mathics3 keeps the result of each of the last ``$HistoryLength`` inputs
+as a rule ``Out[n] -> result``, so a session that works on large results
+holds on to many of them. After each input, ``OutHistory.update()``
+estimates the size of each Out[] result. The most recent results are
+kept in memory until they add up to ``Settings`$OutHistoryMemoryLimit``
+megabytes; older results than that are pickled to a file of their own
+under ``DEFAULT_OUT_HISTORY_DIR``, and their rule becomes
+
+    Out[n] -> Settings`SpilledOut["file"]
+
+which reads the result back whenever ``Out[n]`` or ``%n`` is used. Only
+files in the directory of a store of this process are read: a file
+named by an input could run any code when it is unpickled. The latest
+result, and results smaller than ``SMALL_RESULT_SIZE`` bytes, are
+always kept in memory.
+
+The files of a session are removed when its rules are, say by
+``$HistoryLength``, and when the session ends. A session checkpoint
+(``mathicsscript.checkpoint``) saves the results themselves rather than
+the names of their files; see ``dumps_with_spilled``.
+"""
+
+import io
+import math
+import os
+import os.path as osp
+import pickle
+import shutil
+import sys
+from typing import Dict, List, Optional, Tuple
+
+from mathics.core.atoms import Integer, MachineReal, String
+from mathics.core.builtin import Builtin
+from mathics.core.expression import Expression
+from mathics.core.rules import Rule
+from mathics.core.symbols import Symbol
+from mathics.core.systemsymbols import SymbolFailed, SymbolOut
+
+from mathicsscript.termshell import CONFIGDIR
+
+DEFAULT_OUT_HISTORY_DIR = osp.join(CONFIGDIR, "out-history")
+
+# Spilling a result smaller than this wouldn't save enough to be worth
+# reading it back.
+SMALL_RESULT_SIZE = 64 * 1024
+
+LIMIT_SETTING = "Settings`$OutHistoryMemoryLimit"
+
+SymbolSpilledOut = Symbol("Settings`SpilledOut")
+
+
+def get_out_history_limit(definitions) -> Optional[int]:
+    """
+    Return ``Settings`$OutHistoryMemoryLimit`` in bytes, or None if it
+    isn't a positive, finite number.
+    """
+    try:
+        value = definitions.get_ownvalue(LIMIT_SETTING).to_python()
+    except ValueError:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if 0 < value < math.inf:
+            return int(value * 1024 * 1024)
+    return None
+
+
+SYMBOL, EXPRESSION, ATOM = range(3)
+
+
+def expression_size(expr) -> int:
+    """
+    Return an estimate of the bytes of memory that ``expr`` takes up.
+    Symbols are shared by all expressions, so they aren't counted, and a
+    subexpression that appears more than once is counted once.
+    """
+    # isinstance() on these ABCs is slow enough to matter for large
+    # results, so each class is looked at just once.
+    kinds: Dict[type, int] = {}
+    size = 0
+    seen = set()
+    stack = [expr]
+    while stack:
+        expr = stack.pop()
+        cls = type(expr)
+        kind = kinds.get(cls)
+        if kind is None:
+            kind = kinds[cls] = (
+                SYMBOL
+                if issubclass(cls, Symbol)
+                else EXPRESSION if issubclass(cls, Expression) else ATOM
+            )
+        if kind == SYMBOL or id(expr) in seen:
+            continue
+        seen.add(id(expr))
+        size += sys.getsizeof(expr)
+        if kind == EXPRESSION:
+            elements = expr.elements
+            size += sys.getsizeof(elements)
+            stack.extend(elements)
+            stack.append(expr.head)
+        else:
+            value = getattr(expr, "value", None)
+            if value is not None:
+                size += sys.getsizeof(value)
+    return size
+
+
+def spilled_file(expr) -> Optional[str]:
+    """
+    Return the file named by ``Settings`SpilledOut["file"]``, or None if
+    ``expr`` isn't of that form.
+    """
+    if isinstance(expr, Expression) and expr.head is SymbolSpilledOut:
+        elements = expr.elements
+        if len(elements) == 1 and isinstance(elements[0], String):
+            return elements[0].value
+    return None
+
+
+# Atoms that are pickled as just their value. Otherwise an Integer, say,
+# would also take along the SymPy number it caches, which takes longer to
+# pickle than everything else and makes the file several times larger.
+VALUE_ATOMS = (Integer, MachineReal, String)
+
+
+class CompactPickler(pickle.Pickler):
+    """
+    A Pickler that pickles VALUE_ATOMS as just their value.
+    """
+
+    def reducer_override(self, obj):
+        cls = type(obj)
+        if cls in VALUE_ATOMS:
+            return cls, (obj.value,)
+        return NotImplemented
+
+
+def compact_dumps(obj) -> bytes:
+    f = io.BytesIO()
+    CompactPickler(f, pickle.HIGHEST_PROTOCOL).dump(obj)
+    return f.getvalue()
+
+
+def dump_spilled(expr, path: str) -> None:
+    with open(path, "wb") as f:
+        CompactPickler(f, pickle.HIGHEST_PROTOCOL).dump(expr)
+
+
+def load_spilled(path: str):
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def out_rules(definitions) -> List[Tuple[int, Rule]]:
+    """
+    Return the ``Out[n] -> result`` rules, with their line numbers.
+    """
+    definition = definitions.user.get("System`Out")
+    if definition is None:
+        return []
+    rules = []
+    for rule in definition.downvalues:
+        lhs = rule.pattern.expr
+        if (
+            isinstance(rule, Rule)
+            and len(lhs.elements) == 1
+            and isinstance(lhs.elements[0], Integer)
+        ):
+            rules.append((lhs.elements[0].value, rule))
+    return rules
+
+
+def _unpickled(value):
+    return value
+
+
+def is_spilled_file(path: str) -> bool:
+    """
+    Return True if ``path`` is in the directory of an OutHistory of this
+    process that has spilled results.
+    """
+    directory = osp.dirname(osp.realpath(path))
+    return any(directory == osp.realpath(store.directory) for store in spilled_stores)
+
+
+class _ExpandingPickler(CompactPickler):
+    """
+    A Pickler that writes the result that a ``Settings`SpilledOut["file"]``
+    stands for in its place.
+    """
+
+    def reducer_override(self, obj):
+        path = spilled_file(obj)
+        if path is None or not is_spilled_file(path):
+            return super().reducer_override(obj)
+        return _unpickled, (load_spilled(path),)
+
+
+def dumps_with_spilled(obj) -> bytes:
+    """
+    ``pickle.dumps(obj)``, except that spilled Out[] results are read back
+    and pickled in place of the names of their files.
+    """
+    if not spilled_stores:
+        return pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+    f = io.BytesIO()
+    _ExpandingPickler(f, pickle.HIGHEST_PROTOCOL).dump(obj)
+    return f.getvalue()
+
+
+def remove_stale_stores(directory: str = DEFAULT_OUT_HISTORY_DIR) -> None:
+    """
+    Remove the files left by sessions whose process is gone.
+    """
+    try:
+        entries = os.listdir(directory)
+    except OSError:
+        return
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+        try:
+            os.kill(int(entry), 0)
+        except ProcessLookupError:
+            shutil.rmtree(osp.join(directory, entry), ignore_errors=True)
+        except OSError:
+            pass
+
+
+# OutHistory objects that have written files, so that pickling has to
+# look for spilled results.
+spilled_stores: List["OutHistory"] = []
+
+
+class OutHistory:
+    """
+    Keeps the Out[] results of a session within
+    ``Settings`$OutHistoryMemoryLimit``, by spilling older ones to files
+    in ``directory``.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        if directory is None:
+            remove_stale_stores()
+            directory = osp.join(DEFAULT_OUT_HISTORY_DIR, str(os.getpid()))
+        self.directory = directory
+        # The size of each result in memory, by the id of the result.
+        self.sizes: Dict[int, int] = {}
+        # The file of each spilled result, by line number.
+        self.spilled: Dict[int, str] = {}
+        self.file_count = 0
+
+    def update(self, definitions) -> int:
+        """
+        Spill older Out[] results until those left in memory fit the
+        limit, and remove the files of results that are gone. Return the
+        number of results spilled.
+        """
+        in_memory: Dict[int, List[Tuple[int, Rule]]] = {}
+        live_files = set()
+        for line, rule in out_rules(definitions):
+            path = spilled_file(rule.replace)
+            if path is None:
+                in_memory.setdefault(id(rule.replace), []).append((line, rule))
+            elif self.spilled.get(line) == path:
+                live_files.add(path)
+        for line, path in list(self.spilled.items()):
+            if path not in live_files:
+                del self.spilled[line]
+                if path not in self.spilled.values():
+                    self.remove_file(path)
+        self.sizes = {key: self.sizes[key] for key in in_memory if key in self.sizes}
+
+        limit = get_out_history_limit(definitions)
+        if limit is None or not in_memory:
+            return 0
+
+        # Each result is counted once, however many lines it is the result
+        # of, at its latest line.
+        by_age = sorted(
+            in_memory.items(), key=lambda item: -max(line for line, _ in item[1])
+        )
+        total = 0
+        count = 0
+        for i, (key, rules) in enumerate(by_age):
+            size = self.sizes.get(key)
+            if size is None:
+                size = self.sizes[key] = expression_size(rules[0][1].replace)
+            total += size
+            if i > 0 and total > limit and size >= SMALL_RESULT_SIZE:
+                self.spill(definitions, rules)
+                del self.sizes[key]
+                total -= size
+                count += len(rules)
+        return count
+
+    def spill(self, definitions, rules: List[Tuple[int, Rule]]) -> None:
+        """
+        Write the result of ``rules``, the Out[] rules of the lines that
+        share it, to a file, and point the rules at that file.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        self.file_count += 1
+        path = osp.join(self.directory, f"out-{rules[0][0]}-{self.file_count}")
+        dump_spilled(rules[0][1].replace, path)
+        if self not in spilled_stores:
+            spilled_stores.append(self)
+        marker = Expression(SymbolSpilledOut, String(path))
+        for line, _ in rules:
+            definitions.add_rule(
+                "System`Out", Rule(Expression(SymbolOut, Integer(line)), marker)
+            )
+            self.spilled[line] = path
+
+    def remove_file(self, path: str) -> None:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+    def close(self) -> None:
+        """
+        Remove the files of this session. Spilled results can't be used
+        after this.
+        """
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.spilled.clear()
+        if self in spilled_stores:
+            spilled_stores.remove(self)
+
+
+class SpilledOut(Builtin):
+    """
+    <dl>
+      <dt>'Settings`SpilledOut["file"]'
+      <dd>reads back an Out[] result that was written to "file" to keep \
+      the session within 'Settings`$OutHistoryMemoryLimit'.
+    </dl>
+    """
+
+    context = "Settings`"
+    messages = {
+        "noread": "The result saved in `1` cannot be read: `2`.",
+        "nostore": "`1` is not a file of this session's Out[] history.",
+    }
+    summary_text = "read back an Out[] result kept on disk"
+
+    def eval(self, file, evaluation):
+        "Settings`SpilledOut[file_String]"
+        if not is_spilled_file(file.value):
+            evaluation.message("Settings`SpilledOut", "nostore", file)
+            return SymbolFailed
+        try:
+            return load_spilled(file.value)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            evaluation.message("Settings`SpilledOut", "noread", file, String(str(e)))
+            return SymbolFailed
+
+
+def install_out_history_builtins(definitions) -> None:
+    SpilledOut(expression=False).contribute(definitions)
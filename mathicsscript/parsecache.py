@@ -0,0 +1,308 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+A cache of the parsed statements of script and package files, used by
+``mathicsscript -f FILE`` and by Get[].
+
+Tokenizing and parsing a large generated package can take longer than
+evaluating it. The first time a file of at least MIN_CACHED_SIZE bytes is
+read, each of its statements is kept, pickled, as it is parsed, and once
+the whole file has been read without a syntax error they are saved in
+PARSE_CACHE_DIR. After that, reading the file unpickles its statements
+instead of parsing it again, as long as its size, modification time and
+contents, and the versions of the parser, are the same.
+
+How a statement is parsed depends on ``$Context`` and ``$ContextPath``
+at the time, which a package changes as it is read with BeginPackage[]
+and Begin[]. So along with each statement we keep the full name that
+each symbol name in it was given. A cached statement is used only if
+those names still come out the same, and is otherwise parsed again from
+its source text.
+
+``install_parse_cache()`` hooks this into Mathics3 parsing, which calls
+``mathics.core.parser.util.parse_returning_code()`` for each statement,
+and into Get[], which makes its feeder with
+``mathics.eval.files_io.files.MathicsFileLineFeeder``.
+"""
+
+import gc
+import hashlib
+import os
+import os.path as osp
+import pickle
+import sys
+import tempfile
+from contextlib import contextmanager
+from typing import List, NamedTuple, Optional, Tuple
+
+import mathics_scanner
+from mathics import version_info
+from mathics.core.element import BaseElement
+from mathics.core.parser import MathicsFileLineFeeder, MathicsMultiLineFeeder
+from mathics.core.parser.convert import Converter
+from mathics.core.parser.feed import MathicsLineFeeder
+from mathics_scanner.location import ContainerKind
+
+from mathicsscript.outhistory import compact_dumps
+from mathicsscript.termshell import CONFIGDIR
+
+CACHE_FORMAT_VERSION = 1
+
+PARSE_CACHE_DIR = osp.join(CONFIGDIR, "parse-cache")
+
+# Smaller files are parsed about as fast as their cache can be read.
+MIN_CACHED_SIZE = 64 * 1024
+
+
+class Statement(NamedTuple):
+    source_text: str
+    # (name, full name) of each symbol name looked up in parsing it.
+    lookups: Tuple[Tuple[str, str], ...]
+    expr: BaseElement
+
+
+def parser_version() -> tuple:
+    return (
+        CACHE_FORMAT_VERSION,
+        version_info["mathics"],
+        mathics_scanner.__version__,
+        sys.version_info[:2],
+    )
+
+
+def cache_path(path: str, cache_dir: str = PARSE_CACHE_DIR) -> str:
+    name = hashlib.sha1(osp.abspath(path).encode("utf-8")).hexdigest()
+    return osp.join(cache_dir, name + ".pickle")
+
+
+def file_header(path: str, encoding: Optional[str]) -> dict:
+    """
+    Return what identifies the contents of file ``path`` read with
+    ``encoding``, and the parser that reads it.
+    """
+    stat = os.stat(path)
+    with open(path, "rb") as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    return {
+        "version": parser_version(),
+        "encoding": encoding,
+        "size": stat.st_size,
+        "mtime": stat.st_mtime_ns,
+        "sha1": digest,
+    }
+
+
+@contextmanager
+def gc_paused():
+    """
+    Turn off the cyclic garbage collector, which pickling and unpickling
+    many objects at once would otherwise set off over and over.
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def read_parse_cache(
+    path: str, encoding: Optional[str], cache_dir: str = PARSE_CACHE_DIR
+) -> Optional[List[Statement]]:
+    """
+    Return the statements cached for file ``path``, or None if there are
+    none for its current contents.
+    """
+    try:
+        with open(cache_path(path, cache_dir), "rb") as f:
+            if pickle.load(f) != file_header(path, encoding):
+                return None
+            with gc_paused():
+                return pickle.load(f)
+    except Exception:
+        return None
+
+
+def write_parse_cache(
+    path: str,
+    encoding: Optional[str],
+    statements: List[Statement],
+    cache_dir: str = PARSE_CACHE_DIR,
+) -> None:
+    cache_file = cache_path(path, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(file_header(path, encoding), f, pickle.HIGHEST_PROTOCOL)
+            f.write(compact_dumps(statements))
+        os.replace(tmp_path, cache_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+class RecordingLookup:
+    """
+    Stands in for Definitions in converting a parsed statement, noting
+    the full name given to each symbol name.
+    """
+
+    def __init__(self, definitions):
+        self.definitions = definitions
+        self.lookups = {}
+
+    def lookup_name(self, name: str) -> str:
+        full_name = self.lookups[name] = self.definitions.lookup_name(name)
+        return full_name
+
+
+converter = Converter()
+
+
+class ParsedFileFeeder(MathicsLineFeeder):
+    """
+    Feeds the cached statements of a file, rather than its lines.
+    """
+
+    def __init__(self, path: str, statements: List[Statement]):
+        super().__init__(path, container_kind=ContainerKind.FILE)
+        self.statements = statements
+        self.position = 0
+
+    def feed(self) -> str:
+        return ""
+
+    def empty(self) -> bool:
+        return self.position >= len(self.statements)
+
+    def parse_next(self, definitions) -> tuple:
+        if self.empty():
+            return None, ""
+        statement = self.statements[self.position]
+        self.position += 1
+        lookup_name = definitions.lookup_name
+        if all(lookup_name(name) == full for name, full in statement.lookups):
+            return statement.expr, statement.source_text
+
+        # The contexts aren't what they were when the file was cached.
+        feeder = MathicsMultiLineFeeder(
+            statement.source_text, self.container, ContainerKind.FILE
+        )
+        result = original_parse_returning_code(definitions, feeder)
+        self.messages.extend(feeder.messages)
+        return result
+
+
+class RecordingFileFeeder(MathicsFileLineFeeder):
+    """
+    Feeds the lines of a file as usual, and keeps its statements as they
+    are parsed, to be cached once it has all been read. A statement is
+    kept pickled until then, since evaluating it leaves state in it that
+    is only good for this run.
+    """
+
+    def __init__(self, fileobject, cache_dir: str = PARSE_CACHE_DIR):
+        super().__init__(fileobject)
+        self.path = fileobject.name
+        self.encoding = getattr(fileobject, "encoding", None)
+        self.cache_dir = cache_dir
+        # Statements with their expression pickled.
+        self.statements: List[Statement] = []
+        self.cacheable = True
+
+    def parse_next(self, definitions) -> tuple:
+        from mathics.core.parser.util import parser
+
+        try:
+            ast = parser.parse(self)
+        except SyntaxError:
+            self.cacheable = False
+            raise
+        if self.messages:
+            self.cacheable = False
+        source_text = parser.tokeniser.source_text
+
+        result = None
+        if ast is not None:
+            recorder = RecordingLookup(definitions)
+            result = converter.convert(ast, recorder)
+            if self.cacheable:
+                self.statements.append(
+                    Statement(
+                        source_text,
+                        tuple(recorder.lookups.items()),
+                        compact_dumps(result),
+                    )
+                )
+        if self.empty() and self.cacheable:
+            self.cacheable = False
+            try:
+                with gc_paused():
+                    statements = [
+                        statement._replace(expr=pickle.loads(statement.expr))
+                        for statement in self.statements
+                    ]
+                    write_parse_cache(
+                        self.path, self.encoding, statements, self.cache_dir
+                    )
+            except OSError:
+                pass
+        return result, source_text
+
+
+def file_feeder(fileobject, trace_fn=None, cache_dir: str = PARSE_CACHE_DIR):
+    """
+    Return a feeder for the statements of the open file ``fileobject``,
+    which uses its cache if it has one, or else makes one. Tracing, which
+    shows the lines of the file, gets a MathicsFileLineFeeder.
+    """
+    path = getattr(fileobject, "name", None)
+    if trace_fn is not None or not isinstance(path, str):
+        return MathicsFileLineFeeder(fileobject, trace_fn)
+    try:
+        if os.stat(path).st_size < MIN_CACHED_SIZE:
+            return MathicsFileLineFeeder(fileobject)
+    except OSError:
+        return MathicsFileLineFeeder(fileobject)
+    # The feeders below are only understood once parsing is hooked.
+    install_parse_cache()
+    encoding = getattr(fileobject, "encoding", None)
+    statements = read_parse_cache(path, encoding, cache_dir)
+    if statements is not None:
+        return ParsedFileFeeder(path, statements)
+    return RecordingFileFeeder(fileobject, cache_dir)
+
+
+original_parse_returning_code = None
+
+
+def parse_returning_code(definitions, feeder) -> tuple:
+    if isinstance(feeder, (ParsedFileFeeder, RecordingFileFeeder)):
+        return feeder.parse_next(definitions)
+    return original_parse_returning_code(definitions, feeder)
+
+
+def install_parse_cache() -> None:
+    global original_parse_returning_code
+
+    import mathics.core.parser.util as parser_util
+    import mathics.eval.files_io.files as eval_files
+
+    if original_parse_returning_code is None:
+        original_parse_returning_code = parser_util.parse_returning_code
+        parser_util.parse_returning_code = parse_returning_code
+        eval_files.MathicsFileLineFeeder = file_feeder
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Python-level profiling of a single mathicsscript input.
+
+This is reached from the ``!!profile`` shell escape in
+``interactive_eval_loop``. The profilers, cProfile, tracemalloc and
+pstats, are imported only when the escape is used, so ordinary
+evaluation pays nothing for them. Like the other shell escapes, it is
+disabled in sandboxed mode, since ``--output`` writes a file.
+
+Usage:
+
+    !!profile [--memory] [--no-cpu] [--limit N] [--sort KEY] [--output FILE] expr
+
+``--memory`` (or ``-m``) traces allocations with tracemalloc,
+``--output`` (or ``-o``) saves the cProfile data in a ``.prof`` file that can
+be read with ``pstats`` or tools like snakeviz.
+"""
+
+import io
+from typing import Any, Callable, NamedTuple, Optional
+
+PROFILE_ESCAPE = "!!profile"
+
+PROFILE_USAGE = """Usage: !!profile [options] expr
+Options:
+	--memory (or -m)       also trace memory allocations with tracemalloc
+	--no-cpu               do not run cProfile
+	--limit (or -n) N      number of entries to show (default 20)
+	--sort (or -s) KEY     pstats sort key (default "cumulative")
+	--output (or -o) FILE  save cProfile data to FILE
+"""
+
+
+class ProfileOptions(NamedTuple):
+    expr: str
+    cpu: bool = True
+    memory: bool = False
+    limit: int = 20
+    sort: str = "cumulative"
+    output: Optional[str] = None
+
+
+def is_profile_command(line: str) -> bool:
+    """
+    Return True if ``line`` is a ``!!profile`` shell escape.
+    """
+    return line == PROFILE_ESCAPE or line.startswith(PROFILE_ESCAPE + " ")
+
+
+def parse_profile_command(line: str) -> ProfileOptions:
+    """
+    Split a ``!!profile`` line into its options and the Mathics3 expression
+    to profile. Options must come before the expression.
+
+    ValueError is raised on a malformed line.
+    """
+    rest = line[len(PROFILE_ESCAPE) :].strip()
+    options = {}
+    while rest.startswith("-"):
+        option, _, rest = rest.partition(" ")
+        rest = rest.lstrip()
+        if option in ("-m", "--memory"):
+            options["memory"] = True
+        elif option == "--no-cpu":
+            options["cpu"] = False
+        elif option in ("-n", "--limit", "-s", "--sort", "-o", "--output"):
+            value, _, rest = rest.partition(" ")
+            rest = rest.lstrip()
+            if not value:
+                raise ValueError(f"option {option} needs a value")
+            if option in ("-n", "--limit"):
+                try:
+                    options["limit"] = int(value)
+                except ValueError:
+                    raise ValueError(f"option {option} needs an integer, got {value}")
+            elif option in ("-s", "--sort"):
+                options["sort"] = value
+            else:
+                options["output"] = value
+        else:
+            raise ValueError(f"unknown option {option}")
+
+    if not rest:
+        raise ValueError("no expression given to profile")
+    return ProfileOptions(rest, **options)
+
+
+def run_profiled(
+    fn: Callable[[], Any], options: ProfileOptions, print_fn: Callable = print
+) -> Any:
+    """
+    Call ``fn`` under cProfile and/or tracemalloc as directed by
+    ``options``. Report hotspots and allocation sites using ``print_fn``
+    and return what ``fn`` returns.
+    """
+    profiler = None
+    if options.cpu:
+        import cProfile
+
+        profiler = cProfile.Profile()
+
+    was_tracing = False
+    if options.memory:
+        import tracemalloc
+
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        memory_start = tracemalloc.take_snapshot()
+
+    try:
+        if profiler is not None:
+            result = profiler.runcall(fn)
+        else:
+            result = fn()
+    finally:
+        if options.memory:
+            memory_end = tracemalloc.take_snapshot()
+            _, peak = tracemalloc.get_traced_memory()
+            if not was_tracing:
+                tracemalloc.stop()
+
+    if profiler is not None:
+        import pstats
+
+        stream = io.StringIO()
+        try:
+            stats = pstats.Stats(profiler, stream=stream).sort_stats(options.sort)
+        except KeyError:
+            print_fn(f'Unknown sort key "{options.sort}"; using "cumulative"')
+            stats = pstats.Stats(profiler, stream=stream).sort_stats("cumulative")
+        stats.print_stats(options.limit)
+        print_fn(stream.getvalue().rstrip())
+        if options.output:
+            try:
+                profiler.dump_stats(options.output)
+            except OSError as e:
+                print_fn(f"Can't write profile data to {options.output}: {e}")
+            else:
+                print_fn(f"Profile data written to {options.output}")
+
+    if options.memory:
+        print_fn(f"\nPeak traced memory: {peak / 1024:.1f} KiB")
+        print_fn(f"Top {options.limit} allocating call sites:")
+        for stat in memory_end.compare_to(memory_start, "lineno")[: options.limit]:
+            print_fn(f"  {stat}")
+
+    return result
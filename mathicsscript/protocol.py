@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+The framing used by ``mathicsscript --serve``.
+
+A message is a JSON object encoded in UTF-8, preceded by its length in
+bytes as a 4-byte big-endian unsigned integer. Both requests and
+responses are framed this way.
+
+A request has an "op" field naming the operation, and usually an "id"
+field, which is copied into the response so that a client can match
+responses to requests. See mathicsscript.server for the operations.
+
+Functions are given for both asyncio streams, used by the server, and
+blocking sockets, used by mathicsscript.client.
+"""
+
+import json
+import socket
+import struct
+from typing import Optional
+
+HEADER = struct.Struct(">I")
+
+# Refuse messages longer than this, which are more likely to be garbage
+# than real requests.
+MAX_MESSAGE_SIZE = 64 * 1024 * 1024
+
+
+class ProtocolError(Exception):
+    """
+    A peer sent something that isn't a properly framed JSON object.
+    """
+
+
+def encode_message(message: dict) -> bytes:
+    body = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    if len(body) > MAX_MESSAGE_SIZE:
+        raise ProtocolError(f"message of {len(body)} bytes is too long")
+    return HEADER.pack(len(body)) + body
+
+
+def decode_body(body: bytes) -> dict:
+    try:
+        message = json.loads(body.decode("utf-8"))
+    except (UnicodeDecodeError, ValueError) as e:
+        raise ProtocolError(f"invalid message: {e}")
+    if not isinstance(message, dict):
+        raise ProtocolError("a message must be a JSON object")
+    return message
+
+
+def check_length(length: int) -> int:
+    if length > MAX_MESSAGE_SIZE:
+        raise ProtocolError(f"message of {length} bytes is too long")
+    return length
+
+
+async def read_message(reader) -> Optional[dict]:
+    """
+    Read a message from an asyncio StreamReader. Return None if the peer
+    closed the connection between messages.
+    """
+    import asyncio
+
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError as e:
+        if e.partial:
+            raise ProtocolError("connection closed inside a message header")
+        return None
+    (length,) = HEADER.unpack(header)
+    try:
+        body = await reader.readexactly(check_length(length))
+    except asyncio.IncompleteReadError:
+        raise ProtocolError("connection closed inside a message")
+    return decode_body(body)
+
+
+async def write_message(writer, message: dict) -> None:
+    """
+    Write a message to an asyncio StreamWriter.
+    """
+    writer.write(encode_message(message))
+    await writer.drain()
+
+
+def recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size > 0:
+        chunk = sock.recv(min(size, 1024 * 1024))
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_message(sock: socket.socket) -> Optional[dict]:
+    """
+    Read a message from a blocking socket. Return None if the peer closed
+    the connection between messages.
+    """
+    header = recv_exactly(sock, HEADER.size)
+    if not header:
+        return None
+    if len(header) < HEADER.size:
+        raise ProtocolError("connection closed inside a message header")
+    (length,) = HEADER.unpack(header)
+    body = recv_exactly(sock, check_length(length))
+    if len(body) < length:
+        raise ProtocolError("connection closed inside a message")
+    return decode_body(body)
+
+
+def send_message(sock: socket.socket, message: dict) -> None:
+    """
+    Write a message to a blocking socket.
+    """
+    sock.sendall(encode_message(message))
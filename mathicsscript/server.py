@@ -0,0 +1,365 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+A Mathics3 kernel served over a Unix domain socket:
+``mathicsscript --serve SOCKET``.
+
+Clients send requests framed as described in mathicsscript.protocol.
+Each request is a JSON object with an "op" field and an optional "id"
+field, which is copied into the response. Every response has an "ok"
+field; when it is false, "error" says what went wrong.
+
+Operations:
+
+    evaluate   "code": Mathics3 source, which may hold several expressions.
+               The response's "results" is a list with an object for each
+               expression, in the form written by --output-format jsonl.
+    interrupt  Abort the evaluation in progress, if any. "interrupted"
+               in the response says whether there was one.
+    complete   "text": input text, "cursor": optional cursor offset into
+               "text". The response's "completions" is a list of
+               {"text", "start"} objects, where "start" is the (negative)
+               offset from the cursor of the text that is replaced.
+    shutdown   Stop the server once the response has been sent.
+
+All clients share one set of Definitions. Evaluations are done one at a
+time in a worker thread, in the order they are received, so that the
+server keeps reading requests, interrupts in particular, while an
+evaluation runs. Completions are done in that thread too, so that they
+don't look through the definitions while an evaluation changes them. An interrupt marks the evaluation in progress as
+interrupted, and it is aborted, just as choosing "abort" after a
+CONTROL-C does in the REPL, the next time it checks whether it has been
+stopped. Mathics3 checks this as it evaluates each expression, but a
+long-running call into SymPy or mpmath is not stopped until it returns.
+"""
+
+import asyncio
+import gc
+import os
+import socket
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from mathics.core.parser import MathicsMultiLineFeeder
+
+from mathicsscript.jsonl_output import JSONLinesEvaluation, iter_feeder_records
+from mathicsscript.protocol import ProtocolError, read_message, write_message
+
+
+def check_socket_path(socket_path: str) -> None:
+    """
+    Remove a socket left behind by a server that is no longer running.
+    Raise OSError if ``socket_path`` is some other kind of file or
+    another server is listening on it.
+    """
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(f"{socket_path} exists and is not a socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except ConnectionRefusedError:
+            os.unlink(socket_path)
+            return
+    raise OSError(f"a server is already listening on {socket_path}")
+
+
+# Memory set aside so that there is enough to report running out of it.
+MEMORY_RESERVE_SIZE = 4 * 1024 * 1024
+
+# The message for an evaluation that ran out of memory.
+NO_MEMORY_TEXT = (
+    "The current computation was aborted because there was insufficient "
+    "memory available to complete the computation."
+)
+
+
+class KernelServer:
+    """
+    Serve evaluation, completion and interrupts for ``definitions`` to
+    clients connecting on ``socket_path``, or, for a session started by
+    mathicsscript.sessions, to the single client of ``serve_connection()``.
+
+    If ``idle_timeout`` is given, a client that sends no request for that
+    many seconds, while nothing is being evaluated, is disconnected.
+    """
+
+    def __init__(
+        self,
+        definitions,
+        socket_path: Optional[str] = None,
+        timeout=None,
+        idle_timeout: Optional[float] = None,
+    ):
+        self.definitions = definitions
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        # A single thread, so evaluations are done in the order received.
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="mathicsscript-eval"
+        )
+        # The evaluation in progress, while there is one to interrupt.
+        self.evaluation: Optional[JSONLinesEvaluation] = None
+        self.evaluation_lock = threading.Lock()
+        self.completer = None
+        self.shutdown_requested: Optional[asyncio.Event] = None
+        self.memory_reserve: Optional[bytearray] = bytearray(MEMORY_RESERVE_SIZE)
+        # Memory used before running out is not reliably given back, so
+        # after that the server stops once it has sent its response.
+        self.out_of_memory = False
+
+    def evaluate(self, code: str) -> list:
+        """
+        Evaluate ``code`` and return the list of results. This is run in
+        the worker thread.
+        """
+        feeder = MathicsMultiLineFeeder(code, "")
+        records = []
+        try:
+            for record, _ in iter_feeder_records(
+                self.definitions,
+                feeder,
+                self.timeout,
+                on_evaluation=self.start_evaluation,
+            ):
+                records.append(record)
+        except SystemExit:
+            # Quit[] ends the evaluation, which is reported in its
+            # result's "exit" field, but not the server.
+            pass
+        except MemoryError:
+            # For a session, this is its memory limit being reached.
+            # The rest of the code is not evaluated.
+            self.out_of_memory = True
+            self.memory_reserve = None
+            gc.collect()
+            records.append(
+                {
+                    "line": None,
+                    "input": None,
+                    "result": None,
+                    "fullform": None,
+                    "head": None,
+                    "messages": [
+                        {
+                            "symbol": "General",
+                            "tag": "nomem",
+                            "text": NO_MEMORY_TEXT,
+                        }
+                    ],
+                    "prints": [],
+                    "timing": None,
+                    "exc_result": "$Aborted",
+                }
+            )
+        finally:
+            with self.evaluation_lock:
+                self.evaluation = None
+        return records
+
+    def start_evaluation(self, evaluation: JSONLinesEvaluation) -> None:
+        with self.evaluation_lock:
+            self.evaluation = evaluation
+
+    def interrupt(self) -> bool:
+        """
+        Abort the evaluation in progress, if there is one, so that its
+        result is $Aborted. Return True if there was one.
+        """
+        with self.evaluation_lock:
+            if self.evaluation is None:
+                return False
+            self.evaluation.interrupted = True
+            return True
+
+    def complete(self, text: str, cursor: Optional[int] = None) -> list:
+        """
+        Return the completions of ``text`` at ``cursor``. This is run in
+        the worker thread too, so that evaluation doesn't change the
+        definitions while they are looked through.
+        """
+        from prompt_toolkit.completion import CompleteEvent
+        from prompt_toolkit.document import Document
+
+        from mathicsscript.completion import Mathics3Completer
+
+        if self.completer is None:
+            self.completer = Mathics3Completer(self.definitions)
+        document = Document(text, len(text) if cursor is None else cursor)
+        return [
+            {"text": completion.text, "start": completion.start_position}
+            for completion in self.completer.get_completions(document, CompleteEvent())
+        ]
+
+    async def handle_request(self, request: dict) -> dict:
+        op = request.get("op")
+        if op == "evaluate":
+            code = request.get("code")
+            if not isinstance(code, str):
+                raise ValueError('"evaluate" needs a "code" string')
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(self.executor, self.evaluate, code)
+            return {"results": results}
+        elif op == "interrupt":
+            return {"interrupted": self.interrupt()}
+        elif op == "complete":
+            text = request.get("text")
+            if not isinstance(text, str):
+                raise ValueError('"complete" needs a "text" string')
+            loop = asyncio.get_running_loop()
+            completions = await loop.run_in_executor(
+                self.executor, self.complete, text, request.get("cursor")
+            )
+            return {"completions": completions}
+        elif op == "shutdown":
+            self.interrupt()
+            self.shutdown_requested.set()
+            return {}
+        raise ValueError(f"unknown operation {op!r}")
+
+    async def respond(self, writer, request: dict) -> None:
+        response = {"id": request.get("id")}
+        try:
+            response.update(await self.handle_request(request))
+            response["ok"] = True
+        except Exception as e:
+            response.update(ok=False, error=str(e))
+        try:
+            await write_message(writer, response)
+        except ConnectionError:
+            # The client has gone away.
+            pass
+        if self.out_of_memory:
+            self.shutdown_requested.set()
+
+    async def handle_client(
+        self, reader, writer, first_request: Optional[dict] = None
+    ) -> None:
+        """
+        Respond to the requests from a client, starting with
+        ``first_request`` if it has already been read, until the client
+        disconnects or has been idle for too long.
+        """
+        # Requests are handled concurrently, so that an interrupt isn't
+        # stuck behind the evaluation it is meant to stop.
+        tasks = set()
+        last_activity = time.monotonic()
+
+        def start_task(request: dict):
+            task = asyncio.create_task(self.respond(writer, request))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+        try:
+            if first_request is not None:
+                start_task(first_request)
+            while True:
+                read = asyncio.ensure_future(read_message(reader))
+                while not read.done():
+                    # Evaluations in progress keep the client from
+                    # being idle, so check again every so often.
+                    await asyncio.wait({read}, timeout=self.idle_timeout)
+                    if tasks:
+                        last_activity = time.monotonic()
+                    elif (
+                        not read.done()
+                        and time.monotonic() - last_activity >= self.idle_timeout
+                    ):
+                        read.cancel()
+                        await write_message(
+                            writer,
+                            {
+                                "id": None,
+                                "ok": False,
+                                "error": f"idle for {self.idle_timeout} seconds",
+                            },
+                        )
+                        return
+                try:
+                    request = read.result()
+                except ProtocolError as e:
+                    await write_message(
+                        writer, {"id": None, "ok": False, "error": str(e)}
+                    )
+                    break
+                if request is None:
+                    break
+                last_activity = time.monotonic()
+                start_task(request)
+            if tasks:
+                await asyncio.wait(tasks)
+        except (ConnectionError, asyncio.CancelledError):
+            # The client went away, or the server is shutting down.
+            pass
+        finally:
+            writer.close()
+
+    async def serve_connection(
+        self, sock: socket.socket, first_request: Optional[dict] = None
+    ) -> None:
+        """
+        Serve the client on the connected socket ``sock`` until it
+        disconnects, is idle for too long, or asks for shutdown.
+        """
+        self.shutdown_requested = asyncio.Event()
+        reader, writer = await asyncio.open_unix_connection(sock=sock)
+        client = asyncio.ensure_future(
+            self.handle_client(reader, writer, first_request)
+        )
+        shutdown = asyncio.ensure_future(self.shutdown_requested.wait())
+        try:
+            await asyncio.wait({client, shutdown}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            shutdown.cancel()
+            if not client.done():
+                # Give the response to "shutdown" a chance to be sent.
+                await asyncio.sleep(0)
+                writer.close()
+                client.cancel()
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def serve(self) -> None:
+        self.shutdown_requested = asyncio.Event()
+        check_socket_path(self.socket_path)
+        # Only the user running the server can connect to it.
+        old_umask = os.umask(0o077)
+        try:
+            server = await asyncio.start_unix_server(
+                self.handle_client, path=self.socket_path
+            )
+        finally:
+            os.umask(old_umask)
+        try:
+            async with server:
+                await self.shutdown_requested.wait()
+        finally:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def serve(definitions, socket_path: str, timeout=None) -> None:
+    """
+    Serve ``definitions`` on ``socket_path`` until a client asks for
+    shutdown.
+    """
+    asyncio.run(KernelServer(definitions, socket_path, timeout).serve())
@@ -0,0 +1,355 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Many independent sessions from one server:
+``mathicsscript --serve SOCKET --sessions``.
+
+The server process loads the builtin definitions once. Each client
+connection then gets its own session: a worker process forked from the
+server, which starts out sharing the server's memory copy-on-write, so
+that the memory a session adds is mostly just its own definitions.
+Sessions speak the protocol described in mathicsscript.server.
+
+Requests sent on a connection before it starts a session are answered
+by the server process itself:
+
+    status     The response's "sessions" lists each session's process
+               id, its client's process id when known, the time it
+               started, its resident and private memory in bytes, and the
+               CPU seconds it has used. Memory and CPU use are read from
+               /proc and are null where that isn't available.
+    shutdown   End all sessions and stop the server.
+
+Any other request starts a session, which then handles that request and
+all later ones on the connection; "shutdown" from a session ends just
+that session. A session also ends when its client disconnects, or when it
+has been idle for the idle timeout.
+
+With a memory limit, a session's address space may grow by at most that
+much beyond its size when it was started. An evaluation that needs more
+is aborted with a General::nomem message. The limit needs /proc to find
+that size, so it can only be given on Linux.
+"""
+
+import gc
+import os
+import selectors
+import signal
+import socket
+import struct
+import time
+from typing import Dict, NamedTuple, Optional
+
+from mathicsscript.memorylimit import set_memory_limit
+from mathicsscript.protocol import (
+    HEADER,
+    ProtocolError,
+    check_length,
+    decode_body,
+    encode_message,
+)
+from mathicsscript.server import KernelServer, check_socket_path
+
+# How often, in seconds, finished sessions are cleaned up.
+REAP_INTERVAL = 1.0
+
+# How long sessions get to exit after SIGTERM when the server stops.
+SHUTDOWN_GRACE = 5.0
+
+
+class Session(NamedTuple):
+    pid: int
+    client_pid: Optional[int]
+    started: float
+
+
+def peer_pid(conn: socket.socket) -> Optional[int]:
+    """
+    Return the process id of the client on the other end of ``conn``, if
+    the OS tells us.
+    """
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    try:
+        creds = conn.getsockopt(
+            socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i")
+        )
+    except OSError:
+        return None
+    pid, _uid, _gid = struct.unpack("3i", creds)
+    return pid
+
+
+def process_usage(pid: int) -> dict:
+    """
+    Return the resident memory, private memory and CPU seconds of
+    process ``pid``, from /proc. Values that can't be found are None.
+    """
+    usage = {"rss": None, "private": None, "cpu_seconds": None}
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            usage["rss"] = int(f.read().split()[1]) * page_size
+        with open(f"/proc/{pid}/stat") as f:
+            # The command name in field 2 may hold spaces, so split after it.
+            fields = f.read().rsplit(")", 1)[1].split()
+        # utime and stime are fields 14 and 15.
+        usage["cpu_seconds"] = (int(fields[11]) + int(fields[12])) / os.sysconf(
+            "SC_CLK_TCK"
+        )
+    except (OSError, IndexError, ValueError):
+        return usage
+    try:
+        # Memory not shared with the server or other sessions.
+        private_kb = 0
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                if line.startswith(("Private_Clean:", "Private_Dirty:")):
+                    private_kb += int(line.split()[1])
+        usage["private"] = private_kb * 1024
+    except (OSError, IndexError, ValueError):
+        pass
+    return usage
+
+
+def message_length(buffer: bytearray) -> int:
+    """
+    Return the body length given in the header at the start of ``buffer``.
+    """
+    (length,) = HEADER.unpack(buffer[: HEADER.size])
+    return check_length(length)
+
+
+class SessionServer:
+    """
+    Accept connections on ``socket_path`` and start a session for each.
+    See the module docstring.
+    """
+
+    def __init__(
+        self,
+        definitions,
+        socket_path: str,
+        timeout=None,
+        idle_timeout: Optional[float] = None,
+        memory_limit: Optional[int] = None,
+    ):
+        self.definitions = definitions
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.idle_timeout = idle_timeout
+        self.memory_limit = memory_limit
+        self.sessions: Dict[int, Session] = {}
+        # Bytes read so far on connections that haven't started a session.
+        self.pending: Dict[socket.socket, bytearray] = {}
+        self.selector = selectors.DefaultSelector()
+        self.listener: Optional[socket.socket] = None
+        self.shutdown_requested = False
+
+    def status(self) -> list:
+        return [
+            {
+                "pid": session.pid,
+                "client_pid": session.client_pid,
+                "started": session.started,
+                **process_usage(session.pid),
+            }
+            for session in self.sessions.values()
+        ]
+
+    def close_pending(self, conn: socket.socket) -> None:
+        self.selector.unregister(conn)
+        del self.pending[conn]
+        conn.close()
+
+    def reply(self, conn: socket.socket, response: dict) -> None:
+        # Responses are small, so a blocking send won't hold things up.
+        conn.setblocking(True)
+        try:
+            conn.sendall(encode_message(response))
+        except OSError:
+            pass
+        conn.setblocking(False)
+
+    def read_pending(self, conn: socket.socket) -> None:
+        """
+        Read more of the first message on ``conn``, and act on it once it
+        is complete. Only that message is read, so that anything after it
+        is left for the session.
+        """
+        buffer = self.pending[conn]
+        try:
+            if len(buffer) < HEADER.size:
+                wanted = HEADER.size - len(buffer)
+            else:
+                wanted = HEADER.size + message_length(buffer) - len(buffer)
+            try:
+                data = conn.recv(wanted)
+            except BlockingIOError:
+                return
+            except OSError:
+                data = b""
+            if not data:
+                self.close_pending(conn)
+                return
+            buffer += data
+            if len(buffer) < HEADER.size or len(buffer) < HEADER.size + (
+                message_length(buffer)
+            ):
+                return
+            request = decode_body(bytes(buffer[HEADER.size :]))
+        except ProtocolError as e:
+            self.reply(conn, {"id": None, "ok": False, "error": str(e)})
+            self.close_pending(conn)
+            return
+
+        op = request.get("op")
+        if op == "status":
+            del buffer[:]
+            self.reply(
+                conn, {"id": request.get("id"), "ok": True, "sessions": self.status()}
+            )
+        elif op == "shutdown":
+            self.reply(conn, {"id": request.get("id"), "ok": True})
+            self.close_pending(conn)
+            self.shutdown_requested = True
+        else:
+            self.start_session(conn, request)
+
+    def start_session(self, conn: socket.socket, first_request: dict) -> None:
+        self.selector.unregister(conn)
+        del self.pending[conn]
+        client_pid = peer_pid(conn)
+        pid = os.fork()
+        if pid == 0:
+            self.run_session(conn, first_request)
+        self.sessions[pid] = Session(pid, client_pid, time.time())
+        conn.close()
+
+    def run_session(self, conn: socket.socket, first_request: dict) -> None:
+        """
+        Serve the session on ``conn`` in a forked process, then exit.
+        """
+        import asyncio
+
+        exit_code = 0
+        try:
+            # Close what belongs to the server, so that its connections
+            # close when it closes them.
+            self.selector.close()
+            self.listener.close()
+            for other in self.pending:
+                other.close()
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            if self.memory_limit is not None:
+                set_memory_limit(self.memory_limit)
+            conn.setblocking(False)
+            server = KernelServer(
+                self.definitions, timeout=self.timeout, idle_timeout=self.idle_timeout
+            )
+            asyncio.run(server.serve_connection(conn, first_request))
+        except BaseException:
+            exit_code = 1
+        finally:
+            # Don't run anything the server would do on exit.
+            os._exit(exit_code)
+
+    def reap(self) -> None:
+        while self.sessions:
+            try:
+                pid, _ = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.sessions.clear()
+                return
+            if pid == 0:
+                return
+            self.sessions.pop(pid, None)
+
+    def stop_sessions(self) -> None:
+        for pid in self.sessions:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + SHUTDOWN_GRACE
+        while self.sessions and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.05)
+        for pid in self.sessions:
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        while self.sessions:
+            pid, _ = os.waitpid(-1, 0)
+            self.sessions.pop(pid, None)
+
+    def serve(self) -> None:
+        check_socket_path(self.socket_path)
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Only the user running the server can connect to it.
+        old_umask = os.umask(0o077)
+        try:
+            self.listener.bind(self.socket_path)
+        finally:
+            os.umask(old_umask)
+        self.listener.listen()
+        self.listener.setblocking(False)
+        self.selector.register(self.listener, selectors.EVENT_READ)
+
+        # Keep the garbage collector from touching, and so copying, the
+        # objects that sessions share with the server.
+        gc.collect()
+        gc.freeze()
+        # Stop the way a shutdown request does.
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        try:
+            while not self.shutdown_requested:
+                for key, _ in self.selector.select(timeout=REAP_INTERVAL):
+                    if key.fileobj is self.listener:
+                        try:
+                            conn, _ = self.listener.accept()
+                        except BlockingIOError:
+                            continue
+                        conn.setblocking(False)
+                        self.pending[conn] = bytearray()
+                        self.selector.register(conn, selectors.EVENT_READ)
+                    else:
+                        self.read_pending(key.fileobj)
+                self.reap()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            for conn in list(self.pending):
+                self.close_pending(conn)
+            self.selector.close()
+            self.listener.close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            self.stop_sessions()
+
+
+def serve_sessions(
+    definitions,
+    socket_path: str,
+    timeout=None,
+    idle_timeout: Optional[float] = None,
+    memory_limit: Optional[int] = None,
+) -> None:
+    """
+    Serve a session for each client connecting on ``socket_path`` until
+    asked to shut down.
+    """
+    SessionServer(definitions, socket_path, timeout, idle_timeout, memory_limit).serve()
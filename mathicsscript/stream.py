@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Reading input for ``mathicsscript --stdin-stream``.
+
+In this mode mathicsscript sits at the end of a pipe, evaluating each
+expression as soon as it has been completely read, and runs until
+end of file. This lets a long-running producer send many expressions
+to a single mathicsscript process rather than starting one per
+expression.
+"""
+
+import io
+import sys
+
+from mathics.core.parser.feed import MathicsLineFeeder
+from mathics_scanner.location import ContainerKind
+
+# Size of the read buffer on the input file descriptor. A read returns
+# whatever is available in the pipe, up to this much, so a larger buffer
+# doesn't delay a line that is written on its own.
+STREAM_BUFFER_SIZE = 64 * 1024
+
+
+def open_stdin_stream(buffer_size: int = STREAM_BUFFER_SIZE) -> io.TextIOWrapper:
+    """
+    Return a buffered text stream on standard input that leaves the
+    underlying file descriptor open when it is closed.
+    """
+    return io.open(
+        sys.stdin.fileno(),
+        "r",
+        buffering=buffer_size,
+        encoding=sys.stdin.encoding,
+        errors=sys.stdin.errors,
+        closefd=False,
+    )
+
+
+class MathicsStreamLineFeeder(MathicsLineFeeder):
+    """
+    A feeder that feeds lines from an open text stream, such as a pipe.
+
+    Unlike MathicsFileLineFeeder, the text read so far is not kept around,
+    so memory use does not grow with the length of the stream.
+    """
+
+    def __init__(self, stream, container: str = "<stdin>"):
+        super().__init__(container, container_kind=ContainerKind.UNKNOWN)
+        self.stream = stream
+        self.eof = False
+
+    def feed(self) -> str:
+        # As with MathicsFileLineFeeder, blank lines are skipped
+        # rather than handed to the parser one at a time.
+        while True:
+            line = self.stream.readline()
+            if line == "":
+                self.eof = True
+                return line
+            self.lineno += 1
+            if line != "\n":
+                return line
+
+    def empty(self) -> bool:
+        return self.eof
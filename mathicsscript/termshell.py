@@ -1,15 +1,17 @@
 # -*- coding: utf-8 -*-
 #   Copyright (C) 2020-2022, 2024, 2025 Rocky Bernstein <rb@dustyfeet.com>
 
+import contextlib
 import locale
 import os
 import os.path as osp
 import pathlib
-from typing import Any, Union
+import sys
+from functools import cache
+from typing import Any, Callable, List, Union
 
 import mathics_scanner.location
 
-from columnize import columnize
 from mathics.core.atoms import String
 from mathics.core.attributes import attribute_string_to_number
 from mathics.core.expression import Expression, from_python  # strip_context,
@@ -23,17 +25,10 @@ from mathics_pygments.lexer import MathematicaLexer, MToken
 from pygments import format, highlight, lex
 from pygments.formatters import Terminal256Formatter
 from pygments.formatters.terminal import TERMINAL_COLORS
-from pygments.styles import get_all_styles
 from pygments.util import ClassNotFound
 
-# FIXME: __main__ shouldn't be needed. Fix term_background
-from term_background.__main__ import is_dark_background
-
-
 mma_lexer = MathematicaLexer()
 
-ALL_PYGMENTS_STYLES = list(get_all_styles()) + ["None"]
-
 color_scheme = TERMINAL_COLORS.copy()
 color_scheme[MToken.SYMBOL] = ("yellow", "ansibrightyellow")
 color_scheme[MToken.BUILTIN] = ("ansigreen", "ansibrightgreen")
@@ -45,29 +40,55 @@ CONFIGHOME = os.environ.get("XDG_CONFIG_HOME", osp.expanduser("~/.config"))
 CONFIGDIR = osp.join(CONFIGHOME, "Mathics3")
 os.makedirs(CONFIGDIR, exist_ok=True)
 
-try:
-    HISTSIZE = int(os.environ.get("MATHICSSCRIPT_HISTSIZE", 50))
-except Exception:
-    HISTSIZE = 50
-
+# History is now kept by mathicsscript.history; this file is only read
+# to start that off.
 HISTFILE = os.environ.get("MATHICS3_HISTFILE", osp.join(CONFIGDIR, "history"))
 USER_INPUTRC = os.environ.get("MATHICS3_INPUTRC", osp.join(CONFIGDIR, "inputrc"))
 
-# Create HISTFILE if it doesn't exist already
-if not osp.isfile(HISTFILE):
-    pathlib.Path(HISTFILE).touch()
-
 SymbolPygmentsStylesAvailable = Symbol("Settings`PygmentsStylesAvailable")
 
 
+@cache
+def get_all_pygments_styles() -> List[str]:
+    """
+    Return the names of all Pygments styles, plus "None".
+    Finding these involves looking at installed plugins, so we do this
+    only once.
+    """
+    from pygments.styles import get_all_styles
+
+    return list(get_all_styles()) + ["None"]
+
+
 def is_pygments_style(style: str) -> bool:
-    if style not in ALL_PYGMENTS_STYLES:
+    all_pygments_styles = get_all_pygments_styles()
+    if style not in all_pygments_styles:
+        from columnize import columnize
+
         print(f"Pygments style name '{style}' not found.")
-        print(f"Style names are:\n{columnize(ALL_PYGMENTS_STYLES)}")
+        print(f"Style names are:\n{columnize(all_pygments_styles)}")
         return False
     return True
 
 
+def read_inputrc(read_init_file_fn: Callable, use_unicode: bool) -> None:
+    """
+    Read GNU Readline style inputrc
+    """
+    # GNU Readline inputrc $include's paths are relative to itself,
+    # so chdir to its directory before reading the file.
+    parent_dir = pathlib.Path(__file__).parent.absolute()
+    path_context_fn = (
+        parent_dir if sys.version_info < (3, 11) else contextlib.chdir(parent_dir)
+    )
+    with path_context_fn:
+        inputrc = "inputrc-unicode" if use_unicode else "inputrc-no-unicode"
+        try:
+            read_init_file_fn(str(parent_dir / "data" / inputrc))
+        except Exception:
+            pass
+
+
 class ShellEscapeException(Exception):
     def __init__(self, line):
         self.line = line
@@ -90,6 +111,8 @@ class TerminalShellCommon(MathicsLineFeeder):
 
         self.lineno = 0
         self.terminal_formatter = None
+        # A mathicsscript.history.HistoryStore, if input is kept in history.
+        self.history_store = None
         self.prompt = prompt
         self.want_completion = want_completion
 
@@ -100,7 +123,7 @@ class TerminalShellCommon(MathicsLineFeeder):
         self.definitions.set_ownvalue("Settings`$UseUnicode", from_python(use_unicode))
         self.definitions.set_ownvalue(
             "Settings`PygmentsStylesAvailable",
-            from_python(ALL_PYGMENTS_STYLES),
+            from_python(get_all_pygments_styles()),
         )
 
         self.definitions.add_message(
@@ -129,6 +152,13 @@ class TerminalShellCommon(MathicsLineFeeder):
             "Settings`$UseUnicode", attribute_string_to_number["System`Locked"]
         )
 
+    def add_history(self, text: str) -> None:
+        """
+        Add ``text`` to the history of entered input. Shells whose
+        line editor records input itself do nothing here.
+        """
+        return
+
     def change_pygments_style(self, style: str):
         if not style or style == self.pygments_style:
             return False
@@ -329,6 +359,9 @@ class TerminalShellCommon(MathicsLineFeeder):
 
             # If no style given, choose one based on the background.
             if style is None:
+                # FIXME: __main__ shouldn't be needed. Fix term_background
+                from term_background.__main__ import is_dark_background
+
                 dark_background = is_dark_background()
                 if dark_background:
                     style = "inkpot"
@@ -16,24 +16,24 @@ except ImportError:
 
 
 from typing import Final
-from mathicsscript.bindkeys import read_inputrc
+from mathicsscript.history import HISTORY_LOAD_SIZE, HistoryStore
 from mathicsscript.termshell import (
-    CONFIGDIR,
-    HISTSIZE,
     TerminalShellCommon,
     USER_INPUTRC,
+    read_inputrc,
 )
 from mathics.core.symbols import strip_context
-from mathicsscript.settings import NAMED_CHARACTERS
+from mathicsscript.chartables import get_character_tables
 
 try:
     from readline import (
+        add_history,
+        get_current_history_length,
         parse_and_bind,
-        read_history_file,
+        remove_history_item,
+        set_auto_history,
         set_completer,
         set_completer_delims,
-        set_history_length,
-        write_history_file,
     )
 
     have_full_readline = True
@@ -43,18 +43,14 @@ except ImportError:
     def null_fn(*_):
         return
 
-    def write_history_file(_: str):
-        return
-
-    parse_and_bind = read_history_file = set_history_length = null_fn
+    add_history = get_current_history_length = parse_and_bind = null_fn
+    remove_history_item = set_auto_history = null_fn
     set_completer = set_completer_delims = null_fn
 
 
 RL_COMPLETER_DELIMS_WITH_BRACE: Final[str] = " \t\n_~!@#%^&*()-=+{]}|;:'\",<>/?"
 RL_COMPLETER_DELIMS: Final[str] = " \t\n_~!@#%^&*()-=+[{]}\\|;:'\",<>/?"
 
-HISTFILE: Final[str] = osp.join(CONFIGDIR, "history-gnu")
-
 
 class TerminalShellGNUReadline(TerminalShellCommon):
     def __init__(
@@ -69,7 +65,6 @@ class TerminalShellGNUReadline(TerminalShellCommon):
 
         # Try importing readline to enable arrow keys support etc.
         self.using_readline = False
-        self.history_length = definitions.get_config_value("$HistoryLength", HISTSIZE)
         if have_full_readline and want_readline:
             self.using_readline = sys.stdin.isatty() and sys.stdout.isatty()
             self.ansi_color_re = re.compile("\033\\[[0-9;]+m")
@@ -78,9 +73,7 @@ class TerminalShellGNUReadline(TerminalShellCommon):
                     lambda text, state: self.complete_symbol_name(text, state)
                 )
 
-                self.named_character_names = set(
-                    NAMED_CHARACTERS["named-characters"].keys()
-                )
+                self.named_character_names = get_character_tables()["named-characters"]
 
                 # Make _ a delimiter, but not $ or `
                 # set_completer_delims(RL_COMPLETER_DELIMS)
@@ -100,21 +93,25 @@ class TerminalShellGNUReadline(TerminalShellCommon):
                 parse_and_bind("tab: complete")
                 self.completion_candidates = []
 
-            # History
-            try:
-                read_history_file(HISTFILE)
-            except FileNotFoundError:
-                # Create an empty history file.
-                with open(HISTFILE, "w"):
-                    pass
-            except IOError:
-                pass
-            except:  # noqa
-                # PyPy read_history_file fails
-                pass
-
-            set_history_length(self.history_length)
-            atexit.register(self.user_write_history_file)
+        if self.using_readline:
+            # Each line read would otherwise be added to history, so that
+            # an input of many lines added as many entries. Instead, the
+            # complete input is added once it is read; see add_history().
+            set_auto_history(False)
+
+            # History. Only recent entries are loaded, and only that many
+            # are kept as more are added; "!!history" searches the rest.
+            self.history_store = HistoryStore()
+            for entry in reversed(self.history_store.recent(HISTORY_LOAD_SIZE)):
+                add_history(entry.text)
+            atexit.register(self.history_store.close)
+
+    def add_history(self, text: str) -> None:
+        if self.history_store is not None:
+            add_history(text)
+            if get_current_history_length() > HISTORY_LOAD_SIZE:
+                remove_history_item(0)
+            self.history_store.append(text, "gnu")
 
     def complete_interrupt_command(self, text, state):
         # Only complete from this fixed set
@@ -149,8 +146,7 @@ class TerminalShellGNUReadline(TerminalShellCommon):
         if state == 0:
             self.completion_candidates = [
                 prefix + name + "]"
-                for name in self.named_character_names
-                if name.startswith(text)
+                for name in self.named_character_names.prefixed(text)
             ]
             # self.completion_candidates = self.get_completion_symbol_candidates(prefix, text)
         try:
@@ -185,11 +181,3 @@ class TerminalShellGNUReadline(TerminalShellCommon):
         if "`" not in text:
             matches = [strip_context(m) for m in matches]
         return [prefix + m for m in matches]
-
-    def user_write_history_file(self):
-        try:
-            set_history_length(self.history_length)
-            # print(f"Writing {HISTFILE}")
-            write_history_file(HISTFILE)
-        except:  # noqa
-            pass
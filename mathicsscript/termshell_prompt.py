@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 #   Copyright (C) 2021-2022, 2025 Rocky Bernstein <rb@dustyfeet.com>
 
+import atexit
 import os
 import os.path as osp
 import re
@@ -14,25 +15,48 @@ from mathics_pygments.lexer import MathematicaLexer, MToken
 from prompt_toolkit import HTML, PromptSession, print_formatted_text
 from prompt_toolkit.application.current import get_app
 from prompt_toolkit.enums import EditingMode
-from prompt_toolkit.history import FileHistory
+from prompt_toolkit.history import History
 from prompt_toolkit.lexers import PygmentsLexer
 from prompt_toolkit.styles.pygments import style_from_pygments_cls
 from pygments import format, highlight, lex
 from pygments.styles import get_style_by_name
 
-from mathicsscript.bindkeys import bindings, read_init_file, read_inputrc
+from mathicsscript.bindkeys import bindings, read_init_file
 from mathicsscript.completion import Mathics3Completer
+from mathicsscript.history import HISTORY_LOAD_SIZE, HistoryStore
 from mathicsscript.termshell import (
-    HISTFILE,
-    HISTSIZE,
     USER_INPUTRC,
     ShellEscapeException,
     TerminalShellCommon,
     mma_lexer,
+    read_inputrc,
 )
 from mathicsscript.version import __version__
 
 
+class SQLiteHistory(History):
+    """
+    prompt_toolkit history kept in a HistoryStore. Only the most recent
+    ``load_size`` entries are loaded, and only that many are kept in
+    memory as more are added; "!!history" searches the rest.
+    """
+
+    def __init__(self, store: HistoryStore, load_size: int = HISTORY_LOAD_SIZE):
+        self.store = store
+        self.load_size = load_size
+        super().__init__()
+
+    def load_history_strings(self):
+        return (entry.text for entry in self.store.recent(self.load_size))
+
+    def append_string(self, string: str) -> None:
+        super().append_string(string)
+        del self._loaded_strings[self.load_size :]
+
+    def store_string(self, string: str) -> None:
+        self.store.append(string, "prompt")
+
+
 class TerminalShellPromptToolKit(TerminalShellCommon):
     def __init__(
         self,
@@ -47,7 +71,9 @@ class TerminalShellPromptToolKit(TerminalShellCommon):
         colorama_init()
         self.mma_pygments_lexer = PygmentsLexer(MathematicaLexer)
 
-        self.session = PromptSession(history=FileHistory(HISTFILE))
+        self.history_store = HistoryStore()
+        atexit.register(self.history_store.close)
+        self.session = PromptSession(history=SQLiteHistory(self.history_store))
         if edit_mode is not None:
             self.session.editing_mode = (
                 EditingMode.VI if edit_mode == "vi" else EditingMode.EMACS
@@ -55,7 +81,6 @@ class TerminalShellPromptToolKit(TerminalShellCommon):
 
         # Try importing readline to enable arrow keys support etc.
         self.using_readline = False
-        self.history_length = definitions.get_config_value("$HistoryLength", HISTSIZE)
         self.using_readline = sys.stdin.isatty() and sys.stdout.isatty()
         self.ansi_color_re = re.compile("\033\\[[0-9;]+m")
 
@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Showing TeXForm[] results as typeset formulas.
+
+A formula is typeset by matplotlib's mathtext straight into a bitmap
+just big enough for it, without a pyplot figure. The bitmaps, and the
+PNGs made from them, are kept for the last MAX_CACHED formulas, by the
+formula, font size and colors, so showing a formula again costs next to
+nothing.
+
+A formula is shown in the terminal when it can show pictures (see
+inlineimage.py), and otherwise in a matplotlib window. When
+``Settings`$TeXFormDirectory`` is set, as for a run without a display,
+each formula is instead written there as TeXForm-NNN.png, numbered after
+the files already there. It is typeset straight away, so that one that
+can't be is shown as TeX instead, but made into a PNG and written on a
+background thread while evaluation carries on. ``wait_for_writes()``
+waits for those files, and reports any that couldn't be written; a
+forked child must call it before it exits.
+"""
+
+import atexit
+import io
+import math
+import os
+import os.path as osp
+import sys
+from functools import cache, lru_cache
+from typing import List, Optional
+
+from mathics.core.atoms import String
+
+from mathicsscript.figures import get_max_figures, show_figure
+from mathicsscript.inlineimage import get_inline_protocol, terminal_size, write_inline
+from mathicsscript.numberedfiles import create_numbered_file
+
+DIRECTORY_SETTING = "Settings`$TeXFormDirectory"
+
+DEFAULT_FONT_SIZE = 32
+DPI = 100
+
+# The blank pixels left around a formula.
+MARGIN = 4
+
+MAX_CACHED = 256
+
+# The thread that writes files to Settings`$TeXFormDirectory, started
+# when first needed.
+write_pool = None
+
+# The files being written by write_pool, and their futures.
+pending_writes: List[tuple] = []
+
+
+@cache
+def get_mathtext_parser():
+    """
+    Return a mathtext parser that gives bitmaps, or None if matplotlib
+    can't be imported.
+    """
+    try:
+        from matplotlib.mathtext import MathTextParser
+    except ImportError:
+        return None
+    return MathTextParser("agg")
+
+
+@lru_cache(maxsize=MAX_CACHED)
+def tex_image(
+    tex: str,
+    size: float = DEFAULT_FONT_SIZE,
+    color: str = "black",
+    background: Optional[str] = "white",
+):
+    """
+    Return TeX math ``tex`` typeset as an RGBA array of bytes, in font
+    size ``size``, on ``background``, or on a transparent background if
+    that is None. ValueError is raised if mathtext can't typeset ``tex``.
+    """
+    import numpy as np
+    from matplotlib.colors import to_rgba
+    from matplotlib.font_manager import FontProperties
+
+    parser = get_mathtext_parser()
+    if parser is None:
+        raise ValueError("matplotlib is not installed")
+    raster = parser.parse(f"${tex}$", dpi=DPI, prop=FontProperties(size=size))
+    alpha = np.pad(np.asarray(raster.image), MARGIN)[..., np.newaxis] / 255
+    foreground = np.array(to_rgba(color))
+    if background is None:
+        image = np.broadcast_to(foreground, alpha.shape[:2] + (4,)).copy()
+        image[..., 3] *= alpha[..., 0]
+    else:
+        image = foreground * alpha + np.array(to_rgba(background)) * (1 - alpha)
+    image = np.round(image * 255).astype(np.uint8)
+    # It is shared by everyone who asks for it.
+    image.flags.writeable = False
+    return image
+
+
+@lru_cache(maxsize=MAX_CACHED)
+def tex_png(
+    tex: str,
+    size: float = DEFAULT_FONT_SIZE,
+    color: str = "black",
+    background: Optional[str] = "white",
+) -> bytes:
+    """
+    Return ``tex_image(tex, size, color, background)`` as a PNG.
+    """
+    return image_png(tex_image(tex, size, color, background))
+
+
+def image_png(image) -> bytes:
+    """
+    Return RGBA array ``image`` as a PNG.
+    """
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    Image.fromarray(image).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def write_png(image, path: str) -> None:
+    png = image_png(image)
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as f:
+        f.write(png)
+    os.replace(temporary, path)
+
+
+def write_in_background(image, path: str) -> None:
+    """
+    Write RGBA array ``image`` to ``path`` as a PNG on the writing thread.
+    """
+    global write_pool
+    if write_pool is None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        write_pool = ThreadPoolExecutor(1, thread_name_prefix="tex-write")
+        atexit.register(wait_for_writes)
+    pending_writes.append((path, write_pool.submit(write_png, image, path)))
+
+
+def wait_for_writes(wait: bool = True) -> None:
+    """
+    Wait for the files being written to Settings`$TeXFormDirectory, or
+    with ``wait`` False just look at those that are done, and report those
+    that couldn't be written.
+    """
+    unfinished = []
+    for path, future in pending_writes:
+        if not (wait or future.done()):
+            unfinished.append((path, future))
+            continue
+        try:
+            future.result()
+        except Exception as e:
+            print(f"Cannot write TeXForm image {path}: {e}", file=sys.stderr)
+            for leftover in (path, path + ".tmp"):
+                if osp.exists(leftover):
+                    os.unlink(leftover)
+    pending_writes[:] = unfinished
+
+
+def get_tex_directory(definitions) -> Optional[str]:
+    try:
+        value = definitions.get_ownvalue(DIRECTORY_SETTING).get_string_value()
+    except ValueError:
+        return None
+    return osp.expanduser(value) if value else None
+
+
+def show_tex(tex: str, evaluation) -> bool:
+    """
+    Show TeX math ``tex``, the TeXForm of a result, typeset. Return False
+    if it can't be typeset.
+    """
+    if get_mathtext_parser() is None:
+        return False
+    definitions = evaluation.definitions
+    try:
+        image = tex_image(tex)
+    except ValueError:
+        return False
+
+    directory = get_tex_directory(definitions)
+    if directory is not None:
+        wait_for_writes(wait=False)
+        try:
+            path = create_numbered_file(directory, "TeXForm-", ".png")
+        except OSError as e:
+            print(f"Cannot write TeXForm image in {directory}: {e}", file=sys.stderr)
+            return False
+        write_in_background(image, path)
+        return True
+
+    protocol = get_inline_protocol(definitions)
+    if protocol is not None:
+        columns, (cell_width, _) = terminal_size()
+        width = min(math.ceil(image.shape[1] / cell_width), columns - 1)
+        return write_inline(
+            String(tex),
+            lambda: tex_png(tex),
+            protocol,
+            width,
+            cell_width,
+        )
+
+    from mathicsscript.format import get_pyplot
+
+    plt = get_pyplot()
+    if plt is None:
+        return False
+    height, width = image.shape[:2]
+    figure = plt.figure(figsize=(width / DPI, height / DPI), dpi=DPI)
+    figure.figimage(image)
+    show_figure(plt, figure, get_max_figures(definitions))
+    return True
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+# Copyright (C) 2026 Rocky Bernstein <rb@dustyfeet.com>
+#   This program is free software: you can redistribute it and/or modify
+#   it under the terms of the GNU General Public License as published by
+#   the Free Software Foundation, either version 3 of the License, or
+#   (at your option) any later version.
+#
+#   This program is distributed in the hope that it will be useful,
+#   but WITHOUT ANY WARRANTY; without even the implied warranty of
+#   MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#   GNU General Public License for more details.
+#
+#   You should have received a copy of the GNU General Public License
+#   along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+Evaluating a file each time it changes: ``mathicsscript --watch -f FILE``.
+
+mathicsscript starts up and loads the builtin definitions once. Each
+evaluation of the file is then done by a child process forked from it,
+so that every run starts from the same definitions without paying for
+startup again, and what a run defines is gone when it ends.
+
+Changes are noticed with inotify on Linux, and otherwise by checking the
+file's modification time, size and inode every POLL_INTERVAL seconds.
+The directory that holds the file is watched, so that editors that save
+by writing a new file and renaming it over the old one are seen too.
+Saves that come in quick succession are taken together: a run starts
+once the file has been left alone for DEBOUNCE_SECONDS. If a run is still
+going when the file changes, it is stopped and a new one started.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import os.path as osp
+import select
+import signal
+import struct
+import sys
+import time
+from typing import Callable, Optional
+
+DEBOUNCE_SECONDS = 0.2
+POLL_INTERVAL = 0.5
+
+# How often the parent checks whether a run has finished.
+CHILD_POLL_INTERVAL = 0.1
+
+# inotify(7) event masks.
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+WATCH_MASK = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+)
+INOTIFY_EVENT = struct.Struct("iIII")
+
+
+class PollingWatcher:
+    """
+    Notices changes to a file by looking at it every ``interval`` seconds.
+    """
+
+    def __init__(self, path: str, interval: float = POLL_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self.signature = self.get_signature()
+
+    def get_signature(self) -> Optional[tuple]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """
+        Wait up to ``timeout`` seconds, or for good if it is None, for the
+        file to change. Return True if it did.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            signature = self.get_signature()
+            if signature != self.signature:
+                self.signature = signature
+                return True
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            time.sleep(
+                self.interval if remaining is None else min(self.interval, remaining)
+            )
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """
+    Notices changes to a file through Linux's inotify.
+    """
+
+    def __init__(self, path: str):
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.name = osp.basename(path).encode()
+        self.fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        directory = osp.dirname(osp.abspath(path)).encode()
+        if libc.inotify_add_watch(self.fd, directory, WATCH_MASK) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f"cannot watch {directory.decode()}")
+
+    def read_events(self) -> bool:
+        """
+        Read the events that are ready, and return True if any of them is
+        for the file.
+        """
+        changed = False
+        while True:
+            try:
+                data = os.read(self.fd, 1 << 16)
+            except BlockingIOError:
+                return changed
+            position = 0
+            while position + INOTIFY_EVENT.size <= len(data):
+                _, _, _, length = INOTIFY_EVENT.unpack_from(data, position)
+                position += INOTIFY_EVENT.size
+                name = data[position : position + length].rstrip(b"\0")
+                position += length
+                changed = changed or name == self.name
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """
+        Wait up to ``timeout`` seconds, or for good if it is None, for the
+        file to change. Return True if it did.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            try:
+                readable, _, _ = select.select([self.fd], [], [], remaining)
+            except InterruptedError:
+                continue
+            if readable and self.read_events():
+                return True
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+def make_watcher(path: str):
+    """
+    Return an InotifyWatcher for ``path`` where inotify is available, and
+    otherwise a PollingWatcher.
+    """
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(path)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(path)
+
+
+def wait_until_quiet(watcher, debounce: float) -> None:
+    """
+    Wait until the file hasn't changed for ``debounce`` seconds.
+    """
+    while watcher.wait(debounce):
+        pass
+
+
+def start_run(run: Callable[[], None]) -> int:
+    """
+    Fork a child process that calls ``run`` and exits, and return its
+    process id.
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        exit_code = 0
+        try:
+            run()
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 0
+        except BaseException:
+            import traceback
+
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            # Don't run anything that mathicsscript would do on exit.
+            os._exit(exit_code)
+    return pid
+
+
+def stop_run(pid: int) -> None:
+    try:
+        os.kill(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    os.waitpid(pid, 0)
+
+
+def can_watch() -> bool:
+    return hasattr(os, "fork")
+
+
+def watch_file(
+    path: str,
+    run: Callable[[], None],
+    watcher=None,
+    debounce: float = DEBOUNCE_SECONDS,
+    max_runs: Optional[int] = None,
+) -> int:
+    """
+    Call ``run`` in a forked child now and each time the file ``path``
+    changes, stopping a run still in progress. Return when interrupted,
+    or once ``max_runs`` runs have finished.
+    """
+    if watcher is None:
+        watcher = make_watcher(path)
+    # Being told to stop ends a run in progress too.
+    previous_handler = signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    runs = 1
+    pid: Optional[int] = start_run(run)
+    try:
+        while True:
+            # While a run is going, look in on it now and then.
+            if watcher.wait(None if pid is None else CHILD_POLL_INTERVAL):
+                wait_until_quiet(watcher, debounce)
+                if pid is not None:
+                    stop_run(pid)
+                    print(f"\n{path} changed; evaluation stopped.", file=sys.stderr)
+                print(f"Evaluating {path} again.", file=sys.stderr)
+                runs += 1
+                pid = start_run(run)
+            if pid is not None and os.waitpid(pid, os.WNOHANG)[0] == pid:
+                pid = None
+                if max_runs is not None and runs >= max_runs:
+                    return 0
+                print(f"Waiting for {path} to change.", file=sys.stderr)
+    except KeyboardInterrupt:
+        print("", file=sys.stderr)
+    finally:
+        if pid is not None:
+            stop_run(pid)
+        watcher.close()
+        signal.signal(signal.SIGTERM, previous_handler)
+    return 0
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+import pytest
+from mathics.core.definitions import Definitions
+from mathics.core.load_builtin import import_and_load_builtins
+
+# Definitions(add_builtin=True), and test/helper.py's session, need the
+# builtins loaded first.
+import_and_load_builtins()
+
+
+@pytest.fixture(scope="module")
+def definitions():
+    """
+    Definitions with just the builtins, shared by the tests of a module.
+    """
+    return Definitions(add_builtin=True)
@@ -1,3 +1,5 @@
+from mathics.core.definitions import Definitions
+from mathics.core.evaluation import Evaluation
 from mathics.session import MathicsSession
 
 session = MathicsSession(add_builtin=True, catch_interrupt=False)
@@ -13,3 +15,33 @@ def check_evaluation(str_expr: str, str_expected: str, message=""):
         assert result == expected, "%s: got: %s" % (message, result)
     else:
         assert result == expected
+
+
+def new_definitions() -> Definitions:
+    """
+    Return new definitions with just the builtins, at line 0.
+    """
+    definitions = Definitions(add_builtin=True)
+    definitions.set_line_no(0)
+    return definitions
+
+
+def evaluate(definitions, code: str):
+    """
+    Evaluate ``code`` in ``definitions`` and return its Result.
+    """
+    return Evaluation(definitions).parse_evaluate(code)
+
+
+def evaluate_expr(definitions, code: str):
+    """
+    Evaluate ``code`` in ``definitions`` and return the expression it gives.
+    """
+    return evaluate(definitions, code).last_eval
+
+
+def evaluate_text(definitions, code: str):
+    """
+    Evaluate ``code`` in ``definitions`` and return its result as text.
+    """
+    return evaluate(definitions, code).result
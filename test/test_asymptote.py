@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+import os
+import os.path as osp
+import subprocess
+import sys
+
+import pytest
+
+from mathicsscript import asymptote
+
+# Stands in for asy: it logs its arguments and writes the output files asy
+# would. With -View it logs, as "viewer: PROGRAM FILE", the viewer that asy
+# would start on each output: the psviewer of a -config file, or asy's
+# default.
+FAKE_ASY = """\
+import re
+import sys
+args = sys.argv[1:]
+suffix = "." + args[args.index("-f") + 1] if "-f" in args else ".eps"
+if "-o" in args:
+    outputs = [args[args.index("-o") + 1] + suffix]
+else:
+    outputs = [arg[: -len(".asy")] + suffix for arg in args if arg.endswith(".asy")]
+viewer = "gv"
+if "-config" in args:
+    with open(args[args.index("-config") + 1]) as config:
+        viewer = re.search(r'psviewer\\s*=\\s*"([^"]*)"', config.read()).group(1)
+with open({log!r}, "a") as log:
+    log.write(" ".join(args) + "\\n")
+    for name in outputs:
+        with open(name, "w") as output:
+            output.write("%!PS\\n")
+        if "-View" in args or "-V" in args:
+            log.write(f"viewer: {{viewer}} {{name}}\\n")
+"""
+
+
+def write_fake_asy(directory) -> tuple:
+    """
+    Write the fake asy in ``directory``, and return its path and the path
+    of its log.
+    """
+    log = directory / "asy.log"
+    script = directory / "asy"
+    script.write_text(f"#!{sys.executable}\n" + FAKE_ASY.format(log=str(log)))
+    script.chmod(0o755)
+    return str(script), log
+
+
+@pytest.fixture
+def fake_asy(tmp_path, monkeypatch):
+    script, log = write_fake_asy(tmp_path)
+    monkeypatch.setattr(asymptote, "ASY_PROGRAM", script)
+    monkeypatch.setattr(asymptote, "scratch_dir", None)
+    monkeypatch.setattr(asymptote, "last_viewed", None)
+
+    runs = []
+    run = subprocess.run
+
+    def counting_run(*args, **kwargs):
+        runs.append(kwargs.get("args", args[0] if args else None))
+        return run(*args, **kwargs)
+
+    monkeypatch.setattr(subprocess, "run", counting_run)
+    yield log, runs
+    asymptote.remove_scratch_dir()
+
+
+def test_write_asy_and_view(fake_asy):
+    log, runs = fake_asy
+    asymptote.write_asy_and_view("draw(unitcircle);")
+    scratch = asymptote.get_scratch_dir()
+    # Only asy itself is run, and it starts just the user's own viewer, not
+    # a helper named by a configuration file.
+    assert len(runs) == 1
+    (output,) = os.listdir(scratch)
+    assert output.startswith("Mathics3-Graph-") and output.endswith(".eps")
+    args, viewer = log.read_text().splitlines()
+    assert "-config" not in args
+    assert viewer == f"viewer: gv {osp.join(scratch, output)}"
+
+    # The files of the last graphics are removed when the next is shown.
+    asymptote.write_asy_and_view("draw(unitsquare);")
+    assert len(runs) == 2
+    (second,) = os.listdir(scratch)
+    assert second != output
+
+    asymptote.remove_scratch_dir()
+    assert not osp.exists(scratch)
+
+
+def test_asy_batch(tmp_path):
+    script, log = write_fake_asy(tmp_path)
+    batch_dir = tmp_path / "figures"
+    graphics = tmp_path / "graphics.m"
+    graphics.write_text(
+        "Settings`$AsymptoteBatchSize = 3\n"
+        'Settings`$AsymptoteBatchFormat = "svg"\n'
+        + "".join(f"Graphics[{{Circle[{{0, 0}}, {r}]}}]\n" for r in range(1, 6))
+        + "Graphics3D[{Sphere[]}]\n"
+    )
+    environment = dict(os.environ, ASY_PROG=script)
+    subprocess.run(
+        [
+            "mathicsscript",
+            "--readline",
+            "None",
+            "--no-matplotlib",
+            "--asy-batch",
+            str(batch_dir),
+            "-f",
+            str(graphics),
+        ],
+        env=environment,
+        check=True,
+    )
+    # The graphics are compiled three at a time, and the rest at the end.
+    runs = log.read_text().splitlines()
+    assert runs == [
+        "-noV -f svg Mathics3-Graph-001.asy Mathics3-Graph-002.asy "
+        "Mathics3-Graph-003.asy",
+        "-noV -f svg Mathics3-Graph-004.asy Mathics3-Graph-005.asy "
+        "Mathics3-Graph-006.asy",
+    ]
+    assert sorted(os.listdir(batch_dir)) == [
+        f"Mathics3-Graph-00{i}.svg" for i in range(1, 7)
+    ]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+def test_asy_batch_isolate(tmp_path):
+    # Each input is evaluated in a child of its own, which compiles its
+    # graphics before it exits, numbering them after those already made.
+    script, log = write_fake_asy(tmp_path)
+    batch_dir = tmp_path / "figures"
+    result = subprocess.run(
+        [
+            "mathicsscript",
+            "--readline",
+            "None",
+            "--no-matplotlib",
+            "--isolate",
+            "--asy-batch",
+            str(batch_dir),
+        ],
+        input="Graphics[{Circle[]}]\nGraphics[{Disk[]}]\n",
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, ASY_PROG=script, NO_COLOR="1"),
+        check=True,
+    )
+    assert sorted(os.listdir(batch_dir)) == [
+        "Mathics3-Graph-001.pdf",
+        "Mathics3-Graph-002.pdf",
+    ]
+    assert [line for line in log.read_text().splitlines() if "-noV" in line] == [
+        "-noV -f pdf Mathics3-Graph-001.asy",
+        "-noV -f pdf Mathics3-Graph-002.asy",
+    ]
+    assert "Mathics3-Graph-002.pdf" in result.stdout
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import os.path as osp
+
+from mathics_scanner.load import load_mathics3_named_characters_json
+
+from mathicsscript.chartables import (
+    DEFAULT_TABLES_PATH,
+    CharacterTables,
+    compile_tables,
+    load_character_tables,
+    map_tables,
+    write_tables,
+)
+
+
+def test_compile_tables():
+    tables = CharacterTables(
+        compile_tables(
+            {
+                "names": {"Beta": "β", "Alpha": "α", "AltKey": "⎇"},
+                "operators": ["->", "+", "->"],
+            }
+        )
+    )
+    names = tables["names"]
+    assert list(names) == ["Alpha", "AltKey", "Beta"]
+    assert names["Beta"] == "β"
+    assert "Alpha" in names and "Gamma" not in names
+    assert list(names.prefixed("Al")) == ["Alpha", "AltKey"]
+    assert list(names.prefixed("Z")) == []
+
+    operators = tables["operators"]
+    assert list(operators) == ["+", "->"]
+    assert operators[-1] == "->" and operators[:1] == ["+"]
+    assert "->" in operators and "-" not in operators
+
+
+def test_load_character_tables(tmp_path):
+    named_characters = load_mathics3_named_characters_json()["named-characters"]
+    cache_path = str(tmp_path / "character-tables.bin")
+
+    # Without a compiled file, the tables are compiled and cached.
+    tables = load_character_tables(str(tmp_path / "missing.bin"), cache_path)
+    assert dict(tables["named-characters"]) == named_characters
+    assert osp.isfile(cache_path)
+    assert map_tables(cache_path) is not None
+
+    # Tables of another Mathics-Scanner version aren't used.
+    write_tables(compile_tables({"mathics-scanner-version": ["0.0"]}), cache_path)
+    assert map_tables(cache_path) is None
+
+    if osp.isfile(DEFAULT_TABLES_PATH):
+        tables = load_character_tables(cache_path=None)
+        assert tables["named-characters"]["Alpha"] == "α"
@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+
+import pytest
+
+from mathicsscript.checkpoint import (
+    SessionCheckpoint,
+    install_session_builtins,
+    read_records,
+    restore_session,
+)
+
+from .helper import evaluate_text, new_definitions
+
+
+def test_save_and_restore(tmp_path):
+    path = str(tmp_path / "session")
+    definitions = new_definitions()
+    checkpoint = SessionCheckpoint(path)
+    evaluate_text(definitions, "x = 6")
+    evaluate_text(definitions, "f[n_] := n x")
+    checkpoint.save(definitions)
+    evaluate_text(definitions, "f[7]")
+    checkpoint.save(definitions)
+
+    records = list(read_records(path))
+    assert len(records) == 2
+    # After the first record, an input that defines nothing adds just its
+    # In[] and Out[] rules.
+    assert set(records[1]["rules"]) == {"System`In", "System`Out"}
+    assert "System`Out" not in records[1]["changed"]
+
+    evaluate_text(definitions, "Clear[x]")
+    checkpoint.save(definitions, background=True)
+    checkpoint.close()
+
+    # A record cut short is ignored.
+    with open(path, "ab") as f:
+        f.write(b"\xff\xff\x00\x00partial")
+
+    restored = new_definitions()
+    assert restore_session(restored, path) == 3
+    assert restored.get_line_no() == 4
+    assert evaluate_text(restored, "{x, f[2], Out[3]}") == "{x, 2 x, 42}"
+
+
+def test_history_length(tmp_path):
+    path = str(tmp_path / "session")
+    definitions = new_definitions()
+    checkpoint = SessionCheckpoint(path)
+    evaluate_text(definitions, "$HistoryLength = 2; big = Range[1000];")
+    for i in range(4):
+        evaluate_text(definitions, f"{i} + 10")
+        checkpoint.save(definitions)
+    # Out[n] rules dropped as history is trimmed are recorded as removed.
+    assert len(list(read_records(path))) > 1
+
+    restored = new_definitions()
+    restore_session(restored, path)
+    assert evaluate_text(restored, "{Out[3], Out[4], Out[5]}") == "{%3, 12, 13}"
+
+
+class Unpicklable:
+    # Whether pickling fails, as for a definition that holds a Python
+    # object, without changing the definition that holds it.
+    fail = True
+
+    def __reduce__(self):
+        if Unpicklable.fail:
+            raise TypeError("cannot pickle")
+        return Unpicklable, ()
+
+
+def test_skipped_definitions_are_saved_later(tmp_path, monkeypatch):
+    path = str(tmp_path / "session")
+    definitions = new_definitions()
+    checkpoint = SessionCheckpoint(path)
+    evaluate_text(definitions, "y = 1")
+    definitions.user["Global`y"].held = Unpicklable()
+    assert checkpoint.save(definitions) == ["Global`y"]
+    # y hasn't changed since, but it wasn't saved.
+    monkeypatch.setattr(Unpicklable, "fail", False)
+    assert checkpoint.save(definitions) == []
+
+    restored = new_definitions()
+    restore_session(restored, path)
+    assert evaluate_text(restored, "y") == "1"
+
+
+def test_save_session_builtin(tmp_path):
+    path = str(tmp_path / "session")
+    definitions = new_definitions()
+    install_session_builtins(definitions)
+    evaluate_text(definitions, "y = 10")
+    assert evaluate_text(definitions, f'Settings`SaveSession["{path}"]') == path
+
+    restored = new_definitions()
+    restore_session(restored, path)
+    assert evaluate_text(restored, "y + 1") == "11"
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="autosave needs fork()")
+def test_resume(tmp_path):
+    path = str(tmp_path / "session")
+    command = ["mathicsscript", "--readline", "None", "--no-prompt"]
+    command += ["--resume", path, "--autosave", "1"]
+    subprocess.run(command, input="z = 3\nz^2\n", text=True, check=True)
+    result = subprocess.run(
+        command, input="z + Out[2]\n", text=True, capture_output=True, check=True
+    )
+    assert "12" in result.stdout
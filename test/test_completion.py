@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 
 from mathics.core.definitions import Definitions
+from mathics.core.load_builtin import import_and_load_builtins
 from mathicsscript.termshell_gnu import TerminalShellGNUReadline
 
 try:
@@ -12,6 +13,7 @@ else:
 
 
 def test_completion_gnu():
+    import_and_load_builtins()
     definitions = Definitions(add_builtin=True, extension_modules=[])
     term = TerminalShellGNUReadline(
         definitions=definitions,
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+import sys
+
+import pytest
+from mathics.core.evaluation import Evaluation
+
+from mathicsscript.figures import FigureManager, get_max_figures
+from mathicsscript.format import show_graphics
+
+from .helper import evaluate_expr
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+
+def max_rss_mb() -> float:
+    resource = pytest.importorskip("resource")
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux gives kilobytes, macOS bytes.
+    return rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def test_max_figures(definitions):
+    assert get_max_figures(definitions) == 5
+    evaluate_expr(definitions, "Settings`$MaxFigures = Infinity")
+    assert get_max_figures(definitions) is None
+    evaluate_expr(definitions, "Settings`$MaxFigures = 5")
+
+
+def test_figures_kept(monkeypatch):
+    # Windows shown are kept open, up to the limit.
+    monkeypatch.setattr(plt, "get_backend", lambda: "QtAgg")
+    monkeypatch.setattr(plt, "show", lambda: None)
+    manager = FigureManager()
+    figures = [plt.figure() for _ in range(8)]
+    try:
+        for figure in figures:
+            manager.show(plt, figure, 3)
+        assert list(manager.shown) == figures[5:]
+        assert plt.get_fignums() == [figure.number for figure in figures[5:]]
+
+        # Figures whose windows were closed aren't counted.
+        plt.close(figures[6])
+        manager.show(plt, plt.figure(), 3)
+        assert len(manager.shown) == 3 and figures[5] in manager.shown
+    finally:
+        plt.close("all")
+
+
+def test_figures_memory(definitions):
+    # Each result's figure is closed when it can't be shown, so memory
+    # doesn't grow with the number of plots shown.
+    plot = evaluate_expr(definitions, "Plot[{Sin[x], Cos[x]}, {x, 0, 6}]")
+    for _ in range(50):
+        assert show_graphics(plot, Evaluation(definitions), plt)
+    start = max_rss_mb()
+    for _ in range(500):
+        assert show_graphics(plot, Evaluation(definitions), plt)
+    assert plt.get_fignums() == []
+    # Left open, these figures would take over 500 MB.
+    assert max_rss_mb() - start < 50
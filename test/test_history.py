@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import os
+import time
+
+import pytest
+
+from mathicsscript.history import (
+    HistoryOptions,
+    HistoryStore,
+    parse_history_command,
+    show_history,
+)
+from mathicsscript.termshell_prompt import SQLiteHistory
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / "history.sqlite"), legacy_files=())
+    yield store
+    store.close()
+
+
+def test_recent_and_search(store):
+    plot = "Plot[Sin[x], {x, 0, 1}]"
+    for text in ("x = 1", "Expand[(x + y)^2]", "  ", "expand[a]", plot):
+        store.append(text)
+    assert [e.text for e in store.recent(2)] == [plot, "expand[a]"]
+    assert len(store.recent()) == 4
+
+    # Search is case sensitive, with and without the full-text index.
+    assert [e.text for e in store.search("Expand")] == ["Expand[(x + y)^2]"]
+    assert [e.text for e in store.search("x")] == [
+        plot,
+        "expand[a]",
+        "Expand[(x + y)^2]",
+        "x = 1",
+    ]
+    assert [e.text for e in store.search("x", limit=1)] == [plot]
+    assert [e.text for e in store.search(r"^[a-z]+\[", regex=True)] == ["expand[a]"]
+
+
+def test_prompt_history_is_bounded(store):
+    for text in ("a", "b"):
+        store.append(text)
+    history = SQLiteHistory(store, load_size=3)
+
+    async def load():
+        return [text async for text in history.load()]
+
+    assert asyncio.run(load()) == ["b", "a"]
+    for text in ("c", "d", "e"):
+        history.append_string(text)
+    # Older entries are only in the store.
+    assert history.get_strings() == ["c", "d", "e"]
+    assert len(store.recent()) == 5
+
+
+def test_compact(tmp_path):
+    store = HistoryStore(
+        str(tmp_path / "history.sqlite"), max_entries=3, max_days=1, legacy_files=()
+    )
+    store.connection.execute(
+        "INSERT INTO history(time, shell, text) VALUES (?, '', 'old')",
+        (time.time() - 2 * 24 * 60 * 60,),
+    )
+    for i in range(5):
+        store.append(f"x{i}")
+    assert store.compact() == 3
+    assert [e.text for e in store.recent()] == ["x4", "x3", "x2"]
+    assert store.search("x1") == []
+    store.close()
+
+
+def test_legacy_files(tmp_path):
+    prompt_file = tmp_path / "history"
+    prompt_file.write_text(
+        "\n# 2024-01-02 03:04:05.678901\n+f[x_] :=\n+  x^2\n"
+        "\n# 2024-01-03 03:04:05.678901\n+f[3]\n"
+    )
+    gnu_file = tmp_path / "history-gnu"
+    gnu_file.write_text("1 + 1\nN[Pi]\n")
+    path = str(tmp_path / "history.sqlite")
+    legacy_files = (str(prompt_file), str(gnu_file), "/nonexistent")
+    store = HistoryStore(path, legacy_files=legacy_files)
+    assert [e.text for e in store.recent()] == [
+        "N[Pi]",
+        "1 + 1",
+        "f[3]",
+        "f[x_] :=\n  x^2",
+    ]
+    store.close()
+    # Files are only imported into a new database.
+    store = HistoryStore(path, legacy_files=(str(gnu_file),))
+    assert len(store.recent()) == 4
+    store.close()
+    assert os.path.exists(gnu_file)
+
+
+def test_history_command(store):
+    assert parse_history_command("!!history") == HistoryOptions()
+    assert parse_history_command("!!history -r -n 5 Sin\\[") == HistoryOptions(
+        "Sin\\[", regex=True, limit=5
+    )
+    for bad in ("!!history -r", "!!history -n x y", "!!history --bogus y"):
+        with pytest.raises(ValueError):
+            parse_history_command(bad)
+
+    store.append("a = 1")
+    store.append("b = 2")
+    lines = []
+    show_history(store, HistoryOptions(), lines.append)
+    assert [line.split("  ")[-1] for line in lines] == ["a = 1", "b = 2"]
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+import subprocess
+import sys
+
+from mathicsscript.importprofile import ImportTime, parse_importtime
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       104 |        104 |   _io
+import time:       320 |        424 | mathicsscript
+import time:        35 |         35 |     mathicsscript.version
+this line is not import-time output
+"""
+
+
+def test_parse_importtime():
+    assert parse_importtime(IMPORTTIME_OUTPUT) == [
+        ImportTime("_io", 104, 104, 1),
+        ImportTime("mathicsscript", 320, 424, 0),
+        ImportTime("mathicsscript.version", 35, 35, 2),
+    ]
+
+
+def test_deferred_imports():
+    """
+    Optional front-end backends should not be loaded just by importing
+    mathicsscript's main module.
+    """
+    deferred = ("prompt_toolkit", "cairosvg", "columnize", "term_background")
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, mathicsscript.__main__; "
+            f"print([m for m in {deferred!r} if m in sys.modules])",
+        ],
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "[]"
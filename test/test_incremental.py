@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+from mathics.core.evaluation import Evaluation, Output
+
+from mathicsscript.incremental import (
+    IncrementalStats,
+    evaluate_file_incremental,
+    symbols_in,
+)
+
+from .helper import new_definitions, session
+
+SCRIPT = """\
+a = 2
+b = 10 (* not used below *)
+f[x_] := x^a
+Print["f[3] = ", f[3]]
+g = f[4] + 1
+"""
+
+
+class ListOutput(Output):
+    def __init__(self):
+        self.lines = []
+
+    def out(self, out):
+        self.lines.append(str(out))
+
+
+def run(path, cache_dir):
+    """
+    Evaluate ``path`` incrementally in new definitions, and return the
+    statistics, the output shown, and the definitions.
+    """
+    definitions = new_definitions()
+    output = ListOutput()
+    stats = evaluate_file_incremental(
+        definitions,
+        path,
+        output,
+        lambda out: output.lines.append(str(out)),
+        cache_dir=cache_dir,
+    )
+    return stats, output.lines, definitions
+
+
+def value(definitions, code: str) -> str:
+    return Evaluation(definitions).parse_evaluate(code).result
+
+
+def test_symbols_in():
+    from mathics.core.parser import MathicsSingleLineFeeder, parse
+
+    query = parse(session.definitions, MathicsSingleLineFeeder("f[x_] := x^a", ""))
+    assert {"Global`f", "Global`x", "Global`a", "System`Power"} <= symbols_in(query)
+
+
+def test_incremental(tmp_path):
+    script = tmp_path / "script.m"
+    cache_dir = str(tmp_path / "cache")
+    script.write_text(SCRIPT)
+    assert run(str(script), cache_dir)[:2] == (
+        IncrementalStats(5, 0),
+        ["f[3] = 9"],
+    )
+
+    # Nothing changed: output comes from the cache.
+    stats, lines, definitions = run(str(script), cache_dir)
+    assert (stats, lines) == (IncrementalStats(0, 5), ["f[3] = 9"])
+    assert value(definitions, "{a, b, f[2], g}") == "{2, 10, 4, 17}"
+
+    # Changing a reaches f, and through f, g; b is left alone.
+    script.write_text(SCRIPT.replace("a = 2", "a = 3").replace("(*", "(* comment"))
+    stats, lines, definitions = run(str(script), cache_dir)
+    assert (stats, lines) == (IncrementalStats(4, 1), ["f[3] = 27"])
+    assert value(definitions, "g") == "65"
+
+    # Removing a definition makes what read it dirty.
+    script.write_text(SCRIPT.replace("a = 2\n", ""))
+    stats, lines, definitions = run(str(script), cache_dir)
+    assert stats == IncrementalStats(3, 1)
+    assert value(definitions, "g") == "1 + 4 ^ a"
+
+
+def test_volatile(tmp_path):
+    script = tmp_path / "script.m"
+    cache_dir = str(tmp_path / "cache")
+    script.write_text('n = ToExpression["1 + 1"]\nm = n + 1\n')
+    run(str(script), cache_dir)
+    assert run(str(script), cache_dir)[0] == IncrementalStats(2, 0)
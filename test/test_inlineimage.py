@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import base64
+import io
+import re
+
+import pytest
+from mathics.core.evaluation import Evaluation
+
+from mathicsscript import inlineimage
+from mathicsscript.inlineimage import (
+    detect_protocol,
+    encode_kitty,
+    encode_sixel,
+    graphics_png,
+    show_inline,
+)
+
+from .helper import evaluate_expr
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def test_detect_protocol():
+    assert detect_protocol({"TERM": "xterm-kitty"}) == "Kitty"
+    assert detect_protocol({"TERM": "xterm-kitty"}, isatty=False) is None
+    assert detect_protocol({"TERM_PROGRAM": "iTerm.app"}) == "iTerm"
+    assert detect_protocol({"TERM_PROGRAM": "WezTerm"}) == "iTerm"
+    assert detect_protocol({"TERM": "foot"}) == "Sixel"
+    assert detect_protocol({"TERM": "xterm-256color"}) is None
+    assert detect_protocol({"TERM": "tmux-256color", "KITTY_WINDOW_ID": "1"}) is None
+
+
+def test_encoders():
+    png = PNG_SIGNATURE + bytes(range(256)) * 40
+    pieces = list(encode_kitty(png, 30))
+    assert len(pieces) > 1
+    assert pieces[0].startswith(b"\x1b_Ga=T,f=100,q=2,c=30,m=1;")
+    assert pieces[-1].startswith(b"\x1b_Gm=0;")
+    data = b"".join(re.findall(rb";([^;\x1b]*)\x1b\\", b"".join(pieces)))
+    assert base64.standard_b64decode(data) == png
+
+    from PIL import Image
+
+    picture = Image.new("RGB", (10, 7), "white")
+    picture.putpixel((2, 1), (255, 0, 0))
+    buffer = io.BytesIO()
+    picture.save(buffer, format="PNG")
+    sixel = b"".join(encode_sixel(buffer.getvalue(), 1))
+    # The palette, then two bands of six rows. The red pixel is in the
+    # second row of the first band.
+    palette = dict(re.findall(rb"#(\d+);2;(\d+;\d+;\d+)", sixel))
+    colors = {color: index for index, color in palette.items()}
+    white, red = colors[b"100;100;100"], colors[b"100;0;0"]
+    assert sixel.startswith(b'\x1bPq"1;1;10;7#')
+    assert sixel.endswith(b"-#%s!10@-\x1b\\" % white)
+    assert b"#%s~~|!7~" % white in sixel and b"#%s??A" % red in sixel
+
+
+def test_show_inline(definitions, monkeypatch):
+    monkeypatch.setattr(inlineimage, "terminal_size", lambda: (80, (10, 20)))
+    monkeypatch.setattr(inlineimage, "image_cache", inlineimage.InlineImageCache())
+    plot = evaluate_expr(definitions, "Plot[Sin[x], {x, 0, 6}]")
+    out = io.BytesIO()
+    assert show_inline(plot, Evaluation(definitions), "iTerm", out)
+    shown = out.getvalue()
+    header, data = shown.split(b":", 1)
+    # ImageSize 360 is shown 45 cells wide.
+    assert header.endswith(b"width=45")
+    png = base64.standard_b64decode(data.rstrip(b"\x07\n"))
+    assert png.startswith(PNG_SIGNATURE)
+    assert int.from_bytes(png[16:20], "big") == 450
+
+    # Showing it again writes what was written before, without drawing it.
+    monkeypatch.setattr(inlineimage, "graphics_png", None)
+    out = io.BytesIO()
+    assert show_inline(plot, Evaluation(definitions), "iTerm", out)
+    assert out.getvalue() == shown
+
+
+def test_graphics_png_image(definitions):
+    image = evaluate_expr(
+        definitions, "Image[Table[{i, 0.5, 0.5}/100, {20}, {i, 100}]]"
+    )
+    png = graphics_png(image, Evaluation(definitions), 50)
+    assert int.from_bytes(png[16:20], "big") == 50
+    assert int.from_bytes(png[20:24], "big") == 10
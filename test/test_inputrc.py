@@ -0,0 +1,142 @@
+def prompt_during_pause(key_bindings, keys: str, look, **options):
+    """
+    Type ``keys``, and once the key timeouts, shortened here, have gone by,
+    return what ``look(session)`` gives.
+    """
+    with create_pipe_input() as pipe_input:
+        pipe_input.send_text(keys)
+        session = PromptSession(
+            input=pipe_input,
+            output=DummyOutput(),
+            key_bindings=key_bindings,
+            **options,
+        )
+        session.app.ttimeoutlen = session.app.timeoutlen = 0.05
+        seen = []
+
+        def pause_over():
+            seen.append(look(session))
+            pipe_input.send_text("\r")
+
+        threading.Timer(0.5, pause_over).start()
+        session.prompt()
+        return seen[0]
+
+
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+import os
+import threading
+
+from prompt_toolkit import PromptSession
+from prompt_toolkit.input import create_pipe_input
+from prompt_toolkit.key_binding.vi_state import InputMode
+from prompt_toolkit.key_binding import KeyBindings
+from prompt_toolkit.output import DummyOutput
+
+from mathicsscript.bindkeys import InputrcDispatcher
+from mathicsscript.inputrc import (
+    build_trie,
+    cache_path,
+    load_inputrc_trie,
+    parse_inputrc,
+)
+
+INPUTRC = r"""# A comment
+"\ea\e": "α"
+"\eal\e": "ℵ"
+"\ealt\e": "\\[AltKey]"
+"\e\"\e": "“"
+not a binding
+"""
+
+
+def test_parse_inputrc(capsys):
+    bindings = list(parse_inputrc(INPUTRC))
+    assert bindings == [
+        ("\x1ba\x1b", "α"),
+        ("\x1bal\x1b", "ℵ"),
+        ("\x1balt\x1b", "\\[AltKey]"),
+        ('\x1b"\x1b', "“"),
+    ]
+    assert "expecting 2 fields" in capsys.readouterr().out
+    trie = build_trie(bindings)
+    assert trie["\x1b"]["a"]["\x1b"] == {"": "α"}
+    assert trie["\x1b"]["a"]["l"]["t"]["\x1b"] == {"": "\\[AltKey]"}
+
+
+def test_load_inputrc_trie(tmp_path):
+    inputrc = tmp_path / "inputrc"
+    inputrc.write_text(INPUTRC)
+    cache_dir = str(tmp_path / "cache")
+    assert load_inputrc_trie(str(inputrc), cache_dir)["\x1b"]["a"]
+    cached = cache_path(str(inputrc), cache_dir)
+    assert os.path.isfile(cached)
+
+    # A cached trie is read back without parsing the file...
+    with open(cached, "w") as f:
+        json.dump({"version": 1, "sha1": sha1(inputrc), "trie": {}}, f)
+    assert load_inputrc_trie(str(inputrc), cache_dir) == {}
+    # ... until the file changes.
+    inputrc.write_text(INPUTRC + '"\\eb\\e": "β"\n')
+    trie = load_inputrc_trie(str(inputrc), cache_dir)
+    assert trie["\x1b"]["b"]["\x1b"] == {"": "β"}
+
+
+def sha1(path) -> str:
+    return hashlib.sha1(path.read_bytes()).hexdigest()
+
+
+def prompt(key_bindings, keys: str) -> str:
+    with create_pipe_input() as pipe_input:
+        pipe_input.send_text(keys + "\r")
+        session = PromptSession(
+            input=pipe_input, output=DummyOutput(), key_bindings=key_bindings
+        )
+        return session.prompt()
+
+
+def prompt_with_pause(key_bindings, keys: str, after_pause: str, **options) -> str:
+    """
+    Like prompt(), but ``after_pause`` is typed once the key timeouts,
+    shortened here, have gone by.
+    """
+    with create_pipe_input() as pipe_input:
+        pipe_input.send_text(keys)
+        session = PromptSession(
+            input=pipe_input,
+            output=DummyOutput(),
+            key_bindings=key_bindings,
+            **options,
+        )
+        session.app.ttimeoutlen = session.app.timeoutlen = 0.05
+        threading.Timer(0.5, pipe_input.send_text, [after_pause + "\r"]).start()
+        return session.prompt()
+
+
+def test_dispatcher():
+    key_bindings = KeyBindings()
+    dispatcher = InputrcDispatcher(key_bindings)
+    dispatcher.add_trie(build_trie(parse_inputrc(INPUTRC)))
+    dispatcher.add_trie(build_trie([("\x1bx", "ξ"), ("\x1bxi", "Ξ")]))
+    assert prompt(key_bindings, "x = \x1ba\x1b + \x1bal\x1b") == "x = α + ℵ"
+    assert prompt(key_bindings, '\x1b"\x1bhi') == "“hi"
+    # Keys that stop matching a binding are handled as they would be
+    # without it: here ESC b moves back a word.
+    assert prompt(key_bindings, "one two\x1bbX") == "one Xtwo"
+    # A binding that starts a longer one is used when the next key doesn't
+    # continue the longer one.
+    assert prompt(key_bindings, "\x1bxi\x1bxa") == "Ξξa"
+
+    # Keys that start a binding are flushed when nothing follows them.
+    def text(session):
+        return session.default_buffer.text
+
+    def input_mode(session):
+        return session.app.vi_state.input_mode
+
+    assert prompt_during_pause(key_bindings, "\x1bx", text) == "ξ"
+    # A lone ESC leaves Vi insert mode.
+    mode = prompt_during_pause(key_bindings, "ab\x1b", input_mode, vi_mode=True)
+    assert mode == InputMode.NAVIGATION
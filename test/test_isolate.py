@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import os
+
+import pytest
+from mathics.core.evaluation import Evaluation
+from mathics.core.parser import MathicsSingleLineFeeder, parse
+
+from mathicsscript.isolate import (
+    IsolationLimits,
+    evaluate_isolated,
+    get_isolation_limits,
+)
+from mathicsscript.settings import definitions
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+
+
+def run(code, limits=IsolationLimits(wall_time=30)):
+    evaluation = Evaluation(definitions)
+    query = parse(definitions, MathicsSingleLineFeeder(code, ""))
+    shown = []
+    # The child shows its own result; the parent only shows $Aborted.
+    reason = evaluate_isolated(
+        evaluation, query, limits, lambda result: shown.append(result.last_eval)
+    )
+    return reason, shown
+
+
+def parent_value(code):
+    return Evaluation(definitions).parse_evaluate(code).last_eval.to_python()
+
+
+def test_definitions_come_back():
+    assert run("isolatedX = 5; isolatedF[n_] := n^2") == (None, [])
+    assert parent_value("isolatedF[isolatedX]") == 25
+    assert run("Clear[isolatedF]") == (None, [])
+    assert parent_value("DownValues[isolatedF]") == ()
+
+
+def test_limits_abort():
+    run("isolatedY = 1")
+    line_no = definitions.get_line_no()
+
+    reason, shown = run("isolatedY = 2; While[True]", IsolationLimits(wall_time=1))
+    assert "longer than 1 seconds" in reason
+    assert [str(s) for s in shown] == ["System`$Aborted"]
+    reason, _ = run("isolatedY = 3; While[True]", IsolationLimits(cpu_time=1))
+    assert "CPU time" in reason
+    reason, _ = run(
+        'isolatedY = 4; StringRepeat["a", 10^9]', IsolationLimits(memory=200)
+    )
+    assert "200 MB" in reason
+
+    assert definitions.get_line_no() == line_no + 3
+    assert parent_value("isolatedY") == 1
+    assert str(parent_value(f"Out[{line_no + 1}]")) == "System`$Aborted"
+
+
+def test_get_isolation_limits():
+    assert get_isolation_limits(definitions) == IsolationLimits()
+    parent_value("Settings`$IsolationCPULimit = 2; Settings`$IsolationMemoryLimit = 0")
+    try:
+        assert get_isolation_limits(definitions) == IsolationLimits(cpu_time=2)
+    finally:
+        parent_value("Settings`$IsolationCPULimit = Infinity")
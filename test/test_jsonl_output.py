@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+import json
+import subprocess
+
+
+def run_jsonl(*args, input=None):
+    result = subprocess.run(
+        ["mathicsscript", "--output-format", "jsonl", *args],
+        input=input,
+        capture_output=True,
+        text=True,
+    )
+    return result.returncode, [json.loads(line) for line in result.stdout.splitlines()]
+
+
+def test_jsonl_code():
+    returncode, records = run_jsonl(
+        "-c", "x^2 + 1", "-c", 'Print["hi"]; 1/0', "-c", "f[", "-c", "Quit[4]"
+    )
+    assert returncode == 4
+    assert len(records) == 4
+    first, second, syntax_error, quit_record = records
+    assert first["result"] == "1 + x^2"
+    assert first["fullform"] == "Plus[1, Power[x, 2]]"
+    assert first["head"] == "System`Plus"
+    assert first["exc_result"] == "Null"
+    assert second["prints"] == ["hi"]
+    assert [m["tag"] for m in second["messages"]] == ["infy"]
+    assert syntax_error["line"] is None
+    assert syntax_error["messages"][0]["symbol"] == "Syntax"
+    assert quit_record["exit"] == 4
+
+
+def test_jsonl_stdin():
+    returncode, records = run_jsonl(input="a = 2\n\n(* comment *)\na^10\nAbort[]\n")
+    assert returncode == 0
+    assert [r["result"] for r in records] == ["2", "1024", "$Aborted"]
+    assert records[-1]["exc_result"] == "$Aborted"
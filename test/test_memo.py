@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import os
+import pickle
+
+import pytest
+
+from mathicsscript import memo
+from mathicsscript.memo import (
+    MemoCache,
+    get_memo_cache,
+    install_memo_builtins,
+    memo_key,
+)
+
+from .helper import evaluate, new_definitions
+
+
+@pytest.fixture(autouse=True)
+def memo_key_path(tmp_path, monkeypatch):
+    """
+    Keep the HMAC key of the tests out of the configuration directory.
+    """
+    monkeypatch.setattr(memo, "KEY_PATH", str(tmp_path / "memo.key"))
+
+
+def memo_definitions(memo_dir):
+    definitions = new_definitions()
+    install_memo_builtins(definitions)
+    evaluate(definitions, f'Settings`$MemoDirectory = "{memo_dir}"')
+    return definitions
+
+
+def held(definitions, code: str):
+    return evaluate(definitions, f"Hold[{code}]").last_eval.elements[0]
+
+
+def test_memo_key(tmp_path):
+    definitions = memo_definitions(tmp_path)
+    evaluate(definitions, "g[x_] := x + c; c = 1")
+    key = memo_key(held(definitions, "f[g[2]]"), definitions)
+    assert key == memo_key(held(definitions, "f[g[2]]"), definitions)
+    assert key != memo_key(held(definitions, "f[g[3]]"), definitions)
+
+    # A change to a definition that the expression depends on, however
+    # indirectly, changes its key; one to an unrelated definition doesn't.
+    evaluate(definitions, "d = 1")
+    assert key == memo_key(held(definitions, "f[g[2]]"), definitions)
+    evaluate(definitions, "c = 2")
+    assert key != memo_key(held(definitions, "f[g[2]]"), definitions)
+
+    assert memo_key(held(definitions, "RandomReal[]"), definitions) is None
+
+
+def test_cached(tmp_path):
+    definitions = memo_definitions(tmp_path)
+    first = evaluate(definitions, 'Settings`Cached[Print["hello"]; Expand[(a+b)^3]]')
+    assert [out.text for out in first.out] == ["hello"]
+    cache = get_memo_cache(definitions)
+    assert len(cache.entries()) == 1
+
+    # A later run gets the cached result, and output, without evaluating.
+    definitions = memo_definitions(tmp_path)
+    key = memo_key(held(definitions, 'Print["hello"]; Expand[(a+b)^3]'), definitions)
+    entry = cache.get(key)
+    entry["result"] = evaluate(definitions, "Hold[from cache]").last_eval
+    cache.put(key, entry)
+    second = evaluate(definitions, 'Settings`Cached[Print["hello"]; Expand[(a+b)^3]]')
+    assert second.result == "Hold[from cache]"
+    assert [out.text for out in second.out] == ["hello"]
+
+
+def test_impure_not_cached(tmp_path):
+    definitions = memo_definitions(tmp_path)
+    assert evaluate(definitions, "Settings`Cached[y = 5; y + 1]").result == "6"
+    assert evaluate(definitions, "Settings`Cached[RandomInteger[9] < 10]").result == (
+        "True"
+    )
+    assert get_memo_cache(definitions).entries() == []
+
+
+def test_eviction(tmp_path):
+    cache = MemoCache(str(tmp_path), limit=None)
+    for i, key in enumerate(("aa1", "bb2", "cc3")):
+        cache.put(key, {"result": "x" * 1000})
+        os.utime(cache.path(key), (1000 + i, 1000 + i))
+    # Using an entry makes it the most recently used.
+    assert cache.get("aa1") is not None
+
+    cache.limit = 2500
+    assert cache.evict() == 1
+    assert cache.get("bb2") is None
+    assert cache.get("aa1") is not None and cache.get("cc3") is not None
+
+
+class MakeDirectory:
+    def __init__(self, path):
+        self.path = path
+
+    def __reduce__(self):
+        return os.mkdir, (self.path,)
+
+
+def test_unsigned_entries_not_loaded(tmp_path):
+    cache = MemoCache(str(tmp_path / "memo"))
+    cache.put("aa1", {"result": "x"})
+    assert cache.get("aa1") == {"result": "x"}
+
+    # A file that this cache didn't write is never unpickled.
+    made = tmp_path / "made"
+    payload = pickle.dumps(MakeDirectory(str(made)))
+    for data in (payload, bytes(memo.DIGEST_SIZE) + payload):
+        with open(cache.path("aa1"), "wb") as f:
+            f.write(data)
+        assert cache.get("aa1") is None
+        assert not made.exists()
+        assert not os.path.exists(cache.path("aa1"))
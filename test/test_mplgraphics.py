@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import math
+
+import pytest
+from mathics.core.evaluation import Evaluation
+
+from .helper import evaluate_expr
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+from mathicsscript.mplgraphics import (  # noqa: E402
+    UnsupportedGraphics,
+    graphics_items,
+    render_graphics,
+)
+
+
+def test_graphics_items(definitions):
+    graphics = evaluate_expr(
+        definitions,
+        "Graphics[{Red, {Blue, Thickness[0.01], Line[{{0, 0}, {1, 1}}]},"
+        " Point[{{1, 2}, {3, Indeterminate}}],"
+        " EdgeForm[Black], Opacity[0.5], Disk[{0, 0}, 2, {0, Pi/2}],"
+        ' Text["label", {1, 1}, {-1, 0}]}]',
+    )
+    items = graphics_items(graphics, Evaluation(definitions), 200.0)
+    assert [item.kind for item in items] == ["lines", "points", "disk", "text"]
+    lines, points, disk, text = items
+
+    # Directives apply to the rest of the list they are in.
+    assert lines.style.color == (0.0, 0.0, 1.0, 1.0)
+    assert lines.style.thickness == pytest.approx(2.0)
+    assert lines.data[0].tolist() == [[0.0, 0.0], [1.0, 1.0]]
+    assert points.style.color == (1.0, 0.0, 0.0, 1.0)
+    assert points.data[0].tolist() == [1.0, 2.0]
+    assert math.isnan(points.data[1, 1])
+
+    center, radii, angles = disk.data
+    assert (center, radii) == ((0.0, 0.0), (2.0, 2.0))
+    assert angles == pytest.approx((0.0, math.pi / 2))
+    assert disk.style.fill_color() == (1.0, 0.0, 0.0, 0.5)
+    assert disk.style.edge() == (0.0, 0.0, 0.0, 0.5)
+    assert text.data == ("label", (1.0, 1.0), (-1.0, 0.0))
+
+
+def test_styled_and_empty_graphics(definitions):
+    chart = evaluate_expr(definitions, "PieChart[{1, 2, 3}]")
+    items = graphics_items(chart, Evaluation(definitions), 200.0)
+    assert [item.kind for item in items] == ["disk"] * 3
+    # Each slice is drawn in the color of its Style[], and covers its
+    # share of the circle.
+    assert len({item.style.color for item in items}) == 3
+    sweeps = [item.data[2][1] - item.data[2][0] for item in items]
+    assert sweeps == pytest.approx([math.pi / 3, 2 * math.pi / 3, math.pi])
+
+    styled = evaluate_expr(
+        definitions, "Graphics[{Style[Line[{{0, 0}, {1, 1}}], Red], Point[{}]}]"
+    )
+    lines, points = graphics_items(styled, Evaluation(definitions), 200.0)
+    assert lines.style.color == (1.0, 0.0, 0.0, 1.0)
+    # Style[] applies only to what is in it.
+    assert points.style.color is None
+    assert points.data.shape == (0, 2)
+    plt.close(render_graphics(styled, Evaluation(definitions), plt))
+
+
+def test_render_graphics(definitions):
+    plot = evaluate_expr(definitions, "Plot[{Sin[x], Cos[x]}, {x, 0, 6}]")
+    figure = render_graphics(plot, Evaluation(definitions), plt)
+    try:
+        (ax,) = figure.axes
+        assert len(ax.collections) == 2
+        assert ax.get_xlim() == pytest.approx((-0.3, 6.3), abs=0.01)
+        assert ax.spines["bottom"].get_visible()
+        assert not ax.spines["top"].get_visible()
+    finally:
+        plt.close(figure)
+
+
+def test_unsupported_graphics(definitions):
+    inset = evaluate_expr(definitions, "Graphics[{Line[{{0, 0}, {1, 1}}], Inset[x]}]")
+    figures = plt.get_fignums()
+    with pytest.raises(UnsupportedGraphics):
+        render_graphics(inset, Evaluation(definitions), plt)
+    # No figure is left behind to be shown later.
+    assert plt.get_fignums() == figures
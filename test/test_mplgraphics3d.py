@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import numpy as np
+import pytest
+from mathics.core.evaluation import Evaluation
+
+from .helper import evaluate_expr
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+from mathicsscript.mplgraphics import UnsupportedGraphics  # noqa: E402
+from mathicsscript.mplgraphics3d import (  # noqa: E402
+    decimate,
+    graphics3d_items,
+    render_graphics3d,
+)
+
+
+def surface_triangles(n: int) -> list:
+    x, y = np.meshgrid(np.linspace(0, 3, n), np.linspace(0, 3, n))
+    grid = np.stack([x, y, np.sin(x * y)], axis=-1)
+    triangles = []
+    for i in range(n - 1):
+        for j in range(n - 1):
+            triangles.append(grid[[i, i + 1, i], [j, j, j + 1]])
+            triangles.append(grid[[i + 1, i + 1, i], [j, j + 1, j + 1]])
+    return triangles
+
+
+def test_graphics3d_items(definitions):
+    graphics = evaluate_expr(
+        definitions,
+        "Graphics3D[{Red, Sphere[{0, 0, 0}, 2], Cuboid[{1, 1, 1}],"
+        " Polygon[{{0, 0, 0}, {0, 1, 0}, {1, 0, 0}}],"
+        " Polygon[{{0, 0, 1}, {0, 1, 1}, {1, 0, 1}}]}]",
+    )
+    items = graphics3d_items(graphics, Evaluation(definitions), 360.0)
+    # Polygons in the same style are drawn together.
+    (item,) = items
+    assert item.kind == "polygons"
+    assert item.style.color == (1.0, 0.0, 0.0, 1.0)
+    sphere = np.array(item.data[:288])
+    assert np.allclose(np.linalg.norm(sphere, axis=-1), 2)
+    cuboid = np.array(item.data[288:294])
+    assert cuboid.min() == 1 and cuboid.max() == 2
+    # The triangles now go around so that they face up.
+    for triangle in item.data[294:]:
+        normal = np.cross(triangle[1] - triangle[0], triangle[2] - triangle[0])
+        assert normal[2] > 0
+
+
+def test_decimate():
+    triangles = surface_triangles(100)
+    assert len(triangles) == 19602
+    assert sum(len(group) for group in decimate(triangles, 20000)) == 19602
+
+    (simplified,) = decimate(triangles, 2000)
+    assert 500 < len(simplified) <= 2000
+    assert simplified.shape[1:] == (3, 3)
+    # The simplified surface covers the same area.
+    assert simplified[..., 0].min() == pytest.approx(0, abs=0.1)
+    assert simplified[..., 0].max() == pytest.approx(3, abs=0.1)
+
+
+def test_render_graphics3d(definitions):
+    plot = evaluate_expr(definitions, "Plot3D[x y, {x, 0, 1}, {y, 0, 2}]")
+    figure = render_graphics3d(plot, Evaluation(definitions), plt)
+    try:
+        (ax,) = figure.axes
+        assert ax.name == "3d"
+        assert ax.get_ylim() == pytest.approx((0, 2))
+        assert ax.get_zlim() == pytest.approx((0, 2))
+    finally:
+        plt.close(figure)
+
+    cylinder = evaluate_expr(definitions, "Graphics3D[{Sphere[], Cylinder[]}]")
+    with pytest.raises(UnsupportedGraphics):
+        render_graphics3d(cylinder, Evaluation(definitions), plt)
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import sqlite3
+
+import pytest
+
+pexpect = pytest.importorskip("pexpect")
+pytest.importorskip("readline")
+
+PASTE_LINES = 5000
+
+# Loaded at startup through PYTHONPATH: counts the calls that change
+# GNU Readline's history, and writes the counts out on exit.
+COUNT_CALLS = """
+import atexit, json, os, readline
+
+counts = {"add_history": 0, "remove_history_item": 0}
+
+
+def count(name):
+    function = getattr(readline, name)
+
+    def counted(*args):
+        counts[name] += 1
+        return function(*args)
+
+    setattr(readline, name, counted)
+
+
+for name in counts:
+    count(name)
+atexit.register(
+    lambda: open(os.environ["READLINE_CALLS"], "w").write(json.dumps(counts))
+)
+"""
+
+
+def start_gnu_shell(tmp_path):
+    site = tmp_path / "site"
+    site.mkdir()
+    (site / "sitecustomize.py").write_text(COUNT_CALLS)
+    return pexpect.spawn(
+        "mathicsscript",
+        ["--readline", "gnu", "--quiet", "--no-asymptote", "--no-matplotlib"],
+        env=dict(
+            os.environ,
+            XDG_CONFIG_HOME=str(tmp_path),
+            NO_COLOR="1",
+            PYTHONPATH=str(site),
+            READLINE_CALLS=str(tmp_path / "calls.json"),
+        ),
+        encoding="utf-8",
+        timeout=120,
+    )
+
+
+def paste(shell, lines):
+    """
+    Type ``lines`` as fast as the shell reads them, reading its echo as we
+    go so that neither side blocks on a full terminal buffer.
+    """
+    for start in range(0, len(lines), 100):
+        shell.send("".join(line + "\r" for line in lines[start : start + 100]))
+        while True:
+            try:
+                shell.read_nonblocking(65536, timeout=0.01)
+            except pexpect.TIMEOUT:
+                break
+
+
+def test_multiline_paste_is_one_history_entry(tmp_path):
+    os.makedirs(tmp_path / "Mathics3")
+    shell = start_gnu_shell(tmp_path)
+    shell.expect(r"In\[1\]:=")
+
+    lines = ["Total[{"] + ["1,"] * (PASTE_LINES - 1) + ["1}]"]
+    paste(shell, lines)
+    shell.expect(r"Out\[1\]= 5000")
+    shell.send(" ".join(lines) + "\r")
+    shell.expect(r"Out\[2\]= 5000")
+
+    # Up arrow recalls the whole pasted input, not just its last line.
+    shell.send("\x1b[A\x1b[A\r")
+    shell.expect(r"Out\[3\]= 5000")
+    shell.sendline("Quit[]")
+    shell.expect(pexpect.EOF)
+
+    # History is changed once for each input, however many lines it has.
+    with open(tmp_path / "calls.json") as f:
+        assert json.load(f) == {"add_history": 4, "remove_history_item": 0}
+
+    connection = sqlite3.connect(tmp_path / "Mathics3" / "history.sqlite")
+    entries = [text for (text,) in connection.execute("SELECT text FROM history")]
+    connection.close()
+    assert len(entries) == 4
+    assert entries[0] == "\n".join(lines)
+    assert entries[2] == entries[0]
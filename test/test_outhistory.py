@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+import os
+import pickle
+
+from mathicsscript.checkpoint import SessionCheckpoint, restore_session
+from mathicsscript.outhistory import (
+    OutHistory,
+    expression_size,
+    install_out_history_builtins,
+    out_rules,
+    spilled_file,
+)
+
+from .helper import evaluate_expr, evaluate_text, new_definitions
+
+
+def out_history_definitions():
+    definitions = new_definitions()
+    install_out_history_builtins(definitions)
+    return definitions
+
+
+def spilled_lines(definitions):
+    return sorted(
+        line for line, rule in out_rules(definitions) if spilled_file(rule.replace)
+    )
+
+
+def test_expression_size():
+    definitions = out_history_definitions()
+    small = evaluate_expr(definitions, "Range[10]")
+    large = evaluate_expr(definitions, "Range[10000]")
+    assert 0 < expression_size(small) < expression_size(large)
+
+
+def test_spill_and_reload(tmp_path):
+    directory = str(tmp_path / "out")
+    definitions = out_history_definitions()
+    out_history = OutHistory(directory)
+    # Room for two of the results below, of about 1.8 megabytes each.
+    evaluate_text(definitions, "Settings`$OutHistoryMemoryLimit = 4")
+    for i in range(1, 6):
+        evaluate_text(definitions, f"Range[{i}, 20000 + {i}]")
+        out_history.update(definitions)
+    # Line 1 set the limit.
+    assert spilled_lines(definitions) == [2, 3, 4]
+    assert len(os.listdir(directory)) == 3
+
+    assert evaluate_text(definitions, "Total[Out[3]]") == str(sum(range(2, 20003)))
+    assert evaluate_text(definitions, "First[%4]") == "3"
+
+    # Results dropped by $HistoryLength take their files with them.
+    evaluate_text(definitions, "$HistoryLength = 2")
+    out_history.update(definitions)
+    assert spilled_lines(definitions) == []
+    assert os.listdir(directory) == []
+
+    out_history.close()
+    assert not os.path.exists(directory)
+
+
+def test_checkpoint_saves_spilled_results(tmp_path):
+    definitions = out_history_definitions()
+    out_history = OutHistory(str(tmp_path / "out"))
+    evaluate_text(definitions, "Settings`$OutHistoryMemoryLimit = 2")
+    evaluate_text(definitions, "Range[20000]")
+    evaluate_text(definitions, "Range[30000]")
+    out_history.update(definitions)
+    assert spilled_lines(definitions) == [2]
+
+    path = str(tmp_path / "session")
+    SessionCheckpoint(path).save(definitions)
+    out_history.close()
+
+    restored = out_history_definitions()
+    restore_session(restored, path)
+    assert spilled_lines(restored) == []
+    assert evaluate_text(restored, "Length[Out[2]]") == "20000"
+
+
+class MakeDirectory:
+    def __init__(self, path):
+        self.path = path
+
+    def __reduce__(self):
+        return os.mkdir, (self.path,)
+
+
+def test_spilled_out_reads_only_its_own_files(tmp_path):
+    definitions = out_history_definitions()
+    out_history = OutHistory(str(tmp_path / "out"))
+    evaluate_text(definitions, "Settings`$OutHistoryMemoryLimit = 1")
+    evaluate_text(definitions, "Range[20000]")
+    evaluate_text(definitions, "Range[30000]")
+    out_history.update(definitions)
+    assert spilled_lines(definitions) == [2]
+
+    # Unpickling this file would make a directory.
+    marker = tmp_path / "unpickled"
+    path = tmp_path / "result"
+    path.write_bytes(pickle.dumps(MakeDirectory(str(marker))))
+    for name in (str(path), str(tmp_path / "out" / ".." / "result")):
+        assert evaluate_text(definitions, f'Settings`SpilledOut["{name}"]') == "$Failed"
+    assert not marker.exists()
+    assert evaluate_text(definitions, "Length[Out[2]]") == "20000"
+    out_history.close()
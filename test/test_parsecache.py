@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+import os
+import os.path as osp
+from functools import partial
+
+import pytest
+from mathics.core.evaluation import Evaluation
+
+from mathicsscript import parsecache
+from mathicsscript.parsecache import (
+    ParsedFileFeeder,
+    RecordingFileFeeder,
+    cache_path,
+    file_feeder,
+)
+
+from .helper import new_definitions
+
+PACKAGE = """\
+BeginPackage["PCTest`"]
+square::usage = "square[x] gives x^2."
+Begin["`Private`"]
+helper[x_] := x * x
+square[x_] := helper[x]
+End[]
+EndPackage[]
+total = Sum[square[i], {i, 10}]
+"""
+
+
+@pytest.fixture(autouse=True)
+def cache_every_file(monkeypatch):
+    monkeypatch.setattr(parsecache, "MIN_CACHED_SIZE", 0)
+
+
+def evaluate_file(path, cache_dir):
+    """
+    Evaluate the file ``path`` in new definitions, and return the
+    definitions and the class of the feeder used.
+    """
+    definitions = new_definitions()
+    with open(path, "r") as f:
+        feeder = file_feeder(f, cache_dir=cache_dir)
+        while not feeder.empty():
+            evaluation = Evaluation(definitions, catch_interrupt=False)
+            query = evaluation.parse_feeder(feeder)
+            if query is not None:
+                evaluation.evaluate(query)
+    return definitions, type(feeder)
+
+
+def value(definitions, code: str) -> str:
+    return Evaluation(definitions).parse_evaluate(code).result
+
+
+def test_parse_cache(tmp_path):
+    script = tmp_path / "package.m"
+    cache_dir = str(tmp_path / "cache")
+    script.write_text(PACKAGE)
+
+    definitions, feeder_class = evaluate_file(str(script), cache_dir)
+    assert feeder_class is RecordingFileFeeder
+    assert osp.isfile(cache_path(str(script), cache_dir))
+    assert value(definitions, "total") == "385"
+
+    # The package's symbols are given their contexts as it is read, even
+    # though its statements are no longer parsed.
+    definitions, feeder_class = evaluate_file(str(script), cache_dir)
+    assert feeder_class is ParsedFileFeeder
+    assert value(definitions, "total") == "385"
+    assert value(definitions, "Context[square]") == "PCTest`"
+    assert value(definitions, "Context[PCTest`Private`helper]") == "PCTest`Private`"
+    assert value(definitions, 'Names["Global`helper"]') == "{}"
+
+    # Changing the file throws out its cache.
+    script.write_text(PACKAGE.replace("{i, 10}", "{i, 3}"))
+    stat = os.stat(script)
+    os.utime(script, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    definitions, feeder_class = evaluate_file(str(script), cache_dir)
+    assert feeder_class is RecordingFileFeeder
+    assert value(definitions, "total") == "14"
+
+
+def test_parse_cache_contexts(tmp_path):
+    # A statement whose symbols resolve differently from when it was cached
+    # is parsed again.
+    script = tmp_path / "script.m"
+    cache_dir = str(tmp_path / "cache")
+    script.write_text("value = 1\n")
+    evaluate_file(str(script), cache_dir)
+
+    definitions = new_definitions()
+    value(definitions, 'Begin["Other`"]')
+    value(definitions, "value = 0")
+    with open(script, "r") as f:
+        feeder = file_feeder(f, cache_dir=cache_dir)
+        assert isinstance(feeder, ParsedFileFeeder)
+        Evaluation(definitions).evaluate(Evaluation(definitions).parse_feeder(feeder))
+    assert value(definitions, "{Other`value, ValueQ[Global`value]}") == "{1, False}"
+
+
+def test_parse_cache_get(tmp_path, monkeypatch):
+    import mathics.eval.files_io.files as eval_files
+
+    package = tmp_path / "package.m"
+    cache_dir = str(tmp_path / "cache")
+    package.write_text(PACKAGE)
+    parsecache.install_parse_cache()
+    monkeypatch.setattr(
+        eval_files, "MathicsFileLineFeeder", partial(file_feeder, cache_dir=cache_dir)
+    )
+
+    for _ in range(2):
+        definitions = new_definitions()
+        value(definitions, f'Get["{package}"]')
+        assert value(definitions, "total") == "385"
+        assert osp.isfile(cache_path(str(package), cache_dir))
+
+
+def test_parse_cache_syntax_error(tmp_path):
+    script = tmp_path / "script.m"
+    cache_dir = str(tmp_path / "cache")
+    script.write_text("a = 1\nb = (2\n")
+    evaluate_file(str(script), cache_dir)
+    assert not osp.exists(cache_path(str(script), cache_dir))
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+import os
+import os.path as osp
+import pstats
+import subprocess
+
+import pytest
+
+from mathicsscript.profiling import (
+    ProfileOptions,
+    is_profile_command,
+    parse_profile_command,
+    run_profiled,
+)
+
+
+def test_is_profile_command():
+    assert is_profile_command("!!profile 1 + 2")
+    assert is_profile_command("!!profile")
+    assert not is_profile_command("!!profile.m")
+    assert not is_profile_command("!ls")
+
+
+def test_parse_profile_command():
+    assert parse_profile_command("!!profile Expand[(x+y)^10]") == ProfileOptions(
+        "Expand[(x+y)^10]"
+    )
+    assert parse_profile_command(
+        "!!profile -m --limit 5 -o /tmp/x.prof  N[Pi, 1000]"
+    ) == ProfileOptions("N[Pi, 1000]", memory=True, limit=5, output="/tmp/x.prof")
+    assert parse_profile_command("!!profile --no-cpu -m f[-1]") == ProfileOptions(
+        "f[-1]", cpu=False, memory=True
+    )
+
+    for bad in ("!!profile", "!!profile -m", "!!profile --bogus 1", "!!profile -n x 1"):
+        with pytest.raises(ValueError):
+            parse_profile_command(bad)
+
+
+def test_run_profiled(tmp_path):
+    lines = []
+    prof_file = str(tmp_path / "out.prof")
+    options = ProfileOptions("", memory=True, limit=3, output=prof_file)
+    result = run_profiled(lambda: [str(i) for i in range(1000)], options, lines.append)
+    assert len(result) == 1000
+    report = "\n".join(lines)
+    assert "function calls" in report
+    assert "allocating call sites" in report
+    assert osp.isfile(prof_file)
+    pstats.Stats(prof_file)
+
+
+def run_shell(directory, text: str, **environment) -> str:
+    return subprocess.run(
+        ["mathicsscript", "--readline", "None", "--no-prompt"],
+        input=text,
+        capture_output=True,
+        text=True,
+        cwd=directory,
+        env=dict(os.environ, **environment),
+    ).stdout
+
+
+def test_profile_escape_shell(tmp_path):
+    # In sandboxed mode, !!profile can't write its --output file.
+    output = run_shell(tmp_path, "!!profile -o out.prof 1 + 1\n", MATHICS3_SANDBOX="1")
+    assert "disabled in sandboxed mode" in output
+    assert not (tmp_path / "out.prof").exists()
+
+    # "!!profile" still shows a file named profile.
+    (tmp_path / "profile").write_text("shown from a file\n")
+    assert "shown from a file" in run_shell(tmp_path, "!!profile\n")
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import os.path as osp
+import socket
+import subprocess
+import threading
+import time
+
+import pytest
+
+from mathicsscript.client import MathicsClient, ServerError
+from mathicsscript.protocol import (
+    ProtocolError,
+    encode_message,
+    recv_message,
+    send_message,
+)
+from mathicsscript.server import KernelServer
+
+
+def test_protocol():
+    message = {"op": "evaluate", "code": "\\[Alpha] + 1"}
+    left, right = socket.socketpair()
+    with left, right:
+        send_message(left, message)
+        left.sendall(encode_message({"id": 2})[:-1])
+        left.shutdown(socket.SHUT_WR)
+        assert recv_message(right) == message
+        with pytest.raises(ProtocolError):
+            recv_message(right)
+
+
+def test_interrupt(definitions):
+    kernel = KernelServer(definitions)
+    assert not kernel.interrupt()
+    # An interrupt sent as soon as the evaluation has started.
+    start_evaluation = kernel.start_evaluation
+    kernel.start_evaluation = lambda evaluation: (
+        start_evaluation(evaluation),
+        kernel.interrupt(),
+    )
+    assert kernel.evaluate("1 + 1")[0]["exc_result"] == "$Aborted"
+    del kernel.start_evaluation
+    # Nothing is left to be interrupted, and the worker thread goes on.
+    assert not kernel.interrupt()
+    assert kernel.evaluate("2 + 2")[0]["result"] == "4"
+
+
+def test_complete_after_evaluation(definitions):
+    kernel = KernelServer(definitions)
+    finished = []
+
+    async def request(op: str, **fields):
+        response = await kernel.handle_request({"op": op, **fields})
+        finished.append(op)
+        return response
+
+    async def evaluate_and_complete():
+        return await asyncio.gather(
+            request("evaluate", code="Pause[0.5]; completeMe = 1"),
+            request("complete", text="completeM"),
+        )
+
+    _, response = asyncio.run(evaluate_and_complete())
+    # The completion waits for the evaluation, and so sees what it defined.
+    assert finished == ["evaluate", "complete"]
+    assert {"text": "completeMe", "start": -9} in response["completions"]
+
+
+@pytest.fixture
+def server(tmp_path):
+    socket_path = str(tmp_path / "kernel.sock")
+    process = subprocess.Popen(["mathicsscript", "--serve", socket_path])
+    yield socket_path
+    if process.poll() is None:
+        with MathicsClient(socket_path) as client:
+            client.shutdown()
+    assert process.wait(timeout=60) == 0
+    assert not osp.exists(socket_path)
+
+
+def test_serve(server):
+    with MathicsClient(server, wait=60) as client:
+        results = client.evaluate('x = 6; x^2\nPrint["hi"]\nf[')
+        assert [r["result"] for r in results] == ["36", "Null", None]
+        assert results[1]["prints"] == ["hi"]
+        assert results[2]["messages"][0]["tag"] == "sntxi"
+        assert client.evaluate("x + 1")[0]["result"] == "7"
+
+        assert {"text": "Fibonacci", "start": -5} in client.complete("Fibon")
+        with pytest.raises(ServerError):
+            client.request("no-such-operation")
+
+        assert not client.interrupt()
+        results = {}
+        evaluating = threading.Thread(
+            target=lambda: results.update(r=client.evaluate("Do[x++, {10^9}]\nx > 6"))
+        )
+        evaluating.start()
+        time.sleep(1)
+        with MathicsClient(server) as other_client:
+            assert other_client.interrupt()
+        evaluating.join(timeout=60)
+        aborted, after = results["r"]
+        assert aborted["exc_result"] == "$Aborted"
+        assert after["result"] == "True"
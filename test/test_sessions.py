@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from mathicsscript import memorylimit
+from mathicsscript.client import MathicsClient
+from mathicsscript.sessions import process_usage
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="sessions are reported using /proc"
+)
+
+
+def test_process_usage():
+    usage = process_usage(os.getpid())
+    assert usage["rss"] > 0
+    assert 0 < usage["private"] <= usage["rss"]
+    assert usage["cpu_seconds"] > 0
+
+
+def test_memory_limit_without_proc(monkeypatch, tmp_path):
+    monkeypatch.setattr(memorylimit, "STATM_PATH", str(tmp_path / "statm"))
+    assert not memorylimit.can_limit_memory()
+    assert not memorylimit.set_memory_limit(100 * 1024 * 1024)
+
+
+@pytest.fixture
+def server(tmp_path):
+    socket_path = str(tmp_path / "kernel.sock")
+    process = subprocess.Popen(
+        [
+            "mathicsscript",
+            "--serve",
+            socket_path,
+            "--sessions",
+            "--session-memory-limit",
+            "100",
+        ]
+    )
+    yield socket_path
+    if process.poll() is None:
+        with MathicsClient(socket_path) as client:
+            client.shutdown()
+    assert process.wait(timeout=60) == 0
+
+
+def test_sessions(server):
+    with (
+        MathicsClient(server, wait=60) as status_client,
+        MathicsClient(server) as first,
+        MathicsClient(server) as second,
+    ):
+        assert status_client.status() == []
+        assert first.evaluate("x = 1")[0]["result"] == "1"
+        # Each client has its own definitions.
+        assert second.evaluate("x")[0]["result"] == "x"
+        sessions = status_client.status()
+        assert len(sessions) == 2
+        assert all(s["client_pid"] == os.getpid() for s in sessions)
+        assert all(s["rss"] > s["private"] > 0 for s in sessions)
+
+        # An interrupt can be sent while the same client is evaluating.
+        results = {}
+        evaluating = threading.Thread(
+            target=lambda: results.update(r=first.evaluate("Do[x++, {10^9}]"))
+        )
+        evaluating.start()
+        time.sleep(1)
+        assert first.interrupt()
+        evaluating.join(timeout=60)
+        assert results["r"][0]["exc_result"] == "$Aborted"
+
+        result = second.evaluate("Length[Range[10^8]]")[0]
+        assert result["exc_result"] == "$Aborted"
+        assert result["messages"][0]["tag"] == "nomem"
+        # That session ends, but others go on.
+        assert first.evaluate("x > 1")[0]["result"] == "True"
+        first.shutdown()
+        deadline = time.monotonic() + 10
+        while status_client.status() and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert status_client.status() == []
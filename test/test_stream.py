@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+import io
+import subprocess
+
+from mathicsscript.stream import MathicsStreamLineFeeder
+
+
+def test_stream_feeder():
+    feeder = MathicsStreamLineFeeder(io.StringIO("a\n\n\nb\n"))
+    assert feeder.feed() == "a\n"
+    assert feeder.feed() == "b\n"
+    assert feeder.lineno == 4
+    assert not feeder.empty()
+    assert feeder.feed() == ""
+    assert feeder.empty()
+
+
+def test_stdin_stream():
+    with subprocess.Popen(
+        ["mathicsscript", "--stdin-stream", "-c", "a = 10"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        text=True,
+    ) as process:
+        assert process.stdout.readline() == "10\n"
+        # Each result should come back before more input is sent.
+        for expr, expected in (("a + 1", "11"), ("f[\n\n a]", "f[10]")):
+            process.stdin.write(expr + "\n")
+            process.stdin.flush()
+            assert process.stdout.readline() == expected + "\n"
+        process.stdin.write("Quit[3]\n")
+        process.stdin.close()
+        assert process.wait() == 3
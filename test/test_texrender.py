@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import subprocess
+import sys
+
+import pytest
+from mathics.core.atoms import String
+from mathics.core.definitions import Definitions
+from mathics.core.evaluation import Evaluation
+
+from mathicsscript import texrender
+from mathicsscript.format import format_output
+
+matplotlib = pytest.importorskip("matplotlib")
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+from mathicsscript.texrender import tex_image, tex_png  # noqa: E402
+
+
+@pytest.fixture
+def definitions():
+    definitions = Definitions(add_builtin=True)
+    for setting in ("$UseMatplotlib", "$RenderTeXForm"):
+        Evaluation(definitions).parse_evaluate(f"Settings`{setting} = True")
+    return definitions
+
+
+def show_texform(definitions, code: str):
+    evaluation = Evaluation(definitions)
+    expr = evaluation.parse_evaluate(f"TeXForm[{code}]").last_eval
+    return format_output(Evaluation(definitions), expr, "text")
+
+
+def test_tex_image():
+    image = tex_image(r"x^2 + \sqrt{y}")
+    height, width, depth = image.shape
+    assert depth == 4 and width > height > 20
+    # Just big enough for the formula and its margin.
+    assert image[:4].min() == 255 and image[4:-4, 4:-4].min() < 10
+    assert tex_image(r"x^2 + \sqrt{y}") is image
+    assert tex_png(r"x^2 + \sqrt{y}").startswith(b"\x89PNG")
+
+    clear = tex_image("x", 20, "red", None)
+    assert clear[0, 0, 3] == 0 and clear[..., 3].max() == 255
+    assert clear[..., :3].reshape(-1, 3).tolist()[0] == [255, 0, 0]
+
+    with pytest.raises(ValueError):
+        tex_image(r"\begin{array}x\end{array}")
+
+
+def test_show_tex_window(definitions, monkeypatch):
+    monkeypatch.setattr(texrender, "get_inline_protocol", lambda definitions: None)
+    figures = []
+    monkeypatch.setattr(
+        texrender, "show_figure", lambda plt, figure, limit: figures.append(figure)
+    )
+    try:
+        assert show_texform(definitions, "x^2 / 2").value == r"\frac{x^2}{2}"
+        (figure,) = figures
+        (image,) = figure.images
+        assert image.get_array().shape == tex_image(r"\frac{x^2}{2}").shape
+    finally:
+        plt.close("all")
+
+
+def test_show_tex_inline(definitions, monkeypatch):
+    out = io.BytesIO()
+    monkeypatch.setattr(texrender, "get_inline_protocol", lambda definitions: "iTerm")
+    monkeypatch.setattr(texrender, "terminal_size", lambda: (80, (10, 20)))
+    monkeypatch.setattr(sys, "stdout", io.TextIOWrapper(out))
+    show_texform(definitions, "Sqrt[y]")
+    assert out.getvalue().startswith(b"\x1b]1337;File=inline=1;")
+
+
+def test_tex_directory(definitions, tmp_path, monkeypatch, capsys):
+    Evaluation(definitions).parse_evaluate(f'Settings`$TeXFormDirectory = "{tmp_path}"')
+    for code in ("a + b", "Integrate[f[x], x]", "a + b"):
+        assert isinstance(show_texform(definitions, code), String)
+    # mathtext can't typeset an array, so its TeX is shown instead.
+    assert "array" in show_texform(definitions, "MatrixForm[{{1, 2}, {3, 4}}]")
+    texrender.wait_for_writes()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "TeXForm-001.png",
+        "TeXForm-002.png",
+        "TeXForm-003.png",
+    ]
+    first, third = tmp_path / "TeXForm-001.png", tmp_path / "TeXForm-003.png"
+    assert first.read_bytes() == third.read_bytes() == tex_png("a+b")
+
+    def fail(image):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(texrender, "image_png", fail)
+    show_texform(definitions, "c + d")
+    texrender.wait_for_writes()
+    assert "TeXForm-004.png: disk full" in capsys.readouterr().err
+    assert not (tmp_path / "TeXForm-004.png").exists()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+def test_tex_directory_isolate(tmp_path):
+    # The child each input is evaluated in writes its image before it
+    # exits, numbered after those already there.
+    subprocess.run(
+        ["mathicsscript", "--readline", "None", "--isolate"],
+        input=(
+            f'Settings`$TeXFormDirectory = "{tmp_path}"\n'
+            "TeXForm[a + b]\nTeXForm[Sqrt[c]]\n"
+        ),
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, MPLBACKEND="Agg"),
+        check=True,
+    )
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "TeXForm-001.png",
+        "TeXForm-002.png",
+    ]
+    assert (tmp_path / "TeXForm-002.png").read_bytes() == tex_png(r"\sqrt{c}")
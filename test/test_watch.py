@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from mathicsscript.watch import (
+    PollingWatcher,
+    make_watcher,
+    wait_until_quiet,
+    watch_file,
+)
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+
+
+@pytest.mark.parametrize("polling", [False, True])
+def test_watcher(tmp_path, polling):
+    path = tmp_path / "script.m"
+    path.write_text("1")
+    watcher = PollingWatcher(str(path), 0.05) if polling else make_watcher(str(path))
+    try:
+        assert not watcher.wait(0.2)
+        (tmp_path / "other.m").write_text("2")
+        path.write_text("2")
+        assert watcher.wait(2)
+        wait_until_quiet(watcher, 0.2)
+
+        # Saving by renaming a new file over the old one counts.
+        (tmp_path / "new.m").write_text("three")
+        os.replace(tmp_path / "new.m", path)
+        assert watcher.wait(2)
+    finally:
+        watcher.close()
+
+
+def test_watch_file(tmp_path):
+    path = tmp_path / "script.m"
+    log = tmp_path / "log"
+    path.write_text("first")
+
+    def run():
+        with open(log, "a") as f:
+            f.write(path.read_text() + "\n")
+
+    def edit():
+        time.sleep(0.5)
+        path.write_text("second")
+
+    editing = threading.Thread(target=edit)
+    editing.start()
+    watch_file(str(path), run, debounce=0.1, max_runs=2)
+    editing.join()
+    assert log.read_text() == "first\nsecond\n"
+
+
+def test_watch_command(tmp_path):
+    path = tmp_path / "script.m"
+    path.write_text('Print["run ", x = 1]\n')
+    process = subprocess.Popen(
+        [sys.executable, "-m", "mathicsscript", "--watch", "-f", str(path)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        assert process.stdout.readline() == "run 1\n"
+        # Each run starts from fresh definitions.
+        path.write_text('Print["run ", x + 1]\n')
+        assert process.stdout.readline() == "run 1 + x\n"
+    finally:
+        process.terminate()
+        assert process.wait(timeout=30) == 0